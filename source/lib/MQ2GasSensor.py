@@ -1,9 +1,20 @@
 # MQ2GasSensor.py
 # MQ-2 가연성 가스센서 라이브러리
+#
+# - 예열 상태는 ticks_ms 로 추적한다. (기다리지 않고 is_warmed_up()/warmup_remaining_ms() 로 확인)
+# - ADC 는 공용 버스트 샘플러(AdcSampler)로 읽고, 전압은 read_mv()(read_uv 또는 보정 LUT)를 사용한다.
+# - 가스 곡선(Rs/Ro = a * ppm^b)은 log10 ppm = (log10 ratio - log10 a) / b 형태의
+#   계수 (log10 a, 1/b) 로 미리 계산해 두고, 한 번 측정한 Rs/Ro 로 5종 가스 ppm 을 한 번에 구한다.
+# - update() 를 메인 루프에서 호출하면 period_ms 주기로 측정해 결과를 캐시한다. (BLE MQ2 서비스)
 
-import machine
 import time
 import math
+import json
+from adc_sampler import AdcSampler, make_adc
+
+
+CAL_FILE = "/mq2_cal.json"
+
 
 class MQ2GasSensor:
     """
@@ -15,6 +26,8 @@ class MQ2GasSensor:
     # MQ-2 기본 설정값
     RL_VALUE = 5.0          # 로드 저항 (kΩ)
     RO_CLEAN_AIR = 9.83     # 깨끗한 공기에서의 센서 저항 (kΩ)
+    VCC = 3.3               # 센서 출력 분압 기준 전압 (V)
+    WARMUP_MS = 20000       # 예열 시간 (20초)
     
     # 가스별 곡선 상수 (Rs/Ro = a * ppm^b)
     GAS_LPG = {"a": 2.3, "b": -0.24}
@@ -23,125 +36,289 @@ class MQ2GasSensor:
     GAS_HYDROGEN = {"a": 1.8, "b": -0.21}
     GAS_ALCOHOL = {"a": 0.75, "b": -0.42}
     
+    # 한 번에 계산하는 가스 순서 (read_all_ppm / ppm 캐시 순서)
+    GAS_NAMES = ("LPG", "METHANE", "SMOKE", "HYDROGEN", "ALCOHOL")
+    
     # 경보 임계값 (ppm)
     ALARM_THRESHOLD = 300   # 일반적인 경보 수준
     
-    def __init__(self, adc_pin, ro_value=None):
+    def __init__(self, adc_pin, ro_value=None, period_ms=1000, cal_file=CAL_FILE):
         """
         MQ-2 센서 초기화
         
         Args:
             adc_pin (int): ADC 핀 번호
-            ro_value (float): 깨끗한 공기에서의 센서 저항값 (None이면 기본값)
+            ro_value (float): 깨끗한 공기에서의 센서 저항값 (None이면 저장된 보정값 또는 기본값)
+            period_ms (int): update() 측정 주기(ms)
+            cal_file (str): Ro 보정값 저장 파일 (None 이면 저장 안 함)
         """
         self.adc_pin = adc_pin
-        self.ro_value = ro_value or self.RO_CLEAN_AIR
+        self.cal_file = cal_file
+        self.ro_value = self.RO_CLEAN_AIR
+        if ro_value:
+            self.ro_value = ro_value
+        else:
+            self._load_calibration()
+        
+        # 가스 곡선 계수: (log10 a, 1/b)
+        self._curves = tuple(
+            (math.log10(c["a"]), 1.0 / c["b"])
+            for c in (self.GAS_LPG, self.GAS_METHANE, self.GAS_SMOKE,
+                      self.GAS_HYDROGEN, self.GAS_ALCOHOL)
+        )
         
-        # ADC 초기화
-        self.adc = machine.ADC(machine.Pin(adc_pin))
-        self.adc.atten(machine.ADC.ATTN_11DB)
-        self.adc.width(machine.ADC.WIDTH_12BIT)
+        # ADC 초기화 (공용 버스트 샘플러)
+        self.adc = make_adc(adc_pin)
+        self._sampler = AdcSampler(self.adc, size=16)
         
         # 상태 변수
         self.last_reading = None
         self.readings_count = 0
         self.warmed_up = False
-        self.warmup_start = time.time()
+        self.warmup_start = time.ticks_ms()
+        
+        # update() 캐시
+        self.period_ms = max(100, int(period_ms))
+        self.voltage = 0.0
+        self.ratio = float('inf')
+        self.ppm = [0.0] * len(self.GAS_NAMES)
+        self._measured_ms = None
+        self._next_ms = self.warmup_start
         
         print(f"MQ-2 센서 초기화 완료 (핀: {adc_pin})")
         print("⏰ 센서 예열 중... (20초 권장)")
     
-    def read_raw(self):
-        """원시 ADC 값 읽기"""
-        return self.adc.read()
+    # ------------------------------------------------------------------
+    # 보정값 저장
+    # ------------------------------------------------------------------
+    def _load_calibration(self):
+        """저장된 Ro 보정값을 불러온다. (성공 여부 반환)"""
+        if not self.cal_file:
+            return False
+        try:
+            with open(self.cal_file, "r") as f:
+                self.ro_value = float(json.load(f)["ro"])
+            return True
+        except Exception:
+            return False
+    
+    def save_calibration(self):
+        """현재 Ro 값을 저장한다. (성공 여부 반환)"""
+        if not self.cal_file:
+            return False
+        try:
+            with open(self.cal_file, "w") as f:
+                json.dump({"ro": self.ro_value}, f)
+            return True
+        except Exception:
+            return False
+    
+    # ------------------------------------------------------------------
+    # 예열 상태 (논블로킹)
+    # ------------------------------------------------------------------
+    def warmup_elapsed_ms(self):
+        """초기화 후 경과 시간(ms)"""
+        return time.ticks_diff(time.ticks_ms(), self.warmup_start)
     
-    def read_voltage(self):
-        """전압 읽기"""
-        return (self.read_raw() / 4095) * 3.3
+    def warmup_remaining_ms(self):
+        """예열 완료까지 남은 시간(ms), 완료 시 0"""
+        if self.warmed_up:
+            return 0
+        remaining = self.WARMUP_MS - self.warmup_elapsed_ms()
+        if remaining <= 0:
+            self.warmed_up = True
+            return 0
+        return remaining
+    
+    def is_warmed_up(self):
+        """예열 완료 여부"""
+        return self.warmup_remaining_ms() == 0
     
-    def read_resistance(self):
+    # ------------------------------------------------------------------
+    # 측정
+    # ------------------------------------------------------------------
+    def read_raw(self):
+        """원시 ADC 값 읽기 (버스트 샘플 평균)"""
+        return int(self._sampler.read_mean() + 0.5)
+    
+    def read_voltage(self, samples=1):
         """
-        센서 저항값 계산 (Rs)
+        전압 읽기 (read_uv() 또는 보드 보정 LUT, adc_calib)
         
-        Returns:
-            float: 센서 저항값 (kΩ)
+        Args:
+            samples (int): 평균할 버스트 수 (버스트당 16샘플, 대기 없음)
         """
-        voltage = self.read_voltage()
-        
+        if samples <= 1:
+            return self._sampler.read_mv() / 1000
+        total = 0.0
+        for _ in range(samples):
+            total += self._sampler.read_mv()
+        return total / samples / 1000
+    
+    def _resistance(self, voltage):
+        """전압으로 센서 저항값(Rs, kΩ) 계산"""
         # 전압이 너무 낮으면 최대 저항으로 처리
         if voltage <= 0.1:
             return float('inf')
         
         # Rs 계산: Rs = (Vc - Vout) * RL / Vout
-        # Vc = 3.3V (공급전압)
-        rs = ((3.3 - voltage) * self.RL_VALUE) / voltage
-        return rs
+        return ((self.VCC - voltage) * self.RL_VALUE) / voltage
     
-    def read_ratio(self):
+    def read_resistance(self, samples=1):
         """
-        Rs/Ro 비율 계산
+        센서 저항값 계산 (Rs)
         
         Returns:
-            float: Rs/Ro 비율
+            float: 센서 저항값 (kΩ)
         """
-        rs = self.read_resistance()
+        return self._resistance(self.read_voltage(samples))
+    
+    def _ratio(self, voltage):
+        rs = self._resistance(voltage)
         if rs == float('inf'):
             return float('inf')
+        return rs / self.ro_value
+    
+    def read_ratio(self, samples=1):
+        """
+        Rs/Ro 비율 계산
+        
+        Args:
+            samples (int): 평균할 버스트 수
         
-        ratio = rs / self.ro_value
+        Returns:
+            float: Rs/Ro 비율
+        """
+        ratio = self._ratio(self.read_voltage(samples))
         self.last_reading = ratio
         self.readings_count += 1
-        
         return ratio
     
+    def _gas_index(self, gas_type):
+        try:
+            return self.GAS_NAMES.index(gas_type.upper())
+        except ValueError:
+            return 0  # 기본값 LPG
+    
+    def ratio_to_ppm(self, ratio, gas_type="LPG"):
+        """Rs/Ro 비율을 한 가스의 ppm 으로 변환"""
+        if ratio == float('inf') or ratio <= 0:
+            return 0.0
+        log_a, inv_b = self._curves[self._gas_index(gas_type)]
+        try:
+            return 10 ** ((math.log10(ratio) - log_a) * inv_b)
+        except (OverflowError, ValueError):
+            return 0.0
+    
+    def ratio_to_all_ppm(self, ratio, out=None):
+        """
+        Rs/Ro 비율 하나로 GAS_NAMES 순서의 ppm 을 한 번에 계산
+        
+        Args:
+            ratio (float): Rs/Ro
+            out (list): 결과를 채울 리스트 (None 이면 새로 만듦)
+        
+        Returns:
+            list: [LPG, METHANE, SMOKE, HYDROGEN, ALCOHOL] ppm
+        """
+        if out is None:
+            out = [0.0] * len(self._curves)
+        if ratio == float('inf') or ratio <= 0:
+            for i in range(len(out)):
+                out[i] = 0.0
+            return out
+        log_r = math.log10(ratio)
+        i = 0
+        for log_a, inv_b in self._curves:
+            try:
+                out[i] = 10 ** ((log_r - log_a) * inv_b)
+            except OverflowError:
+                out[i] = 0.0
+            i += 1
+        return out
+    
     def read_ppm(self, gas_type="LPG", samples=1):
         """
         가스 농도 측정 (ppm)
         
         Args:
             gas_type (str): 가스 종류 ("LPG", "METHANE", "SMOKE", "HYDROGEN", "ALCOHOL")
-            samples (int): 평균용 샘플 수
+            samples (int): 평균할 버스트 수 (대기 없음)
             
         Returns:
             float: 가스 농도 (ppm)
         """
-        # 여러 샘플 평균
-        if samples > 1:
-            total_ratio = 0
-            for _ in range(samples):
-                total_ratio += self.read_ratio()
-                time.sleep_ms(100)
-            avg_ratio = total_ratio / samples
-        else:
-            avg_ratio = self.read_ratio()
-        
-        # 가스별 상수 선택
-        gas_constants = {
-            "LPG": self.GAS_LPG,
-            "METHANE": self.GAS_METHANE,
-            "SMOKE": self.GAS_SMOKE,
-            "HYDROGEN": self.GAS_HYDROGEN,
-            "ALCOHOL": self.GAS_ALCOHOL
-        }
-        
-        if gas_type.upper() not in gas_constants:
-            gas_type = "LPG"  # 기본값
+        return self.ratio_to_ppm(self.read_ratio(samples), gas_type)
+    
+    def read_all_ppm(self, samples=1):
+        """
+        한 번 측정한 Rs/Ro 로 5종 가스 ppm 을 모두 계산
         
-        constants = gas_constants[gas_type.upper()]
+        Returns:
+            list: GAS_NAMES 순서의 ppm
+        """
+        return self.ratio_to_all_ppm(self.read_ratio(samples))
+    
+    def danger_level(self, ppm):
+        """ppm 에 대한 위험도 문자열"""
+        if ppm >= self.ALARM_THRESHOLD:
+            return "위험"
+        elif ppm >= self.ALARM_THRESHOLD * 0.5:
+            return "주의"
+        elif ppm >= self.ALARM_THRESHOLD * 0.2:
+            return "약간검출"
+        return "안전"
+    
+    # ------------------------------------------------------------------
+    # 주기 측정 / 캐시 (메인 루프용)
+    # ------------------------------------------------------------------
+    def set_period(self, period_ms):
+        """update() 측정 주기(ms) 변경"""
+        self.period_ms = max(100, int(period_ms))
+        self._next_ms = time.ticks_ms()
+    
+    def update(self):
+        """
+        측정 시각이 되었으면 1회 측정해 전압/비율/5종 ppm 을 캐시한다. (메인 루프에서 주기 호출)
         
-        # ppm 계산: ppm = (Rs/Ro / a) ^ (1/b)
-        if avg_ratio == float('inf') or avg_ratio <= 0:
-            return 0.0
+        Returns:
+            bool: 새 측정값이 캐시되었는지 여부
+        """
+        now = time.ticks_ms()
+        if time.ticks_diff(now, self._next_ms) < 0:
+            return False
+        self._next_ms = time.ticks_add(now, self.period_ms)
+        self.measure()
+        return True
+    
+    def measure(self):
+        """
+        주기와 관계없이 즉시 1회 측정해 캐시를 갱신한다. (버스트 1회 + log10 1회)
         
-        try:
-            ppm = math.pow(avg_ratio / constants["a"], 1.0 / constants["b"])
-            return max(0.0, ppm)
-        except:
-            return 0.0
+        Returns:
+            list: GAS_NAMES 순서의 ppm (캐시 리스트)
+        """
+        self.voltage = self.read_voltage()
+        self.ratio = self._ratio(self.voltage)
+        self.last_reading = self.ratio
+        self.readings_count += 1
+        self.ratio_to_all_ppm(self.ratio, self.ppm)
+        self._measured_ms = time.ticks_ms()
+        return self.ppm
+    
+    def has_data(self):
+        """캐시된 측정값이 있는지 여부"""
+        return self._measured_ms is not None
+    
+    def data_age_ms(self):
+        """마지막 update() 측정 후 경과 시간(ms), 측정 전이면 None"""
+        if self._measured_ms is None:
+            return None
+        return time.ticks_diff(time.ticks_ms(), self._measured_ms)
     
     def get_status(self, gas_type="LPG"):
         """
-        센서 상태 반환
+        센서 상태 반환 (1회 측정)
         
         Args:
             gas_type (str): 측정할 가스 종류
@@ -151,23 +328,15 @@ class MQ2GasSensor:
         """
         raw = self.read_raw()
         voltage = self.read_voltage()
-        resistance = self.read_resistance()
-        ratio = self.read_ratio()
-        ppm = self.read_ppm(gas_type)
+        resistance = self._resistance(voltage)
+        ratio = self._ratio(voltage)
+        self.last_reading = ratio
+        self.readings_count += 1
+        ppm = self.ratio_to_ppm(ratio, gas_type)
         
         # 예열 상태 확인
-        elapsed = time.time() - self.warmup_start
-        self.warmed_up = elapsed >= 20  # 20초 후 예열 완료
-        
-        # 위험도 판정
-        if ppm >= self.ALARM_THRESHOLD:
-            danger_level = "위험"
-        elif ppm >= self.ALARM_THRESHOLD * 0.5:
-            danger_level = "주의"
-        elif ppm >= self.ALARM_THRESHOLD * 0.2:
-            danger_level = "약간검출"
-        else:
-            danger_level = "안전"
+        self.is_warmed_up()
+        elapsed = self.warmup_elapsed_ms() / 1000
         
         return {
             "gas_type": gas_type,
@@ -176,41 +345,37 @@ class MQ2GasSensor:
             "resistance": round(resistance, 2) if resistance != float('inf') else "inf",
             "ratio": round(ratio, 3) if ratio != float('inf') else "inf",
             "raw": raw,
-            "danger_level": danger_level,
+            "danger_level": self.danger_level(ppm),
             "warmed_up": self.warmed_up,
             "warmup_time": round(elapsed, 1),
             "pin": self.adc_pin,
             "readings_count": self.readings_count
         }
     
-    def calibrate_ro(self, samples=50):
+    def calibrate_ro(self, samples=50, save=True):
         """
         깨끗한 공기에서 Ro 값 보정
         
         Args:
-            samples (int): 보정용 샘플 수
+            samples (int): 보정용 버스트 수 (버스트당 16샘플, 대기 없음)
+            save (bool): 보정값을 cal_file 에 저장할지 여부
             
         Returns:
             float: 보정된 Ro 값
         """
-        print("Ro 보정 중... (깨끗한 공기에서 실행하세요)")
-        
         total_rs = 0
         valid_samples = 0
         
-        for i in range(samples):
+        for _ in range(samples):
             rs = self.read_resistance()
             if rs != float('inf'):
                 total_rs += rs
                 valid_samples += 1
-            
-            if (i + 1) % 10 == 0:
-                print(f"진행률: {i+1}/{samples}")
-            
-            time.sleep(0.2)
         
         if valid_samples > 0:
             self.ro_value = total_rs / valid_samples
+            if save:
+                self.save_calibration()
             print(f"Ro 보정 완료: {self.ro_value:.2f} kΩ")
         else:
             print("보정 실패: 유효한 샘플이 없습니다")
@@ -242,16 +407,15 @@ class MQ2GasSensor:
         return ppm >= self.ALARM_THRESHOLD
     
     def wait_for_warmup(self):
-        """센서 예열 완료까지 대기"""
-        if self.warmed_up:
-            return
-        
-        elapsed = time.time() - self.warmup_start
-        remaining = max(0, 20 - elapsed)
+        """
+        센서 예열 완료까지 대기 (단독 스크립트용 블로킹 API)
         
+        BLE 서비스 등 메인 루프에서는 is_warmed_up() / warmup_remaining_ms() 를 사용한다.
+        """
+        remaining = self.warmup_remaining_ms()
         if remaining > 0:
-            print(f"센서 예열 대기 중... {remaining:.1f}초 남음")
-            time.sleep(remaining)
+            print(f"센서 예열 대기 중... {remaining / 1000:.1f}초 남음")
+            time.sleep_ms(remaining)
             self.warmed_up = True
             print("✅ 센서 예열 완료!")
 
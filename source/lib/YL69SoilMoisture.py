@@ -1,8 +1,7 @@
 # YL69SoilMoisture.py
 # YL-69 토양수분센서 간단 라이브러리 (조도센서 + 먼지센서 스타일)
 
-import machine
-import time
+from adc_sampler import AdcSampler, make_adc
 
 class YL69SoilMoisture:
     """
@@ -15,7 +14,7 @@ class YL69SoilMoisture:
     DEFAULT_DRY = 1750  #3800
     DEFAULT_WET = 500   #1200
     
-    def __init__(self, adc_pin, dry_value=None, wet_value=None):
+    def __init__(self, adc_pin, dry_value=None, wet_value=None, samples=16):
         """
         센서 초기화
         
@@ -23,23 +22,25 @@ class YL69SoilMoisture:
             adc_pin (int): ADC 핀 번호
             dry_value (int): 건조값 (None이면 기본값)
             wet_value (int): 습윤값 (None이면 기본값)
+            samples (int): 한 번 읽을 때 평균할 버스트 샘플 수 (기본 16)
         """
         self.adc_pin = adc_pin
         self.dry_value = dry_value or self.DEFAULT_DRY
         self.wet_value = wet_value or self.DEFAULT_WET
         
         # ADC 초기화 (조도센서 방식)
-        self.adc = machine.ADC(machine.Pin(adc_pin))
-        self.adc.atten(machine.ADC.ATTN_11DB)
-        self.adc.width(machine.ADC.WIDTH_12BIT)
+        self.adc = make_adc(adc_pin)
+        
+        # 버스트 샘플러 (공용 ADC 샘플링 엔진)
+        self._sampler = AdcSampler(self.adc, size=samples)
         
         # 상태 변수 (먼지센서 방식)
         self.last_reading = None
         self.readings_count = 0
         
     def read_raw(self):
-        """원시 ADC 값 읽기"""
-        return self.adc.read()
+        """원시 ADC 값 읽기 (버스트 샘플 평균)"""
+        return int(self._sampler.read_mean() + 0.5)
     
     def read_voltage(self):
         """전압 읽기"""
@@ -50,20 +51,13 @@ class YL69SoilMoisture:
         수분 백분율 읽기
         
         Args:
-            samples (int): 평균용 샘플 수
+            samples (int): 평균용 샘플 수 (버스트 크기보다 작으면 버스트 크기)
             
         Returns:
             float: 수분 백분율 (0-100%)
         """
-        # 여러 샘플 평균 (먼지센서 방식)
-        if samples > 1:
-            total = 0
-            for _ in range(samples):
-                total += self.read_raw()
-                time.sleep_ms(50)
-            raw = total / samples
-        else:
-            raw = self.read_raw()
+        # 여러 샘플 평균 (대기 없이 버스트로 채움)
+        raw = self._sampler.read_average(max(samples, self._sampler.size))
         
         # YL-69 특성: 높은 값 = 건조, 낮은 값 = 습윤
         if raw >= self.dry_value:
@@ -82,31 +76,17 @@ class YL69SoilMoisture:
     
 
     
-    def calibrate_dry(self, samples=5):
-        """건조 상태 보정"""
+    def calibrate_dry(self, samples=64):
+        """건조 상태 보정 (samples 개 버스트 평균)"""
         print("건조 상태 보정 중...")
-        total = 0
-        for i in range(samples):
-            reading = self.read_raw()
-            total += reading
-            print(f"  샘플 {i+1}/{samples}: {reading}")
-            time.sleep(0.5)
-        
-        self.dry_value = int(total / samples)
+        self.dry_value = int(self._sampler.read_average(samples) + 0.5)
         print(f"건조값: {self.dry_value}")
         return self.dry_value
     
-    def calibrate_wet(self, samples=5):
-        """습윤 상태 보정"""
+    def calibrate_wet(self, samples=64):
+        """습윤 상태 보정 (samples 개 버스트 평균)"""
         print("습윤 상태 보정 중...")
-        total = 0
-        for i in range(samples):
-            reading = self.read_raw()
-            total += reading
-            print(f"  샘플 {i+1}/{samples}: {reading}")
-            time.sleep(0.5)
-        
-        self.wet_value = int(total / samples)
+        self.wet_value = int(self._sampler.read_average(samples) + 0.5)
         print(f"습윤값: {self.wet_value}")
         return self.wet_value
     
@@ -0,0 +1,187 @@
+"""
+ESP32 ADC 전압 보정 서비스
+
+ATTN_11DB 에서 ESP32/ESP32-S3 ADC 는 raw/4095*3.3 과 같은 선형 관계가 아니며
+(양 끝이 휘고, 보드마다 오프셋/기울기가 다름) 드라이버마다 같은 환산식을 반복하고 있었다.
+전압을 보고하는 드라이버(EZVOLT, DIY-A/B, MQ-2, 먼지센서)는 이 모듈로 전압을 구한다.
+
+- ADC.read_uv() 를 지원하는 펌웨어: eFuse 공장 보정값을 사용하는 read_uv() 를 그대로 사용
+  (AdcSampler.read_mv() 참고)
+- 지원하지 않으면: 보드별 보정점(raw, mV)으로 만든 구간 선형 LUT 를 사용
+  - 보정점은 CAL_FILE 에 저장되며, 부팅 시(모듈 import 시) 1회 읽어
+    32 카운트 간격 129개 노드의 array('H') LUT 로 펼쳐 둔다.
+  - 변환은 노드 2개 조회 + 정수 보간 1회 (float 연산 없음)
+  - 보정점이 없으면 기존 환산(0 → 0mV, 4095 → 3300mV)과 동일한 결과
+- raw 값만 가진 경로(먼지센서 타이머 콜백 등)는 read_uv() 지원 여부와 관계없이 LUT 를 쓴다.
+  read_uv() 지원 펌웨어에서는 EZVOLT:CAL 을 거부하므로 이 경로는 기본 선형 환산이 된다.
+
+사용 예:
+    from adc_calib import calibration
+
+    mv = calibration.raw_to_mv(2048)
+    calibration.add_point(2048, 1650)   # 멀티미터로 잰 값 추가 (자동 저장)
+"""
+
+import array
+import json
+
+
+CAL_FILE = "/adc_cal.json"
+
+# 보정점이 없을 때 사용하는 기본값 (기존 raw/4095*3.3 과 동일)
+DEFAULT_POINTS = ((0, 0), (4095, 3300))
+
+
+def has_read_uv(adc):
+    """ADC 객체가 read_uv()(eFuse 보정)를 지원하는지 여부"""
+    return hasattr(adc, "read_uv")
+
+
+class AdcCalibration:
+    """
+    보드별 구간 선형 ADC 보정 LUT
+
+    Attributes:
+        points (list): 정렬된 보정점 [(raw12, mV), ...]
+    """
+
+    STEP_SHIFT = 5                      # 노드 간격 32 카운트
+    STEP = 1 << STEP_SHIFT
+    NODES = (4096 >> STEP_SHIFT) + 1    # 129개 (0, 32, ..., 4096)
+
+    def __init__(self, cal_file=CAL_FILE):
+        self.cal_file = cal_file
+        self.points = list(DEFAULT_POINTS)
+        self._lut = array.array("H", bytes(2 * self.NODES))
+        if not self.load():
+            self._build()
+
+    # ------------------------------------------------------------------
+    # 보정점 관리
+    # ------------------------------------------------------------------
+    def load(self):
+        """
+        저장된 보정점을 불러와 LUT 를 만든다.
+
+        Returns:
+            bool: 불러오기 성공 여부
+        """
+        if not self.cal_file:
+            return False
+        try:
+            with open(self.cal_file, "r") as f:
+                points = json.load(f)["points"]
+            self.set_points(points, save=False)
+            return True
+        except Exception:
+            return False
+
+    def save(self):
+        """
+        현재 보정점을 플래시에 저장한다.
+
+        Returns:
+            bool: 저장 성공 여부
+        """
+        if not self.cal_file:
+            return False
+        try:
+            with open(self.cal_file, "w") as f:
+                json.dump({"points": self.points}, f)
+            return True
+        except Exception:
+            return False
+
+    def set_points(self, points, save=True):
+        """
+        보정점 전체 설정
+
+        Args:
+            points: [(raw12, mV), ...] — 2개 이상, raw 는 0~4095
+            save (bool): 저장 여부
+        """
+        pts = {}
+        for raw, mv in points:
+            raw = int(raw)
+            if 0 <= raw <= 4095:
+                pts[raw] = int(mv)
+        if len(pts) < 2:
+            raise ValueError("at least 2 calibration points required")
+        self.points = sorted(pts.items())
+        self._build()
+        if save:
+            self.save()
+
+    def add_point(self, raw, mv, save=True):
+        """
+        보정점 1개 추가 (같은 raw 는 덮어씀)
+
+        기본 보정점만 있는 상태에서 처음 추가하면 (0, 0) 과 새 점으로 시작한다.
+        """
+        if self.points == list(DEFAULT_POINTS):
+            points = [(0, 0)]
+        else:
+            points = list(self.points)
+        points = [p for p in points if p[0] != int(raw)]
+        points.append((int(raw), int(mv)))
+        if len(points) < 2:
+            points.append(DEFAULT_POINTS[1])
+        self.set_points(points, save)
+
+    def reset(self):
+        """기본 보정으로 되돌리고 저장 파일을 지운다."""
+        self.points = list(DEFAULT_POINTS)
+        self._build()
+        if self.cal_file:
+            try:
+                import os
+                os.remove(self.cal_file)
+            except Exception:
+                pass
+
+    def is_default(self):
+        """보정점 없이 기본 환산을 사용 중인지 여부"""
+        return self.points == list(DEFAULT_POINTS)
+
+    # ------------------------------------------------------------------
+    # LUT
+    # ------------------------------------------------------------------
+    def _build(self):
+        """보정점을 구간 선형 보간해 균일 간격 LUT 로 펼친다. (부팅/보정 시 1회)"""
+        pts = self.points
+        last = len(pts) - 1
+        seg = 0
+        for i in range(self.NODES):
+            x = i << self.STEP_SHIFT
+            # x 가 속한 구간 찾기 (양 끝은 첫/마지막 구간을 연장)
+            while seg < last - 1 and x > pts[seg + 1][0]:
+                seg += 1
+            x0, y0 = pts[seg]
+            x1, y1 = pts[seg + 1]
+            y = y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+            self._lut[i] = max(0, min(int(y + 0.5), 65535))
+
+    def raw_to_mv(self, raw):
+        """
+        12비트 raw 값을 mV 로 변환 (LUT 조회 + 정수 보간)
+
+        Args:
+            raw (int): 0~4095
+        """
+        raw = int(raw)
+        if raw <= 0:
+            return self._lut[0]
+        if raw > 4095:
+            raw = 4095
+        i = raw >> self.STEP_SHIFT
+        f = raw & (self.STEP - 1)
+        a = self._lut[i]
+        return a + (((self._lut[i + 1] - a) * f) >> self.STEP_SHIFT)
+
+    def raw_to_volt(self, raw):
+        """12비트 raw 값을 V 로 변환"""
+        return self.raw_to_mv(raw) / 1000
+
+
+# 부팅 시 1회 로드되는 공용 인스턴스
+calibration = AdcCalibration()
@@ -0,0 +1,185 @@
+"""
+EZMaker 아날로그 센서 공용 버스트 ADC 샘플러
+
+EZLIGHT / EZSOUND / EZVOLT / HALL / DIY-A / DIY-B / 토양수분(YL-69) 드라이버가
+공통으로 사용하는 샘플링 엔진이다.
+
+- 미리 할당한 array('H') 버퍼에 N개 샘플을 연속으로 채운다. (샘플당 할당 없음)
+- 간격(interval_us)을 주면 ticks_us 기준으로 일정 간격 샘플링, 0이면 최대 속도
+- 채우는 루프 안에서 평균 / 최소 / 최대 / 표준편차를 한 번에 계산한다.
+- 샘플 값은 12비트(0~4095) 스케일로 저장한다. (read_u16() >> 4)
+
+각 드라이버는 평균값에 자신의 스케일링(10비트 변환, 전압, 백분율 등)만 적용한다.
+전압이 필요한 드라이버는 read_mv()를 사용한다. (read_uv() 또는 보드 보정 LUT, adc_calib 참고)
+
+사용 예:
+    from adc_sampler import AdcSampler, make_adc
+
+    adc = make_adc(2)                    # A0 포트 (ATTN_11DB, 12비트)
+    sampler = AdcSampler(adc, size=16)
+    mean, vmin, vmax, std = sampler.sample()
+"""
+
+import time
+import array
+import machine
+import micropython
+from adc_calib import calibration, has_read_uv
+
+
+def make_adc(adc_pin):
+    """
+    EZMaker 아날로그 포트용 ADC 객체 생성 (ATTN_11DB -> 약 0~3.3V, 12비트)
+    """
+    adc = machine.ADC(machine.Pin(adc_pin))
+    try:
+        adc.atten(machine.ADC.ATTN_11DB)
+    except AttributeError:
+        # 플랫폼에 따라 atten이 없을 수 있음
+        pass
+    try:
+        adc.width(machine.ADC.WIDTH_12BIT)
+    except AttributeError:
+        # width 설정이 없는 포트도 있으므로 무시
+        pass
+    return adc
+
+
+class AdcSampler:
+    """
+    버스트 ADC 샘플러
+
+    Attributes:
+        buf (array('H')): 마지막 샘플 버퍼 (12비트 값)
+        count (int): 마지막 샘플링에서 채운 샘플 수
+        mean, min, max, std: 마지막 샘플링 통계 (12비트 스케일)
+    """
+
+    def __init__(self, adc, size=16, interval_us=0):
+        """
+        Args:
+            adc (machine.ADC): 샘플링할 ADC 객체
+            size (int): 버퍼 크기 (한 번에 채울 최대 샘플 수)
+            interval_us (int): 기본 샘플 간격(us), 0이면 최대 속도
+        """
+        if size < 1:
+            size = 1
+        self.adc = adc
+        self.size = size
+        self.interval_us = interval_us
+        self.buf = array.array("H", bytes(2 * size))
+        self.count = 0
+        self.mean = 0.0
+        self.min = 0
+        self.max = 0
+        self.std = 0.0
+        self._read_uv = adc.read_uv if has_read_uv(adc) else None
+
+    @micropython.native
+    def _fill(self, n, interval_us):
+        """
+        버퍼에 n개 샘플을 채우면서 합/제곱합/최소/최대를 누적한다.
+        (12비트 값이므로 n<=64 에서 제곱합이 small int 범위를 넘지 않는다)
+        """
+        read = self.adc.read_u16
+        buf = self.buf
+        total = 0
+        total_sq = 0
+        vmin = 4095
+        vmax = 0
+        if interval_us > 0:
+            deadline = time.ticks_us()
+            for i in range(n):
+                while time.ticks_diff(time.ticks_us(), deadline) < 0:
+                    pass
+                v = read() >> 4
+                buf[i] = v
+                total += v
+                total_sq += v * v
+                if v < vmin:
+                    vmin = v
+                if v > vmax:
+                    vmax = v
+                deadline = time.ticks_add(deadline, interval_us)
+        else:
+            for i in range(n):
+                v = read() >> 4
+                buf[i] = v
+                total += v
+                total_sq += v * v
+                if v < vmin:
+                    vmin = v
+                if v > vmax:
+                    vmax = v
+        return total, total_sq, vmin, vmax
+
+    def sample(self, n=None, interval_us=None):
+        """
+        N개 샘플을 채우고 통계를 반환한다.
+
+        Args:
+            n (int): 샘플 수 (None 이면 버퍼 크기, 최대 버퍼 크기)
+            interval_us (int): 샘플 간격(us) (None 이면 기본값)
+
+        Returns:
+            tuple: (mean, min, max, std) — 12비트(0~4095) 스케일
+        """
+        if n is None or n > self.size:
+            n = self.size
+        if n < 1:
+            n = 1
+        if interval_us is None:
+            interval_us = self.interval_us
+
+        total, total_sq, vmin, vmax = self._fill(n, interval_us)
+
+        mean = total / n
+        var = total_sq / n - mean * mean
+        self.count = n
+        self.mean = mean
+        self.min = vmin
+        self.max = vmax
+        self.std = var ** 0.5 if var > 0 else 0.0
+        return mean, vmin, vmax, self.std
+
+    def read_mean(self, n=None, interval_us=None):
+        """N개 샘플 평균(12비트 스케일, float)만 반환"""
+        return self.sample(n, interval_us)[0]
+
+    def read_average(self, n, interval_us=None):
+        """
+        버퍼 크기보다 많은 샘플의 평균(12비트 스케일, float)을 반환한다.
+        (버퍼 크기 단위로 나눠 채우므로 추가 할당 없음)
+        """
+        if n < 1:
+            n = 1
+        total = 0.0
+        remaining = n
+        while remaining > 0:
+            chunk = remaining if remaining < self.size else self.size
+            total += self.read_mean(chunk, interval_us) * chunk
+            remaining -= chunk
+        return total / n
+
+    @micropython.native
+    def _sum_uv(self, n):
+        read = self._read_uv
+        total = 0
+        for _ in range(n):
+            total += read()
+        return total
+
+    def read_mv(self, n=None):
+        """
+        N개 샘플 평균 전압(mV, float) 반환
+
+        - read_uv() 지원 시: eFuse 보정 전압을 평균
+        - 미지원 시: raw 평균을 보드 보정 LUT(adc_calib.calibration)로 변환
+        """
+        if n is None or n > self.size:
+            n = self.size
+        if n < 1:
+            n = 1
+        if self._read_uv is not None:
+            return self._sum_uv(n) / n / 1000
+        return calibration.raw_to_mv(int(self.read_mean(n) + 0.5))
@@ -211,6 +211,18 @@ _EZ_DUST_CHAR = (
     _FLAG_WRITE | _FLAG_NOTIFY,
 )
 
+# [NEW] EZMaker SCOPE CHAR - A0~A4 아날로그 포트 오실로스코프 캡처 (바이너리 청크 전송, 별도 UUID 대역)
+_EZ_SCOPE_CHAR = (
+    bluetooth.UUID("22223333-4444-5555-6666-777788889011"),  # Write+Notify
+    _FLAG_WRITE | _FLAG_NOTIFY,
+)
+
+# [NEW] MQ-2 GAS CHAR - MQ-2 가연성 가스센서 (예열 상태 + 5종 가스 ppm, 별도 UUID 대역)
+_MQ2_CHAR = (
+    bluetooth.UUID("22223333-4444-5555-6666-777788889012"),  # Write+Notify
+    _FLAG_WRITE | _FLAG_NOTIFY,
+)
+
 # [NEW] HEART RATE CHAR - 심장박동 센서 추가
 _HEART_RATE_CHAR = (
     bluetooth.UUID("11112222-3333-4444-5555-666677778897"),  # Write+Notify
@@ -261,6 +273,8 @@ _SENSOR_SERVICE = (
         _EZ_SOUND_CHAR,  # EZMaker 소리센서 (마이크)
         _EZ_WEIGHT_CHAR,  # EZMaker 무게센서 (HX711)
         _EZ_DUST_CHAR,    # EZMaker 미세먼지 센서 (PMS7003M)
+        _EZ_SCOPE_CHAR,   # EZMaker 오실로스코프 캡처 (A0~A4)
+        _MQ2_CHAR,        # MQ-2 가연성 가스센서
     ),
 )
 
@@ -321,20 +335,26 @@ class BLEUART:
              self._diya_handle, self._diyb_handle, self._hall_handle,
              self._ez_light_handle, self._ez_volt_handle, self._ez_curr_handle,
              self._ez_thermal_handle, self._ez_sound_handle, self._ez_weight_handle,
-             self._ez_dust_handle),  # EZMaker 전용 자이로/기압/CO2/DIY/자기장/밝기/전압/전류/온도/소리/무게/미세먼지 센서 핸들 추가
+             self._ez_dust_handle, self._ez_scope_handle, self._mq2_handle),  # EZMaker 전용 자이로/기압/CO2/DIY/자기장/밝기/전압/전류/온도/소리/무게/미세먼지 센서, 오실로스코프, MQ-2 핸들 추가
         ) = self._ble.gatts_register_services(_ALL_SERVICES)
 
         # 🔥 BLE 특성 버퍼 크기 설정 (명령어 잘림 방지)
         try:
             # 버저 특성 버퍼 크기 증가 (긴 명령어 지원)
-            self._ble.gatts_set_buffer(self._buzzer_handle, 64, True)
-            logger.info("Buzzer characteristic buffer set to 64 bytes", "BLE")
+            self._ble.gatts_set_buffer(self._buzzer_handle, 200, True)  # BUZ:SONG 업로드 청크
+            logger.info("Buzzer characteristic buffer set to 200 bytes", "BLE")
             
             # 다른 주요 특성들도 버퍼 크기 증가
             #self._ble.gatts_set_buffer(self._led_handle, 64, True)
             #self._ble.gatts_set_buffer(self._cam_handle, 64, True)
-            #self._ble.gatts_set_buffer(self._servo_handle, 64, True)
-            self._ble.gatts_set_buffer(self._neo_handle, 64, True)
+            self._ble.gatts_set_buffer(self._servo_handle, 64, True)  # SERVO:GROUP 다중 목표 명령
+            self._ble.gatts_set_buffer(self._neo_handle, 200, True)  # NEO:FRAME 바이너리 (MTU 185 → 쓰기 1회 최대 182바이트 = 헤더 12 + 56픽셀)
+            self._ble.gatts_set_buffer(self._ez_weight_handle, 64, True)  # EZWEIGHT:CALIBRATE:<g> / EZWEIGHT:SCALE:<값>
+            self._ble.gatts_set_buffer(self._ez_co2_handle, 64, True)  # EZCO2:MODE:SINGLE:<ms>
+            self._ble.gatts_set_buffer(self._ez_press_handle, 64, True)  # EZPRESS:PROFILE:<이름> / EZPRESS:SEALEVEL:<Pa>
+            self._ble.gatts_set_buffer(self._ez_sound_handle, 64, True)  # EZSOUND:STREAM:ON:<ms>
+            self._ble.gatts_set_buffer(self._ez_scope_handle, 64, True)  # SCOPE:TRIG:<레벨>,<엣지>,<프리트리거>
+            self._ble.gatts_set_buffer(self._mq2_handle, 64, True)
             #self._ble.gatts_set_buffer(self._dcmotor_handle, 64, True)
 
 
@@ -382,6 +402,8 @@ class BLEUART:
         self._ez_sound_handler = None  # [NEW] EZMaker 소리센서
         self._ez_weight_handler = None  # [NEW] EZMaker 무게센서
         self._ez_dust_handler = None  # [NEW] EZMaker 미세먼지 센서 (PMS7003M)
+        self._ez_scope_handler = None  # [NEW] EZMaker 오실로스코프 캡처
+        self._mq2_handler = None  # [NEW] MQ-2 가연성 가스센서
         self._connect_handler = None
         self._disconnect_handler = None
         self._upgrade_handler = None  # [NEW] 펌웨어 업그레이드 핸들러
@@ -573,6 +595,18 @@ class BLEUART:
         fn(conn_handle, cmd_str) -> handle EZMaker fine dust sensor (PMS7003M) commands
         """
         self._ez_dust_handler = fn
+
+    def set_ez_scope_handler(self, fn):
+        """
+        fn(conn_handle, cmd_str) -> handle EZMaker oscilloscope capture (A0~A4) commands
+        """
+        self._ez_scope_handler = fn
+
+    def set_mq2_handler(self, fn):
+        """
+        fn(conn_handle, cmd_str) -> handle MQ-2 gas sensor commands
+        """
+        self._mq2_handler = fn
     
     def set_diyb_handler(self, fn):
         """
@@ -695,6 +729,16 @@ class BLEUART:
         """EZMaker 미세먼지 센서(EZDUST, PMS7003M) 데이터 알림"""
         for c in self._connections:
             self._ble.gatts_notify(c, self._ez_dust_handle, data)
+
+    def ez_scope_notify(self, data):
+        """EZMaker 오실로스코프(SCOPE) 알림 (텍스트 헤더/바이너리 청크)"""
+        for c in self._connections:
+            self._ble.gatts_notify(c, self._ez_scope_handle, data)
+
+    def mq2_notify(self, data):
+        """MQ-2 가연성 가스센서 데이터 알림"""
+        for c in self._connections:
+            self._ble.gatts_notify(c, self._mq2_handle, data)
             
     def servo_notify(self, data):
         for c in self._connections:
@@ -832,7 +876,10 @@ class BLEUART:
             # NEOPIXEL
             elif attr_handle == self._neo_handle and self._neopixel_handler:
                 raw = self._ble.gatts_read(self._neo_handle)
-                cmd = raw.decode().strip()  # 대문자 변환 안함 (RGB 값 유지)
+                if raw.startswith(b"NEO:FRAME:"):
+                    cmd = bytes(raw)  # 바이너리 프레임은 디코딩하지 않고 그대로 전달
+                else:
+                    cmd = raw.decode().strip()  # 대문자 변환 안함 (RGB 값 유지)
                 micropython.schedule(scheduled_handler, (self, self._neopixel_handler, conn_handle, cmd))
 
             # LCD (I2C 캐릭터 LCD)
@@ -856,7 +903,10 @@ class BLEUART:
             # BUZZER
             elif attr_handle == self._buzzer_handle and self._buzzer_handler:
                 raw = self._ble.gatts_read(self._buzzer_handle)
-                cmd = raw.decode().strip()  # 대소문자 구분 유지
+                if raw.startswith(b"BUZ:SONG:BIN:"):
+                    cmd = bytes(raw)  # 바이너리 곡 청크는 디코딩하지 않고 그대로 전달
+                else:
+                    cmd = raw.decode().strip()  # 대소문자 구분 유지
                 micropython.schedule(scheduled_handler, (self, self._buzzer_handler, conn_handle, cmd))
 
             # GYRO (DeepCo 공통)
@@ -985,6 +1035,18 @@ class BLEUART:
                 cmd = raw.decode().strip().upper()
                 micropython.schedule(scheduled_handler, (self, self._ez_dust_handler, conn_handle, cmd))
 
+            # EZ-SCOPE (EZMaker 오실로스코프 캡처)
+            elif attr_handle == self._ez_scope_handle and self._ez_scope_handler:
+                raw = self._ble.gatts_read(self._ez_scope_handle)
+                cmd = raw.decode().strip().upper()
+                micropython.schedule(scheduled_handler, (self, self._ez_scope_handler, conn_handle, cmd))
+
+            # MQ-2 GAS SENSOR (가연성 가스센서)
+            elif attr_handle == self._mq2_handle and self._mq2_handler:
+                raw = self._ble.gatts_read(self._mq2_handle)
+                cmd = raw.decode().strip().upper()
+                micropython.schedule(scheduled_handler, (self, self._mq2_handler, conn_handle, cmd))
+
     def _advertise(self, interval_us=500000):
         self._ble.gap_advertise(interval_us, adv_data=self._payload, resp_data=self._rspdata)
 
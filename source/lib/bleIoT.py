@@ -6,15 +6,23 @@ import _thread
 import gc
 import array
 import dht
+from dht_service import DhtService
 import network
 from micropython import const  # const 함수 임포트 추가
-from HC1SR04 import HCSR04
+from ultrasonic_sensor import UltrasonicSensor
 from neopixel import NeoPixel  # NeoPixel 라이브러리 추가
+from neo_effects import NeoEffects  # NeoPixel 효과 엔진 (LUT 기반)
+from servo_motion import ServoMotion  # 서보 부드러운 이동 / 그룹 이동
+from dc_motor_ramp import MotorRamp  # DC 모터 소프트 스타트 / 가감속
+from led_blink import LedBlinker  # LED 하드웨어(저주파 PWM) 깜빡임
 from i2c_lcd import I2cLcd  # I2C LCD 드라이버 추가
+from lcd_widgets import LcdWidgets  # LCD 마퀴/센서 값 바인딩 위젯
 import bleBaseIoT
 import buzzerModule  # 통합된 버저 모듈 사용
+from buzzer_song import parse_rtttl, decode_notes, song_name, SongStore  # BUZ:SONG 업로드/캐시
 import ubinascii
 from cameraModule import CameraModule  # CameraModule 임포트 추가
+from cam_adaptive import CamAdaptive  # 카메라 해상도/품질 자동 조절
 import logger  # 로깅 시스템 임포트
 
 # EZMaker 자이로센서(ICM20948) 드라이버 임포트
@@ -52,11 +60,14 @@ from diyB_sensor import DiyBSensor
 from hall_sensor import HallSensor
 from ez_light_sensor import EzLightSensor
 from ez_volt_sensor import EzVoltSensor
+from adc_calib import calibration as adc_calibration
 from human_sensor import HumanSensor
 from ez_curr_sensor import EzCurrSensor
 from ez_thermal_sensor import EzThermalSensor
 from ez_sound_sensor import EzSoundSensor
 from ez_weight_sensor import EzWeightSensor
+from scope_capture import ScopeCapture
+from MQ2GasSensor import MQ2GasSensor
 
 # DC 모터 핀 추가
 PIN_DCMOTOR = None  # DC 모터 PWM 핀
@@ -68,6 +79,7 @@ PIN_DCMOTOR = None  # DC 모터 PWM 핀
 PIN_LED = None  # 초기값은 None
 led_pin = None
 led_pwm_value = 255  # LED의 PWM 값 (0-255), 기본값 255(최대 밝기)
+led_blinker = None   # LedBlinker: LED:BLINK (핀 설정 시 생성)
 
 # 초음파 센서 핀
 PIN_ULTRASONIC_TRIGGER = None
@@ -83,6 +95,7 @@ servo_pin1 = None
 servo_pin2 = None
 servo_pwm1 = None
 servo_pwm2 = None
+servo_motion = ServoMotion()  # 서보별 현재 각도/이동 상태 (메인 루프에서 update)
 
 # TTP223 터치센서 핀
 PIN_TOUCH = None
@@ -126,14 +139,21 @@ LCD_ROWS = 0                # LCD 줄 수 (2 또는 4 등)
 LCD_COLS = 0                # LCD 열 수 (16 또는 20 등)
 lcd_i2c = None              # SoftI2C 인스턴스
 lcd = None                  # I2cLcd 인스턴스
+lcd_widgets = None          # LcdWidgets 인스턴스 (LCD 초기화 시 생성)
 
 # BLE 연결 상태 변수
 ble_connected = False
 
 # 센서/액추에이터 객체 초기화
 ultraSensor = None
+ultra_streaming = False       # ULTRA:STREAM 연속 측정 알림 여부
+ultra_status_pending = False  # ULTRA:STATUS 단발 측정 응답 대기 (메인 루프에서 완료 시 응답)
 dht_pin = None
 dht_sensor = None
+dht_service = None          # DhtService: 주기 측정/캐시 (메인 루프에서 update)
+dht_period_ms = 2000        # DHT 측정 주기(ms), DHT11 최소 1000ms
+dht_status_pending = False  # 첫 측정 전 STATUS 요청 (측정 완료 시 응답)
+DHT_STATUS_MAX_ERRORS = 2   # 응답 대기 중 연속 측정 실패가 이만큼이면 오류 응답
 servo_pin = None
 servo_pwm = None
 neo_pin = None
@@ -147,8 +167,13 @@ ez_gyro_i2c = None     # ICM20948용 I2C (EZMaker 전용)
 ez_gyro_sensor = None  # ICM20948 센서 객체
 ez_press_i2c = None    # BMP280용 I2C (EZMaker 전용)
 ez_press_sensor = None # BMP280 센서 객체
+EZ_PRESS_PROFILE = "STANDARD"  # BMP280 오버샘플링/필터 프로파일 (ULTRA_LOW_POWER ~ ULTRA_HIGH_RES)
+EZ_PRESS_FORCED = False        # True: Forced 모드(요청 시 1회 측정), False: Normal 모드(연속 측정)
 ez_co2_i2c = None      # SCD40용 I2C (EZMaker 전용)
 ez_co2_sensor = None   # SCD40 센서 객체
+EZ_CO2_MODE = "PERIODIC"          # SCD40 측정 모드: PERIODIC(5초) / LOWPOWER(30초) / SINGLE(SCD41 단발)
+ez_co2_status_pending = False     # 첫 측정값 수신 전 STATUS 요청이 있었는지 (수신 즉시 응답)
+ez_co2_status_deadline = 0        # 대기 중인 STATUS 의 응답 기한 (지나면 오류 응답)
 
 # 버저 초기화 상태 추적 변수
 buzzer_initialized = False
@@ -158,8 +183,13 @@ dust_sensor = None          # DeepCo 공통 아날로그 먼지센서
 ez_dust_sensor = None       # EZMaker 디지털 미세먼지 센서(PMS7003M)
 PIN_EZDUST_RX = None        # EZDUST UART RX 핀 (센서 TX에 연결)
 PIN_EZDUST_TX = None        # EZDUST UART TX 핀 (센서 RX에 연결)
+ez_dust_poll_interval = 100 # EZDUST UART 수신 처리 주기(ms), 메인 루프에서 poll()
+last_ez_dust_poll = 0
 dcmotor_pin = None   # DC 모터 핀
 dcmotor_pwm = None   # DC 모터 PWM 제어
+dcmotor_ramp = None  # MotorRamp: 목표 속도까지 가감속 (메인 루프에서 update)
+dcmotor_freq = 500   # DC 모터 PWM 주파수(Hz), MOTOR:FREQ 로 변경 (핀 재설정 후에도 유지)
+dcmotor_accel = MotorRamp.DEFAULT_ACCEL  # 가속도(%/s), MOTOR:ACCEL 로 변경 (0 이면 즉시)
 
 # 심장박동 센서 관련 변수
 heart_rate_i2c = None
@@ -195,13 +225,31 @@ PIN_EZVOLT = None          # EZMaker 전압센서 핀
 ez_curr_sensor = None      # EzCurrSensor 객체 (INA219)
 PIN_EZCURR_SDA = None      # EZMaker 전류센서 I2C SDA 핀
 PIN_EZCURR_SCL = None      # EZMaker 전류센서 I2C SCL 핀
+ez_curr_poll_interval = 20 # EZCURR 변환 완료 확인/에너지 적산 주기(ms)
+last_ez_curr_poll = 0
 ez_thermal_sensor = None   # EzThermalSensor 객체 (DS18B20)
 PIN_EZTHERMAL = None       # EZMaker 수중/접촉 온도센서 핀
 ez_sound_sensor = None     # EzSoundSensor 객체
 PIN_EZSOUND = None         # EZMaker 소리센서 핀
+ez_sound_streaming = False       # EZSOUND:STREAM 레벨 알림 여부
+ez_sound_level_pending = False   # EZSOUND:LEVEL 단발 요청 (첫 창 계산 후 응답)
+ez_sound_stream_interval = 200   # 레벨 알림 주기(ms)
+last_ez_sound_stream = 0
 ez_weight_sensor = None    # EzWeightSensor 객체 (HX711)
 PIN_EZWEIGHT_DOUT = None   # EZMaker 무게센서 DOUT(DT) 핀
 PIN_EZWEIGHT_SCK = None    # EZMaker 무게센서 SCK(CLK) 핀
+ez_weight_poll_interval = 20  # EZWEIGHT DOUT-ready 확인 주기(ms), HX711 10SPS
+last_ez_weight_poll = 0
+
+# EZMaker 오실로스코프 캡처 (A0~A4 아날로그 포트)
+ez_scope = None            # ScopeCapture 객체 (첫 SCOPE 명령 시 생성)
+
+# MQ-2 가연성 가스센서 관련 변수
+mq2_sensor = None          # MQ2GasSensor 객체
+PIN_MQ2 = None             # MQ-2 아날로그 출력 핀
+mq2_streaming = False      # MQ2:STREAM 주기 알림 여부
+mq2_stream_interval = 1000 # MQ2 측정/알림 주기(ms)
+mq2_warmup_notified = False  # 예열 완료 알림(MQ2:WARMUP:DONE) 전송 여부
 
 # 토양수분센서 관련 변수
 soil_sensor = None  # YL69SoilMoisture 센서 객체
@@ -237,17 +285,17 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
     global PIN_EZCURR_SDA, PIN_EZCURR_SCL, neo_num_pixels
     global PIN_DCMOTOR, PIN_SOIL, PIN_RAIN, PIN_HUMAN, PIN_LASER, PIN_DIYA, PIN_DIYB, PIN_HALL, PIN_EZLIGHT, PIN_EZVOLT, PIN_EZTHERMAL, PIN_EZSOUND  # DC 모터, 토양수분, 빗방울, 인체감지, 레이저, DIY-A/DIY-B/HALL/EZLIGHT/EZVOLT/EZTHERMAL/EZSOUND 핀 변수
     global PIN_EZWEIGHT_DOUT, PIN_EZWEIGHT_SCK  # EZWEIGHT(HX711) 핀 변수
-    global led_pin, ultraSensor, dht_pin, dht_sensor, servo_pin, servo_pwm
+    global led_pin, led_blinker, ultraSensor, dht_pin, dht_sensor, dht_service, servo_pin, servo_pwm
     global servo_pin1, servo_pin2, servo_pwm1, servo_pwm2
-    global neo_pin, neo, touch_pin, light_analog_pin, light_digital_pin
-    global gyro_i2c, gyro_sensor, ez_gyro_i2c, ez_gyro_sensor, ez_press_i2c, ez_press_sensor, ez_co2_i2c, ez_co2_sensor
+    global neo_pin, neo, neo_fx, touch_pin, light_analog_pin, light_digital_pin
+    global gyro_i2c, gyro_sensor, ez_gyro_i2c, ez_gyro_sensor, ez_press_i2c, ez_press_sensor, ez_co2_i2c, ez_co2_sensor, EZ_CO2_MODE
     global ez_curr_i2c, ez_curr_sensor
-    global dcmotor_pin, dcmotor_pwm, dust_sensor  # DC 모터 객체 추가
+    global dcmotor_pin, dcmotor_pwm, dcmotor_ramp, dust_sensor  # DC 모터 객체 추가
     global heart_rate_i2c, heart_rate_sensor, heart_rate_monitor  # 심장박동 센서 객체 추가
     global soil_sensor, rain_sensor, human_sensor, diya_sensor, diyb_sensor, hall_sensor, ez_light_sensor, ez_volt_sensor, ez_thermal_sensor, ez_sound_sensor  # 토양수분, 빗방울, 인체감지, DIY-A/DIY-B/HALL/EZLIGHT/EZVOLT/EZTHERMAL/EZSOUND 센서 객체 추가
     global ez_weight_sensor  # EZWEIGHT(HX711) 센서 객체
     global laser_pin  # 레이저 모듈 제어 핀
-    global LCD_I2C_ADDR, LCD_SDA_PIN, LCD_SCL_PIN, LCD_ROWS, LCD_COLS, lcd_i2c, lcd  # I2C LCD 관련 전역 변수
+    global LCD_I2C_ADDR, LCD_SDA_PIN, LCD_SCL_PIN, LCD_ROWS, LCD_COLS, lcd_i2c, lcd, lcd_widgets  # I2C LCD 관련 전역 변수
     
     pin_type = pin_type.lower()
     
@@ -268,6 +316,12 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
             PIN_LED = pin_number
             
             # LED 핀 재설정
+            if led_blinker is not None:
+                try:
+                    led_blinker.stop()
+                except:
+                    pass
+                led_blinker = None
             if led_pin is not None:
                 try:
                     led_pin.deinit()  # 기존 핀 설정 해제
@@ -280,6 +334,7 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
             led_pin = PWM(led_temp_pin)
             led_pin.freq(1000)  # PWM 주파수 설정 (1kHz)
             led_pin.duty_u16(0)  # 초기 밝기 0
+            led_blinker = LedBlinker(led_pin, base_freq=1000)
             
             logger.info(f"LED pin set to {pin_number} (PWM mode)", "LED")
             return True
@@ -334,6 +389,7 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
             # DHT 센서 핀 재설정
             dht_pin = machine.Pin(pin_number, machine.Pin.IN)
             dht_sensor = dht.DHT11(dht_pin)
+            dht_service = DhtService(dht_sensor, period_ms=dht_period_ms)
             
             logger.info(f"DHT sensor pin set to {pin_number}", "DHT")
             return True
@@ -344,10 +400,11 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
             if secondary_pin is not None:
                 PIN_ULTRASONIC_ECHO = secondary_pin
             
-            # HCSR04 객체 다시 생성
-            ultraSensor = HCSR04(trigger_pin=pin_number, 
-                                echo_pin=secondary_pin, 
-                                echo_timeout_us=10000)
+            # 기존 센서 IRQ 해제 후 다시 생성 (echo 핀이 없거나 같으면 1핀 모드)
+            if ultraSensor is not None:
+                ultraSensor.deinit()
+            ultraSensor = UltrasonicSensor(trigger_pin=pin_number,
+                                           echo_pin=secondary_pin)
             
             logger.info(f"Ultrasonic sensor trigger pin set to {pin_number}", "ULTRA")
             if secondary_pin is not None:
@@ -379,6 +436,7 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
             # 서보1도 함께 설정 (레거시 호환)
             servo_pin1 = servo_pin
             servo_pwm1 = servo_pwm
+            servo_motion.attach(1, servo_pwm1)
             
             logger.info(f"Servo motor pin set to {pin_number}", "SERVO")
             return True
@@ -402,6 +460,7 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
             servo_pin = servo_pin1
             servo_pwm = servo_pwm1
             PIN_SERVO = PIN_SERVO1
+            servo_motion.attach(1, servo_pwm1)
             
             logger.info(f"Servo motor 1 pin set to {pin_number}", "SERVO")
             return True
@@ -420,6 +479,7 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
             servo_pin2 = machine.Pin(pin_number, machine.Pin.OUT)
             servo_pwm2 = machine.PWM(servo_pin2)
             servo_pwm2.freq(50)  # 서보는 보통 50Hz
+            servo_motion.attach(2, servo_pwm2)
             
             logger.info(f"Servo motor 2 pin set to {pin_number}", "SERVO")
             return True
@@ -446,7 +506,10 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
             neo_num_pixels = pixel_count
             
             # NeoPixel 핀 및 LED 개수 재설정
-            # 기존 NeoPixel 끄기
+            # 기존 효과 중지 후 NeoPixel 끄기
+            if neo_fx is not None:
+                neo_fx.stop(clear=False)
+                neo_fx = None
             if neo is not None:
                 try:
                     neo.fill((0, 0, 0))
@@ -460,6 +523,7 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
             # 초기화 시 모든 LED 끄기
             neo.fill((0, 0, 0))
             neo.write()
+            neo_fx = NeoEffects(neo, brightness=int(neo_brightness * 255 + 0.5))
             
             logger.info(f"NeoPixel pin set to {pin_number} with {neo_num_pixels} LEDs", "NEO")
             return True
@@ -584,7 +648,12 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
                         logger.info("[EZPRESS] Using address 0x77", "PRESS")
 
                     try:
-                        ez_press_sensor = BMP280(ez_press_i2c, addr)
+                        ez_press_sensor = BMP280(
+                            ez_press_i2c,
+                            addr,
+                            profile=EZ_PRESS_PROFILE,
+                            mode=BMP280.MODE_FORCED if EZ_PRESS_FORCED else BMP280.MODE_NORMAL,
+                        )
                         logger.info("BMP280 sensor initialized successfully (EZMaker)", "PRESS")
                     except Exception as e:
                         logger.error(f"Failed to initialize BMP280: {e}", "PRESS")
@@ -629,7 +698,13 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
                     if addr in devices:
                         try:
                             ez_co2_sensor = SCD40(ez_co2_i2c, addr)
-                            ez_co2_sensor.start_measurement()
+                            try:
+                                ez_co2_sensor.set_mode(EZ_CO2_MODE)
+                            except ValueError as e:
+                                # 단발 모드를 지원하지 않는 센서로 교체된 경우 등
+                                logger.warning(f"EZ-CO2 mode {EZ_CO2_MODE} unavailable ({e}), using PERIODIC", "CO2")
+                                EZ_CO2_MODE = SCD40.MODE_PERIODIC
+                                ez_co2_sensor.set_mode(EZ_CO2_MODE)
                             logger.info("SCD40 CO2 sensor initialized successfully (EZMaker)", "CO2")
                         except Exception as e:
                             logger.error(f"Failed to initialize SCD40: {e}", "CO2")
@@ -740,6 +815,7 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
                     pass
             lcd_i2c = None
             lcd = None
+            lcd_widgets = None
 
             try:
                 from machine import SoftI2C, Pin
@@ -763,6 +839,7 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
 
                 # LCD 인스턴스 생성
                 lcd = I2cLcd(lcd_i2c, LCD_I2C_ADDR, LCD_ROWS, LCD_COLS)
+                lcd_widgets = LcdWidgets(lcd, _lcd_source_value)
                 logger.info(
                     f"LCD initialized at 0x{LCD_I2C_ADDR:02X} (cols={LCD_COLS}, rows={LCD_ROWS}), SDA={LCD_SDA_PIN}, SCL={LCD_SCL_PIN}",
                     "LCD",
@@ -784,6 +861,7 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
                     dcmotor_pwm.deinit()
                 except:
                     pass
+            dcmotor_ramp = None
             
             # 새 핀 설정
             dcmotor_pin = machine.Pin(pin_number, machine.Pin.OUT)
@@ -792,9 +870,9 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
             # PWM 핀 설정 (속도 제어용)
             try:
                 dcmotor_pwm = machine.PWM(dcmotor_pin)
-                dcmotor_pwm.freq(500)  # DC 모터 제어에 적합한 주파수
-                dcmotor_pwm.duty(0)    # 초기 상태는 0%
-                logger.info(f"DC Motor pin set to {pin_number}", "MOTOR")
+                # 주파수 설정 + 듀티 0% (duty_u16)
+                dcmotor_ramp = MotorRamp(dcmotor_pwm, freq=dcmotor_freq, accel=dcmotor_accel)
+                logger.info(f"DC Motor pin set to {pin_number} ({dcmotor_freq}Hz)", "MOTOR")
                 return True
             except Exception as e:
                 logger.error(f"Failed to initialize DC Motor PWM: {e}", "MOTOR")
@@ -802,19 +880,22 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
                 
         elif pin_type == 'dust':
             # 먼지 센서 핀 설정
-            # 기존 센서 클래스 종료 (필요시)
+            # 기존 센서 클래스 종료 (측정 타이머 해제)
             if dust_sensor is not None:
-                # 클린업 코드가 필요하면 여기에 추가
-                pass
+                try:
+                    dust_sensor.stop()
+                except Exception:
+                    pass
+                dust_sensor = None
                 
-            # 새 핀으로 센서 초기화 (led_pin, vo_pin)
+            # 새 핀으로 센서 초기화 (led_pin, vo_pin) 후 타이머 기반 백그라운드 측정 시작
+            # 저장된 보정값(VOC)이 없으면 첫 측정값이 기준값이 됨 (DUST:CALIBRATE 로 재보정/저장)
             try:
                 dust_sensor = DustSensor(led_pin=pin_number, vo_pin=secondary_pin)
+                dust_sensor.start()
                 logger.info(f"Dust sensor initialized (LED pin: {pin_number}, ADC pin: {secondary_pin})", "DUST")
-                voc = dust_sensor.calibrate(20)  # 적은 샘플로 빠른 보정
-                msg = f"DUST:CALIBRATE:DONE:{voc:.3f}"
-                uart.dust_notify(msg.encode())
-                logger.info(f"Dust sensor calibrated: VOC={voc:.3f}V", "DUST")
+                if dust_sensor.is_calibrated:
+                    logger.info(f"Dust sensor calibration loaded: VOC={dust_sensor.voc:.3f}V", "DUST")
                 return True
             except Exception as e:
                 logger.error(f"Failed to initialize dust sensor: {e}", "DUST")
@@ -845,6 +926,24 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
                 ez_dust_sensor = None
                 return False
             
+        elif pin_type == 'mq2':
+            # MQ-2 가연성 가스센서 아날로그 핀 설정
+            global mq2_sensor, PIN_MQ2, mq2_warmup_notified
+            PIN_MQ2 = pin_number
+
+            # 핀이 바뀌면 예열을 처음부터 다시 추적
+            mq2_sensor = None
+            mq2_warmup_notified = False
+
+            try:
+                mq2_sensor = MQ2GasSensor(adc_pin=pin_number, period_ms=mq2_stream_interval)
+                logger.info(f"MQ-2 gas sensor initialized on pin {pin_number}", "MQ2")
+                return True
+            except Exception as e:
+                logger.error(f"Failed to initialize MQ-2 gas sensor: {e}", "MQ2")
+                mq2_sensor = None
+                return False
+
         elif pin_type == 'heart':
             # 심장박동 센서(MAX30102) 핀 설정
             heart_rate_sda_pin = pin_number
@@ -1067,9 +1166,13 @@ def update_pin_config(pin_type, pin_number, secondary_pin=None):
             # EZMaker 소리센서(EZSOUND) 핀 설정
             PIN_EZSOUND = pin_number
 
-            # 기존 센서 객체 정리 (필요 시 별도 deinit 없음)
+            # 기존 센서 객체 정리 (레벨미터 타이머 해제)
             if ez_sound_sensor is not None:
-                pass
+                try:
+                    ez_sound_sensor.stop_level()
+                except Exception:
+                    pass
+                ez_sound_sensor = None
 
             # 새 EZSOUND 센서 초기화
             try:
@@ -1149,27 +1252,7 @@ def get_device_name():
 # 1) LED
 # ---------------------------
 # LED 핀은 None으로 초기화되어 있으므로 여기서는 초기화하지 않음
-blink_flag = False
-blink_interval = 1000  # LED 깜빡임 간격 (밀리초 단위), 기본값 1000ms
-
-def led_blink_thread():
-    while True:
-        if blink_flag and led_pin is not None:
-            if hasattr(led_pin, 'duty'):  # PWM 모드인 경우
-                # 현재 값이 0이면 최대 밝기로, 아니면 0으로 설정
-                current = led_pin.duty()
-                if current > 0:
-                    led_pin.duty(0)
-                else:
-                    led_pin.duty(1023)  # 최대 밝기
-            else:  # 디지털 모드인 경우
-                led_pin.value(1 - led_pin.value())
-            time.sleep(blink_interval / 1000)  # 밀리초를 초 단위로 변환
-        else:
-            time.sleep(0.1)
-
-# 스레드는 나중에 핀이 설정된 후에 유용할 것이므로 미리 시작
-_thread.start_new_thread(led_blink_thread, ())
+# 깜빡임은 led_blinker(저주파 PWM 또는 메인 루프 마감 시각 방식)가 처리
 
 
 # ---------------------------
@@ -1251,11 +1334,11 @@ def led_handler(conn_handle, cmd_str):
     LED 관련 명령어 처리:
     - LED:ON: LED 켜기 (저장된 PWM 값 사용)
     - LED:OFF: LED 끄기 (PWM 0)
-    - LED:BLINK:간격: LED 깜빡임 시작 (간격은 밀리초 단위)
+    - LED:BLINK:간격: LED 깜빡임 시작 (간격은 밀리초 단위, 간격만큼 켜지고 간격만큼 꺼짐)
     - LED:PIN:핀번호: LED 핀 설정 (항상 PWM 모드로 초기화)
     - LED:BRIGHTNESS:값: LED 밝기 값 설정 (0-255 사이의 PWM 값, 저장만 하고 LED는 켜지 않음)
     """
-    global blink_flag, blink_interval, led_pin, led_pwm_value
+    global led_pin, led_pwm_value
     
     cmd_str = cmd_str.upper()
     logger.debug(f"Received command: {cmd_str}", "LED")
@@ -1267,9 +1350,8 @@ def led_handler(conn_handle, cmd_str):
             #uart.led_notify(b"LED:ERROR:Not configured")
             return
             
-        # 깜빡임 중지
-        blink_flag = False
-        time.sleep(0.2)  # 스레드가 멈출 시간 확보
+        # 깜빡임 중지 (즉시)
+        led_blinker.stop()
         
         # LED ON - 저장된 PWM 값 사용
         pwm_16bit = int((led_pwm_value / 255) * 65535)
@@ -1284,9 +1366,8 @@ def led_handler(conn_handle, cmd_str):
             #uart.led_notify(b"LED:ERROR:Not configured")
             return
         
-        # 깜빡임 중지
-        blink_flag = False
-        time.sleep(0.2)  # 스레드가 멈출 시간 확보
+        # 깜빡임 중지 (즉시)
+        led_blinker.stop()
             
         # LED OFF
         led_pin.duty_u16(0)  # 밝기 0
@@ -1333,11 +1414,10 @@ def led_handler(conn_handle, cmd_str):
             elif interval > 10000:  # 최대 간격 제한
                 interval = 10000
                 
-            blink_interval = interval
-            blink_flag = True
+            mode = led_blinker.start(interval)
             
-            logger.info(f"LED blink started with interval {blink_interval}ms", "LED")
-            #uart.led_notify(f"LED:BLINK:OK:{blink_interval}".encode())
+            logger.info(f"LED blink started with interval {interval}ms ({LedBlinker.MODE_NAMES[mode]})", "LED")
+            #uart.led_notify(f"LED:BLINK:OK:{interval}".encode())
         except Exception as e:
             logger.error(f"Error setting blink interval: {e}", "LED")
             #uart.led_notify(b"LED:ERROR:Invalid blink interval")
@@ -1366,58 +1446,97 @@ def led_handler(conn_handle, cmd_str):
 # 초음파 센서는 None으로 초기화되어 있음
 
 def measure_distance():
+    """
+    최근 측정 거리(cm) 반환 (블로킹 없음)
+    - 미설정: 999, 범위 초과/측정 실패: 900
+    - 연속 측정 중이면 중앙값 필터 결과, 아니면 마지막 단발 측정값
+    """
     if ultraSensor is None:
         logger.warning("Ultrasonic sensor not configured", "ULTRA")
         return 999  # 에러 상태를 900으로 표시
-        
-    try:
-        distance = ultraSensor.distance_cm()
-        # 값이 0이거나 음수인 경우 센서 측정 범위 초과로 처리
-        if distance <= 0:
-            logger.warning("Ultrasonic measurement out of range", "ULTRA")
-            return 900  # 범위 초과/에러를 나타내는 값
-        return distance
-    except Exception as e:
-        logger.error(f"Error measuring distance: {e}", "ULTRA")
-        return 900  # 예외 발생 시 동일하게 900 반환
+
+    distance = ultraSensor.distance_cm if ultraSensor.continuous else ultraSensor.last_raw_cm
+    if distance is None or distance <= 0:
+        return 900  # 범위 초과/에러를 나타내는 값
+    return distance
+
+
+def _ultra_notify_distance():
+    distance = measure_distance()
+    logger.debug(f"Measured distance: {distance:.1f} cm", "ULTRA")
+    uart.ultrasonic_notify(f"ULTRA:{distance:.1f}".encode())
+
 
 def ultrasonic_handler(conn_handle, cmd_str):
     """
     초음파 센서 명령어 처리:
-    - ULTRA:STATUS: 현재 거리 측정하여 반환
-    - ULTRA:PIN:트리거핀,에코핀: 초음파 센서 핀 설정
+    - ULTRA:STATUS: 현재 거리 반환
+      (연속 측정 중이면 캐시 값 즉시 응답, 아니면 트리거 후 메인 루프에서 측정 완료 시 응답)
+    - ULTRA:STREAM:ON[:간격ms]: 연속 측정 + 거리 알림 시작 (기본 50ms, 최소 40ms)
+    - ULTRA:STREAM:OFF: 연속 측정 중지
+    - ULTRA:TEMP:기온: 음속 보정용 기온(°C) 설정
+    - ULTRA:PIN:트리거핀,에코핀: 초음파 센서 핀 설정 (ULTRA:PIN:핀 → 1핀 모듈)
     """
+    global ultra_streaming, ultra_status_pending
+
     cmd_str = cmd_str.upper()
     logger.debug(f"Received command: {cmd_str}", "ULTRA")
 
-    if cmd_str == "ULTRA:STATUS":
+    if cmd_str.startswith("ULTRA:") and not cmd_str.startswith("ULTRA:PIN:") and ultraSensor is None:
         # 초음파 센서가 설정되지 않은 경우
-        if ultraSensor is None:
-            logger.warning("Ultrasonic sensor not configured", "ULTRA")
-            uart.ultrasonic_notify(b"ULTRA:ERROR:Sensor not configured")
-            return
-            
-        # 거리 측정 및 전송
+        logger.warning("Ultrasonic sensor not configured", "ULTRA")
+        uart.ultrasonic_notify(b"ULTRA:ERROR:Sensor not configured")
+        return
+
+    if cmd_str == "ULTRA:STATUS":
         try:
-            distance = measure_distance()
-            logger.info(f"Measured distance: {distance:.1f} cm", "ULTRA")
-            distance_str = f"ULTRA:{distance:.1f}"
-            uart.ultrasonic_notify(distance_str.encode())
+            age = ultraSensor.age_ms()
+            if ultraSensor.continuous and age is not None and age < ultraSensor.interval_ms * 3:
+                _ultra_notify_distance()
+            else:
+                # 단발 측정: 트리거만 보내고 결과는 메인 루프에서 응답
+                ultraSensor.trigger()
+                ultra_status_pending = True
         except Exception as e:
             logger.error(f"Error measuring distance: {e}", "ULTRA")
             uart.ultrasonic_notify(b"ULTRA:ERROR:Measurement failed")
+    elif cmd_str.startswith("ULTRA:STREAM:"):
+        try:
+            parts = cmd_str.split(":")
+            if parts[2] == "ON":
+                interval = int(parts[3]) if len(parts) > 3 else 50
+                ultraSensor.start_continuous(interval)
+                ultra_streaming = True
+                uart.ultrasonic_notify(f"ULTRA:STREAM:ON:{ultraSensor.interval_ms}".encode())
+            elif parts[2] == "OFF":
+                ultraSensor.stop_continuous()
+                ultra_streaming = False
+                uart.ultrasonic_notify(b"ULTRA:STREAM:OFF")
+            else:
+                uart.ultrasonic_notify(b"ULTRA:ERROR:Invalid stream command")
+        except Exception as e:
+            logger.error(f"Error setting ultrasonic stream: {e}", "ULTRA")
+            uart.ultrasonic_notify(b"ULTRA:ERROR:Invalid stream command")
+    elif cmd_str.startswith("ULTRA:TEMP:"):
+        try:
+            temp_c = float(cmd_str.split(":")[2])
+            ultraSensor.set_temperature(temp_c)
+            uart.ultrasonic_notify(f"ULTRA:TEMP:OK:{temp_c:.1f}".encode())
+        except Exception as e:
+            logger.error(f"Error setting ultrasonic temperature: {e}", "ULTRA")
+            uart.ultrasonic_notify(b"ULTRA:ERROR:Invalid temperature")
     # ULTRA:PIN:트리거핀,에코핀
     elif cmd_str.startswith("ULTRA:PIN:"):
         try:
             # 핀 번호 파싱
             pins = cmd_str.split(":")[2].split(",")
-            if len(pins) < 2:
-                logger.warning("Invalid pin configuration. Need two pins.", "ULTRA")
-                uart.ultrasonic_notify(b"ULTRA:ERROR:Need two pins")
+            if len(pins) < 1 or not pins[0]:
+                logger.warning("Invalid pin configuration. Use ULTRA:PIN:trigger[,echo].", "ULTRA")
+                uart.ultrasonic_notify(b"ULTRA:ERROR:Need trigger[,echo] pins")
                 return
                 
             trig_pin = int(pins[0])
-            echo_pin = int(pins[1])
+            echo_pin = int(pins[1]) if len(pins) > 1 else trig_pin  # 1핀 모듈(CS100A)
             
             # 핀 설정 업데이트
             success = update_pin_config('ultra', trig_pin, echo_pin)
@@ -1439,33 +1558,58 @@ def ultrasonic_handler(conn_handle, cmd_str):
 # ---------------------------
 # DHT 센서는 None으로 초기화되어 있음
 
+def _dht_notify_cached():
+    """캐시된 DHT 측정값 전송 (DHT:T=온도,H=습도,AGE=경과ms)"""
+    t, h, age = dht_service.get_cached()
+    msg = f"DHT:T={t:.1f},H={h:.1f},AGE={age}"
+    uart.dht_notify(msg.encode())
+    logger.debug(f"DHT temperature: {t:.1f}°C, humidity: {h:.1f}%, age: {age}ms", "DHT")
+
+
 def dht_handler(conn_handle, cmd_str):
     """
     DHT 온습도 센서 명령어 처리:
-    - DHT:STATUS: 현재 온도와 습도 측정하여 반환
+    - DHT:STATUS: 최근 온도와 습도 반환 (메인 루프에서 주기 측정한 캐시 값)
+      (첫 측정 전이면 측정이 끝나는 즉시 응답)
+    - DHT:PERIOD:ms: 측정 주기 설정 (최소 1000ms)
+    - DHT:ERRORS: 누적 읽기 오류 횟수 반환
     - DHT:PIN:핀번호: DHT 센서 핀 설정
     """
+    global dht_status_pending, dht_period_ms
+
     cmd_str = cmd_str.upper()
     logger.debug(f"Received command: {cmd_str}", "DHT")
     
     if cmd_str == "DHT:STATUS":
         # 센서가 설정되지 않은 경우
-        if dht_sensor is None:
+        if dht_service is None:
             logger.warning("DHT sensor not configured", "DHT")
             uart.dht_notify(b"DHT:ERROR:Sensor not configured")
             return
             
-        # 현재 온습도 측정 및 전송
+        # 캐시된 온습도 전송
         try:
-            dht_sensor.measure()
-            t = dht_sensor.temperature()
-            h = dht_sensor.humidity()
-            msg = f"DHT:T={t:.1f},H={h:.1f}"
-            uart.dht_notify(msg.encode())
-            logger.info(f"DHT temperature: {t:.1f}°C, humidity: {h:.1f}%", "DHT")
+            if not dht_service.has_data():
+                dht_status_pending = True
+                return
+            _dht_notify_cached()
         except Exception as e:
             logger.error(f"Error measuring DHT: {e}", "DHT")
             uart.dht_notify(b"DHT:ERROR:Measurement failed")
+    elif cmd_str.startswith("DHT:PERIOD:"):
+        try:
+            dht_period_ms = max(int(cmd_str.split(":")[2]), DhtService.MIN_PERIOD_MS)
+            if dht_service is not None:
+                dht_service.set_period(dht_period_ms)
+            uart.dht_notify(f"DHT:PERIOD:OK:{dht_period_ms}".encode())
+        except Exception as e:
+            logger.error(f"Error setting DHT period: {e}", "DHT")
+            uart.dht_notify(b"DHT:ERROR:Invalid period")
+    elif cmd_str == "DHT:ERRORS":
+        if dht_service is None:
+            uart.dht_notify(b"DHT:ERROR:Sensor not configured")
+            return
+        uart.dht_notify(f"DHT:ERRORS:{dht_service.error_count}".encode())
     # 핀 설정 명령 처리
     elif cmd_str.startswith("DHT:PIN:"):
         try:
@@ -1496,22 +1640,13 @@ def set_servo_angle(deg):
     서보 펄스 폭 = 500us(0도) ~ 2500us(180도) 일반적인 예시
     MicroPython에서는 duty_ns, duty_u16 등을 사용 가능.
     여기서는 duty_ns를 사용해 봄.
+    (진행 중인 SERVO:MOVE 는 취소되고, 현재 각도는 servo_motion 이 기억)
     """
     if servo_pwm is None:
         logger.warning("Servo motor not configured", "SERVO")
         return False
-        
-    if deg < 0: deg = 0
-    if deg > 180: deg = 180
 
-    # 0도 = 0.5ms, 180도 = 2.5ms
-    pulse_min_ns = 500_000   # 0.5ms = 500,000ns
-    pulse_max_ns = 2_500_000 # 2.5ms
-    # 각도 비율로 보간
-    pulse_ns = pulse_min_ns + (pulse_max_ns - pulse_min_ns) * deg / 180
-
-    servo_pwm.duty_ns(int(pulse_ns))
-    return True
+    return servo_motion.set_angle(1, deg)
 
 def set_servo_angle_by_index(index, deg):
     """
@@ -1519,41 +1654,78 @@ def set_servo_angle_by_index(index, deg):
     deg: 0..180
     특정 서보 모터의 각도를 설정합니다.
     """
-    if index == 1:
-        if servo_pwm1 is None:
-            logger.warning("Servo motor 1 not configured", "SERVO")
-            return False
-            
-        if deg < 0: deg = 0
-        if deg > 180: deg = 180
+    if index not in (1, 2):
+        logger.error(f"Invalid servo index: {index}", "SERVO")
+        return False
+    if not servo_motion.is_attached(index):
+        logger.warning(f"Servo motor {index} not configured", "SERVO")
+        return False
 
-        # 0도 = 0.5ms, 180도 = 2.5ms
-        pulse_min_ns = 500_000   # 0.5ms = 500,000ns
-        pulse_max_ns = 2_500_000 # 2.5ms
-        # 각도 비율로 보간
-        pulse_ns = pulse_min_ns + (pulse_max_ns - pulse_min_ns) * deg / 180
+    return servo_motion.set_angle(index, deg)
 
-        servo_pwm1.duty_ns(int(pulse_ns))
-        return True
-    elif index == 2:
-        if servo_pwm2 is None:
-            logger.warning("Servo motor 2 not configured", "SERVO")
-            return False
-            
-        if deg < 0: deg = 0
-        if deg > 180: deg = 180
+def _servo_parse_ease(parts, pos):
+    """parts[pos] 의 보간 곡선 이름 (없으면 EASE)"""
+    if len(parts) > pos and parts[pos]:
+        return ServoMotion.EASE_NAMES[parts[pos]]
+    return ServoMotion.EASE
 
-        # 0도 = 0.5ms, 180도 = 2.5ms
-        pulse_min_ns = 500_000   # 0.5ms = 500,000ns
-        pulse_max_ns = 2_500_000 # 2.5ms
-        # 각도 비율로 보간
-        pulse_ns = pulse_min_ns + (pulse_max_ns - pulse_min_ns) * deg / 180
+def _servo_motion_command(cmd_str):
+    """
+    SERVO:MOVE / SERVO:GROUP / SERVO:STOP 처리
+    - SERVO:MOVE:서보번호:각도:시간ms[:LINEAR|EASE|TRAP] → 완료 시 SERVO:DONE:서보번호
+    - SERVO:GROUP:시간ms:번호=각도,번호=각도[:곡선] → 모두 함께 도착, 완료 시 SERVO:GROUP:DONE:그룹번호
+    - SERVO:STOP[:서보번호] → 현재 위치에서 정지
+    """
+    parts = cmd_str.split(":")
+    sub = parts[1]
+    try:
+        if sub == "MOVE":
+            index = int(parts[2])
+            angle = int(parts[3])
+            duration = int(parts[4])
+            ease = _servo_parse_ease(parts, 5)
+            if duration < 0:
+                raise ValueError("negative duration")
+            if not servo_motion.move(index, angle, duration, ease):
+                uart.servo_notify(f"SERVO:ERROR:Motor{index} not configured".encode())
+                return
+            logger.info(f"Servo{index} move to {angle} in {duration}ms", "SERVO")
+            uart.servo_notify(f"SERVO:MOVE:OK:{index}".encode())
+
+        elif sub == "GROUP":
+            duration = int(parts[2])
+            if duration < 0:
+                raise ValueError("negative duration")
+            targets = []
+            for item in parts[3].split(","):
+                index, angle = item.split("=")
+                targets.append((int(index), int(angle)))
+            ease = _servo_parse_ease(parts, 4)
+            for index, _ in targets:
+                if not servo_motion.is_attached(index):
+                    uart.servo_notify(f"SERVO:ERROR:Motor{index} not configured".encode())
+                    return
+            group = servo_motion.move_group(targets, duration, ease)
+            logger.info(f"Servo group {group} move {targets} in {duration}ms", "SERVO")
+            uart.servo_notify(f"SERVO:GROUP:OK:{group}".encode())
 
-        servo_pwm2.duty_ns(int(pulse_ns))
-        return True
-    else:
-        logger.error(f"Invalid servo index: {index}", "SERVO")
-        return False
+        elif sub == "STOP":
+            if len(parts) > 2 and parts[2]:
+                servo_motion.stop(int(parts[2]))
+            else:
+                servo_motion.stop()
+            uart.servo_notify(b"SERVO:STOP:OK")
+    except (ValueError, IndexError, KeyError) as e:
+        logger.error(f"Invalid servo motion command: {cmd_str} ({e})", "SERVO")
+        uart.servo_notify(f"SERVO:ERROR:Invalid {sub} command".encode())
+
+def _servo_motion_update():
+    """이동 중인 서보 각도 갱신 + 완료 알림 (메인 루프에서 호출)"""
+    for kind, num in servo_motion.update():
+        if kind == "G":
+            uart.servo_notify(f"SERVO:GROUP:DONE:{num}".encode())
+        else:
+            uart.servo_notify(f"SERVO:DONE:{num}:{int(servo_motion.angle(num))}".encode())
 
 def servo_handler(conn_handle, cmd_str):
     """
@@ -1564,6 +1736,7 @@ def servo_handler(conn_handle, cmd_str):
     - SERVO:각도: 서보 각도 설정 (기존 호환, 첫 번째 서보 제어)
     - SERVO1:각도: 첫 번째 서보 각도 설정
     - SERVO2:각도: 두 번째 서보 각도 설정
+    - SERVO:MOVE / SERVO:GROUP / SERVO:STOP: 부드러운 이동 (_servo_motion_command 참고)
     """
     cmd_str = cmd_str.upper()
     logger.debug(f"Received command: {cmd_str}", "SERVO")
@@ -1613,6 +1786,10 @@ def servo_handler(conn_handle, cmd_str):
             uart.servo_notify(b"SERVO:ERROR:Invalid pin configuration")
             return
     
+    # 부드러운 이동 / 그룹 이동 / 정지
+    elif cmd_str.startswith(("SERVO:MOVE:", "SERVO:GROUP:")) or cmd_str.split(":")[:2] == ["SERVO", "STOP"]:
+        _servo_motion_command(cmd_str)
+
     # 첫 번째 서보 각도 설정 명령 처리 (SERVO1:각도)
     elif cmd_str.startswith("SERVO1:"):
         # 서보 모터가 설정되지 않은 경우
@@ -1699,25 +1876,8 @@ def servo_handler(conn_handle, cmd_str):
 # ---------------------------
 # NeoPixel은 None으로 초기화되어 있음
 
-# NeoPixel 상태 변수
-neo_rainbow_active = False
-neo_rainbow_speed = 5  # 기본 속도 (1-10)
-neo_rainbow_thread = None
-
-# 무지개 효과 함수
-def wheel(pos):
-    """
-    0-255 위치 값을 RGB 색상으로 변환
-    """
-    if pos < 0 or pos > 255:
-        return (0, 0, 0)
-    if pos < 85:
-        return (255 - pos * 3, pos * 3, 0)
-    if pos < 170:
-        pos -= 85
-        return (0, 255 - pos * 3, pos * 3)
-    pos -= 170
-    return (pos * 3, 0, 255 - pos * 3)
+# NeoPixel 효과 엔진 (LCD 초기화처럼 핀 설정 시 생성, 메인 루프에서 update)
+neo_fx = None  # NeoEffects 인스턴스
 
 # 네오픽셀 색상에 밝기 적용 함수 추가
 def apply_brightness(r, g, b, brightness=None):
@@ -1736,69 +1896,60 @@ def apply_brightness(r, g, b, brightness=None):
     
     return (r, g, b)
 
-# 무지개 효과 스레드
-def rainbow_thread(speed=5):
-    global neo_rainbow_active, neo_rainbow_speed, neo_num_pixels  # 전역 변수 사용 선언 추가
-    
-    # 전달받은 speed 파라미터를 전역 변수에 설정
-    neo_rainbow_speed = max(1, min(10, speed))
-    
-    offset = 0
-    while neo_rainbow_active:
-        if neo is None:  # NeoPixel이 설정되지 않은 경우 스레드 종료
-            neo_rainbow_active = False
-            break
-            
-        for i in range(neo_num_pixels):
-            # 각 LED마다 다른 색상 오프셋 적용
-            color = wheel((i * 256 // neo_num_pixels + offset) & 255)
-            # 밝기 적용
-            color = apply_brightness(*color)
-            neo[i] = color
-        neo.write()
-        
-        # 속도에 따른 지연 시간 계산 (속도 1-10)
-        delay = (11 - neo_rainbow_speed) * 0.05
-        time.sleep(delay)
-        
-        # 오프셋 증가
-        offset = (offset + 1) & 255
-    
-    # 스레드 종료 시 모든 LED 끄기
-    if neo is not None:
-        neo.fill((0, 0, 0))
-        neo.write()
-
-# 무지개 효과 시작
+# 무지개 효과 시작 (NEO:RAINBOW 호환)
 def start_rainbow(speed=5):
-    global neo_rainbow_active, neo_rainbow_speed, neo_rainbow_thread
-    
+    return start_effect(NeoEffects.RAINBOW, speed)
+
+# 효과 시작 (이미 실행 중이면 효과/속도/색상만 바꿈)
+def start_effect(effect, speed=5, color=None):
     # NeoPixel이 설정되지 않은 경우
-    if neo is None:
+    if neo is None or neo_fx is None:
         logger.warning("NeoPixel not configured", "NEO")
         return False
-    
-    # 속도 범위 제한 (1-10)
-    neo_rainbow_speed = max(1, min(10, speed))
-    
-    # 이미 실행 중이면 속도만 업데이트
-    if neo_rainbow_active:
-        return True
-    
-    # 무지개 효과 활성화 및 스레드 시작
-    neo_rainbow_active = True
-    neo_rainbow_thread = _thread.start_new_thread(rainbow_thread, (speed,))
+    neo_fx.start(effect, speed, color)
     return True
 
-# 무지개 효과 중지
-def stop_rainbow():
-    global neo_rainbow_active
-    if not neo_rainbow_active:
+# 효과 즉시 중지 (스레드 종료 대기 없음, clear=True 이면 기존처럼 LED 끄기)
+def stop_effect(clear=True):
+    if neo_fx is not None and neo_fx.active:
+        neo_fx.stop(clear)
+
+_NEO_FRAME_HDR = len(b"NEO:FRAME:")
+_NEO_FRAME_SHOW = 0x01  # 기록 후 write() (여러 번에 나눠 보낼 때 마지막 조각에만 설정)
+_NEO_FRAME_ACK = 0x02   # NEO:FRAME:OK 응답 요청 (기본은 오류만 응답)
+
+def _neo_frame(data):
+    """
+    바이너리 프레임 처리:
+      b"NEO:FRAME:" + 시작픽셀(u8) + 플래그(u8) + R,G,B 반복
+    - 플래그 bit0(SHOW): 기록 후 neo.write() 1회
+    - 플래그 bit1(ACK): NEO:FRAME:OK:픽셀수 응답
+    MTU 185 에서 ATT 쓰기 1회는 최대 182바이트라 헤더 12바이트를 빼면 한 번에 56픽셀까지 보낼 수 있다.
+    더 긴 스트립(예: 60픽셀 = 192바이트)은 시작픽셀을 바꿔 여러 번 보내고 마지막에만 SHOW 를 켠다.
+    시작픽셀이 u8 이므로 주소 지정 가능한 스트립은 최대 256픽셀이다.
+    """
+    if neo is None or neo_fx is None:
+        uart.neopixel_notify(b"NEO:ERROR:NeoPixel not configured")
         return
-        
-    neo_rainbow_active = False
-    # 스레드가 종료될 때까지 잠시 대기
-    time.sleep(0.1)
+    if len(data) < _NEO_FRAME_HDR + 2:
+        uart.neopixel_notify(b"NEO:ERROR:Invalid frame")
+        return
+    try:
+        offset = data[_NEO_FRAME_HDR]
+        flags = data[_NEO_FRAME_HDR + 1]
+        if offset >= neo_num_pixels:
+            uart.neopixel_notify(b"NEO:ERROR:Frame offset out of range")
+            return
+        # 호스트 애니메이션이 효과를 대체 (버퍼는 유지)
+        stop_effect(clear=False)
+        count = neo_fx.load_rgb(offset, memoryview(data), _NEO_FRAME_HDR + 2)
+        if flags & _NEO_FRAME_SHOW:
+            neo.write()
+        if flags & _NEO_FRAME_ACK:
+            uart.neopixel_notify(f"NEO:FRAME:OK:{count}".encode())
+    except Exception as e:
+        logger.error(f"Error processing NeoPixel frame: {e}", "NEO")
+        uart.neopixel_notify(b"NEO:ERROR:Frame failed")
 
 def neopixel_handler(conn_handle, cmd_str):
     """
@@ -1807,20 +1958,22 @@ def neopixel_handler(conn_handle, cmd_str):
     - NEO:PX:인덱스,R,G,B: 개별 LED 색상 설정
     - NEO:ALL:R,G,B: 모든 LED 색상 설정
     - NEO:RAINBOW:속도: 무지개 효과 설정
+    - NEO:EFFECT:이름[:속도[:R,G,B]]: 효과 실행 (RAINBOW/CHASE/BREATHE/FADE/SPARKLE, 속도 1-10)
+    - NEO:EFFECT:STOP: 효과 중지 (현재 색 유지)
+    - NEO:RANGE:시작,끝,R,G,B: 시작~끝(포함) LED 를 한 색으로 설정 (write 1회)
+    - NEO:GRAD:시작,끝,R1,G1,B1,R2,G2,B2: 시작~끝(포함) 그라데이션 (write 1회)
+    - NEO:FRAME:<바이너리>: 패킹된 RGB 프레임 (_neo_frame 참고)
     - NEO:OFF: 모든 LED 끄기
     - NEO:BRIGHTNESS:밝기: 네오픽셀 밝기 설정 (0-100)
     """
     global neo_brightness  # 밝기 전역 변수 추가
     
-    # 원시 명령어 로깅 - 문제 디버깅을 위해 추가
-    logger.debug(f"Raw command received: '{cmd_str}'", "NEO")
-    
-    # 명령어의 각 문자를 16진수로 출력하여 숨겨진 문자 확인
-    hex_values = [f"{ord(c):02x}" for c in cmd_str]
-    logger.debug(f"Command bytes: {' '.join(hex_values)}", "NEO")
+    # 바이너리 프레임은 텍스트 파싱/로깅 없이 바로 처리
+    if isinstance(cmd_str, bytes):
+        _neo_frame(cmd_str)
+        return
     
-    logger.info(f"Received command: {cmd_str}", "NEO")
-    print(f"1111111111111Received command: {cmd_str}")
+    logger.debug(f"Received command: {cmd_str}", "NEO")
     
     try:
         # 명령어 파싱
@@ -1877,6 +2030,8 @@ def neopixel_handler(conn_handle, cmd_str):
                 
                 # 0-255에서 0.0-1.0 범위로 변환
                 neo_brightness = brightness_value / 255.0
+                if neo_fx is not None:
+                    neo_fx.set_brightness(brightness_value)
                 
                 logger.info(f"NeoPixel brightness set to {brightness_value}", "NEO")
                 uart.neopixel_notify(f"NEO:BRIGHTNESS:OK:{brightness_value}".encode())
@@ -1916,9 +2071,8 @@ def neopixel_handler(conn_handle, cmd_str):
                 if not (0 <= r <= 255 and 0 <= g <= 255 and 0 <= b <= 255):
                     raise ValueError(f"RGB values must be between 0 and 255")
                 
-                # 무지개 효과 중지
-                if neo_rainbow_active:
-                    stop_rainbow()
+                # 실행 중인 효과 중지
+                stop_effect()
                 
                 # 색상에 밝기 적용
                 color = apply_brightness(r, g, b)
@@ -1964,9 +2118,8 @@ def neopixel_handler(conn_handle, cmd_str):
                 if not (0 <= r <= 255 and 0 <= g <= 255 and 0 <= b <= 255):
                     raise ValueError(f"RGB values must be between 0 and 255")
                 
-                # 무지개 효과 중지
-                if neo_rainbow_active:
-                    stop_rainbow()
+                # 실행 중인 효과 중지
+                stop_effect()
                 
                 # 색상에 밝기 적용
                 color = apply_brightness(r, g, b)
@@ -2005,9 +2158,8 @@ def neopixel_handler(conn_handle, cmd_str):
                 if not (0 <= r <= 255 and 0 <= g <= 255 and 0 <= b <= 255):
                     raise ValueError(f"RGB values must be between 0 and 255")
                 
-                # 무지개 효과 중지
-                if neo_rainbow_active:
-                    stop_rainbow()
+                # 실행 중인 효과 중지
+                stop_effect()
                 
                 # 색상에 밝기 적용
                 color = apply_brightness(r, g, b)
@@ -2047,11 +2199,72 @@ def neopixel_handler(conn_handle, cmd_str):
                 logger.error(f"Error processing NeoPixel command: {e}", "NEO")
                 uart.neopixel_notify(b"NEO:ERROR:Command processing failed")
         
+        # RANGE / GRAD 명령 처리: 구간 채우기 / 그라데이션 (write 1회)
+        elif cmd in ("RANGE", "GRAD") and len(parts) >= 3:
+            try:
+                values = [int(v) for v in parts[2].split(",")]
+                need = 5 if cmd == "RANGE" else 8
+                if len(values) < need:
+                    raise ValueError(f"Not enough values. Expected {need}, got {len(values)}")
+                start, end = values[0], values[1]
+                if start > end:
+                    start, end = end, start
+                if not (0 <= start < neo_num_pixels):
+                    raise ValueError(f"Index {start} out of range (0-{neo_num_pixels-1})")
+                for v in values[2:need]:
+                    if not 0 <= v <= 255:
+                        raise ValueError("RGB values must be between 0 and 255")
+                
+                # 실행 중인 효과 중지
+                stop_effect()
+                
+                if cmd == "RANGE":
+                    count = neo_fx.fill_range(start, end, values[2], values[3], values[4])
+                else:
+                    count = neo_fx.gradient(start, end, values[2:5], values[5:8])
+                neo.write()
+                uart.neopixel_notify(f"NEO:{cmd}:OK:{start},{start + count - 1}".encode())
+            except ValueError as e:
+                logger.error(f"Error in {cmd} command: {e}", "NEO")
+                uart.neopixel_notify(f"NEO:ERROR:Invalid value - {str(e)}".encode())
+            except Exception as e:
+                logger.error(f"Error processing NeoPixel command: {e}", "NEO")
+                uart.neopixel_notify(b"NEO:ERROR:Command processing failed")
+        
+        # EFFECT 명령 처리: NEO:EFFECT:이름[:속도[:R,G,B]]
+        elif cmd == "EFFECT" and len(parts) >= 3:
+            try:
+                name = parts[2].strip()
+                if name == "STOP":
+                    stop_effect(clear=False)
+                    uart.neopixel_notify(b"NEO:EFFECT:OK:STOP")
+                    return
+                effect = NeoEffects.NAMES.get(name)
+                if effect is None:
+                    raise ValueError(f"Unknown effect '{name}'")
+                speed = int(parts[3]) if len(parts) > 3 and parts[3].strip() else 5
+                color = None
+                if len(parts) > 4:
+                    rgb = [int(v) for v in parts[4].split(",")]
+                    if len(rgb) < 3:
+                        raise ValueError("R,G,B required")
+                    color = (rgb[0], rgb[1], rgb[2])
+                if start_effect(effect, speed, color):
+                    logger.info(f"Started {name} effect with speed {speed}", "NEO")
+                    uart.neopixel_notify(f"NEO:EFFECT:OK:{name}".encode())
+                else:
+                    uart.neopixel_notify(b"NEO:ERROR:Failed to start effect")
+            except ValueError as e:
+                logger.error(f"Error in EFFECT command: {e}", "NEO")
+                uart.neopixel_notify(f"NEO:ERROR:Invalid value - {str(e)}".encode())
+            except Exception as e:
+                logger.error(f"Error processing NeoPixel command: {e}", "NEO")
+                uart.neopixel_notify(b"NEO:ERROR:Command processing failed")
+        
         # OFF 명령 처리
         elif cmd == "OFF":
             try:
-                if neo_rainbow_active:
-                    stop_rainbow()
+                stop_effect()
                 
                 neo.fill((0, 0, 0))
                 neo.write()
@@ -2202,7 +2415,13 @@ def lcd_handler(conn_handle, cmd_str):
     - LCD:INIT:20X4:SCL,SDA
     - LCD:CLEAR
     - LCD:BACKLIGHT:ON|OFF
-    - LCD:PRINT:row,col:텍스트...
+    - LCD:PRINT:row,col:텍스트...  (프레임버퍼와 비교해 바뀐 칸만 전송)
+    - LCD:REFRESH  (프레임버퍼 전체 재전송, 화면이 깨졌을 때 복구용)
+    - LCD:SCROLL:row,col,width[,ms]:텍스트...  (보드에서 스크롤하는 마퀴, 기본 300ms/칸)
+    - LCD:BIND:row,col[,ms[,width]]:템플릿...  (예: LCD:BIND:1,0,1000:{EZTHERMAL:.1f}C)
+      캐시된 센서 값으로 ms 주기(기본 1000ms) 갱신, 사용 가능한 이름은 _LCD_SOURCES 참고
+    - LCD:WIDGET:DEL:슬롯 / LCD:WIDGET:CLEAR  (위젯 제거, LCD:CLEAR 도 위젯을 모두 제거)
+    위젯 추가 응답: LCD:WIDGET:OK:슬롯
     """
     global LCD_ROWS, LCD_COLS, lcd
 
@@ -2274,6 +2493,8 @@ def lcd_handler(conn_handle, cmd_str):
         # 화면 지우기
         if subcmd == "CLEAR":
             try:
+                if lcd_widgets is not None:
+                    lcd_widgets.clear()
                 lcd.clear()
                 lcd.home()
                 uart.lcd_notify(b"LCD:CLEAR:OK")
@@ -2305,6 +2526,21 @@ def lcd_handler(conn_handle, cmd_str):
                 uart.lcd_notify(b"LCD:ERROR:BACKLIGHT failed")
             return
 
+        # 위젯: LCD:SCROLL / LCD:BIND / LCD:WIDGET
+        if subcmd in ("SCROLL", "BIND", "WIDGET"):
+            _lcd_widget_command(subcmd, parts)
+            return
+
+        # 전체 재전송: LCD:REFRESH
+        if subcmd == "REFRESH":
+            try:
+                lcd.refresh()
+                uart.lcd_notify(b"LCD:REFRESH:OK")
+            except Exception as e:
+                logger.error(f"Error refreshing LCD: {e}", "LCD")
+                uart.lcd_notify(b"LCD:ERROR:REFRESH failed")
+            return
+
         # 텍스트 출력: LCD:PRINT:row,col:텍스트...
         if subcmd == "PRINT":
             if len(parts) < 4:
@@ -2328,7 +2564,7 @@ def lcd_handler(conn_handle, cmd_str):
                 return
 
             try:
-                # I2cLcd.move_to는 내부에서 범위 클램핑 수행
+                # I2cLcd.move_to는 내부에서 범위 클램핑 수행, putstr는 바뀐 칸만 전송
                 lcd.move_to(col, row)
                 lcd.putstr(text)
                 uart.lcd_notify(b"LCD:PRINT:OK")
@@ -2345,6 +2581,126 @@ def lcd_handler(conn_handle, cmd_str):
         logger.error(f"Error processing LCD command: {e}", "LCD")
         uart.lcd_notify(b"LCD:ERROR:Command processing failed")
 
+# LCD 바인딩 필드에서 사용할 수 있는 값 (모두 캐시 또는 논블로킹 측정, 없으면 None)
+def _lcd_src_dht(index):
+    if dht_service is None:
+        return None
+    cached = dht_service.get_cached()
+    return cached[index] if cached else None
+
+
+def _lcd_src_ez_thermal():
+    if ez_thermal_sensor is None:
+        return None
+    ez_thermal_sensor.update()
+    return ez_thermal_sensor.temperature
+
+
+def _lcd_src_ultra():
+    if ultraSensor is None:
+        return None
+    # 연속 측정 중이 아니면 오래된 값일 때 한 번 트리거 (결과는 메인 루프 poll()에서 수신)
+    if not ultraSensor.continuous:
+        age = ultraSensor.age_ms()
+        if age is None or age > 500:
+            ultraSensor.trigger()
+    return ultraSensor.distance_cm
+
+
+def _lcd_src_ez_dust():
+    if ez_dust_sensor is None or not ez_dust_sensor.has_data():
+        return None
+    return ez_dust_sensor.read()[1]
+
+
+def _lcd_src_mq2():
+    if mq2_sensor is None:
+        return None
+    mq2_sensor.update()
+    return mq2_sensor.ppm[0] if mq2_sensor.has_data() else None
+
+
+_LCD_SOURCES = {
+    "TEMP": lambda: _lcd_src_dht(0),          # DHT 온도 (℃)
+    "HUMI": lambda: _lcd_src_dht(1),          # DHT 습도 (%)
+    "EZTHERMAL": _lcd_src_ez_thermal,         # 수중/접촉 온도 (℃)
+    "EZWEIGHT": lambda: ez_weight_sensor.cached_weight() if ez_weight_sensor else None,  # 무게 (g), 캐시값만 (블로킹 없음)
+    "EZCURR": lambda: ez_curr_sensor.get_status()["current_mA"] if ez_curr_sensor else None,  # 전류 (mA)
+    "EZVOLT": lambda: ez_volt_sensor.read_voltage_input() if ez_volt_sensor else None,  # 입력 전압 (V)
+    "EZLIGHT": lambda: ez_light_sensor.get_status()["percent"] if ez_light_sensor else None,  # 밝기 (%)
+    "EZSOUND": lambda: ez_sound_sensor.get_status()["percent"] if ez_sound_sensor else None,  # 소리 (%)
+    "SOIL": lambda: soil_sensor.read_moisture() if soil_sensor else None,  # 토양수분 (%)
+    "ULTRA": _lcd_src_ultra,                  # 거리 (cm)
+    "EZDUST": _lcd_src_ez_dust,               # PM2.5 (μg/m³)
+    "MQ2": _lcd_src_mq2,                      # LPG (ppm)
+}
+
+
+def _lcd_source_value(name):
+    """LCD 바인딩 필드 값 조회 (LcdWidgets resolve 콜백)"""
+    src = _LCD_SOURCES.get(name)
+    return src() if src else None
+
+
+def _lcd_widget_command(subcmd, parts):
+    """LCD:SCROLL / LCD:BIND / LCD:WIDGET 처리 (lcd_handler 에서 호출)"""
+    if lcd_widgets is None:
+        uart.lcd_notify(b"LCD:ERROR:Not initialized")
+        return
+
+    if subcmd == "WIDGET":
+        action = parts[2].upper() if len(parts) > 2 else ""
+        if action == "CLEAR":
+            lcd_widgets.clear()
+            uart.lcd_notify(b"LCD:WIDGET:CLEAR:OK")
+        elif action == "DEL" and len(parts) > 3:
+            try:
+                slot = int(parts[3])
+            except ValueError:
+                slot = -1
+            if lcd_widgets.remove(slot):
+                uart.lcd_notify(f"LCD:WIDGET:DEL:OK:{slot}".encode())
+            else:
+                uart.lcd_notify(b"LCD:ERROR:Invalid widget slot")
+        else:
+            uart.lcd_notify(b"LCD:ERROR:Invalid WIDGET command")
+        return
+
+    if len(parts) < 4:
+        logger.error(f"{subcmd} command requires position and text", "LCD")
+        uart.lcd_notify(f"LCD:ERROR:{subcmd} requires position and text".encode())
+        return
+
+    text = ":".join(parts[3:])  # 텍스트/템플릿 내의 ':' 보존
+    try:
+        args = [int(v.strip()) for v in parts[2].split(",")]
+        row, col = args[0], args[1]
+    except Exception:
+        logger.error(f"Invalid position in {subcmd}: {parts[2]}", "LCD")
+        uart.lcd_notify(b"LCD:ERROR:Invalid row,col")
+        return
+
+    try:
+        if subcmd == "SCROLL":
+            if len(args) < 3:
+                raise ValueError("width required")
+            step_ms = args[3] if len(args) > 3 else 300
+            slot = lcd_widgets.add_marquee(row, col, args[2], text, step_ms)
+        else:
+            period_ms = args[2] if len(args) > 2 else 1000
+            width = args[3] if len(args) > 3 else None
+            slot = lcd_widgets.add_field(row, col, text, period_ms, width)
+            unknown = [n for n in lcd_widgets.widgets[slot].names if n not in _LCD_SOURCES]
+            if unknown:
+                lcd_widgets.remove(slot)
+                uart.lcd_notify(f"LCD:ERROR:Unknown source {unknown[0]}".encode())
+                return
+        uart.lcd_notify(f"LCD:WIDGET:OK:{slot}".encode())
+    except Exception as e:
+        logger.error(f"Error adding LCD widget: {e}", "LCD")
+        uart.lcd_notify(f"LCD:ERROR:{subcmd} failed".encode())
+
+
 # ---------------------------
 # EZMaker DIY-A 센서 (아날로그 전압)
 # ---------------------------
@@ -2564,6 +2920,10 @@ def ez_volt_handler(conn_handle, cmd_str):
     """
     EZMaker 전압센서(EZVOLT) 명령어 처리:
     - EZVOLT:STATUS: 현재 전압 값 측정하여 반환
+    - EZVOLT:CAL:입력전압V: 멀티미터로 잰 현재 입력 전압을 보드 ADC 보정점으로 추가/저장
+      응답: EZVOLT:CAL:OK:raw12,보드mV (read_uv() 미지원 펌웨어에서 사용하는 보정 LUT)
+      read_uv() 지원 펌웨어에서는 보정점이 전압 읽기에 쓰이지 않으므로 EZVOLT:CAL:ERROR:READ_UV_ACTIVE
+    - EZVOLT:CAL:RESET: ADC 보정점 초기화 (기본 환산 사용)
     - EZVOLT:PIN:핀번호: EZVOLT 센서 ADC 핀 설정
     """
     logger.debug(f"Received command: {cmd_str}", "EZVOLT")
@@ -2595,6 +2955,28 @@ def ez_volt_handler(conn_handle, cmd_str):
             logger.error(f"Error measuring EZ-Volt sensor: {e}", "EZVOLT")
             uart.ez_volt_notify(b"EZVOLT:ERROR:Measurement failed")
 
+    elif cmd_str == "EZVOLT:CAL:RESET":
+        adc_calibration.reset()
+        uart.ez_volt_notify(b"EZVOLT:CAL:RESET:OK")
+
+    elif cmd_str.startswith("EZVOLT:CAL:"):
+        if ez_volt_sensor is None:
+            logger.warning("EZ-Volt sensor not configured", "EZVOLT")
+            uart.ez_volt_notify(b"EZVOLT:ERROR:Sensor not configured")
+            return
+        if ez_volt_sensor.uses_read_uv():
+            logger.warning("read_uv() active, ADC calibration point ignored", "EZVOLT")
+            uart.ez_volt_notify(b"EZVOLT:CAL:ERROR:READ_UV_ACTIVE")
+            return
+        try:
+            input_v = float(cmd_str.split(":")[2])
+            raw_12, board_mv = ez_volt_sensor.calibrate_point(input_v)
+            uart.ez_volt_notify(f"EZVOLT:CAL:OK:{raw_12},{board_mv}".encode())
+            logger.info(f"ADC calibration point added: raw={raw_12}, {board_mv}mV", "EZVOLT")
+        except Exception as e:
+            logger.error(f"Error calibrating EZ-Volt sensor: {e}", "EZVOLT")
+            uart.ez_volt_notify(b"EZVOLT:ERROR:Calibration failed")
+
     elif cmd_str.startswith("EZVOLT:PIN:"):
         # 핀 설정 명령 처리
         try:
@@ -2616,13 +2998,26 @@ def ez_volt_handler(conn_handle, cmd_str):
 # ---------------------------
 # EZMaker 소리센서 (EZSOUND)
 # ---------------------------
+def _ez_sound_notify_level():
+    level = ez_sound_sensor.take_level()
+    if level is None:
+        return
+    rms, p2p, db, peak = level
+    uart.ez_sound_notify(f"EZSOUND:LEVEL:{rms:.1f},{p2p},{db:.1f},{peak}".encode())
+
+
 def ez_sound_handler(conn_handle, cmd_str):
     """
     EZMaker 소리센서(EZSOUND) 명령어 처리:
     - EZSOUND:STATUS: 현재 소리 레벨 값 측정하여 반환
+    - EZSOUND:LEVEL: 창(기본 2kHz x 256샘플) 단위 RMS / 피크-투-피크 / 추정 dB 반환
+      응답: EZSOUND:LEVEL:rms,p2p,dB,peak (rms/p2p/peak 는 10비트 스케일, peak 는 직전 응답 이후 최대 p2p)
+    - EZSOUND:STREAM:ON[:간격ms]: 레벨미터 연속 실행 + 주기 알림 (기본 200ms, 최소 50ms)
+    - EZSOUND:STREAM:OFF: 레벨 알림/레벨미터 중지
     - EZSOUND:PIN:핀번호: EZSOUND 센서 ADC 핀 설정
     """
     global ez_sound_sensor, PIN_EZSOUND
+    global ez_sound_streaming, ez_sound_level_pending, ez_sound_stream_interval, last_ez_sound_stream
 
     logger.debug(f"Received command: {cmd_str}", "EZSOUND")
 
@@ -2653,6 +3048,50 @@ def ez_sound_handler(conn_handle, cmd_str):
             logger.error(f"Error measuring EZ-Sound sensor: {e}", "EZSOUND")
             uart.ez_sound_notify(b"EZSOUND:ERROR:Measurement failed")
 
+    elif cmd_str == "EZSOUND:LEVEL":
+        if ez_sound_sensor is None:
+            logger.warning("EZ-Sound sensor not configured", "EZSOUND")
+            uart.ez_sound_notify(b"EZSOUND:ERROR:Sensor not configured")
+            return
+        try:
+            age = ez_sound_sensor.level_age_ms()
+            if ez_sound_sensor.level_active and age is not None and age < 500:
+                _ez_sound_notify_level()
+            else:
+                # 레벨미터를 시작하고 첫 창 계산이 끝나면 메인 루프에서 응답
+                if not ez_sound_sensor.level_active:
+                    ez_sound_sensor.start_level()
+                ez_sound_level_pending = True
+        except Exception as e:
+            logger.error(f"Error measuring EZ-Sound level: {e}", "EZSOUND")
+            uart.ez_sound_notify(b"EZSOUND:ERROR:Level failed")
+
+    elif cmd_str.startswith("EZSOUND:STREAM:"):
+        if ez_sound_sensor is None:
+            logger.warning("EZ-Sound sensor not configured", "EZSOUND")
+            uart.ez_sound_notify(b"EZSOUND:ERROR:Sensor not configured")
+            return
+        try:
+            parts = cmd_str.split(":")
+            if parts[2] == "ON":
+                interval = int(parts[3]) if len(parts) > 3 else 200
+                ez_sound_stream_interval = max(interval, 50)
+                if not ez_sound_sensor.level_active:
+                    ez_sound_sensor.start_level()
+                ez_sound_streaming = True
+                last_ez_sound_stream = time.ticks_ms()
+                uart.ez_sound_notify(f"EZSOUND:STREAM:ON:{ez_sound_stream_interval}".encode())
+            elif parts[2] == "OFF":
+                ez_sound_streaming = False
+                ez_sound_level_pending = False
+                ez_sound_sensor.stop_level()
+                uart.ez_sound_notify(b"EZSOUND:STREAM:OFF")
+            else:
+                uart.ez_sound_notify(b"EZSOUND:ERROR:Invalid stream command")
+        except Exception as e:
+            logger.error(f"Error setting EZ-Sound stream: {e}", "EZSOUND")
+            uart.ez_sound_notify(b"EZSOUND:ERROR:Invalid stream command")
+
     elif cmd_str.startswith("EZSOUND:PIN:"):
         # 핀 설정 명령 처리
         try:
@@ -2660,6 +3099,8 @@ def ez_sound_handler(conn_handle, cmd_str):
             success = update_pin_config('ezsound', pin_number)
             if success:
                 PIN_EZSOUND = pin_number
+                ez_sound_streaming = False
+                ez_sound_level_pending = False
                 uart.ez_sound_notify(f"EZSOUND:PIN:OK:{pin_number}".encode())
             else:
                 uart.ez_sound_notify(b"EZSOUND:ERROR:Pin configuration failed")
@@ -2678,7 +3119,10 @@ def ez_sound_handler(conn_handle, cmd_str):
 def ez_weight_handler(conn_handle, cmd_str):
     """
     EZMaker 무게센서(EZWEIGHT, HX711) 명령어 처리:
-    - EZWEIGHT:STATUS: 현재 무게 값 측정하여 반환
+    - EZWEIGHT:STATUS: 현재 무게 값 반환 (메인 루프에서 수집/필터링한 캐시 값)
+    - EZWEIGHT:TARE: 현재 값을 영점으로 설정 (플래시에 저장)
+    - EZWEIGHT:SCALE:값: 스케일 인자 설정 (플래시에 저장)
+    - EZWEIGHT:CALIBRATE:무게(g): 알려진 무게로 스케일 인자 계산 (플래시에 저장)
     - EZWEIGHT:PIN:DOUT,SCK: 무게센서 DOUT/SCK 핀 설정
     """
     global ez_weight_sensor, PIN_EZWEIGHT_DOUT, PIN_EZWEIGHT_SCK
@@ -2713,6 +3157,38 @@ def ez_weight_handler(conn_handle, cmd_str):
             logger.error(f"Error measuring EZ-Weight sensor: {e}", "EZWEIGHT")
             uart.ez_weight_notify(b"EZWEIGHT:ERROR:Measurement failed")
 
+    elif cmd_str == "EZWEIGHT:TARE" or cmd_str.startswith("EZWEIGHT:SCALE") or cmd_str.startswith("EZWEIGHT:CALIBRATE:"):
+        if ez_weight_sensor is None:
+            logger.warning("EZ-Weight sensor not configured", "EZWEIGHT")
+            uart.ez_weight_notify(b"EZWEIGHT:ERROR:Sensor not configured")
+            return
+
+        try:
+            if cmd_str == "EZWEIGHT:TARE":
+                if ez_weight_sensor.tare():
+                    uart.ez_weight_notify(b"EZWEIGHT:TARE:OK")
+                    logger.info("EZ-Weight tare done", "EZWEIGHT")
+                else:
+                    uart.ez_weight_notify(b"EZWEIGHT:ERROR:Tare failed")
+            elif cmd_str == "EZWEIGHT:SCALE":
+                uart.ez_weight_notify(f"EZWEIGHT:SCALE:{ez_weight_sensor.scale:.4f}".encode())
+            elif cmd_str.startswith("EZWEIGHT:SCALE:"):
+                scale = float(cmd_str.split(":")[2])
+                ez_weight_sensor.set_scale(scale)
+                uart.ez_weight_notify(f"EZWEIGHT:SCALE:OK:{scale:.4f}".encode())
+                logger.info(f"EZ-Weight scale set to {scale:.4f}", "EZWEIGHT")
+            else:
+                known = float(cmd_str.split(":")[2])
+                scale = ez_weight_sensor.calibrate(known)
+                if scale is None:
+                    uart.ez_weight_notify(b"EZWEIGHT:ERROR:Calibration failed")
+                else:
+                    uart.ez_weight_notify(f"EZWEIGHT:CALIBRATE:OK:{scale:.4f}".encode())
+                    logger.info(f"EZ-Weight calibrated with {known}g: scale={scale:.4f}", "EZWEIGHT")
+        except Exception as e:
+            logger.error(f"Error calibrating EZ-Weight sensor: {e}", "EZWEIGHT")
+            uart.ez_weight_notify(b"EZWEIGHT:ERROR:Invalid calibration command")
+
     elif cmd_str.startswith("EZWEIGHT:PIN:"):
         try:
             parts = cmd_str.split(":")
@@ -2812,6 +3288,9 @@ def ez_curr_handler(conn_handle, cmd_str):
     """
     EZMaker 전류센서(EZCURR, INA219) 명령어 처리:
     - EZCURR:STATUS: 현재 전류/전압 값 측정하여 반환
+    - EZCURR:ENERGY: 누적 전하량/에너지 반환 (EZCURR:ENERGY:mAh,mWh,초)
+    - EZCURR:ENERGY:RESET: 누적값 초기화
+    - EZCURR:AVG:n: ADC 평균 샘플 수 설정 (1,2,4,...,128)
     - EZCURR:PIN:SDA,SCL: I2C 핀 설정
     """
     global ez_curr_sensor, PIN_EZCURR_SDA, PIN_EZCURR_SCL
@@ -2849,6 +3328,32 @@ def ez_curr_handler(conn_handle, cmd_str):
             logger.error(f"[EZCURR] Measurement error: {e}", "CURR")
             uart.ez_curr_notify(b"EZCURR:ERROR:Measurement failed")
 
+    elif cmd_str.startswith("EZCURR:ENERGY") or cmd_str.startswith("EZCURR:AVG:"):
+        if ez_curr_sensor is None:
+            logger.warning("EZ-Curr sensor not configured", "CURR")
+            uart.ez_curr_notify(b"EZCURR:ERROR:Sensor not configured")
+            return
+
+        try:
+            if cmd_str == "EZCURR:ENERGY":
+                energy = ez_curr_sensor.get_energy()
+                msg = "EZCURR:ENERGY:{:.4f},{:.4f},{:.1f}".format(
+                    energy["charge_mAh"], energy["energy_mWh"], energy["seconds"]
+                )
+                uart.ez_curr_notify(msg.encode())
+            elif cmd_str == "EZCURR:ENERGY:RESET":
+                ez_curr_sensor.reset_energy()
+                uart.ez_curr_notify(b"EZCURR:ENERGY:RESET:OK")
+            elif cmd_str.startswith("EZCURR:AVG:"):
+                samples = int(cmd_str.split(":")[2])
+                ez_curr_sensor.set_averaging(samples)
+                uart.ez_curr_notify(f"EZCURR:AVG:OK:{samples}".encode())
+            else:
+                uart.ez_curr_notify(b"EZCURR:ERROR:Unknown command")
+        except Exception as e:
+            logger.error(f"[EZCURR] Energy/averaging error: {e}", "CURR")
+            uart.ez_curr_notify(b"EZCURR:ERROR:Invalid command")
+
     elif cmd_str.startswith("EZCURR:PIN:"):
         try:
             parts = cmd_str.split(":")
@@ -3081,6 +3586,103 @@ def rain_handler(conn_handle, cmd_str):
 # ---------------------------
 # 8)버저
 # ---------------------------
+buzzer_songs = SongStore()    # 컴파일된 곡 플래시 캐시 (/songs)
+buzzer_upload = None          # 업로드 중인 곡 [이름 또는 None, 형식("RTTTL"/"BIN"/None), bytearray]
+BUZZER_UPLOAD_MAX = 4096      # 업로드 최대 바이트
+
+def _buzzer_song_upload_append(kind, chunk):
+    """업로드 버퍼에 청크 추가 (형식이 섞이거나 너무 크면 업로드 취소)"""
+    global buzzer_upload
+    if buzzer_upload is None:
+        uart.buzzer_notify(b"BUZ:SONG:ERROR:No upload in progress")
+        return
+    if buzzer_upload[1] not in (None, kind):
+        buzzer_upload = None
+        uart.buzzer_notify(b"BUZ:SONG:ERROR:Mixed RTTTL and binary data")
+        return
+    data = buzzer_upload[2]
+    if len(data) + len(chunk) > BUZZER_UPLOAD_MAX:
+        buzzer_upload = None
+        uart.buzzer_notify(b"BUZ:SONG:ERROR:Song too large")
+        return
+    buzzer_upload[1] = kind
+    data.extend(chunk)
+
+def _buzzer_song_command(cmd_str):
+    """
+    사용자 멜로디 업로드/재생 (보드에서 컴파일, 보드 타이머로 재생):
+    - BUZ:SONG:BEGIN[:이름] - 업로드 시작 (이름이 있으면 /songs 에 캐시)
+    - BUZ:SONG:DATA:RTTTL텍스트 - RTTTL 조각 추가 (여러 번 나눠 전송)
+    - BUZ:SONG:BIN:<바이너리> - [MIDI음, 길이ms u16 LE] 3바이트 단위 조각 추가
+    - BUZ:SONG:END - 컴파일 + 재생 (+ 캐시) → BUZ:SONG:OK:단계수
+    - BUZ:SONG:RTTTL:RTTTL텍스트 - 한 번에 컴파일 + 재생 (캐시 안 함)
+    - BUZ:SONG:PLAY:이름 - 캐시된 곡 재생 (파싱 없음)
+    - BUZ:SONG:LIST / BUZ:SONG:DEL:이름
+    """
+    global buzzer_upload
+
+    if isinstance(cmd_str, bytes):
+        _buzzer_song_upload_append("BIN", memoryview(cmd_str)[13:])  # len(b"BUZ:SONG:BIN:")
+        return
+
+    parts = cmd_str.split(":", 3)
+    sub = parts[2].upper() if len(parts) > 2 else ""
+    arg = parts[3] if len(parts) > 3 else ""
+    try:
+        if sub == "BEGIN":
+            name = song_name(arg) if arg else None
+            buzzer_upload = [name, None, bytearray()]
+            uart.buzzer_notify(b"BUZ:SONG:READY")
+
+        elif sub == "DATA":
+            _buzzer_song_upload_append("RTTTL", arg.encode())
+
+        elif sub == "END":
+            if buzzer_upload is None:
+                uart.buzzer_notify(b"BUZ:SONG:ERROR:No upload in progress")
+                return
+            name, kind, data = buzzer_upload
+            buzzer_upload = None
+            if kind == "BIN":
+                steps = decode_notes(data)
+            else:
+                steps = parse_rtttl(data.decode())
+            count = buzzerModule.play_steps(steps, name or "SONG")
+            if not count:
+                uart.buzzer_notify(b"BUZ:SONG:ERROR:Empty song")
+                return
+            if name:
+                buzzer_songs.save(name, buzzerModule.compiled_bytes())
+            logger.info(f"Song {name} compiled ({count} steps)", "BUZ")
+            uart.buzzer_notify(f"BUZ:SONG:OK:{count}".encode())
+
+        elif sub == "RTTTL":
+            count = buzzerModule.play_steps(parse_rtttl(arg), "SONG")
+            uart.buzzer_notify(f"BUZ:SONG:OK:{count}".encode())
+
+        elif sub == "PLAY":
+            name = song_name(arg)
+            if not buzzer_songs.exists(name):
+                uart.buzzer_notify(b"BUZ:SONG:ERROR:Unknown song")
+                return
+            count = buzzerModule.play_compiled_file(buzzer_songs.path(name), name)
+            uart.buzzer_notify(f"BUZ:SONG:PLAY:OK:{count}".encode())
+
+        elif sub == "LIST":
+            uart.buzzer_notify(("BUZ:SONG:LIST:" + ",".join(buzzer_songs.names())).encode())
+
+        elif sub == "DEL":
+            if buzzer_songs.delete(song_name(arg)):
+                uart.buzzer_notify(b"BUZ:SONG:DEL:OK")
+            else:
+                uart.buzzer_notify(b"BUZ:SONG:ERROR:Unknown song")
+
+        else:
+            uart.buzzer_notify(b"BUZ:SONG:ERROR:Unknown command")
+    except (ValueError, IndexError, UnicodeError) as e:
+        logger.error(f"Invalid song: {e}", "BUZ")
+        uart.buzzer_notify(b"BUZ:SONG:ERROR:Invalid song")
+
 def buzzer_handler(conn_handle, cmd_str):
     """
     버저 관련 명령어 처리:
@@ -3091,8 +3693,17 @@ def buzzer_handler(conn_handle, cmd_str):
     - BUZ:PLAY:MELODY_NAME[:tempo] - 내장 멜로디 재생
     - BUZ:STOP - 재생 중지
     - BUZ:STATUS - 재생 상태 확인
+    - BUZ:SONG:... - 사용자 멜로디 업로드/재생 (_buzzer_song_command 참고)
     """
     global buzzer_initialized
+
+    # 바이너리 곡 청크 (BUZ:SONG:BIN:)
+    if isinstance(cmd_str, bytes):
+        if buzzer_initialized:
+            _buzzer_song_command(cmd_str)
+        else:
+            uart.buzzer_notify(b"BUZ:SONG:ERROR:Not initialized")
+        return
     
    
     
@@ -3116,7 +3727,7 @@ def buzzer_handler(conn_handle, cmd_str):
                 return
         
         # 다른 명령들은 버저가 초기화되었는지 확인
-        elif cmd_str.startswith("BUZ:BEEP") or cmd_str.startswith("BUZ:PLAY:") or cmd_str == "BUZ:STATUS" or cmd_str == "BUZ:STOP":
+        elif cmd_str.startswith("BUZ:BEEP") or cmd_str.startswith("BUZ:PLAY:") or cmd_str.startswith("BUZ:SONG:") or cmd_str == "BUZ:STATUS" or cmd_str == "BUZ:STOP":
             # 버저가 초기화되지 않았다면 오류 반환
             if not buzzer_initialized:
                 logger.error("Buzzer not initialized, send BUZ:INIT first", "BUZ")
@@ -3223,6 +3834,10 @@ def buzzer_handler(conn_handle, cmd_str):
                 buzzerModule.play_melody(melody_name, tempo)
                 ###uart.buzzer_notify(b"PLAYING")
                 
+            # 사용자 멜로디 업로드/재생
+            elif cmd_str.startswith("BUZ:SONG:"):
+                _buzzer_song_command(cmd_str)
+
             # 중지 명령 처리
             elif cmd_str == "BUZ:STOP":
                 logger.info("BUZ:STOP", cmd_str)
@@ -3278,18 +3893,33 @@ gc_interval = 5000  # 5초마다 GC 수행
 CAM_CHUNK_SIZE = 160
 CAM_TX_MAX_CHUNKS_PER_TICK = 1  # 3에서 1로 줄여서 BLE 버퍼 부하 감소
 
+CAM_HEADER_MAX = 16                # "BIN{seq}:" / "SIZE:{n}" 헤더 최대 길이
+
 _cam_lock = _thread.allocate_lock()
-_cam_pending_frame = None          # 최신 프레임 1개만 유지 (큐 폭주 방지)
-_cam_tx_frame = None               # 현재 전송 중인 프레임
+# 프레임은 cam.pool(FramePool) 슬롯 번호로 주고받는다. (-1 = 없음)
+_cam_pending_slot = -1             # 최신 프레임 1개만 유지 (큐 폭주 방지)
+_cam_pending_len = 0
+_cam_pending_ms = 0                # 대기 프레임 캡처 완료 시각
+_cam_tx_slot = -1                  # 현재 전송 중인 프레임 슬롯
+_cam_tx_frame = None               # 전송 중인 프레임 memoryview (풀 버퍼, 복사 없음)
 _cam_tx_offset = 0
+# notify 버퍼: 헤더를 제자리에 쓰고 청크를 뒤에 복사해 memoryview 로 전송 (청크마다 할당 없음)
+_cam_tx_buf = bytearray(CAM_HEADER_MAX + CAM_CHUNK_SIZE)
+_cam_tx_mv = memoryview(_cam_tx_buf)
 _cam_tx_seq = 0
 _cam_tx_stage = 0                  # 0=idle, 1=sent CAM:START, 2=sent SIZE, 3=sending chunks, 4=sent CAM:END
+_cam_tx_capture_ms = 0             # 전송 중 프레임 캡처 시각 (지연 측정)
+_cam_tx_start_ms = 0               # 전송 시작 시각 (처리량 측정)
 _cam_snapshot_requested = False
 
 _cam_worker_started = False
 _cam_worker_stop = False
 _cam_last_capture_ms = 0
 
+# 적응형 화질 (CAM:AUTO): 전송 펌프가 측정/판단, 캡처 스레드가 단계 적용
+cam_adapt = None
+_cam_adapt_request = -1            # 캡처 스레드가 적용할 단계 (-1 = 없음)
+
 # 카메라 초기화 시도
 try:
     # CameraModule 인스턴스 생성
@@ -3297,6 +3927,7 @@ try:
     # 기본 설정으로 카메라 초기화
     if cam.init(frame_size="QVGA", quality=85, fb_count=2):
         camera_enabled = True
+        cam_adapt = CamAdaptive(cam.get_frame_size(), cam.get_quality())
         logger.info("Camera initialized successfully", "CAM")
     else:
         camera_enabled = False
@@ -3321,24 +3952,53 @@ except Exception as e:
     import machine
     machine.reset()  # 하드 리셋 수행
 
-def _camera_offer_frame(frame):
-    """최신 프레임 1개만 유지하도록 교체."""
-    global _cam_pending_frame
-    if not frame:
-        return
+def _camera_offer_frame(slot, length):
+    """최신 프레임 1개만 유지하도록 교체 (밀려난 프레임 슬롯은 풀에 반환)."""
+    global _cam_pending_slot, _cam_pending_len, _cam_pending_ms
     try:
         with _cam_lock:
-            _cam_pending_frame = frame
+            old = _cam_pending_slot
+            _cam_pending_slot = slot
+            _cam_pending_len = length
+            _cam_pending_ms = time.ticks_ms()
+        if old >= 0:
+            cam.pool.release(old)
     except Exception as e:
         logger.error(f"Failed to offer camera frame: {e}", "CAM")
 
+def _camera_put_header(prefix, number, suffix=b""):
+    """
+    _cam_tx_buf 앞에 prefix + 10진수 + suffix 를 기록 (문자열/bytes 생성 없음)
+
+    Returns:
+        int: 헤더 길이
+    """
+    buf = _cam_tx_buf
+    pos = len(prefix)
+    buf[:pos] = prefix
+    digits = 1
+    v = number
+    while v >= 10:
+        v //= 10
+        digits += 1
+    end = pos + digits
+    v = number
+    for i in range(end - 1, pos - 1, -1):
+        buf[i] = 48 + v % 10
+        v //= 10
+    for ch in suffix:
+        buf[end] = ch
+        end += 1
+    return end
+
 def _camera_request_snapshot():
     global _cam_snapshot_requested
     _cam_snapshot_requested = True
 
 def _camera_abort_tx():
-    """전송 중 프레임을 중단하고 상태 초기화."""
-    global _cam_tx_frame, _cam_tx_offset, _cam_tx_seq, _cam_tx_stage, _cam_pending_frame
+    """전송 중 프레임을 중단하고 상태 초기화 (프레임 슬롯은 풀에 반환)."""
+    global _cam_tx_frame, _cam_tx_offset, _cam_tx_seq, _cam_tx_stage
+    global _cam_tx_slot, _cam_pending_slot
     try:
         # 호스트가 프레임 파서를 멈추지 않도록 END는 보내줌(가능할 때만)
         if uart and ble_connected:
@@ -3346,19 +4006,28 @@ def _camera_abort_tx():
     except Exception:
         pass
     with _cam_lock:
+        tx_slot = _cam_tx_slot
+        pending_slot = _cam_pending_slot
         _cam_tx_frame = None
+        _cam_tx_slot = -1
         _cam_tx_offset = 0
         _cam_tx_seq = 0
         _cam_tx_stage = 0
-        _cam_pending_frame = None
+        _cam_pending_slot = -1
+    if cam is not None and cam.pool is not None:
+        cam.pool.release(tx_slot)
+        cam.pool.release(pending_slot)
 
 def _camera_tx_pump(max_chunks=CAM_TX_MAX_CHUNKS_PER_TICK):
     """
     메인 루프에서 호출: 한 번에 청크 몇 개만 전송하고 빠르게 반환.
     프로토콜은 기존과 동일:
       CAM:START -> SIZE:<n> -> BIN{seq}:<bytes>... -> CAM:END
+    헤더는 미리 할당한 _cam_tx_buf 에 제자리로 쓰고, 풀 버퍼의 청크를 그 뒤에 복사해
+    memoryview 로 notify 한다. (슬라이스 복사 / 헤더 bytes 생성 / 연결 복사 없음)
     """
-    global _cam_tx_frame, _cam_tx_offset, _cam_tx_seq, _cam_tx_stage, _cam_pending_frame
+    global _cam_tx_frame, _cam_tx_offset, _cam_tx_seq, _cam_tx_stage
+    global _cam_tx_slot, _cam_pending_slot, _cam_tx_capture_ms, _cam_tx_start_ms
 
     if not (uart and ble_connected and camera_enabled):
         return
@@ -3371,10 +4040,13 @@ def _camera_tx_pump(max_chunks=CAM_TX_MAX_CHUNKS_PER_TICK):
     # 전송 중이 아니면 pending에서 가져와 시작
     if _cam_tx_stage == 0:
         with _cam_lock:
-            if _cam_pending_frame is None:
+            if _cam_pending_slot < 0:
                 return
-            _cam_tx_frame = _cam_pending_frame
-            _cam_pending_frame = None
+            _cam_tx_slot = _cam_pending_slot
+            _cam_tx_frame = cam.pool.view(_cam_pending_slot, _cam_pending_len)
+            _cam_pending_slot = -1
+            _cam_tx_capture_ms = _cam_pending_ms
+            _cam_tx_start_ms = time.ticks_ms()
             _cam_tx_offset = 0
             _cam_tx_seq = 0
             _cam_tx_stage = 1
@@ -3392,8 +4064,8 @@ def _camera_tx_pump(max_chunks=CAM_TX_MAX_CHUNKS_PER_TICK):
     # Stage 2: SIZE
     if _cam_tx_stage == 2:
         try:
-            size_info = f"SIZE:{len(_cam_tx_frame)}".encode()
-            uart.cam_notify(size_info)
+            n = _camera_put_header(b"SIZE:", len(_cam_tx_frame))
+            uart.cam_notify(_cam_tx_mv[:n])
             _cam_tx_stage = 3
         except Exception as e:
             logger.error(f"Failed to send SIZE: {e}", "CAM")
@@ -3407,14 +4079,16 @@ def _camera_tx_pump(max_chunks=CAM_TX_MAX_CHUNKS_PER_TICK):
             chunks_sent = 0
             while _cam_tx_offset < length and chunks_sent < max_chunks:
                 end = min(_cam_tx_offset + CAM_CHUNK_SIZE, length)
-                chunk = _cam_tx_frame[_cam_tx_offset:end]
-                header = f"BIN{_cam_tx_seq}:".encode()
+                h = _camera_put_header(b"BIN", _cam_tx_seq, b":")
+                n = h + end - _cam_tx_offset
+                _cam_tx_buf[h:n] = _cam_tx_frame[_cam_tx_offset:end]
+                packet = _cam_tx_mv[:n]
                 
                 # ENOMEM 방지를 위한 재시도 로직
                 retry = 3
                 while retry > 0:
                     try:
-                        uart.cam_notify(header + chunk)
+                        uart.cam_notify(packet)
                         break # 성공 시 루프 탈출
                     except Exception as e:
                         if "ENOMEM" in str(e) or "12" in str(e):
@@ -3449,12 +4123,46 @@ def _camera_tx_pump(max_chunks=CAM_TX_MAX_CHUNKS_PER_TICK):
             uart.cam_notify(b"CAM:END")
         except Exception:
             pass
-        # 상태 초기화
+        nbytes = len(_cam_tx_frame)
+        # 상태 초기화 (프레임 슬롯 반환)
         with _cam_lock:
+            tx_slot = _cam_tx_slot
             _cam_tx_frame = None
+            _cam_tx_slot = -1
             _cam_tx_offset = 0
             _cam_tx_seq = 0
             _cam_tx_stage = 0
+        cam.pool.release(tx_slot)
+        _camera_adapt_record(nbytes)
+
+def _camera_adapt_record(nbytes):
+    """프레임 전송 완료 실측값을 적응형 컨트롤러에 넘기고, 단계가 바뀌면 캡처 스레드에 요청."""
+    global _cam_adapt_request
+    if cam_adapt is None:
+        return
+    level = cam_adapt.frame_sent(nbytes, _cam_tx_capture_ms, _cam_tx_start_ms, time.ticks_ms())
+    if level < 0:
+        return
+    _cam_adapt_request = level
+    size, quality = CamAdaptive.LEVELS[level]
+    logger.info(f"Adaptive camera level {level}: {size} q{quality} ({cam_adapt.bps}B/s)", "CAM")
+    try:
+        uart.cam_notify(f"CAM:AUTO:LEVEL:{level},{size},{quality}".encode())
+    except Exception:
+        pass
+
+def _camera_apply_level():
+    """캡처 스레드에서 호출: 요청된 단계의 품질/프레임 크기 적용 (캡처와 겹치지 않도록)."""
+    global _cam_adapt_request
+    level = _cam_adapt_request
+    _cam_adapt_request = -1
+    size, quality = CamAdaptive.LEVELS[level]
+    if cam.get_frame_size() != size:
+        cam.set_frame_size(size)
+    if cam.get_quality() != quality:
+        cam.set_quality(quality)
+    # 적용에 실패했으면 컨트롤러 단계를 실제 설정에 맞춤
+    cam_adapt.level = CamAdaptive.find_level(cam.get_frame_size(), cam.get_quality())
 
 def _camera_worker():
     """카메라 캡처 전용 스레드."""
@@ -3463,21 +4171,23 @@ def _camera_worker():
     while not _cam_worker_stop:
         try:
             if camera_enabled and cam and ble_connected and uart:
+                if _cam_adapt_request >= 0:
+                    _camera_apply_level()
                 now = time.ticks_ms()
 
                 # 스냅샷 요청 우선 처리
                 if _cam_snapshot_requested:
                     _cam_snapshot_requested = False
-                    frame = cam.capture_frame()
-                    if frame:
-                        _camera_offer_frame(frame)
+                    got = cam.capture_into()
+                    if got:
+                        _camera_offer_frame(got[0], got[1])
 
                 # 스트리밍 캡처
                 if streaming:
                     if time.ticks_diff(now, _cam_last_capture_ms) >= stream_interval:
-                        frame = cam.capture_frame()
-                        if frame:
-                            _camera_offer_frame(frame)
+                        got = cam.capture_into()
+                        if got:
+                            _camera_offer_frame(got[0], got[1])
                         _cam_last_capture_ms = now
         except Exception as e:
             logger.error(f"Camera worker error: {e}", "CAM")
@@ -3500,6 +4210,46 @@ def _ensure_camera_worker():
         logger.error(f"Failed to start camera worker thread: {e}", "CAM")
         _cam_worker_started = False
 
+def _camera_auto_notify(msg):
+    try:
+        uart.cam_notify(msg.encode())
+    except Exception as e:
+        logger.error(f"Failed to send {msg}: {e}", "CAM")
+
+def _camera_auto_command(cmd_str):
+    """
+    적응형 화질 명령
+      CAM:AUTO:FPS:<n>      목표 FPS(1~20) — 캡처 간격도 1000/n ms 로 맞춤
+      CAM:AUTO:LAT:<ms>     목표 지연(캡처→CAM:END, 100~10000ms)
+      CAM:AUTO:OFF          자동 조절 중지 (현재 해상도/품질 유지)
+      CAM:AUTO:STATE        CAM:AUTO:STATE:모드,목표,단계,크기,품질,바이트/s,FPSx10,지연ms
+    """
+    global stream_interval
+    if cam_adapt is None:
+        _camera_auto_notify("CAM:AUTO:ERROR:NOT_READY")
+        return
+    parts = cmd_str.split(":")
+    sub = parts[2] if len(parts) > 2 else ""
+    try:
+        if sub in ("FPS", "LAT") and len(parts) == 4:
+            mode = CamAdaptive.FPS if sub == "FPS" else CamAdaptive.LATENCY
+            cam_adapt.set_target(mode, int(parts[3]))
+            interval = cam_adapt.interval_ms()
+            if interval is not None:
+                stream_interval = max(50, min(1000, interval))
+            logger.info(f"Adaptive camera {sub} target {cam_adapt.target}", "CAM")
+            _camera_auto_notify(f"CAM:AUTO:OK:{sub}:{cam_adapt.target}")
+        elif sub == "OFF":
+            cam_adapt.stop()
+            _camera_auto_notify("CAM:AUTO:OK:OFF")
+        elif sub == "STATE":
+            _camera_auto_notify("CAM:AUTO:STATE:" + ",".join(str(v) for v in cam_adapt.state()))
+        else:
+            _camera_auto_notify("CAM:AUTO:ERROR:UNKNOWN_CMD")
+    except ValueError as e:
+        logger.error(f"Adaptive camera command error: {e}", "CAM")
+        _camera_auto_notify("CAM:AUTO:ERROR:INVALID_VALUE")
+
 def cam_handler(conn_handle, cmd_str):
     global streaming, stream_interval
     cmd_str = cmd_str.upper()
@@ -3527,6 +4277,9 @@ def cam_handler(conn_handle, cmd_str):
         except Exception as e:
             logger.error(f"Error setting interval: {e}", "CAM")
         
+    elif cmd_str.startswith("CAM:AUTO:"):
+        _camera_auto_command(cmd_str)
+
     elif cmd_str == "CAM:STREAM:ON":
         global streaming
         if streaming:
@@ -3589,7 +4342,7 @@ def disconnect_handler(conn_handle):
     logger.info(f"Device disconnected (handle: {conn_handle})", "BLE")
     
     # 글로벌 변수에 연결 상태 저장
-    global ble_connected, buzzer_initialized, gyro_streaming, neo_rainbow_active
+    global ble_connected, buzzer_initialized, gyro_streaming
     global heart_rate_streaming, heart_rate_enabled  # 심장박동 센서 스트리밍 변수 추가
     ble_connected = False
     
@@ -3606,15 +4359,28 @@ def disconnect_handler(conn_handle):
     streaming = False
     gyro_streaming = False
     heart_rate_streaming = False  # 심장박동 센서 스트리밍도 중지
+    global ultra_streaming, ultra_status_pending
+    ultra_streaming = False
+    ultra_status_pending = False
+    if ultraSensor is not None:
+        ultraSensor.stop_continuous()
+    global ez_sound_streaming, ez_sound_level_pending
+    ez_sound_streaming = False
+    ez_sound_level_pending = False
+    if ez_sound_sensor is not None:
+        ez_sound_sensor.stop_level()
+    if ez_scope is not None:
+        ez_scope.stop()
+    global mq2_streaming
+    mq2_streaming = False
+    servo_motion.stop()  # 진행 중인 서보 이동은 현재 위치에서 정지
+    if cam_adapt is not None:
+        cam_adapt.stop()  # 자동 화질 조절 중지 (현재 해상도/품질은 유지)
     
-    # 무지개 효과 먼저 중지 (스레드 문제 해결)
-    if neo_rainbow_active:
-        try:
-            logger.info("Stopping rainbow effect on disconnect", "NEO")
-            stop_rainbow()
-            time.sleep(0.2)  # 스레드가 완전히 종료될 시간 확보
-        except Exception as e:
-            logger.error(f"Error stopping rainbow effect: {e}", "NEO")
+    # NeoPixel 효과 중지 (대기 없이 즉시)
+    if neo_fx is not None and neo_fx.active:
+        logger.info("Stopping NeoPixel effect on disconnect", "NEO")
+        stop_effect()
     
     # 그 다음 모든 NeoPixel LED 끄기
     if neo is not None:
@@ -3628,8 +4394,8 @@ def disconnect_handler(conn_handle):
     # LED로 연결 상태 표시 (선택적)
     if led_pin:
         # LED 깜빡임 중지
-        global blink_flag
-        blink_flag = False
+        if led_blinker is not None:
+            led_blinker.stop()
         led_pin.duty_u16(0)  # 연결 해제되면 LED 끄기 (PWM 모드)
 
     # 버저 완전 정리 (중지 및 리소스 해제)
@@ -3650,10 +4416,10 @@ def disconnect_handler(conn_handle):
     except Exception as e:
         logger.warning(f"Error deinitializing buzzer: {e}", "BUZ")
         
-    # DC 모터 정지
+    # DC 모터 정지 (램프 없이 즉시)
     try:
-        if dcmotor_pwm:
-            dcmotor_pwm.duty(0)  # 모터 정지
+        if dcmotor_ramp:
+            dcmotor_ramp.estop()
     except Exception as e:
         logger.warning(f"Error stopping DC motor: {e}", "MOTOR")
 
@@ -3942,9 +4708,14 @@ def ez_press_handler(conn_handle, cmd_str):
     """
     EZMaker 기압센서(BMP280) 명령어 처리:
     - EZPRESS:STATUS - 현재 온도 및 기압 값 측정
+    - EZPRESS:ALT - 현재 고도(m) 반환 (해수면 기압 기준)
+    - EZPRESS:SEALEVEL:기압(Pa) - 고도 계산 기준 해수면 기압 설정
+    - EZPRESS:ALTCAL:고도(m) - 현재 위치의 알려진 고도로 해수면 기압 기준 보정
+    - EZPRESS:PROFILE:이름[:FORCED|NORMAL] - 오버샘플링/필터 프로파일 및 측정 모드 설정
+      (ULTRA_LOW_POWER, LOW_POWER, STANDARD, HIGH_RES, ULTRA_HIGH_RES)
     - EZPRESS:PIN:SDA핀,SCL핀 - 기압센서 I2C 핀 설정
     """
-    global ez_press_i2c, ez_press_sensor
+    global ez_press_i2c, ez_press_sensor, EZ_PRESS_PROFILE, EZ_PRESS_FORCED
     
     cmd_str = cmd_str.upper()
     logger.debug(f"Received command: {cmd_str}", "PRESS")
@@ -3969,6 +4740,43 @@ def ez_press_handler(conn_handle, cmd_str):
         except Exception as e:
             logger.error(f"Error reading EZ-Press sensor: {e}", "PRESS")
             uart.ez_press_notify(b"EZPRESS:ERROR:Measurement failed")
+
+    elif cmd_str in ("EZPRESS:ALT", "EZPRESS:SEALEVEL") or cmd_str.startswith("EZPRESS:SEALEVEL:") \
+            or cmd_str.startswith("EZPRESS:ALTCAL:") or cmd_str.startswith("EZPRESS:PROFILE:"):
+        if ez_press_sensor is None:
+            logger.warning("EZ-Press sensor not configured", "PRESS")
+            uart.ez_press_notify(b"EZPRESS:ERROR:Sensor not configured")
+            return
+
+        try:
+            parts = cmd_str.split(":")
+            if parts[1] == "ALT":
+                alt = ez_press_sensor.read_altitude()
+                uart.ez_press_notify("EZPRESS:ALT={:.2f}".format(alt).encode())
+            elif parts[1] == "SEALEVEL":
+                if len(parts) > 2:
+                    ez_press_sensor.set_sea_level(float(parts[2]))
+                msg = "EZPRESS:SEALEVEL={:.2f}".format(ez_press_sensor.sea_level_pa)
+                uart.ez_press_notify(msg.encode())
+            elif parts[1] == "ALTCAL":
+                sea_level = ez_press_sensor.calibrate_altitude(float(parts[2]))
+                uart.ez_press_notify("EZPRESS:SEALEVEL={:.2f}".format(sea_level).encode())
+            else:
+                profile = parts[2]
+                forced = EZ_PRESS_FORCED
+                if len(parts) > 3:
+                    forced = parts[3] == "FORCED"
+                mode = BMP280.MODE_FORCED if forced else BMP280.MODE_NORMAL
+                ez_press_sensor.set_profile(profile, mode)
+                EZ_PRESS_PROFILE = profile
+                EZ_PRESS_FORCED = forced
+                uart.ez_press_notify(
+                    f"EZPRESS:PROFILE:OK:{profile}:{'FORCED' if forced else 'NORMAL'}".encode()
+                )
+            logger.debug(f"EZ-Press command done: {cmd_str}", "PRESS")
+        except Exception as e:
+            logger.error(f"Error handling EZ-Press command: {e}", "PRESS")
+            uart.ez_press_notify(b"EZPRESS:ERROR:Invalid command")
     
     elif cmd_str.startswith("EZPRESS:PIN:"):
         try:
@@ -3998,13 +4806,31 @@ def ez_press_handler(conn_handle, cmd_str):
 # ---------------------------
 # 10-3) EZMaker CO2 센서 (SCD40)
 # ---------------------------
+def _ez_co2_notify_cached():
+    """캐시된 SCD40 측정값을 EZCO2 포맷으로 전송"""
+    co2, temp_c, hum, _ = ez_co2_sensor.get_cached()
+
+    # 단일 라인 키=값 포맷 (CO2 ppm, Temp, Humidity)
+    msg = "EZCO2:CO2={:.0f},T={:.2f},H={:.2f}".format(co2, temp_c, hum)
+
+    uart.ez_co2_notify(msg.encode())
+    logger.debug(
+        f"EZ-CO2 values: CO2={co2:.0f}ppm, T={temp_c:.2f}C, H={hum:.2f}%RH",
+        "CO2",
+    )
+
+
 def ez_co2_handler(conn_handle, cmd_str):
     """
     EZMaker CO2 센서(SCD40) 명령어 처리:
-    - EZCO2:STATUS - 현재 CO2/온도/습도 값 측정
+    - EZCO2:STATUS - 최근 CO2/온도/습도 값 반환
+      (측정은 메인 루프에서 주기당 1회 확인/캐시, 첫 측정 전이면 값이 들어오는 즉시 응답)
+    - EZCO2:MODE:PERIODIC|LOWPOWER|SINGLE[:간격ms] - 측정 모드 변경
+      (SINGLE 은 SCD41 전용 단발 측정, 간격 기본 60000ms,
+       SCD40 이면 EZCO2:MODE:ERROR:SINGLE_UNSUPPORTED 응답 후 기존 모드 유지)
     - EZCO2:PIN:SDA핀,SCL핀 - CO2 센서 I2C 핀 설정
     """
-    global ez_co2_i2c, ez_co2_sensor
+    global ez_co2_i2c, ez_co2_sensor, ez_co2_status_pending, ez_co2_status_deadline, EZ_CO2_MODE
     
     cmd_str = cmd_str.upper()
     logger.debug(f"Received command: {cmd_str}", "CO2")
@@ -4016,25 +4842,41 @@ def ez_co2_handler(conn_handle, cmd_str):
             return
         
         try:
-            # 데이터 준비 여부 확인 (SCD40은 약 5초마다 갱신)
-            if not ez_co2_sensor.is_data_ready():
-                logger.info("EZ-CO2 data not ready yet", "CO2")
-                uart.ez_co2_notify(b"EZCO2:WAIT")
+            if not ez_co2_sensor.has_data():
+                # 첫 측정 전: 메인 루프에서 값이 캐시되는 즉시 응답
+                logger.info("EZ-CO2 first measurement pending", "CO2")
+                ez_co2_status_pending = True
+                ez_co2_status_deadline = time.ticks_add(time.ticks_ms(), ez_co2_sensor.result_timeout_ms())
                 return
 
-            co2, temp_c, hum = ez_co2_sensor.read()
-
-            # 단일 라인 키=값 포맷 (CO2 ppm, Temp, Humidity)
-            msg = "EZCO2:CO2={:.0f},T={:.2f},H={:.2f}".format(co2, temp_c, hum)
-
-            uart.ez_co2_notify(msg.encode())
-            logger.debug(
-                f"EZ-CO2 values: CO2={co2:.0f}ppm, T={temp_c:.2f}C, H={hum:.2f}%RH",
-                "CO2",
-            )
+            _ez_co2_notify_cached()
         except Exception as e:
             logger.error(f"Error reading EZ-CO2 sensor: {e}", "CO2")
             uart.ez_co2_notify(b"EZCO2:ERROR:Measurement failed")
+
+    elif cmd_str.startswith("EZCO2:MODE:"):
+        if ez_co2_sensor is None:
+            logger.warning("EZ-CO2 sensor not configured", "CO2")
+            uart.ez_co2_notify(b"EZCO2:ERROR:Sensor not configured")
+            return
+
+        try:
+            parts = cmd_str.split(":")
+            mode = parts[2]
+            interval = int(parts[3]) if len(parts) > 3 else None
+            ez_co2_sensor.set_mode(mode, interval)
+            EZ_CO2_MODE = mode
+            logger.info(f"EZ-CO2 mode set to {mode}", "CO2")
+            uart.ez_co2_notify(f"EZCO2:MODE:OK:{mode}".encode())
+        except ValueError as e:
+            logger.error(f"Error setting EZ-CO2 mode: {e}", "CO2")
+            if mode == SCD40.MODE_SINGLE_SHOT and not ez_co2_sensor.supports_single_shot():
+                uart.ez_co2_notify(b"EZCO2:MODE:ERROR:SINGLE_UNSUPPORTED")
+            else:
+                uart.ez_co2_notify(b"EZCO2:ERROR:Invalid mode")
+        except Exception as e:
+            logger.error(f"Error setting EZ-CO2 mode: {e}", "CO2")
+            uart.ez_co2_notify(b"EZCO2:ERROR:Invalid mode")
     
     elif cmd_str.startswith("EZCO2:PIN:"):
         try:
@@ -4067,8 +4909,8 @@ def ez_co2_handler(conn_handle, cmd_str):
 def dust_handler(conn_handle, cmd_str):
     """
     먼지 센서 명령어 처리:
-    - DUST:STATUS: 현재 먼지 센서 값 측정하여 반환
-    - DUST:CALIBRATE: 센서 보정 수행
+    - DUST:STATUS: 현재 먼지 센서 값 반환 (타이머로 측정 중인 이동 평균, 즉시 응답)
+    - DUST:CALIBRATE: 센서 보정 수행 (최근 0.5초 샘플로 즉시 계산, 플래시에 저장)
     - DUST:PIN:LED핀번호,ADC핀번호: 핀 설정
     """
     logger.debug(f"Received command: {cmd_str}", "DUST")
@@ -4107,7 +4949,7 @@ def dust_handler(conn_handle, cmd_str):
         # 센서 보정 실행
         try:
             uart.dust_notify(b"DUST:CALIBRATE:START")
-            voc = dust_sensor.calibrate(samples=50)  # 적은 샘플로 빠른 보정
+            voc = dust_sensor.calibrate()  # 이동 평균 창 샘플로 즉시 보정 + 저장
             msg = f"DUST:CALIBRATE:DONE:{voc:.3f}"
             uart.dust_notify(msg.encode())
             logger.info(f"Dust sensor calibrated: VOC={voc:.3f}V", "DUST")
@@ -4166,7 +5008,8 @@ def dust_handler(conn_handle, cmd_str):
 def ez_dust_handler(conn_handle, cmd_str):
     """
     EZMaker 미세먼지 센서(PMS7003M) 명령어 처리:
-    - EZDUST:STATUS : 현재 PM10/PM2.5/PM1.0 값을 모두 측정하여 반환
+    - EZDUST:STATUS : 최근 수신한 PM10/PM2.5/PM1.0 값을 모두 반환
+      (프레임 수신/해석은 메인 루프의 poll()에서 백그라운드로 처리, 캐시 값을 즉시 응답)
     - EZDUST:PIN:RX,TX : UART 핀 설정 (센서 TX/RX 연결)
 
     STATUS 응답 포맷:
@@ -4225,18 +5068,241 @@ def ez_dust_handler(conn_handle, cmd_str):
         logger.warning(f"Unknown EZDUST command: {cmd_str}", "EZDUST")
         uart.ez_dust_notify(b"EZDUST:ERROR:Unknown command")
 
+
+# ---------------------------
+# MQ-2 가연성 가스센서 (MQ2)
+# ---------------------------
+def _mq2_notify_cached():
+    """캐시된 MQ-2 측정값 전송: MQ2:LPG,METHANE,SMOKE,HYDROGEN,ALCOHOL,RATIO,WARMUP"""
+    ppm = mq2_sensor.ppm
+    ratio = mq2_sensor.ratio
+    if ratio == float('inf'):
+        ratio = 0.0
+    warmup_s = (mq2_sensor.warmup_remaining_ms() + 999) // 1000
+    msg = f"MQ2:{ppm[0]:.1f},{ppm[1]:.1f},{ppm[2]:.1f},{ppm[3]:.1f},{ppm[4]:.1f},{ratio:.3f},{warmup_s}"
+    uart.mq2_notify(msg.encode())
+
+
+def mq2_handler(conn_handle, cmd_str):
+    """
+    MQ-2 가연성 가스센서 명령어 처리:
+    - MQ2:STATUS : 즉시 1회 측정해 5종 가스 ppm 을 한 번에 반환
+    - MQ2:WARMUP : 예열 남은 시간(초) 반환 (0 이면 예열 완료)
+    - MQ2:STREAM:ON[:간격ms] : 주기 측정 + 알림 (기본 1000ms, 최소 200ms)
+    - MQ2:STREAM:OFF : 주기 알림 중지
+    - MQ2:CALIBRATE : 깨끗한 공기에서 Ro 보정 (예열 완료 후, 플래시에 저장)
+    - MQ2:PIN:핀번호 : MQ-2 아날로그 출력 핀 설정 (예열 추적 재시작)
+
+    STATUS/STREAM 응답 포맷:
+      MQ2:LPG,METHANE,SMOKE,HYDROGEN,ALCOHOL,RATIO,WARMUP
+      (ppm 5개, Rs/Ro 비율, 예열 남은 시간(초))
+    예열이 끝나면 MQ2:WARMUP:DONE 을 한 번 알린다.
+    """
+    global mq2_streaming, mq2_stream_interval
+
+    logger.debug(f"Received command: {cmd_str}", "MQ2")
+    cmd_str = (cmd_str or "").strip().upper()
+
+    if cmd_str.startswith("MQ2:PIN:"):
+        try:
+            pin_number = int(cmd_str.split(":")[2])
+            success = update_pin_config('mq2', pin_number)
+            if success:
+                mq2_streaming = False
+                uart.mq2_notify(f"MQ2:PIN:OK:{pin_number}".encode())
+            else:
+                uart.mq2_notify(b"MQ2:ERROR:Pin configuration failed")
+        except Exception as e:
+            logger.error(f"Error setting MQ-2 sensor pin: {e}", "MQ2")
+            uart.mq2_notify(b"MQ2:ERROR:Invalid pin configuration")
+        return
+
+    if mq2_sensor is None:
+        logger.warning("MQ-2 gas sensor not configured", "MQ2")
+        uart.mq2_notify(b"MQ2:ERROR:Sensor not configured")
+        return
+
+    if cmd_str == "MQ2:STATUS":
+        try:
+            mq2_sensor.measure()
+            _mq2_notify_cached()
+        except Exception as e:
+            logger.error(f"Error measuring MQ-2 gas sensor: {e}", "MQ2")
+            uart.mq2_notify(b"MQ2:ERROR:Measurement failed")
+
+    elif cmd_str == "MQ2:WARMUP":
+        remaining_s = (mq2_sensor.warmup_remaining_ms() + 999) // 1000
+        uart.mq2_notify(f"MQ2:WARMUP:{remaining_s}".encode())
+
+    elif cmd_str.startswith("MQ2:STREAM:"):
+        try:
+            parts = cmd_str.split(":")
+            if parts[2] == "ON":
+                interval = int(parts[3]) if len(parts) > 3 else 1000
+                mq2_stream_interval = max(interval, 200)
+                mq2_sensor.set_period(mq2_stream_interval)
+                mq2_streaming = True
+                uart.mq2_notify(f"MQ2:STREAM:ON:{mq2_stream_interval}".encode())
+            elif parts[2] == "OFF":
+                mq2_streaming = False
+                uart.mq2_notify(b"MQ2:STREAM:OFF")
+            else:
+                uart.mq2_notify(b"MQ2:ERROR:Invalid stream command")
+        except Exception as e:
+            logger.error(f"Error setting MQ-2 stream: {e}", "MQ2")
+            uart.mq2_notify(b"MQ2:ERROR:Invalid stream command")
+
+    elif cmd_str == "MQ2:CALIBRATE":
+        if not mq2_sensor.is_warmed_up():
+            uart.mq2_notify(b"MQ2:ERROR:Warming up")
+            return
+        try:
+            ro = mq2_sensor.calibrate_ro()
+            uart.mq2_notify(f"MQ2:CALIBRATE:OK:{ro:.2f}".encode())
+        except Exception as e:
+            logger.error(f"Error calibrating MQ-2 gas sensor: {e}", "MQ2")
+            uart.mq2_notify(b"MQ2:ERROR:Calibration failed")
+
+    else:
+        logger.warning(f"Unknown MQ2 command: {cmd_str}", "MQ2")
+        uart.mq2_notify(b"MQ2:ERROR:Unknown command")
+
+
+# ---------------------------
+# EZMaker 오실로스코프 캡처 (SCOPE, A0~A4)
+# ---------------------------
+_SCOPE_STATE_NAMES = ("IDLE", "PREFILL", "WAIT_TRIG", "POST", "DONE")
+
+
+def ez_scope_handler(conn_handle, cmd_str):
+    """
+    A0~A4 아날로그 포트(GPIO 2/1/3/20/19) 다채널 파형 캡처 명령어 처리:
+    - SCOPE:CH:핀[,핀...]: 캡처 채널 설정 (1~5개, 예: SCOPE:CH:2,1)
+    - SCOPE:RATE:Hz: 채널당 샘플링 주파수 (최대 5000Hz, 채널 수 x Hz <= 10000)
+    - SCOPE:SAMPLES:n: 채널당 캡처 샘플 수 (최대 4000 / 채널 수)
+    - SCOPE:TRIG:OFF: 트리거 없이 즉시 캡처
+    - SCOPE:TRIG:레벨,RISE|FALL[,프리트리거[,채널인덱스[,타임아웃ms]]]: 레벨 트리거 (레벨은 12비트 0~4095)
+    - SCOPE:START: 캡처 시작 → SCOPE:ARMED:채널수,Hz,샘플수
+      완료 시 SCOPE:BEGIN:채널수,Hz,샘플수,트리거위치 → 바이너리 청크(uint16 LE 인터리브) → SCOPE:END:청크수
+    - SCOPE:STOP: 캡처/전송 중지
+    - SCOPE:STATUS: SCOPE:STATE:상태,CH=핀/핀,RATE=Hz,SAMPLES=n,ACTUAL=Hz
+      (ACTUAL: 진행 중/마지막 캡처에서 콜백 시각으로 잰 실제 주파수, 설정보다 낮으면 캡처가 밀린 것)
+    """
+    global ez_scope
+
+    logger.debug(f"Received command: {cmd_str}", "SCOPE")
+    cmd_str = (cmd_str or "").strip().upper()
+
+    try:
+        if ez_scope is None:
+            ez_scope = ScopeCapture()
+    except Exception as e:
+        logger.error(f"Failed to create scope capture: {e}", "SCOPE")
+        uart.ez_scope_notify(b"SCOPE:ERROR:Init failed")
+        return
+
+    if cmd_str.startswith("SCOPE:CH:"):
+        try:
+            pins = [int(p) for p in cmd_str.split(":")[2].split(",")]
+            ez_scope.configure(pins=pins)
+            uart.ez_scope_notify(("SCOPE:CH:OK:" + ",".join(str(p) for p in ez_scope.pins)).encode())
+        except Exception as e:
+            logger.error(f"Error setting scope channels: {e}", "SCOPE")
+            uart.ez_scope_notify(b"SCOPE:ERROR:Invalid channels")
+
+    elif cmd_str.startswith("SCOPE:RATE:"):
+        try:
+            ez_scope.configure(rate_hz=int(cmd_str.split(":")[2]))
+            uart.ez_scope_notify(f"SCOPE:RATE:OK:{ez_scope.rate_hz}".encode())
+        except Exception as e:
+            logger.error(f"Error setting scope rate: {e}", "SCOPE")
+            uart.ez_scope_notify(b"SCOPE:ERROR:Invalid rate")
+
+    elif cmd_str.startswith("SCOPE:SAMPLES:"):
+        try:
+            ez_scope.configure(frames=int(cmd_str.split(":")[2]))
+            uart.ez_scope_notify(f"SCOPE:SAMPLES:OK:{ez_scope.frames}".encode())
+        except Exception as e:
+            logger.error(f"Error setting scope samples: {e}", "SCOPE")
+            uart.ez_scope_notify(b"SCOPE:ERROR:Invalid samples")
+
+    elif cmd_str.startswith("SCOPE:TRIG:"):
+        try:
+            arg = cmd_str.split(":")[2]
+            if arg == "OFF":
+                ez_scope.set_trigger(level=None)
+                uart.ez_scope_notify(b"SCOPE:TRIG:OK:OFF")
+            else:
+                parts = arg.split(",")
+                level = int(parts[0])
+                if len(parts) > 1 and parts[1] == "FALL":
+                    edge = ScopeCapture.EDGE_FALL
+                elif len(parts) > 1 and parts[1] not in ("RISE", ""):
+                    raise ValueError("edge must be RISE or FALL")
+                else:
+                    edge = ScopeCapture.EDGE_RISE
+                pre = int(parts[2]) if len(parts) > 2 else 0
+                channel = int(parts[3]) if len(parts) > 3 else 0
+                timeout = int(parts[4]) if len(parts) > 4 else 2000
+                ez_scope.set_trigger(level, edge, pre, channel, timeout)
+                edge_name = "FALL" if edge == ScopeCapture.EDGE_FALL else "RISE"
+                uart.ez_scope_notify(
+                    f"SCOPE:TRIG:OK:{ez_scope.trigger_level},{edge_name},{ez_scope.pretrigger}".encode()
+                )
+        except Exception as e:
+            logger.error(f"Error setting scope trigger: {e}", "SCOPE")
+            uart.ez_scope_notify(b"SCOPE:ERROR:Invalid trigger")
+
+    elif cmd_str == "SCOPE:START":
+        try:
+            if not ez_scope.pins:
+                uart.ez_scope_notify(b"SCOPE:ERROR:Channels not configured")
+                return
+            ez_scope.start()
+            uart.ez_scope_notify(
+                f"SCOPE:ARMED:{len(ez_scope.pins)},{ez_scope.rate_hz},{ez_scope.frames}".encode()
+            )
+        except Exception as e:
+            logger.error(f"Error starting scope capture: {e}", "SCOPE")
+            uart.ez_scope_notify(b"SCOPE:ERROR:Start failed")
+
+    elif cmd_str == "SCOPE:STOP":
+        ez_scope.stop()
+        uart.ez_scope_notify(b"SCOPE:STOP:OK")
+
+    elif cmd_str == "SCOPE:STATUS":
+        pins = "/".join(str(p) for p in ez_scope.pins)
+        state = _SCOPE_STATE_NAMES[ez_scope.state]
+        actual = ez_scope.actual_rate_hz or ez_scope.measured_rate_hz()
+        uart.ez_scope_notify(
+            f"SCOPE:STATE:{state},CH={pins},RATE={ez_scope.rate_hz},SAMPLES={ez_scope.frames},ACTUAL={actual}".encode()
+        )
+
+    else:
+        logger.warning(f"Unknown SCOPE command: {cmd_str}", "SCOPE")
+        uart.ez_scope_notify(b"SCOPE:ERROR:Unknown command")
+
 # ---------------------------
 # 12) DC 모터
 # ---------------------------
 
+def _dcmotor_state_notify(prefix="MOTOR:STATE"):
+    """현재 속도,목표 속도,가속도(%/s),PWM 주파수 알림"""
+    r = dcmotor_ramp
+    uart.dcmotor_notify(f"{prefix}:{r.speed()},{r.target_speed()},{r.accel},{r.freq}".encode())
+
 def dcmotor_handler(conn_handle, cmd_str):
     """
     DC 모터 명령어 처리 (단방향):
     - MOTOR:PIN:핀번호 - DC 모터 핀 설정 (PWM 속도 제어)
-    - MOTOR:SPEED:속도 - 모터 구동 (속도: 0-100)
-    - MOTOR:STOP - 모터 정지
+    - MOTOR:SPEED:속도 - 목표 속도(0-100)까지 가감속, 도착 시 MOTOR:RAMP:DONE:속도
+    - MOTOR:STOP - 가감속으로 정지
+    - MOTOR:ESTOP - 비상 정지 (램프 없이 즉시 0)
+    - MOTOR:ACCEL:%/s - 가속도 설정 (0 이면 램프 없이 즉시)
+    - MOTOR:FREQ:Hz - PWM 주파수 설정 (10~40000)
+    - MOTOR:STATE - MOTOR:STATE:현재속도,목표속도,가속도,주파수
     """
-    global dcmotor_pin, dcmotor_pwm
+    global dcmotor_freq, dcmotor_accel
     
     logger.debug(f"Received command: {cmd_str}", "MOTOR")
     
@@ -4255,15 +5321,62 @@ def dcmotor_handler(conn_handle, cmd_str):
         except Exception as e:
             logger.error(f"Error setting DC motor pin: {e}", "MOTOR")
             uart.dcmotor_notify(b"MOTOR:ERROR:Invalid pin configuration")
-    
-    # 모터 구동 명령 처리 (SPEED)
-    elif cmd_str.startswith("MOTOR:SPEED:"):
+        return
+
+    # 비상 정지: 설정 여부와 관계없이 먼저 처리
+    if cmd_str == "MOTOR:ESTOP":
+        if dcmotor_ramp is not None:
+            dcmotor_ramp.estop()
+        logger.warning("DC motor emergency stop", "MOTOR")
+        uart.dcmotor_notify(b"MOTOR:ESTOP:OK")
+        return
+
+    # 가속도 / 주파수는 핀 설정 전에도 저장해 두고 핀 설정 시 적용
+    if cmd_str.startswith("MOTOR:ACCEL:"):
+        try:
+            accel = int(cmd_str.split(":")[2])
+            if accel < 0:
+                raise ValueError("negative accel")
+            dcmotor_accel = accel
+            if dcmotor_ramp is not None:
+                dcmotor_ramp.set_accel(accel)
+            logger.info(f"DC motor accel set to {accel}%/s", "MOTOR")
+            uart.dcmotor_notify(f"MOTOR:ACCEL:OK:{accel}".encode())
+        except Exception as e:
+            logger.error(f"Invalid DC motor accel: {e}", "MOTOR")
+            uart.dcmotor_notify(b"MOTOR:ERROR:Invalid accel")
+        return
+
+    if cmd_str.startswith("MOTOR:FREQ:"):
+        try:
+            freq = int(cmd_str.split(":")[2])
+            if not MotorRamp.FREQ_MIN <= freq <= MotorRamp.FREQ_MAX:
+                raise ValueError("freq out of range")
+            if dcmotor_ramp is not None:
+                dcmotor_ramp.set_freq(freq)
+            dcmotor_freq = freq
+            logger.info(f"DC motor PWM frequency set to {freq}Hz", "MOTOR")
+            uart.dcmotor_notify(f"MOTOR:FREQ:OK:{freq}".encode())
+        except Exception as e:
+            logger.error(f"Invalid DC motor frequency: {e}", "MOTOR")
+            uart.dcmotor_notify(b"MOTOR:ERROR:Invalid frequency")
+        return
+
+    # 역방향 명령 처리 - 지원하지 않음
+    if cmd_str.startswith("MOTOR:REV:"):
+        logger.warning("Reverse direction not supported for this motor", "MOTOR")
+        uart.dcmotor_notify(b"MOTOR:ERROR:Reverse direction not supported")
+        return
+
+    if cmd_str.startswith("MOTOR:SPEED:") or cmd_str in ("MOTOR:STOP", "MOTOR:STATE"):
         # DC 모터가 설정되지 않은 경우
-        if dcmotor_pwm is None:
+        if dcmotor_ramp is None:
             logger.warning("DC motor not configured", "MOTOR")
             uart.dcmotor_notify(b"MOTOR:ERROR:Motor not configured")
             return
-            
+
+    # 모터 구동 명령 처리 (SPEED)
+    if cmd_str.startswith("MOTOR:SPEED:"):
         try:
             # 속도 파싱 (0-100)
             speed = int(cmd_str.split(":")[2])
@@ -4271,38 +5384,30 @@ def dcmotor_handler(conn_handle, cmd_str):
                 speed = 0
             elif speed > 100:
                 speed = 100
-                
-            # PWM으로 속도 설정 (0-1023 스케일로 변환)
-            duty = int(speed * 10.23)  # 0-100을 0-1023으로 변환
-            dcmotor_pwm.duty(duty)
             
-            logger.info(f"DC motor running at {speed}% speed", "MOTOR")
+            reached = dcmotor_ramp.set_target(speed)
+            logger.info(f"DC motor target speed {speed}% (accel {dcmotor_ramp.accel}%/s)", "MOTOR")
             uart.dcmotor_notify(f"MOTOR:SPEED:OK:{speed}".encode())
+            if reached:
+                uart.dcmotor_notify(f"MOTOR:RAMP:DONE:{speed}".encode())
         except Exception as e:
             logger.error(f"Error setting DC motor speed: {e}", "MOTOR")
             uart.dcmotor_notify(b"MOTOR:ERROR:Speed setting failed")
     
     elif cmd_str == "MOTOR:STOP":
-        # DC 모터가 설정되지 않은 경우
-        if dcmotor_pwm is None:
-            logger.warning("DC motor not configured", "MOTOR")
-            uart.dcmotor_notify(b"MOTOR:ERROR:Motor not configured")
-            return
-            
         try:
-            # 모터 정지 (PWM 0)
-            dcmotor_pwm.duty(0)
+            # 가감속으로 정지 (즉시 정지는 MOTOR:ESTOP)
+            if dcmotor_ramp.set_target(0):
+                uart.dcmotor_notify(b"MOTOR:RAMP:DONE:0")
             
-            logger.info("DC motor stopped", "MOTOR")
+            logger.info("DC motor stopping", "MOTOR")
             uart.dcmotor_notify(b"MOTOR:STOP:OK")
         except Exception as e:
             logger.error(f"Error stopping DC motor: {e}", "MOTOR")
             uart.dcmotor_notify(b"MOTOR:ERROR:Stop failed")
-    
-    # 역방향 명령 처리 - 지원하지 않음
-    elif cmd_str.startswith("MOTOR:REV:"):
-        logger.warning("Reverse direction not supported for this motor", "MOTOR")
-        uart.dcmotor_notify(b"MOTOR:ERROR:Reverse direction not supported")
+
+    elif cmd_str == "MOTOR:STATE":
+        _dcmotor_state_notify()
             
     else:
         logger.warning(f"Unknown DC motor command: {cmd_str}", "MOTOR")
@@ -4493,6 +5598,8 @@ uart.set_ez_light_handler(ez_light_handler)  # EZMaker 밝기센서(EZLIGHT) 핸
 uart.set_ez_weight_handler(ez_weight_handler)  # EZMaker 무게센서(EZWEIGHT) 핸들러 등록
 uart.set_ez_sound_handler(ez_sound_handler)  # EZMaker 소리센서(EZSOUND) 핸들러 등록
 uart.set_ez_dust_handler(ez_dust_handler)  # EZMaker 미세먼지 센서(EZDUST, PMS7003M) 핸들러 등록
+uart.set_ez_scope_handler(ez_scope_handler)  # EZMaker 오실로스코프 캡처(SCOPE) 핸들러 등록
+uart.set_mq2_handler(mq2_handler)  # MQ-2 가연성 가스센서 핸들러 등록
 uart.set_ez_volt_handler(ez_volt_handler)    # EZMaker 전압센서(EZVOLT) 핸들러 등록
 uart.set_ez_curr_handler(ez_curr_handler)    # EZMaker 전류센서(EZCURR, INA219) 핸들러 등록
 uart.set_ez_thermal_handler(ez_thermal_handler)  # EZMaker 수중/접촉 온도센서(EZTHERMAL, DS18B20) 핸들러 등록
@@ -4555,8 +5662,9 @@ def cleanup_resources():
     
     # DC 모터 정지 및 리소스 정리
     try:
+        if dcmotor_ramp:
+            dcmotor_ramp.estop()  # 모터 즉시 정지
         if dcmotor_pwm:
-            dcmotor_pwm.duty(0)  # 모터 정지
             dcmotor_pwm.deinit()  # PWM 리소스 해제
     except Exception as e:
         logger.warning(f"Error cleaning up DC motor resources: {e}", "MOTOR")
@@ -4587,6 +5695,156 @@ try:
                 _ensure_camera_worker()
             _camera_tx_pump()
         
+        # EZDUST(PMS7003M) UART 수신 처리: 버퍼에 쌓인 프레임을 해석해 캐시 갱신
+        if ez_dust_sensor is not None:
+            current_time = time.ticks_ms()
+            if time.ticks_diff(current_time, last_ez_dust_poll) >= ez_dust_poll_interval:
+                try:
+                    ez_dust_sensor.poll()
+                except Exception as e:
+                    logger.error(f"Error polling EZDUST sensor: {e}", "EZDUST")
+                last_ez_dust_poll = current_time
+
+        # EZWEIGHT(HX711) 수집: 변환 완료(DOUT LOW) 시에만 1회 읽어 필터 갱신
+        if ez_weight_sensor is not None:
+            current_time = time.ticks_ms()
+            if time.ticks_diff(current_time, last_ez_weight_poll) >= ez_weight_poll_interval:
+                try:
+                    ez_weight_sensor.update()
+                except Exception as e:
+                    logger.error(f"Error sampling EZ-Weight sensor: {e}", "EZWEIGHT")
+                last_ez_weight_poll = current_time
+
+        # EZCO2(SCD40) 측정값 캐시: 측정 주기마다 data-ready 를 1회 확인
+        if ez_co2_sensor is not None:
+            try:
+                if ez_co2_sensor.update() and ez_co2_status_pending and uart and ble_connected:
+                    ez_co2_status_pending = False
+                    _ez_co2_notify_cached()
+                if ez_co2_sensor.mode != EZ_CO2_MODE and EZ_CO2_MODE == SCD40.MODE_SINGLE_SHOT:
+                    # 단발 측정 결과가 나오지 않아 센서가 주기 모드로 전환함 (SCD40)
+                    EZ_CO2_MODE = ez_co2_sensor.mode
+                    logger.warning("EZ-CO2 single-shot unsupported, switched to PERIODIC", "CO2")
+                    if uart and ble_connected:
+                        uart.ez_co2_notify(b"EZCO2:MODE:ERROR:SINGLE_UNSUPPORTED")
+            except Exception as e:
+                logger.error(f"Error updating EZ-CO2 sensor: {e}", "CO2")
+            if ez_co2_status_pending and time.ticks_diff(time.ticks_ms(), ez_co2_status_deadline) >= 0:
+                # 센서 분리/오류로 측정값이 오지 않음: 대기 중인 EZCO2:STATUS 에 오류로 응답
+                ez_co2_status_pending = False
+                logger.warning("EZ-CO2 measurement timed out", "CO2")
+                if uart and ble_connected:
+                    uart.ez_co2_notify(b"EZCO2:ERROR:Measurement timeout")
+
+        # EZCURR(INA219) 에너지 적산: 변환 완료 시에만 읽어 mAh/mWh 누적
+        if ez_curr_sensor is not None:
+            current_time = time.ticks_ms()
+            if time.ticks_diff(current_time, last_ez_curr_poll) >= ez_curr_poll_interval:
+                try:
+                    ez_curr_sensor.update()
+                except Exception as e:
+                    logger.error(f"Error updating EZ-Curr sensor: {e}", "CURR")
+                last_ez_curr_poll = current_time
+
+        # 초음파 센서: IRQ로 기록된 에코 처리, 연속 모드 트리거
+        if ultraSensor is not None:
+            try:
+                if ultraSensor.poll() and uart and ble_connected:
+                    if ultra_status_pending:
+                        ultra_status_pending = False
+                        _ultra_notify_distance()
+                    elif ultra_streaming:
+                        _ultra_notify_distance()
+            except Exception as e:
+                logger.error(f"Error polling ultrasonic sensor: {e}", "ULTRA")
+
+        # DHT 온습도: 주기마다 최대 1회 측정해 캐시 (실패 시 백오프 재시도)
+        if dht_service is not None:
+            try:
+                if dht_service.update() and dht_status_pending and uart and ble_connected:
+                    dht_status_pending = False
+                    _dht_notify_cached()
+                elif dht_status_pending and dht_service.consecutive_errors >= DHT_STATUS_MAX_ERRORS:
+                    # 센서 분리/고장: 대기 중인 DHT:STATUS 에 오류로 응답
+                    dht_status_pending = False
+                    if uart and ble_connected:
+                        uart.dht_notify(b"DHT:ERROR:Measurement failed")
+            except Exception as e:
+                logger.error(f"Error updating DHT sensor: {e}", "DHT")
+
+        # EZSOUND 레벨미터: 타이머가 채운 창마다 RMS/p2p/dB 계산, 단발/주기 알림
+        if ez_sound_sensor is not None and ez_sound_sensor.level_active:
+            try:
+                if ez_sound_sensor.update_level() and ez_sound_level_pending and uart and ble_connected:
+                    ez_sound_level_pending = False
+                    _ez_sound_notify_level()
+                    if not ez_sound_streaming:
+                        ez_sound_sensor.stop_level()
+                if ez_sound_streaming and uart and ble_connected:
+                    current_time = time.ticks_ms()
+                    if time.ticks_diff(current_time, last_ez_sound_stream) >= ez_sound_stream_interval:
+                        _ez_sound_notify_level()
+                        last_ez_sound_stream = current_time
+            except Exception as e:
+                logger.error(f"Error updating EZ-Sound level: {e}", "EZSOUND")
+
+        # 오실로스코프 캡처: 트리거 타임아웃/완료 처리, 완료된 캡처를 청크 몇 개씩 전송
+        if ez_scope is not None and ez_scope.state != ScopeCapture.IDLE:
+            try:
+                ez_scope.update()
+                if uart and ble_connected:
+                    ez_scope.pump(uart.ez_scope_notify)
+            except Exception as e:
+                # 전송 실패(ENOMEM 등)는 다음 루프에서 같은 위치부터 재시도
+                logger.error(f"Error processing scope capture: {e}", "SCOPE")
+
+        # LED 깜빡임 (저주파 PWM 으로 만들 수 없는 간격만 메인 루프에서 전환)
+        if led_blinker is not None and led_blinker.mode == LedBlinker.SOFT:
+            led_blinker.update()
+
+        # NeoPixel 효과: 프레임 시각이 되면 LUT 로 buf 를 채워 write()
+        if neo_fx is not None and neo_fx.active:
+            try:
+                neo_fx.update()
+            except Exception as e:
+                logger.error(f"Error updating NeoPixel effect: {e}", "NEO")
+                neo_fx.stop(clear=False)
+
+        # DC 모터 램프: 20ms 마다 가속도만큼 듀티 이동, 목표 도착 시 MOTOR:RAMP:DONE 알림
+        if dcmotor_ramp is not None and dcmotor_ramp.ramping:
+            try:
+                if dcmotor_ramp.update() and uart and ble_connected:
+                    uart.dcmotor_notify(f"MOTOR:RAMP:DONE:{dcmotor_ramp.speed()}".encode())
+            except Exception as e:
+                logger.error(f"Error updating DC motor ramp: {e}", "MOTOR")
+                dcmotor_ramp.estop()
+
+        # 서보 부드러운 이동: 20ms(50Hz) 마다 보간 각도 출력, 도착 시 SERVO:DONE 알림
+        if servo_motion.busy():
+            try:
+                _servo_motion_update()
+            except Exception as e:
+                logger.error(f"Error updating servo motion: {e}", "SERVO")
+                servo_motion.stop()
+
+        # LCD 위젯: 마퀴 스크롤/바인딩 필드 갱신 (BLE 전송 없이 보드에서 직접 출력)
+        if lcd_widgets is not None and lcd_widgets.active():
+            try:
+                lcd_widgets.update()
+            except Exception as e:
+                logger.error(f"Error updating LCD widgets: {e}", "LCD")
+
+        # MQ-2 가스센서: 예열 완료 1회 알림, 스트리밍 중 주기 측정(5종 ppm 일괄 계산) + 알림
+        if mq2_sensor is not None and uart and ble_connected:
+            try:
+                if not mq2_warmup_notified and mq2_sensor.is_warmed_up():
+                    mq2_warmup_notified = True
+                    uart.mq2_notify(b"MQ2:WARMUP:DONE")
+                if mq2_streaming and mq2_sensor.update():
+                    _mq2_notify_cached()
+            except Exception as e:
+                logger.error(f"Error updating MQ-2 gas sensor: {e}", "MQ2")
+
         # 심장박동 센서 처리
         if heart_rate_streaming and heart_rate_enabled and heart_rate_sensor and heart_rate_monitor and uart and ble_connected:
             current_time = time.ticks_ms()
@@ -9,6 +9,10 @@ BMP280 기압 센서 MicroPython 드라이버 라이브러리
 - 온도 측정 (0~65°C)
 - I2C 통신
 - 내부 보정 데이터 자동 로드
+- 오버샘플링/IIR 필터 프로파일 (ULTRA_LOW_POWER ~ ULTRA_HIGH_RES)
+- Normal 모드(연속 측정) / Forced 모드(요청 시 1회 측정, 상태 레지스터 폴링)
+- 데이터시트 정수 보정식 (온도 32비트, 기압 64비트)
+- 해수면 기압 기준 고도 계산
 
 사용 예:
     from machine import Pin, SoftI2C
@@ -21,6 +25,11 @@ BMP280 기압 센서 MicroPython 드라이버 라이브러리
     print(f"Temperature: {temp:.2f} C")
     print(f"Pressure: {press/100:.2f} hPa")
 
+    # 저전력 단발 측정 + 고도
+    sensor = BMP280(i2c, profile=BMP280.PROFILE_ULTRA_LOW_POWER, mode=BMP280.MODE_FORCED)
+    sensor.set_sea_level(102000)
+    print(f"Altitude: {sensor.read_altitude():.1f} m")
+
 연결:
 - SCL (D5) -> GPIO 40
 - SDA (D6) -> GPIO 41
@@ -34,31 +43,80 @@ from machine import SoftI2C
 import time
 import ustruct
 
+# 레지스터
+_REG_CALIB = 0x88
+_REG_STATUS = 0xF3
+_REG_CTRL_MEAS = 0xF4
+_REG_CONFIG = 0xF5
+_REG_DATA = 0xF7
+
+_STATUS_MEASURING = 0x08
+
+# 표준 대기 해수면 기압(Pa)
+SEA_LEVEL_PA = 101325.0
+
+
 class BMP280:
     """BMP280 기압 센서 드라이버"""
+
+    # 측정 모드 (ctrl_meas[1:0])
+    MODE_SLEEP = 0
+    MODE_FORCED = 1
+    MODE_NORMAL = 3
+
+    # 프로파일 이름
+    PROFILE_ULTRA_LOW_POWER = "ULTRA_LOW_POWER"
+    PROFILE_LOW_POWER = "LOW_POWER"
+    PROFILE_STANDARD = "STANDARD"
+    PROFILE_HIGH_RES = "HIGH_RES"
+    PROFILE_ULTRA_HIGH_RES = "ULTRA_HIGH_RES"
+
+    # 프로파일: (osrs_p, osrs_t, filter) 레지스터 코드, 최대 측정시간(ms)
+    # - osrs 코드: 1=x1, 2=x2, 3=x4, 4=x8, 5=x16
+    # - filter 코드: 0=off, 1=2, 2=4, 3=8, 4=16
+    # 데이터시트 Table 4/7 기준
+    _PROFILES = {
+        "ULTRA_LOW_POWER": (1, 1, 0, 7),    # 2.62 Pa, x1/x1, 필터 off
+        "LOW_POWER": (2, 1, 0, 9),          # 1.31 Pa, x2/x1, 필터 off
+        "STANDARD": (3, 1, 2, 14),          # 0.66 Pa, x4/x1, 필터 4
+        "HIGH_RES": (4, 1, 2, 23),          # 0.33 Pa, x8/x1, 필터 4
+        "ULTRA_HIGH_RES": (5, 2, 4, 44),    # 0.16 Pa, x16/x2, 필터 16
+    }
+
+    # Normal 모드 대기시간 코드 (t_sb)
+    _STANDBY_CODES = {
+        0.5: 0, 62.5: 1, 125: 2, 250: 3, 500: 4, 1000: 5, 2000: 6, 4000: 7,
+    }
     
-    def __init__(self, i2c, addr=0x77):
+    def __init__(self, i2c, addr=0x77, profile="STANDARD", mode=3, standby_ms=0.5):
+        """
+        Args:
+            i2c: I2C 객체
+            addr: I2C 주소 (0x76 또는 0x77)
+            profile: 오버샘플링/필터 프로파일 이름 (PROFILE_*)
+            mode: MODE_NORMAL(연속 측정) 또는 MODE_FORCED(요청 시 1회 측정)
+            standby_ms: Normal 모드 측정 사이 대기시간(ms)
+        """
         self.i2c = i2c
         self.addr = addr
         self.t_fine = 0
+        self.sea_level_pa = SEA_LEVEL_PA
+
+        # 측정 데이터 버퍼 (F7~FC, 6바이트, 재사용)
+        self._buf = bytearray(6)
+        self._one = bytearray(1)
         
-        # Calibration data
-        self.dig_T1 = self.read_u16_le(0x88)
-        self.dig_T2 = self.read_s16_le(0x8A)
-        self.dig_T3 = self.read_s16_le(0x8C)
-        self.dig_P1 = self.read_u16_le(0x8E)
-        self.dig_P2 = self.read_s16_le(0x90)
-        self.dig_P3 = self.read_s16_le(0x92)
-        self.dig_P4 = self.read_s16_le(0x94)
-        self.dig_P5 = self.read_s16_le(0x96)
-        self.dig_P6 = self.read_s16_le(0x98)
-        self.dig_P7 = self.read_s16_le(0x9A)
-        self.dig_P8 = self.read_s16_le(0x9C)
-        self.dig_P9 = self.read_s16_le(0x9E)
+        # Calibration data (0x88~0x9F, 24바이트 한 번에 읽기)
+        calib = self.i2c.readfrom_mem(self.addr, _REG_CALIB, 24)
+        (self.dig_T1, self.dig_T2, self.dig_T3,
+         self.dig_P1, self.dig_P2, self.dig_P3, self.dig_P4, self.dig_P5,
+         self.dig_P6, self.dig_P7, self.dig_P8, self.dig_P9) = ustruct.unpack('<HhhHhhhhhhhh', calib)
         
         # Configure
-        self.write_byte(0xF4, 0x27) # Normal mode
-        self.write_byte(0xF5, 0xA0) # Standby 1000ms, Filter x4
+        self.profile = None
+        self.mode = mode
+        self.standby_ms = standby_ms
+        self.set_profile(profile, mode, standby_ms)
 
     def read_u16_le(self, reg):
         data = self.i2c.readfrom_mem(self.addr, reg, 2)
@@ -71,39 +129,143 @@ class BMP280:
     def write_byte(self, reg, val):
         self.i2c.writeto_mem(self.addr, reg, bytes([val]))
 
-    def read(self):
-        """온도와 기압 읽기"""
-        data = self.i2c.readfrom_mem(self.addr, 0xF7, 6)
-        
+    # ------------------------------------------------------------------
+    # 설정
+    # ------------------------------------------------------------------
+    def set_profile(self, profile, mode=None, standby_ms=None):
+        """
+        오버샘플링/IIR 필터 프로파일 및 측정 모드 설정
+
+        Args:
+            profile: PROFILE_* 이름
+            mode: MODE_NORMAL / MODE_FORCED (None 이면 유지)
+            standby_ms: Normal 모드 대기시간(ms) (None 이면 유지)
+        """
+        if profile not in self._PROFILES:
+            raise ValueError("Unknown BMP280 profile: {}".format(profile))
+        if mode is None:
+            mode = self.mode
+        if mode not in (self.MODE_NORMAL, self.MODE_FORCED):
+            raise ValueError("Unsupported BMP280 mode: {}".format(mode))
+        if standby_ms is None:
+            standby_ms = self.standby_ms
+        if standby_ms not in self._STANDBY_CODES:
+            raise ValueError("Unsupported standby time: {}".format(standby_ms))
+
+        osrs_p, osrs_t, filt, meas_ms = self._PROFILES[profile]
+        self.profile = profile
+        self.mode = mode
+        self.standby_ms = standby_ms
+        self._meas_ms = meas_ms
+
+        # config 레지스터는 Sleep 모드에서 써야 확실히 반영된다
+        self.write_byte(_REG_CTRL_MEAS, 0x00)
+        self.write_byte(_REG_CONFIG, (self._STANDBY_CODES[standby_ms] << 5) | (filt << 2))
+
+        # Forced 모드는 측정 요청 시마다 ctrl_meas 를 다시 쓴다
+        self._ctrl_forced = (osrs_t << 5) | (osrs_p << 2) | self.MODE_FORCED
+        if mode == self.MODE_NORMAL:
+            self.write_byte(_REG_CTRL_MEAS, (osrs_t << 5) | (osrs_p << 2) | self.MODE_NORMAL)
+
+    def set_sea_level(self, pressure_pa):
+        """고도 계산 기준 해수면 기압(Pa) 설정"""
+        self.sea_level_pa = float(pressure_pa)
+
+    def calibrate_altitude(self, altitude_m):
+        """
+        현재 위치의 알려진 고도(m)로 해수면 기압 기준을 역산해 저장
+
+        Returns:
+            float: 계산된 해수면 기압(Pa)
+        """
+        _, press = self.read()
+        self.sea_level_pa = press / ((1.0 - altitude_m / 44330.0) ** 5.255)
+        return self.sea_level_pa
+
+    # ------------------------------------------------------------------
+    # 측정
+    # ------------------------------------------------------------------
+    def _measure_forced(self, timeout_ms=100):
+        """Forced 모드 1회 측정 요청 후 완료(status.measuring=0)까지 대기"""
+        self._one[0] = self._ctrl_forced
+        self.i2c.writeto_mem(self.addr, _REG_CTRL_MEAS, self._one)
+        # 프로파일별 최대 측정시간만큼 먼저 대기한 뒤 상태 비트 확인
+        time.sleep_ms(self._meas_ms)
+        start = time.ticks_ms()
+        while True:
+            self.i2c.readfrom_mem_into(self.addr, _REG_STATUS, self._one)
+            if not (self._one[0] & _STATUS_MEASURING):
+                return
+            if time.ticks_diff(time.ticks_ms(), start) > timeout_ms:
+                raise OSError("BMP280 measurement timeout")
+            time.sleep_ms(1)
+
+    def read_raw(self):
+        """
+        보정 전 ADC 값 읽기 (F7~FC 6바이트 버스트)
+
+        Returns:
+            tuple: (raw_t, raw_p)
+        """
+        if self.mode == self.MODE_FORCED:
+            self._measure_forced()
+        data = self._buf
+        self.i2c.readfrom_mem_into(self.addr, _REG_DATA, data)
         raw_p = (data[0] << 12) | (data[1] << 4) | (data[2] >> 4)
         raw_t = (data[3] << 12) | (data[4] << 4) | (data[5] >> 4)
-        
-        # Calculate Temperature
+        return raw_t, raw_p
+
+    def _compensate_t(self, raw_t):
+        """온도 보정 (데이터시트 32비트 정수식), 0.01°C 단위 정수 반환"""
         var1 = (((raw_t >> 3) - (self.dig_T1 << 1)) * self.dig_T2) >> 11
         var2 = (((((raw_t >> 4) - self.dig_T1) * ((raw_t >> 4) - self.dig_T1)) >> 12) * self.dig_T3) >> 14
         self.t_fine = var1 + var2
-        temp = (self.t_fine * 5 + 128) >> 8
-        
-        # Calculate Pressure
-        var1 = (self.t_fine >> 1) - 64000
-        var2 = (((var1 >> 2) * (var1 >> 2)) >> 11) * self.dig_P6
-        var2 = var2 + ((var1 * self.dig_P5) << 1)
-        var2 = (var2 >> 2) + (self.dig_P4 << 16)
-        var1 = (((self.dig_P3 * (((var1 >> 2) * (var1 >> 2)) >> 13)) >> 3) + ((self.dig_P2 * var1) >> 1)) >> 18
-        var1 = ((var1 + 32768) * self.dig_P1) >> 15
-        
+        return (self.t_fine * 5 + 128) >> 8
+
+    def _compensate_p(self, raw_p):
+        """
+        기압 보정 (데이터시트 64비트 정수식), Q24.8 형식(Pa*256) 정수 반환
+        t_fine 은 _compensate_t 에서 먼저 계산되어 있어야 한다.
+        """
+        var1 = self.t_fine - 128000
+        var2 = var1 * var1 * self.dig_P6
+        var2 = var2 + ((var1 * self.dig_P5) << 17)
+        var2 = var2 + (self.dig_P4 << 35)
+        var1 = ((var1 * var1 * self.dig_P3) >> 8) + ((var1 * self.dig_P2) << 12)
+        var1 = (((1 << 47) + var1) * self.dig_P1) >> 33
+
         if var1 == 0:
-            return temp / 100.0, 0
-            
-        p = ((1048576 - raw_p) - (var2 >> 12)) * 3125
-        if p < 0x80000000:
-            p = (p << 1) // var1
-        else:
-            p = (p // var1) * 2
-            
-        var1 = (self.dig_P9 * (((p >> 3) * (p >> 3)) >> 13)) >> 12
-        var2 = (((p >> 2)) * self.dig_P8) >> 13
-        p = p + ((var1 + var2 + self.dig_P7) >> 4)
-        
-        return temp / 100.0, p / 256.0  # Temp in C, Pressure in Pa
+            return 0  # 0 나누기 방지
+
+        p = 1048576 - raw_p
+        p = (((p << 31) - var2) * 3125) // var1
+        var1 = (self.dig_P9 * (p >> 13) * (p >> 13)) >> 25
+        var2 = (self.dig_P8 * p) >> 19
+        return ((p + var1 + var2) >> 8) + (self.dig_P7 << 4)
+
+    def read_int(self):
+        """
+        온도와 기압을 정수로 읽기 (부동소수점 연산 없음)
+
+        Returns:
+            tuple: (temp_centi_c, pressure_q24_8) — 0.01°C 단위, Pa*256
+        """
+        raw_t, raw_p = self.read_raw()
+        temp = self._compensate_t(raw_t)
+        return temp, self._compensate_p(raw_p)
+
+    def read(self):
+        """온도와 기압 읽기"""
+        temp, press = self.read_int()
+        return temp / 100.0, press / 256.0  # Temp in C, Pressure in Pa
+
+    def altitude(self, pressure_pa):
+        """기압(Pa)으로부터 캐시된 해수면 기준 고도(m) 계산"""
+        if pressure_pa <= 0:
+            return 0.0
+        return 44330.0 * (1.0 - (pressure_pa / self.sea_level_pa) ** 0.1902949)
 
+    def read_altitude(self):
+        """현재 고도(m) 읽기"""
+        _, press = self.read()
+        return self.altitude(press)
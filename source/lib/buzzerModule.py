@@ -1,9 +1,10 @@
 # buzzerModule.py
 # 버저 제어를 위한 간단한 라이브러리
+# 멜로디/비동기 비프는 스레드 대신 하드웨어 타이머(one-shot) 시퀀서로 재생한다.
 
 import machine
 import time
-import _thread
+import array
 
 # 음표 주파수 (3옥타브 ~ 5옥타브)
 # 3옥타브 (낮은 옥타브)
@@ -49,38 +50,98 @@ NOTE_AS5 = 932
 NOTE_B5 = 988
 
 # 미리 정의된 멜로디
-MELODY_TWINKLE_TWINKLE = [
-    (NOTE_C4, '4'), (NOTE_C4, '4'), (NOTE_G4, '4'), (NOTE_G4, '4'),
-    (NOTE_A4, '4'), (NOTE_A4, '4'), (NOTE_G4, '2'),
-    (NOTE_F4, '4'), (NOTE_F4, '4'), (NOTE_E4, '4'), (NOTE_E4, '4'),
-    (NOTE_D4, '4'), (NOTE_D4, '4'), (NOTE_C4, '2')
-]
-
-MELODY_FUR_ELISE = [
-    (NOTE_E5, '8'), (NOTE_DS5, '8'), (NOTE_E5, '8'), (NOTE_DS5, '8'),
-    (NOTE_E5, '8'), (NOTE_B4, '8'), (NOTE_D5, '8'), (NOTE_C5, '8'),
-    (NOTE_A4, '4'), (0, '8'), (NOTE_C4, '8'), (NOTE_E4, '8'), (NOTE_A4, '8'),
-    (NOTE_B4, '4'), (0, '8'), (NOTE_E4, '8'), (NOTE_GS4, '8'), (NOTE_B4, '8'),
-    (NOTE_C5, '4')
-]
+# array('H') 에 [주파수, 음표 길이, 주파수, 음표 길이, ...] 로 저장 (0 = 쉼표)
+# 음표 길이: 1=온음표, 2=2분, 4=4분, 8=8분, 16=16분, 32=32분 음표
+MELODY_TWINKLE_TWINKLE = array.array('H', (
+    NOTE_C4, 4, NOTE_C4, 4, NOTE_G4, 4, NOTE_G4, 4,
+    NOTE_A4, 4, NOTE_A4, 4, NOTE_G4, 2,
+    NOTE_F4, 4, NOTE_F4, 4, NOTE_E4, 4, NOTE_E4, 4,
+    NOTE_D4, 4, NOTE_D4, 4, NOTE_C4, 2,
+))
+
+MELODY_FUR_ELISE = array.array('H', (
+    NOTE_E5, 8, NOTE_DS5, 8, NOTE_E5, 8, NOTE_DS5, 8,
+    NOTE_E5, 8, NOTE_B4, 8, NOTE_D5, 8, NOTE_C5, 8,
+    NOTE_A4, 4, 0, 8, NOTE_C4, 8, NOTE_E4, 8, NOTE_A4, 8,
+    NOTE_B4, 4, 0, 8, NOTE_E4, 8, NOTE_GS4, 8, NOTE_B4, 8,
+    NOTE_C5, 4,
+))
 
 # 멜로디: 학교종이 땡땡땡
-MELODY_SCHOOL_BELL = [
-    (NOTE_G4, '4'), (NOTE_G4, '4'), (NOTE_A4, '4'), (NOTE_A4, '4'),
-    (NOTE_G4, '4'), (NOTE_G4, '4'), (NOTE_E4, '2'),
-    (NOTE_G4, '4'), (NOTE_G4, '4'), (NOTE_E4, '4'), (NOTE_E4, '4'),
-    (NOTE_D4, '2'), (0, '2')
-]
+MELODY_SCHOOL_BELL = array.array('H', (
+    NOTE_G4, 4, NOTE_G4, 4, NOTE_A4, 4, NOTE_A4, 4,
+    NOTE_G4, 4, NOTE_G4, 4, NOTE_E4, 2,
+    NOTE_G4, 4, NOTE_G4, 4, NOTE_E4, 4, NOTE_E4, 4,
+    NOTE_D4, 2, 0, 2,
+))
 
 # 간단한 효과음
-SOUND_BEEP = [(NOTE_C5, '8')]
-SOUND_SUCCESS = [(NOTE_C4, '8'), (NOTE_E4, '8'), (NOTE_G4, '4')]
-SOUND_ERROR = [(NOTE_A4, '8'), (NOTE_E4, '8'), (NOTE_A3, '4')]
-SOUND_ALERT = [(NOTE_A4, '16'), (NOTE_A4, '16'), (NOTE_A4, '8')]
+SOUND_BEEP = array.array('H', (NOTE_C5, 8))
+SOUND_SUCCESS = array.array('H', (NOTE_C4, 8, NOTE_E4, 8, NOTE_G4, 4))
+SOUND_ERROR = array.array('H', (NOTE_A4, 8, NOTE_E4, 8, NOTE_A3, 4))
+SOUND_ALERT = array.array('H', (NOTE_A4, 16, NOTE_A4, 16, NOTE_A4, 8))
+
+# BUZ:PLAY 이름 → 멜로디
+MELODIES = {
+    "TWINKLE": MELODY_TWINKLE_TWINKLE,
+    "FUR_ELISE": MELODY_FUR_ELISE,
+    "SCHOOL_BELL": MELODY_SCHOOL_BELL,
+    "BEEP": SOUND_BEEP,
+    "SUCCESS": SOUND_SUCCESS,
+    "ERROR": SOUND_ERROR,
+    "ALERT": SOUND_ALERT,
+}
+
+# 템포별 음표 길이(ms) 표 캐시: 템포 → array('H') (인덱스 = 음표 길이 1~32)
+_duration_tables = {}
+_DURATION_CACHE_MAX = 8
+# 템포 범위: 4 미만이면 온음표(240000 // tempo ms)가 array('H') 범위(65535)를 넘는다.
+# 상한 600 은 실용 한계 (32분 음표 12ms 로, 음표 사이 NOTE_GAP_MS 무음과 비슷해져 음으로 들리지 않음).
+TEMPO_MIN = 4
+TEMPO_MAX = 600
+
+def clamp_tempo(tempo):
+    """템포를 TEMPO_MIN~TEMPO_MAX 로 제한 (0 이하는 기본 120)"""
+    if tempo <= 0:
+        return 120
+    return max(TEMPO_MIN, min(TEMPO_MAX, tempo))
+
+def duration_table(tempo):
+    """
+    템포의 음표 길이 표 (처음 한 번만 계산, 이후 캐시 재사용)
+
+    table[n] = n분 음표 길이(ms), 표에 없는 길이는 4분 음표 길이
+    """
+    tempo = clamp_tempo(tempo)
+    table = _duration_tables.get(tempo)
+    if table is None:
+        if len(_duration_tables) >= _DURATION_CACHE_MAX:
+            _duration_tables.clear()
+        whole_ms = 240000 // tempo  # 온음표 = 4박
+        table = array.array('H', (whole_ms // 4,) * 33)
+        for n in (1, 2, 4, 8, 16, 32):
+            table[n] = whole_ms // n
+        _duration_tables[tempo] = table
+    return table
+
+# 버저 시퀀서 (스레드 없이 one-shot 하드웨어 타이머로 음 전환)
+# 타이머 0~2 는 EZSOUND / SCOPE / 먼지센서가 사용
+TIMER_ID = 3
+MAX_STEPS = 512          # 시퀀스 최대 단계 수 (단계 = 주파수, 길이ms, BUZ:SONG 곡 포함)
+NOTE_GAP_MS = 5          # 멜로디 음표 사이 무음 간격
+DUTY_ON = 32767          # 50% 듀티
 
 # 버저 컨트롤러 클래스
 class BuzzerController:
-    def __init__(self, pin=42):
+    """
+    버저 제어 + 타이머 시퀀서
+
+    재생할 음은 미리 할당한 array('H') 에 (주파수, 길이ms) 단계로 컴파일해 두고,
+    one-shot machine.Timer 콜백이 단계마다 PWM 주파수/듀티를 바꾼 뒤 다음 단계 길이로
+    타이머를 다시 건다. 정지는 타이머 해제 + 듀티 0 으로 즉시 끝난다. (대기 없음)
+    """
+
+    def __init__(self, pin=42, timer_id=TIMER_ID):
         # Ensure attribute exists even if init fails
         self._current_melody_name = None
         try:
@@ -88,10 +149,14 @@ class BuzzerController:
             self._initialized = True
             self._completion_callback = None
             
-            # 멜로디 재생을 위한 스레드 변수
-            self._melody_thread = None
-            self._melody_stop_flag = False
-            self._melody_thread_lock = _thread.allocate_lock()
+            # 시퀀서 상태 (단계 버퍼는 1회 할당)
+            self._steps = array.array('H', bytes(4 * MAX_STEPS))
+            self._count = 0
+            self._pos = 0
+            self._playing = False
+            self._timer = machine.Timer(timer_id)
+            self._cb = self._on_timer  # 콜백마다 bound method 생성 방지
+            
             self.pin = machine.Pin(pin, machine.Pin.OUT)
             # Some boards can't use default PWM freq (often 5000Hz).
             # Try safe frequency first, then fall back.
@@ -107,16 +172,145 @@ class BuzzerController:
         except Exception as e:
             self._initialized = False
             print(f"[Buzzer] Error initializing: {e}")
-    
+
+    # ------------------------------------------------------------------
+    # 시퀀서
+    # ------------------------------------------------------------------
+    def _load_steps(self, steps):
+        """
+        (주파수, 길이ms) 목록을 단계 버퍼에 기록 (주파수 0 은 쉼표)
+
+        Returns:
+            int: 기록한 단계 수 (MAX_STEPS 초과분은 버림)
+        """
+        buf = self._steps
+        n = 0
+        for freq, duration_ms in steps:
+            if n >= MAX_STEPS:
+                print("[Buzzer] Sequence truncated to MAX_STEPS")
+                break
+            buf[2 * n] = int(freq)
+            buf[2 * n + 1] = max(1, min(65535, int(duration_ms)))
+            n += 1
+        self._count = n
+        return n
+
+    def _start_sequence(self, name):
+        """버퍼에 컴파일된 시퀀스 재생 시작 (첫 단계는 호출 측에서 바로 출력)"""
+        self._stop_sequence()
+        self.is_continuous = False
+        if self._count == 0:
+            return False
+        self._pos = 0
+        self._playing = True
+        self._current_melody_name = name
+        self._advance()
+        return True
+
+    def _on_timer(self, _timer):
+        """타이머 콜백: 다음 단계로 전환"""
+        if self._playing:
+            self._advance()
+
+    def _advance(self):
+        i = self._pos
+        if i >= self._count:
+            self._finish()
+            return
+        steps = self._steps
+        freq = steps[2 * i]
+        self._pos = i + 1
+        try:
+            if freq:
+                self.pwm.freq(freq)
+                self.pwm.duty_u16(DUTY_ON)
+            else:
+                self.pwm.duty_u16(0)
+            self._timer.init(mode=machine.Timer.ONE_SHOT, period=steps[2 * i + 1], callback=self._cb)
+        except Exception as e:
+            print(f"[Buzzer] Sequencer error, stopping: {e}")
+            self._stop_sequence()
+
+    def _finish(self):
+        """시퀀스 끝: 음소거 후 완료 콜백"""
+        self._playing = False
+        self._current_melody_name = None
+        try:
+            self.pwm.duty_u16(0)
+        except Exception:
+            pass
+        if self._completion_callback:
+            try:
+                self._completion_callback("COMPLETED")
+            except Exception as e:
+                print(f"[Buzzer] Completion callback error: {e}")
+
+    def _stop_sequence(self):
+        """재생 중인 시퀀스 즉시 중지 (타이머 해제 + 음소거)"""
+        was_playing = self._playing
+        self._playing = False
+        self._current_melody_name = None
+        try:
+            self._timer.deinit()
+        except Exception:
+            pass
+        if was_playing:
+            try:
+                self.pwm.duty_u16(0)
+            except Exception:
+                pass
+        return True
+
+    def is_playing(self):
+        """시퀀스(멜로디/비동기 비프) 재생 중 여부"""
+        return self._playing
+
+    def play_steps(self, steps, name="SONG"):
+        """
+        (주파수, 길이ms) 단계 목록/제너레이터를 단계 버퍼로 컴파일해 재생
+
+        Returns:
+            int: 컴파일된 단계 수 (재생 실패 시 0)
+        """
+        if not self._initialized:
+            return 0
+        self._stop_sequence()
+        n = self._load_steps(steps)
+        if not self._start_sequence(name):
+            return 0
+        return n
+
+    def compiled_bytes(self):
+        """마지막으로 컴파일된 단계 버퍼 (플래시 캐시 저장용, 복사 없음)"""
+        return memoryview(self._steps)[:2 * self._count]
+
+    def play_compiled_file(self, path, name="SONG"):
+        """
+        compiled_bytes() 로 저장한 파일을 단계 버퍼에 바로 읽어 재생 (파싱 없음)
+
+        Returns:
+            int: 단계 수 (재생 실패 시 0)
+        """
+        if not self._initialized:
+            return 0
+        self._stop_sequence()
+        with open(path, "rb") as f:
+            nbytes = f.readinto(self._steps)  # 바이트 수 반환
+        self._count = min(MAX_STEPS, nbytes // 4)
+        if not self._start_sequence(name):
+            return 0
+        return self._count
+
+    # ------------------------------------------------------------------
+    # 재생
+    # ------------------------------------------------------------------
     def beep(self, count=1, frequency=2000, duration_ms=100, interval_ms=100):
-        """일반 비프음 재생"""
+        """일반 비프음 재생 (블로킹)"""
         if not self._initialized:
             return False
             
         # 이미 재생 중인 멜로디가 있으면 중지
-        if not self._stop_all_threads():
-            print("[Buzzer] SAFETY: Cannot beep - thread still active")
-            return False
+        self._stop_sequence()
             
         try:
             self.is_continuous = False
@@ -124,7 +318,7 @@ class BuzzerController:
             
             for i in range(count):
                 self.pwm.freq(frequency)
-                self.pwm.duty_u16(32767)  # 50% 듀티 사이클
+                self.pwm.duty_u16(DUTY_ON)  # 50% 듀티 사이클
                 time.sleep_ms(duration_ms)
                 self.pwm.duty_u16(0)  # 음소거
                 if i < count-1:
@@ -135,279 +329,69 @@ class BuzzerController:
             print(f"[Buzzer] Error in beep: {e}")
             self.pwm.duty_u16(0)  # 오류 발생 시 음소거
             return False
-    
-    def _melody_thread_function(self, melody, tempo):
-        """멜로디 재생을 위한 스레드 함수 - IRQ 최적화"""
-        if not self._initialized:
-            return
-            
-        try:
-            # 멜로디 재생
-            for note, note_type in melody:
-                # 중지 플래그 확인 (덜 빈번하게)
-                with self._melody_thread_lock:
-                    if self._melody_stop_flag:
-                        break
-                
-                try:
-                    duration_ms = self._calculate_duration(tempo, note_type)
-                    if note > 0:
-                        # PWM 비활성화 상태 확인
-                        if not self._initialized:
-                            break
-                        
-                        try:
-                            self.pwm.freq(note)
-                            self.pwm.duty_u16(32767)
-                        except (RuntimeError, OSError) as e:
-                            print(f"[Buzzer] PWM operation failed, stopping melody: {e}")
-                            break
-                        
-                        # 긴 음표는 큰 청크로 나누어 IRQ 부하 감소
-                        if duration_ms > 200:
-                            # 200ms 이상은 100ms 청크로
-                            total_chunks = max(1, int(duration_ms / 100))
-                            chunk_ms = duration_ms / total_chunks
-                        else:
-                            # 짧은 음표는 그냥 한번에 재생
-                            total_chunks = 1
-                            chunk_ms = duration_ms
-                        
-                        for chunk in range(total_chunks):
-                            time.sleep_ms(int(chunk_ms))
-                            # 중지 플래그 확인 (청크당 한 번만)
-                            if total_chunks > 1:  # 긴 음표에서만 중간 체크
-                                with self._melody_thread_lock:
-                                    if self._melody_stop_flag:
-                                        break
-                            # PWM 비활성화 상태 확인
-                            if not self._initialized:
-                                break
-                        
-                        # 최종 중지 플래그 확인
-                        with self._melody_thread_lock:
-                            if self._melody_stop_flag or not self._initialized:
-                                break
-                        
-                        try:
-                            self.pwm.duty_u16(0)
-                        except (RuntimeError, OSError):
-                            # PWM이 이미 비활성화됨
-                            break
-                    else:
-                        # 쉼표 - 간단하게 처리
-                        if duration_ms > 200:
-                            # 긴 쉼표만 중간 체크
-                            chunks = int(duration_ms / 100)
-                            for _ in range(chunks):
-                                time.sleep_ms(100)
-                                with self._melody_thread_lock:
-                                    if self._melody_stop_flag:
-                                        break
-                            remainder = duration_ms % 100
-                            if remainder > 0:
-                                time.sleep_ms(remainder)
-                        else:
-                            # 짧은 쉼표는 한번에
-                            time.sleep_ms(duration_ms)
-                
-                except Exception as e:
-                    print(f"[Buzzer] Error playing note: {e}")
-                    # 노트 재생 중 오류 발생 시 다음 노트로 계속 진행
-                    
-                # 중지 플래그 확인 (노트 사이에만)
-                with self._melody_thread_lock:
-                    if self._melody_stop_flag or not self._initialized:
-                        break
-                    
-                # 노트 간 간격 줄임
-                time.sleep_ms(5)
-            
-            # 모든 소리 중지 시도
-            try:
-                if self._initialized:
-                    self.pwm.duty_u16(0)
-            except Exception:
-                # PWM이 이미 비활성화됨
-                pass
-            
-            # 스레드 변수 초기화
-            with self._melody_thread_lock:
-                self._melody_thread = None
-                self._melody_stop_flag = False
-                self._current_melody_name = None
-                    
-        except Exception as e:
-            print(f"[Buzzer] Error in melody thread: {e}")
-            # 오류 발생 시 소리 중지 시도
-            try:
-                if self._initialized:
-                    self.pwm.duty_u16(0)
-            except Exception:
-                # PWM이 이미 비활성화됨
-                pass
-            
-            # 스레드 변수 초기화
-            with self._melody_thread_lock:
-                self._melody_thread = None
-                self._melody_stop_flag = False
-                self._current_melody_name = None
-    
-    def _stop_all_threads(self):
-        """실행 중인 모든 스레드 중지 (멜로디, 비프음 등) - IRQ 최적화"""
-        # 스레드 중지 플래그 설정
-        with self._melody_thread_lock:
-            if self._melody_thread is not None:
-                self._melody_stop_flag = True
-                print("[Buzzer] Stop signal sent to thread")
-            else:
-                # 스레드가 없으면 바로 리턴
-                return True
-        
-        # 소리 즉시 중지 (하드웨어 안전 우선)
-        if self._initialized:
-            try:
-                self.pwm.duty_u16(0)
-                print("[Buzzer] PWM stopped")
-            except Exception as e:
-                print(f"[Buzzer] PWM stop error: {e}")
-        
-        # 스레드가 자연스럽게 종료될 때까지 대기 (IRQ 부하 감소)
-        max_wait = 20  # 20 × 25ms = 500ms (간격을 늘림)
-        while max_wait > 0:
-            with self._melody_thread_lock:
-                if self._melody_thread is None:
-                    print("[Buzzer] Thread stopped naturally")
-                    return True
-            time.sleep_ms(25)  # 25ms로 늘림 (IRQ 부하 감소)
-            max_wait -= 1
-        
-        # 스레드가 여전히 존재하면 강제 정리하지 않음
-        print("[Buzzer] WARNING: Thread still running, keeping it safe")
-        return False  # 정리 실패 표시
+
+    def _load_melody(self, melody, tempo):
+        """
+        array('H') 멜로디를 템포 길이 표로 단계 버퍼에 기록 (음표마다 NOTE_GAP_MS 무음)
+        문자열 처리/float 연산/할당 없음
+
+        Returns:
+            int: 단계 수
+        """
+        table = duration_table(tempo)
+        buf = self._steps
+        n = 0
+        limit = MAX_STEPS - 1
+        for k in range(0, len(melody), 2):
+            if n >= limit:
+                break
+            length = melody[k + 1]
+            buf[2 * n] = melody[k]
+            buf[2 * n + 1] = table[length] if length <= 32 else table[4]
+            buf[2 * n + 2] = 0
+            buf[2 * n + 3] = NOTE_GAP_MS
+            n += 2
+        self._count = n
+        return n
     
     def play_melody(self, melody_name, tempo=120):
-        """스마트 멜로디 재생 - 안전 우선"""
+        """내장 멜로디 재생 (비차단, 타이머 시퀀서)"""
         if not self._initialized:
             return False
         
         melody_name_upper = melody_name.upper()
         
-        # 먼저 이전 스레드가 있는지 확인 (안전 우선)
-        thread_exists = False
-        current_melody = None
-        
-        with self._melody_thread_lock:
-            if self._melody_thread is not None:
-                thread_exists = True
-                current_melody = self._current_melody_name
-        
-        # 이전 스레드가 있으면 정리 시도
-        if thread_exists:
-            if current_melody == melody_name_upper:
-                print(f"[Buzzer] {melody_name} already playing, stopping first")
-            else:
-                print(f"[Buzzer] Changing melody to {melody_name}")
-            
-            cleanup_success = self._stop_all_threads()
-            
-            if not cleanup_success:
-                print(f"[Buzzer] SAFETY: Cannot start {melody_name} - previous thread still active")
-                return False  # 안전을 위해 새 재생 거부
+        melody = MELODIES.get(melody_name_upper)
+        if melody is None:
+            print(f"[Buzzer] Unknown melody: {melody_name}")
+            return False
+        tempo = clamp_tempo(tempo)
         
         try:
-            self.is_continuous = False
-            
-            # 멜로디 선택
-            melody = None
-            if melody_name_upper == "TWINKLE":
-                melody = MELODY_TWINKLE_TWINKLE
-                print("[Buzzer] Playing Twinkle Twinkle")
-            elif melody_name_upper == "FUR_ELISE":
-                melody = MELODY_FUR_ELISE
-                print("[Buzzer] Playing Fur Elise")
-            elif melody_name_upper == "SCHOOL_BELL":
-                melody = MELODY_SCHOOL_BELL
-                print("[Buzzer] Playing School Bell")
-            elif melody_name_upper == "BEEP":
-                melody = SOUND_BEEP
-                print("[Buzzer] Playing Beep")
-            elif melody_name_upper == "SUCCESS":
-                melody = SOUND_SUCCESS
-                print("[Buzzer] Playing Success sound")
-            elif melody_name_upper == "ERROR":
-                melody = SOUND_ERROR
-                print("[Buzzer] Playing Error sound")
-            elif melody_name_upper == "ALERT":
-                melody = SOUND_ALERT
-                print("[Buzzer] Playing Alert sound")
-            else:
-                print(f"[Buzzer] Unknown melody: {melody_name}")
-                return False
-            
-            # 멜로디 스레드 시작 (이중 안전 체크)
-            with self._melody_thread_lock:
-                # 마지막 순간에 다시 한번 스레드 상태 확인
-                if self._melody_thread is not None:
-                    print(f"[Buzzer] CRITICAL: Thread found at start time! Aborting {melody_name}")
-                    return False
-                
-                self._melody_stop_flag = False
-                self._current_melody_name = melody_name_upper
-                
-                try:
-                    self._melody_thread = _thread.start_new_thread(self._melody_thread_function, (melody, tempo))
-                    print(f"[Buzzer] Thread started safely for {melody_name_upper}")
-                except Exception as e:
-                    print(f"[Buzzer] CRITICAL: Thread start failed: {e}")
-                    self._melody_thread = None
-                    self._melody_stop_flag = False
-                    self._current_melody_name = None
-                    return False
-                
-            return True
+            self._stop_sequence()
+            self._load_melody(melody, tempo)
+            print(f"[Buzzer] Playing {melody_name_upper}")
+            return self._start_sequence(melody_name_upper)
         except Exception as e:
-            print(f"[Buzzer] Error starting melody thread: {e}")
+            print(f"[Buzzer] Error starting melody: {e}")
+            self._stop_sequence()
             self.pwm.duty_u16(0)
             return False
     
-    def _calculate_duration(self, tempo, note_type):
-        """음표 지속 시간 계산"""
-        try:
-            # 4분 음표 하나의 지속 시간 (ms)
-            quarter_note_ms = 60000 / tempo
-            
-            # 음표 유형에 따른 지속 시간
-            durations = {
-                '1': quarter_note_ms * 4,    # 온음표
-                '2': quarter_note_ms * 2,    # 2분 음표
-                '4': quarter_note_ms,        # 4분 음표
-                '8': quarter_note_ms / 2,    # 8분 음표
-                '16': quarter_note_ms / 4,   # 16분 음표
-                '32': quarter_note_ms / 8    # 32분 음표
-            }
-            
-            return durations.get(note_type, quarter_note_ms)
-        except Exception as e:
-            print(f"[Buzzer] Error calculating duration: {e}")
-            return 500  # 기본값
-    
     def play_tone(self, frequency=2000, duration_ms=500):
-        """단일 톤 재생"""
-        # 이미 재생 중인 멜로디가 있으면 중지
-        if not self._stop_all_threads():
-            print("[Buzzer] SAFETY: Cannot play tone - thread still active")
-            return False
-        
+        """단일 톤 재생 (블로킹)"""
         if not self._initialized:
             return False
+        
+        # 이미 재생 중인 멜로디가 있으면 중지
+        self._stop_sequence()
             
         try:
             self.is_continuous = False
             print(f"[Buzzer] Playing tone {frequency}Hz for {duration_ms}ms")
             
             self.pwm.freq(frequency)
-            self.pwm.duty_u16(32767)
+            self.pwm.duty_u16(DUTY_ON)
             time.sleep_ms(duration_ms)
             self.pwm.duty_u16(0)
             
@@ -419,18 +403,16 @@ class BuzzerController:
     
     def play_continuous(self, frequency=2000):
         """연속 비프음 시작"""
-        # 이미 재생 중인 멜로디가 있으면 중지
-        if not self._stop_all_threads():
-            print("[Buzzer] SAFETY: Cannot play continuous - thread still active")
-            return False
-        
         if not self._initialized:
             return False
+        
+        # 이미 재생 중인 멜로디가 있으면 중지
+        self._stop_sequence()
             
         try:
             print(f"[Buzzer] Starting continuous beep at {frequency}Hz")
             self.pwm.freq(frequency)
-            self.pwm.duty_u16(32767)
+            self.pwm.duty_u16(DUTY_ON)
             self.is_continuous = True
             return True
         except Exception as e:
@@ -439,25 +421,16 @@ class BuzzerController:
             return False
     
     def stop(self):
-        """모든 소리 중지 (멜로디, 비프음, 연속음 등 모든 스레드 정리)"""
+        """모든 소리 즉시 중지 (멜로디, 비프음, 연속음)"""
         if not self._initialized:
             return False
             
         try:
-            print("[Buzzer] Stopping all sound")
-            # 모든 스레드 중지 (안전 우선)
-            cleanup_success = self._stop_all_threads()
-            
-            # 모든 소리 중지 및 상태 초기화
+            self._stop_sequence()
             self.pwm.duty_u16(0)
             self.is_continuous = False
-            
-            if cleanup_success:
-                print("[Buzzer] All stopped successfully")
-            else:
-                print("[Buzzer] Sound stopped, but thread cleanup incomplete")
-            
-            return cleanup_success
+            print("[Buzzer] All sound stopped")
+            return True
         except Exception as e:
             print(f"[Buzzer] Error in stop: {e}")
             return False
@@ -467,62 +440,29 @@ class BuzzerController:
         if not self._initialized:
             return False
             
-        # 멜로디 스레드가 실행 중이거나 연속 모드이거나 소리가 나고 있으면 활성 상태
-        is_melody_active = False
-        with self._melody_thread_lock:
-            is_melody_active = self._melody_thread is not None
-            
-        return is_melody_active or self.is_continuous or self.pwm.duty_u16() > 0
+        # 시퀀스 재생 중이거나 연속 모드이거나 소리가 나고 있으면 활성 상태
+        return self._playing or self.is_continuous or self.pwm.duty_u16() > 0
     
     def set_completion_callback(self, callback):
-        """완료 콜백 설정"""
+        """완료 콜백 설정 (시퀀스가 끝나면 타이머 콜백 문맥에서 callback("COMPLETED") 호출)"""
         self._completion_callback = callback
     
     def deinit(self):
-        """리소스 해제 - 완전한 정리"""
+        """리소스 해제 (타이머 + PWM)"""
         if not self._initialized:
             return False
             
         try:
-            print("[Buzzer] Starting complete deinitialization")
-            
-            # 1단계: 모든 재생 중지 (스레드 정리 포함)
-            self.stop()
-            
-            # 2단계: 스레드가 완전히 종료될 때까지 강제 대기
-            max_wait = 12  # 12 × 25ms = 300ms 대기
-            while max_wait > 0:
-                with self._melody_thread_lock:
-                    if self._melody_thread is None:
-                        break
-                print(f"[Buzzer] Waiting for thread cleanup... ({max_wait*25}ms left)")
-                time.sleep_ms(25)  # IRQ 부하 감소
-                max_wait -= 1
-            
-            # 3단계: 강제 변수 초기화 (최후의 수단)
-            with self._melody_thread_lock:
-                if self._melody_thread is not None:
-                    print("[Buzzer] WARNING: Forcing thread cleanup")
-                self._melody_thread = None
-                self._melody_stop_flag = False
-                self._current_melody_name = None
-            
-            # 4단계: 하드웨어 완전 해제
+            self._stop_sequence()
+            self.is_continuous = False
             try:
                 self.pwm.duty_u16(0)
-                time.sleep_ms(10)  # PWM 안정화 대기
                 self.pwm.deinit()
                 print("[Buzzer] PWM deinitialized")
             except Exception as e:
                 print(f"[Buzzer] PWM deinit error: {e}")
-            
-            # 5단계: 상태 완전 초기화
             self._initialized = False
-            self.is_continuous = False
-            
-            print("[Buzzer] Complete deinitialization finished")
             return True
-            
         except Exception as e:
             print(f"[Buzzer] Error during deinitialization: {e}")
             # 에러가 발생해도 상태는 초기화
@@ -530,127 +470,24 @@ class BuzzerController:
             return False
 
     def beep_async(self, count=1, frequency=2000, duration_ms=100, interval_ms=100):
-        """비동기 비프음 재생"""
+        """비동기 비프음 재생 (타이머 시퀀서)"""
         if not self._initialized:
             return False
         
-        # 기존 재생 중지
-        if not self._stop_all_threads():
-            print("[Buzzer] SAFETY: Cannot start beep - thread still active")
-            return False
-        
-        # beep을 위한 간단한 멜로디 생성
-        beep_melody = []
-        for i in range(count):
-            beep_melody.append((frequency, duration_ms))
-            if i < count-1:
-                beep_melody.append((0, interval_ms))  # 쉼표
-        
-        # 스레드로 실행
         try:
-            with self._melody_thread_lock:
-                self._melody_stop_flag = False
-                self._current_melody_name = "BEEP"
-                self._melody_thread = _thread.start_new_thread(self._beep_thread_function, (beep_melody,))
-            
-            return True
+            self._stop_sequence()
+            steps = []
+            for i in range(count):
+                steps.append((frequency, duration_ms))
+                if i < count-1:
+                    steps.append((0, interval_ms))  # 쉼표
+            self._load_steps(steps)
+            return self._start_sequence("BEEP")
         except Exception as e:
-            print(f"[Buzzer] Error starting beep thread: {e}")
+            print(f"[Buzzer] Error starting beep: {e}")
+            self._stop_sequence()
             return False
 
-    def _beep_thread_function(self, beep_melody):
-        """비프음 재생을 위한 스레드 함수"""
-        if not self._initialized:
-            return
-            
-        try:
-            for note, duration_ms in beep_melody:
-                # 중지 플래그 확인
-                with self._melody_thread_lock:
-                    if self._melody_stop_flag:
-                        break
-                
-                if note > 0:
-                    # 비프음 재생
-                    if not self._initialized:
-                        break
-                    
-                    try:
-                        self.pwm.freq(note)
-                        self.pwm.duty_u16(32767)
-                    except (RuntimeError, OSError):
-                        break
-                    
-                    # 지속시간을 청크로 나누어 중지 확인
-                    total_chunks = max(1, int(duration_ms / 50))
-                    chunk_ms = duration_ms / total_chunks
-                    
-                    for _ in range(total_chunks):
-                        time.sleep_ms(int(chunk_ms))
-                        with self._melody_thread_lock:
-                            if self._melody_stop_flag:
-                                break
-                        if not self._initialized:
-                            break
-                    
-                    # 중지 플래그 확인
-                    with self._melody_thread_lock:
-                        if self._melody_stop_flag or not self._initialized:
-                            break
-                    
-                    try:
-                        self.pwm.duty_u16(0)
-                    except (RuntimeError, OSError):
-                        break
-                else:
-                    # 쉼표 (무음)
-                    total_chunks = max(1, int(duration_ms / 50))
-                    chunk_ms = duration_ms / total_chunks
-                    
-                    for _ in range(total_chunks):
-                        time.sleep_ms(int(chunk_ms))
-                        with self._melody_thread_lock:
-                            if self._melody_stop_flag:
-                                break
-                        if not self._initialized:
-                            break
-                
-                # 중지 플래그 확인
-                with self._melody_thread_lock:
-                    if self._melody_stop_flag or not self._initialized:
-                        break
-            
-            # 모든 소리 중지
-            try:
-                if self._initialized:
-                    self.pwm.duty_u16(0)
-            except Exception:
-                pass
-            
-            # 스레드 변수 초기화
-            with self._melody_thread_lock:
-                self._melody_thread = None
-                self._melody_stop_flag = False
-                self._current_melody_name = None
-            
-            # 완료 콜백 호출 - IRQ 충돌 방지를 위해 제거됨
-            # if self._completion_callback:
-            #     self._completion_callback("COMPLETED")
-                    
-        except Exception as e:
-            print(f"[Buzzer] Error in beep thread: {e}")
-            try:
-                if self._initialized:
-                    self.pwm.duty_u16(0)
-            except Exception:
-                pass
-            
-            # 스레드 변수 초기화
-            with self._melody_thread_lock:
-                self._melody_thread = None
-                self._melody_stop_flag = False
-                self._current_melody_name = None
-
 # 전역 버저 인스턴스
 _buzzer = None
 
@@ -691,6 +528,26 @@ def play_melody(melody_name, tempo=120):
         init()
     return _buzzer.play_melody(melody_name, tempo)
 
+def play_steps(steps, name="SONG"):
+    """(주파수, 길이ms) 단계 재생 (BUZ:SONG)"""
+    global _buzzer
+    if _buzzer is None:
+        init()
+    return _buzzer.play_steps(steps, name)
+
+def compiled_bytes():
+    """마지막으로 컴파일된 단계 버퍼"""
+    if _buzzer is None:
+        return b""
+    return _buzzer.compiled_bytes()
+
+def play_compiled_file(path, name="SONG"):
+    """플래시에 캐시된 단계 버퍼 재생"""
+    global _buzzer
+    if _buzzer is None:
+        init()
+    return _buzzer.play_compiled_file(path, name)
+
 def play_tone(frequency, duration_ms=500):
     """단일 톤 재생"""
     global _buzzer
@@ -733,30 +590,9 @@ def deinit():
         return True
     
     try:
-        print("[Buzzer] Global deinitialization starting")
-        
-        # 먼저 모든 재생 중지
-        _buzzer.stop()
-        
-        # 충분한 시간을 주고 완전히 정리
-        max_wait = 12  # 12 × 25ms = 300ms 대기
-        while max_wait > 0:
-            try:
-                is_thread_active = _buzzer._melody_thread is not None
-                if not is_thread_active:
-                    break
-            except:
-                break
-            time.sleep_ms(25)  # IRQ 부하 감소
-            max_wait -= 1
-        
-        # 리소스 해제
+        # 타이머 해제 + 음소거는 즉시 끝나므로 대기 없음
         result = _buzzer.deinit()
-        
-        # 전역 변수 완전 정리
         _buzzer = None
-        
-        print("[Buzzer] Global deinitialization complete")
         return result
         
     except Exception as e:
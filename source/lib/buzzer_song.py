@@ -0,0 +1,193 @@
+"""
+버저 사용자 멜로디(BUZ:SONG) 컴파일러 / 플래시 캐시
+
+블록 코딩에서 만든 곡을 BUZ:BEEP 여러 번으로 보내면 BLE 지연 때문에 박자가 흔들린다.
+곡 전체를 한 번 올리면 보드가 (주파수, 길이ms) 단계로 컴파일해 버저 타이머 시퀀서가
+재생하므로 박자가 보드 기준으로 정확하다.
+
+- RTTTL 텍스트: "name:d=4,o=5,b=120:8e6,8d#6,p,4c.6"
+- 바이너리 스트림: 3바이트 단위 [MIDI 음번호(0=쉼표), 길이ms(u16 little-endian)]
+- 두 형식 모두 제너레이터로 단계를 돌려주고, 시퀀서가 미리 할당한 버퍼에 바로 기록한다.
+- SongStore: 컴파일된 단계 버퍼를 /songs/이름.bin 으로 저장해 다음부터는 파싱 없이 재생
+
+사용 예:
+    import buzzerModule
+    from buzzer_song import parse_rtttl, SongStore
+
+    buzzerModule.play_steps(parse_rtttl("beep:d=8,o=5,b=120:c,e,g"), "BEEP")
+"""
+
+import os
+
+# 4옥타브 반음 주파수 (C4 ~ B4), 다른 옥타브는 2배/절반으로 계산
+_OCTAVE4 = (262, 277, 294, 311, 330, 349, 370, 392, 415, 440, 466, 494)
+
+# RTTTL 음이름 → 반음 번호
+_NOTE_INDEX = {"c": 0, "d": 2, "e": 4, "f": 5, "g": 7, "a": 9, "b": 11}
+
+NOTE_GAP_MS = 5          # 음표 끝 무음 (같은 음 반복 시 구분), 음 길이에 포함
+SONG_DIR = "/songs"
+MAX_NAME_LEN = 16
+
+
+def note_freq(semitone, octave):
+    """반음 번호(0~11) + 옥타브 → 주파수(Hz)"""
+    freq = _OCTAVE4[semitone]
+    if octave >= 4:
+        return freq << (octave - 4)
+    return (freq + (1 << (3 - octave))) >> (4 - octave)
+
+
+def midi_freq(note):
+    """MIDI 음번호(60 = C4) → 주파수(Hz), 0 은 쉼표"""
+    if note <= 0:
+        return 0
+    return note_freq(note % 12, note // 12 - 1)
+
+
+def _articulate(freq, duration_ms):
+    """음 길이 안에서 끝 NOTE_GAP_MS 를 무음으로 나눔"""
+    if freq and duration_ms > 2 * NOTE_GAP_MS:
+        yield freq, duration_ms - NOTE_GAP_MS
+        yield 0, NOTE_GAP_MS
+    else:
+        yield freq, duration_ms
+
+
+def parse_rtttl(text):
+    """
+    RTTTL 문자열 → (주파수, 길이ms) 단계 제너레이터
+
+    Raises:
+        ValueError: 형식 오류
+    """
+    sections = text.strip().split(":")
+    if len(sections) != 3:
+        raise ValueError("RTTTL needs name:defaults:notes")
+    d, o, b = 4, 6, 63
+    for item in sections[1].split(","):
+        item = item.strip().lower()
+        if not item:
+            continue
+        key, _, value = item.partition("=")
+        if key == "d":
+            d = int(value)
+        elif key == "o":
+            o = int(value)
+        elif key == "b":
+            b = int(value)
+    if d <= 0 or b <= 0:
+        raise ValueError("invalid RTTTL defaults")
+    whole_ms = 240000 // b  # 온음표 = 4박
+
+    for token in sections[2].split(","):
+        token = token.strip().lower()
+        if not token:
+            continue
+        i = 0
+        n = len(token)
+        while i < n and token[i].isdigit():
+            i += 1
+        duration = int(token[:i]) if i else d
+        if i >= n:
+            raise ValueError("missing note in " + token)
+        letter = token[i]
+        i += 1
+        if letter == "p":
+            semitone = -1
+        elif letter in _NOTE_INDEX:
+            semitone = _NOTE_INDEX[letter]
+        else:
+            raise ValueError("invalid note " + token)
+        if i < n and token[i] == "#":
+            semitone += 1
+            i += 1
+        dotted = False
+        if i < n and token[i] == ".":
+            dotted = True
+            i += 1
+        octave = o
+        if i < n and token[i].isdigit():
+            octave = int(token[i])
+            i += 1
+        if i < n and token[i] == ".":
+            dotted = True
+            i += 1
+        if duration <= 0:
+            raise ValueError("invalid duration in " + token)
+
+        ms = whole_ms // duration
+        if dotted:
+            ms += ms >> 1
+        if semitone < 0:
+            yield 0, ms
+        else:
+            if semitone > 11:
+                semitone -= 12
+                octave += 1
+            yield from _articulate(note_freq(semitone, octave), ms)
+
+
+def decode_notes(data):
+    """
+    바이너리 (MIDI 음, 길이ms u16 LE) 스트림 → (주파수, 길이ms) 단계 제너레이터
+
+    Raises:
+        ValueError: 길이가 3의 배수가 아님
+    """
+    if len(data) % 3:
+        raise ValueError("binary song length must be a multiple of 3")
+    for k in range(0, len(data), 3):
+        yield from _articulate(midi_freq(data[k]), data[k + 1] | (data[k + 2] << 8))
+
+
+def song_name(name):
+    """저장 이름 정규화 (영문/숫자/_ 만, 대문자, 최대 16자)"""
+    name = name.strip().upper()
+    if not name or len(name) > MAX_NAME_LEN:
+        raise ValueError("song name must be 1~16 chars")
+    for ch in name:
+        if not (ch.isalpha() or ch.isdigit() or ch == "_"):
+            raise ValueError("invalid song name")
+    return name
+
+
+class SongStore:
+    """컴파일된 곡 단계 버퍼의 플래시 캐시 (/songs/이름.bin)"""
+
+    def __init__(self, directory=SONG_DIR):
+        self.directory = directory
+
+    def path(self, name):
+        return "{}/{}.bin".format(self.directory, song_name(name))
+
+    def save(self, name, data):
+        """단계 버퍼(bytes/memoryview) 저장"""
+        try:
+            os.mkdir(self.directory)
+        except OSError:
+            pass  # 이미 있음
+        with open(self.path(name), "wb") as f:
+            f.write(data)
+
+    def exists(self, name):
+        try:
+            os.stat(self.path(name))
+            return True
+        except OSError:
+            return False
+
+    def delete(self, name):
+        try:
+            os.remove(self.path(name))
+            return True
+        except OSError:
+            return False
+
+    def names(self):
+        """저장된 곡 이름 목록"""
+        try:
+            files = os.listdir(self.directory)
+        except OSError:
+            return []
+        return sorted(f[:-4] for f in files if f.endswith(".bin"))
@@ -0,0 +1,197 @@
+"""
+카메라 적응형 화질 컨트롤러 (BLE 실측 처리량 기준 해상도 / JPEG 품질 자동 조절)
+
+부팅 시 QVGA / 품질 85 로 고정하면 BLE 가 따라가지 못할 때 전송 대기 프레임이
+계속 새 프레임으로 바뀌어 스트림이 멈춘 것처럼 보인다. 전송 펌프가 프레임을 다 보낼 때마다
+frame_sent() 로 실측값을 넘기면 목표(FPS 또는 지연)에 맞게 화질 단계를 올리거나 내린다.
+
+- 측정: 프레임 전송 처리량(바이트/s), 프레임 크기, 완료 간격(ms), 캡처→CAM:END 지연(ms)
+  (모두 정수 EWMA, 가중치 1/4)
+- FPS 모드: 현재 처리량으로 프레임 1개를 보내는 시간이 목표 간격보다 길거나
+  완료 간격이 목표의 1.25배를 넘으면 한 단계 내림, 전송 시간 x1.5 가 목표 간격 안이면 한 단계 올림
+- 지연 모드: 지연이 목표를 넘으면 내림, 지연 x1.5 가 목표 안이면 올림
+- 히스테리시스: 단계 변경 후 HOLD_MS 동안 + 새 단계 프레임 MIN_FRAMES 개 전까지는 판단하지 않고,
+  올림은 조건이 연속 UP_CONFIRM 번 맞을 때만 (내림은 바로)
+- 단계 적용(set_quality / 프레임 크기 재구성)은 캡처 중 호출을 피하려고 캡처 스레드에서 한다.
+
+사용 예:
+    from cam_adaptive import CamAdaptive
+
+    adapt = CamAdaptive("QVGA", 85)
+    adapt.set_target(CamAdaptive.FPS, 3)
+    level = adapt.frame_sent(nbytes, capture_ms, start_ms, end_ms)
+    if level >= 0:
+        size, quality = CamAdaptive.LEVELS[level]
+"""
+
+import time
+
+
+class CamAdaptive:
+    """
+    해상도 / JPEG 품질 단계 컨트롤러
+
+    Attributes:
+        mode (int): OFF / FPS / LATENCY
+        target (int): 목표 FPS 또는 목표 지연(ms)
+        level (int): 현재 단계 (LEVELS 인덱스, 클수록 고화질)
+    """
+
+    OFF = 0
+    FPS = 1
+    LATENCY = 2
+    MODE_NAMES = ("OFF", "FPS", "LAT")
+
+    # (프레임 크기, 품질) — 아래일수록 프레임이 크다. 품질은 1~85 (클수록 고화질)
+    LEVELS = (
+        ("QQVGA", 40),
+        ("QQVGA", 60),
+        ("QQVGA", 80),
+        ("QVGA", 40),
+        ("QVGA", 55),
+        ("QVGA", 70),
+        ("QVGA", 85),
+        ("VGA", 45),
+        ("VGA", 60),
+        ("VGA", 75),
+    )
+
+    FPS_MIN = 1
+    FPS_MAX = 20
+    LATENCY_MIN_MS = 100
+    LATENCY_MAX_MS = 10000
+    HOLD_MS = 3000       # 단계 변경 후 판단 보류 시간
+    MIN_FRAMES = 3       # 새 단계에서 측정할 최소 프레임 수
+    UP_CONFIRM = 2       # 올림 조건 연속 횟수
+
+    def __init__(self, frame_size="QVGA", quality=85):
+        self.mode = self.OFF
+        self.target = 0
+        self.level = self.find_level(frame_size, quality)
+        self.bps = 0             # 전송 처리량 (바이트/s)
+        self._reset_stats(time.ticks_ms())
+
+    @classmethod
+    def find_level(cls, frame_size, quality):
+        """현재 카메라 설정에 가장 가까운 단계 (크기가 같은 단계 중 품질이 가장 가까운 것)"""
+        frame_size = frame_size.upper()
+        best = -1
+        for i, (size, q) in enumerate(cls.LEVELS):
+            if size == frame_size and (best < 0 or abs(q - quality) < abs(cls.LEVELS[best][1] - quality)):
+                best = i
+        return best if best >= 0 else cls.LEVELS.index(("QVGA", 85))
+
+    def _reset_stats(self, now):
+        """단계 변경 / 목표 변경 시 프레임 통계 초기화 (링크 처리량 bps 는 유지)"""
+        self.frame_bytes = 0
+        self.frame_ms = 0        # 완료 간격
+        self.latency_ms = 0
+        self._frames = 0
+        self._last_end_ms = None
+        self._changed_ms = now
+        self._up_votes = 0
+
+    def set_target(self, mode, value):
+        """
+        목표 설정 (FPS: 초당 프레임 수, LATENCY: 캡처→전송 완료 지연 ms)
+
+        Raises:
+            ValueError: 범위 밖
+        """
+        value = int(value)
+        if mode == self.FPS:
+            if not self.FPS_MIN <= value <= self.FPS_MAX:
+                raise ValueError("fps out of range")
+        elif mode == self.LATENCY:
+            if not self.LATENCY_MIN_MS <= value <= self.LATENCY_MAX_MS:
+                raise ValueError("latency out of range")
+        else:
+            raise ValueError("invalid mode")
+        self.mode = mode
+        self.target = value
+        self._reset_stats(time.ticks_ms())
+
+    def stop(self):
+        """자동 조절 중지 (현재 단계는 유지)"""
+        self.mode = self.OFF
+
+    @property
+    def active(self):
+        return self.mode != self.OFF
+
+    def interval_ms(self):
+        """FPS 모드의 캡처 간격 (그 외에는 None)"""
+        if self.mode == self.FPS:
+            return 1000 // self.target
+        return None
+
+    def fps_x10(self):
+        """측정된 완료 FPS x10 (측정 전 0)"""
+        return 10000 // self.frame_ms if self.frame_ms else 0
+
+    @staticmethod
+    def _ewma(avg, sample):
+        return sample if avg == 0 else avg + ((sample - avg) >> 2)
+
+    def frame_sent(self, nbytes, capture_ms, start_ms, end_ms):
+        """
+        프레임 1개 전송 완료 기록 후 단계 판단 (전송 펌프에서 CAM:END 직후 호출)
+
+        Args:
+            nbytes (int): JPEG 크기
+            capture_ms (int): 캡처 완료 시각 (ticks_ms)
+            start_ms (int): 전송 시작(CAM:START) 시각
+            end_ms (int): 전송 완료(CAM:END) 시각
+
+        Returns:
+            int: 바꿀 단계 (변경 없으면 -1)
+        """
+        tx_ms = max(1, time.ticks_diff(end_ms, start_ms))
+        self.bps = self._ewma(self.bps, nbytes * 1000 // tx_ms)
+        self.frame_bytes = self._ewma(self.frame_bytes, nbytes)
+        self.latency_ms = self._ewma(self.latency_ms, time.ticks_diff(end_ms, capture_ms))
+        if self._last_end_ms is not None:
+            self.frame_ms = self._ewma(self.frame_ms, time.ticks_diff(end_ms, self._last_end_ms))
+        self._last_end_ms = end_ms
+        self._frames += 1
+
+        if self.mode == self.OFF:
+            return -1
+        if self._frames < self.MIN_FRAMES or time.ticks_diff(end_ms, self._changed_ms) < self.HOLD_MS:
+            return -1
+
+        step = self._decide()
+        if step > 0:
+            self._up_votes += 1
+            if self._up_votes < self.UP_CONFIRM:
+                return -1
+        else:
+            self._up_votes = 0
+        level = self.level + step
+        if step == 0 or not 0 <= level < len(self.LEVELS):
+            return -1
+        self.level = level
+        self._reset_stats(end_ms)
+        return level
+
+    def _decide(self):
+        """+1 = 올림, -1 = 내림, 0 = 유지"""
+        if self.mode == self.FPS:
+            period = 1000 // self.target
+            send_ms = self.frame_bytes * 1000 // max(1, self.bps)
+            if send_ms > period or (self.frame_ms and self.frame_ms * 4 > period * 5):
+                return -1
+            if send_ms * 3 <= period * 2 and self.frame_ms * 10 <= period * 11:
+                return 1
+        else:
+            if self.latency_ms > self.target:
+                return -1
+            if self.latency_ms * 3 <= self.target * 2:
+                return 1
+        return 0
+
+    def state(self):
+        """(모드 이름, 목표, 단계, 크기, 품질, 바이트/s, FPS x10, 지연ms)"""
+        size, quality = self.LEVELS[self.level]
+        return (self.MODE_NAMES[self.mode], self.target, self.level, size, quality,
+                self.bps, self.fps_x10(), self.latency_ms)
@@ -8,8 +8,82 @@
 import time
 import gc
 import array
+import _thread
 import logger  # 로거 모듈 임포트
 
+
+# 해상도별 JPEG 프레임 버퍼 초기 크기 (바이트, 품질 85 기준 여유 포함)
+# 더 큰 프레임이 오면 해당 버퍼만 늘린다. (이후 재사용)
+FRAME_BUFFER_BYTES = {
+    "QQVGA": 12 * 1024,
+    "QVGA": 32 * 1024,
+    "VGA": 80 * 1024,
+    "SVGA": 120 * 1024,
+}
+DEFAULT_FRAME_BUFFER_BYTES = 160 * 1024
+FRAME_POOL_COUNT = 3   # 캡처 중 1 + 전송 대기 1 + 전송 중 1
+
+
+class FramePool:
+    """
+    미리 할당한 JPEG 프레임 버퍼 풀
+
+    캡처 스레드가 acquire() 한 슬롯에 프레임을 복사하고, 전송이 끝나면 release() 한다.
+    보관/전송용 버퍼를 프레임마다 새로 만들지 않으므로 강제 GC 가 필요 없다.
+    (드라이버 capture() 가 돌려주는 bytes 는 여전히 프레임마다 할당되며, 복사 후 바로 버려진다)
+    """
+
+    def __init__(self, count=FRAME_POOL_COUNT, size=DEFAULT_FRAME_BUFFER_BYTES):
+        self.size = size
+        self.bufs = [bytearray(size) for _ in range(count)]
+        self._used = bytearray(count)
+        self._lock = _thread.allocate_lock()
+
+    def resize(self, size):
+        """버퍼 크기 변경 (사용 중이 아닌 슬롯만 다시 할당)"""
+        self.size = size
+        with self._lock:
+            for i, buf in enumerate(self.bufs):
+                if not self._used[i] and len(buf) != size:
+                    self.bufs[i] = None
+                    self.bufs[i] = bytearray(size)
+
+    def acquire(self):
+        """빈 슬롯 번호 (없으면 -1)"""
+        with self._lock:
+            for i in range(len(self._used)):
+                if not self._used[i]:
+                    self._used[i] = 1
+                    return i
+        return -1
+
+    def release(self, slot):
+        if slot >= 0:
+            with self._lock:
+                self._used[slot] = 0
+
+    def store(self, slot, data):
+        """
+        data 를 슬롯 버퍼에 복사 (버퍼보다 크면 4KB 단위로 늘림)
+
+        Returns:
+            int: 저장한 바이트 수
+        """
+        n = len(data)
+        buf = self.bufs[slot]
+        if n > len(buf):
+            logger.warning(f"Frame {n}B exceeds pool buffer {len(buf)}B, growing", "CAM")
+            self.bufs[slot] = None
+            buf = bytearray((n + 4095) & ~4095)
+            self.bufs[slot] = buf
+        buf[:n] = data
+        return n
+
+    def view(self, slot, length):
+        """슬롯 버퍼의 앞 length 바이트 memoryview (복사 없음)"""
+        return memoryview(self.bufs[slot])[:length]
+
+
 class CameraModule:
     def __init__(self):
         """
@@ -20,6 +94,7 @@ class CameraModule:
         self.frame_size = "QVGA"    # 기본 프레임 크기 (320x240)
         self.quality = 85           # 기본 품질 (1-85)
         self.fb_count = 2           # 프레임 버퍼 수
+        self.pool = None            # FramePool (init 시 해상도에 맞춰 생성)
 
     def init(self, frame_size="QVGA", quality=85, fb_count=2):
         """
@@ -77,6 +152,7 @@ class CameraModule:
             # 카메라 초기화
             self.cam.init()
             #self.cam.set_hmirror(True)
+            self._prepare_pool(frame_size)
             self.camera_enabled = True
             logger.info(f"카메라 초기화 성공. 크기: {frame_size}, 품질: {quality}%, 버퍼: {fb_count}", "CAM")
             return True
@@ -101,6 +177,14 @@ class CameraModule:
             machine.reset()  # 하드 리셋 수행
             return False
 
+    def _prepare_pool(self, frame_size):
+        """해상도에 맞는 프레임 버퍼 풀 준비 (이미 있으면 크기만 조정)"""
+        size = FRAME_BUFFER_BYTES.get(frame_size.upper(), DEFAULT_FRAME_BUFFER_BYTES)
+        if self.pool is None:
+            self.pool = FramePool(FRAME_POOL_COUNT, size)
+        elif self.pool.size != size:
+            self.pool.resize(size)
+
     def deinit(self):
         """카메라 리소스 해제"""
         if self.cam is not None:
@@ -169,6 +253,48 @@ class CameraModule:
             logger.error(f"품질 설정 오류: {e}", "CAM")
             return False
 
+    def set_frame_size(self, frame_size):
+        """
+        프레임 크기 변경 (드라이버 재구성, 카메라 재초기화/리셋 없음)
+
+        캡처 중에 호출하면 안 되므로 캡처 스레드에서 호출한다.
+        실패하면 이전 크기로 되돌린다.
+
+        Args:
+            frame_size: 프레임 크기 ("QQVGA", "QVGA", "VGA" 등)
+
+        Returns:
+            bool: 설정 성공 여부
+        """
+        if not self.is_initialized():
+            logger.warning("카메라가 초기화되지 않음", "CAM")
+            return False
+
+        frame_size = frame_size.upper()
+        if frame_size == self.frame_size:
+            return True
+        from camera import FrameSize
+        if not hasattr(FrameSize, frame_size):
+            logger.error(f"지원하지 않는 프레임 크기: {frame_size}", "CAM")
+            return False
+
+        try:
+            self.cam.reconfigure(frame_size=getattr(FrameSize, frame_size))
+            # 재구성 후 품질이 기본값으로 돌아가는 드라이버가 있어 다시 적용
+            self.cam.set_quality(self.quality)
+            self.frame_size = frame_size
+            self._prepare_pool(frame_size)
+            logger.info(f"프레임 크기 {frame_size}로 설정", "CAM")
+            return True
+        except Exception as e:
+            logger.error(f"프레임 크기 설정 오류: {e}", "CAM")
+            try:
+                self.cam.reconfigure(frame_size=getattr(FrameSize, self.frame_size.upper(), FrameSize.QVGA))
+                self.cam.set_quality(self.quality)
+            except Exception:
+                pass
+            return False
+
     def capture_frame(self):
         """
         카메라 프레임 캡처
@@ -226,6 +352,37 @@ class CameraModule:
         logger.error("모든 프레임 캡처 시도 실패", "CAM")
         return None
 
+    def capture_into(self, pool=None):
+        """
+        프레임 버퍼 풀의 빈 슬롯으로 캡처 (강제 GC / 추가 복사 없음)
+
+        드라이버 capture() 는 프레임마다 새 bytes 를 할당해 돌려준다. (into 형태 API 없음)
+        이를 풀 버퍼로 한 번만 복사하고 바로 버리므로 오래 남는 할당은 없다.
+
+        Returns:
+            tuple: (슬롯, 길이) — 실패 시 None (슬롯은 전송 후 pool.release(슬롯))
+        """
+        if not self.is_initialized():
+            return None
+        if pool is None:
+            pool = self.pool
+        slot = pool.acquire()
+        if slot < 0:
+            return None  # 전송이 밀려 빈 버퍼 없음 (이번 캡처는 건너뜀)
+        try:
+            for attempt in range(3):
+                buf = self.cam.capture()
+                if buf and self.validate_jpeg(buf):
+                    n = pool.store(slot, buf)
+                    return slot, n
+                if attempt < 2:
+                    time.sleep_ms(100)  # 센서 안정화 대기 후 재시도
+            logger.error("모든 프레임 캡처 시도 실패", "CAM")
+        except Exception as e:
+            logger.error(f"프레임 캡처 실패: {e}", "CAM")
+        pool.release(slot)
+        return None
+
     def validate_jpeg(self, frame):
         """
         JPEG 이미지 데이터 검증
@@ -242,8 +399,9 @@ class CameraModule:
         # JPEG 시작 마커 (SOI) 확인
         has_soi = frame[0] == 0xFF and frame[1] == 0xD8
         
-        # JPEG 종료 마커 (EOI) 확인
-        has_eoi = frame[-2] == 0xFF and frame[-1] == 0xD9
+        # JPEG 종료 마커 (EOI) 확인 (memoryview 도 지원하도록 양수 인덱스 사용)
+        n = len(frame)
+        has_eoi = frame[n - 2] == 0xFF and frame[n - 1] == 0xD9
         
         return has_soi and has_eoi
 
@@ -0,0 +1,141 @@
+"""
+DC 모터 소프트 스타트 / 가감속(램프) 컨트롤러
+
+MOTOR:SPEED 로 듀티를 한 번에 바꾸면 기동 전류가 튀어서 카메라와 함께 쓸 때
+보드가 리셋(브라운아웃)될 수 있다. 목표 속도만 정해 두면 update() 가 20ms 마다
+설정된 가속도(%/s)로 듀티를 조금씩 바꾼다.
+
+- duty_u16 (0~65535) 사용 (10비트 duty() 대신)
+- 가속도 0 이면 램프 없이 즉시 목표 속도
+- estop(): 램프를 건너뛰고 즉시 듀티 0
+- 진행은 경과 시간 기준이라 메인 루프가 늦어도 가속도는 유지된다.
+- 하드웨어 타이머 대신 메인 루프의 ticks_ms 스케줄을 사용한다. (타이머 0~3 은 이미 할당)
+
+사용 예:
+    from dc_motor_ramp import MotorRamp
+
+    ramp = MotorRamp(machine.PWM(machine.Pin(21)), freq=1000, accel=200)
+    ramp.set_target(80)
+    while True:
+        if ramp.update():
+            print("reached", ramp.speed())
+"""
+
+import time
+
+
+class MotorRamp:
+    """
+    DC 모터 램프 컨트롤러
+
+    Attributes:
+        accel (int): 가속도 (%/s, 0 이면 즉시)
+        freq (int): PWM 주파수 (Hz)
+        duty (int): 현재 출력 듀티 (0~65535)
+        target (int): 목표 듀티 (0~65535)
+    """
+
+    STEP_MS = 20
+    FREQ_MIN = 10
+    FREQ_MAX = 40000
+    DEFAULT_ACCEL = 200     # 0 → 100% 까지 0.5초
+
+    def __init__(self, pwm, freq=500, accel=DEFAULT_ACCEL):
+        self.pwm = pwm
+        self.accel = max(0, int(accel))
+        self.freq = freq
+        self.duty = 0
+        self.target = 0
+        self._last_ms = 0
+        self._next_ms = 0
+        self.set_freq(freq)
+        pwm.duty_u16(0)
+
+    @staticmethod
+    def percent_to_duty(percent):
+        percent = max(0, min(100, percent))
+        return (percent * 65535 + 50) // 100
+
+    @staticmethod
+    def duty_to_percent(duty):
+        return (duty * 100 + 32767) // 65535
+
+    def speed(self):
+        """현재 출력 속도 (%)"""
+        return self.duty_to_percent(self.duty)
+
+    def target_speed(self):
+        """목표 속도 (%)"""
+        return self.duty_to_percent(self.target)
+
+    @property
+    def ramping(self):
+        """목표 속도로 이동 중인지 여부"""
+        return self.duty != self.target
+
+    def set_freq(self, freq):
+        """PWM 주파수 변경 (듀티 비율은 유지)"""
+        freq = int(freq)
+        if not self.FREQ_MIN <= freq <= self.FREQ_MAX:
+            raise ValueError("freq out of range")
+        self.pwm.freq(freq)
+        self.freq = freq
+        # 일부 포트는 주파수 변경 시 듀티가 초기화되므로 다시 적용
+        self.pwm.duty_u16(self.duty)
+
+    def set_accel(self, accel):
+        """가속도 설정 (%/s, 0 이면 즉시)"""
+        self.accel = max(0, int(accel))
+
+    def set_target(self, percent):
+        """
+        목표 속도(0~100%) 설정 후 램프 시작
+
+        Returns:
+            bool: 바로 도착했는지 여부 (가속도 0 또는 이미 같은 속도)
+        """
+        self.target = self.percent_to_duty(int(percent))
+        if self.accel == 0:
+            self._apply(self.target)
+            return True
+        now = time.ticks_ms()
+        self._last_ms = now
+        self._next_ms = now
+        return not self.ramping
+
+    def estop(self):
+        """비상 정지: 램프 없이 즉시 듀티 0"""
+        self.target = 0
+        self._apply(0)
+
+    def _apply(self, duty):
+        self.duty = duty
+        self.pwm.duty_u16(duty)
+
+    def update(self):
+        """
+        STEP_MS 마다 가속도만큼 듀티를 목표 쪽으로 이동 (메인 루프에서 주기 호출)
+
+        Returns:
+            bool: 이번 호출에서 목표 속도에 도착했는지 여부
+        """
+        if self.duty == self.target:
+            return False
+        now = time.ticks_ms()
+        if time.ticks_diff(now, self._next_ms) < 0:
+            return False
+        self._next_ms = time.ticks_add(now, self.STEP_MS)
+
+        dt = time.ticks_diff(now, self._last_ms)
+        # 듀티 변화량 = accel(%/s) x 655.35 x dt(ms) / 1000
+        delta = self.accel * 65535 * dt // 100000
+        if delta <= 0:
+            return False
+        self._last_ms = now
+
+        if self.duty < self.target:
+            duty = min(self.target, self.duty + delta)
+        else:
+            duty = max(self.target, self.duty - delta)
+        self._apply(duty)
+        return duty == self.target
@@ -0,0 +1,102 @@
+"""
+DHT11/DHT22 온습도 캐시 서비스
+
+DHT 센서는 한 번 읽을 때 약 20ms 동안 비트뱅잉 통신을 하고,
+DHT11은 1초(DHT22는 2초)보다 자주 읽으면 실패하거나 이전 값을 돌려준다.
+블록 프로그램이 반복문에서 DHT:STATUS 를 빠르게 보내도 센서를 직접 읽지 않도록,
+메인 루프에서 update()를 호출해 설정한 주기마다 최대 1회만 측정하고
+(온도, 습도, 측정 시각)을 캐시한다.
+
+- 읽기 실패 시 재시도 간격을 두 배씩 늘린다 (최대 max_backoff_ms)
+- 누적 읽기 오류 횟수(error_count)를 보관한다
+
+사용 예:
+    import dht
+    from machine import Pin
+    from dht_service import DhtService
+
+    service = DhtService(dht.DHT11(Pin(4)), period_ms=2000)
+    while True:
+        service.update()
+        cached = service.get_cached()  # (t, h, age_ms) 또는 None
+"""
+
+import time
+
+
+class DhtService:
+    """DHT 센서 주기 측정/캐시 서비스"""
+
+    MIN_PERIOD_MS = 1000  # DHT11 최소 측정 간격
+
+    def __init__(self, sensor, period_ms=2000, max_backoff_ms=16000):
+        """
+        Args:
+            sensor: dht.DHT11 / dht.DHT22 객체
+            period_ms (int): 측정 주기(ms), 최소 MIN_PERIOD_MS
+            max_backoff_ms (int): 실패 시 재시도 간격 상한(ms)
+        """
+        self.sensor = sensor
+        self.period_ms = max(int(period_ms), self.MIN_PERIOD_MS)
+        self.max_backoff_ms = max_backoff_ms
+
+        self.temperature = None
+        self.humidity = None
+        self._measured_ms = None
+
+        self.error_count = 0          # 누적 읽기 오류
+        self.consecutive_errors = 0   # 연속 읽기 오류
+        self._backoff_ms = self.MIN_PERIOD_MS
+        self._next_ms = time.ticks_ms()  # 첫 측정은 즉시 시도
+
+    def set_period(self, period_ms):
+        """측정 주기(ms) 변경"""
+        self.period_ms = max(int(period_ms), self.MIN_PERIOD_MS)
+        if self.consecutive_errors == 0 and self._measured_ms is not None:
+            self._next_ms = time.ticks_add(self._measured_ms, self.period_ms)
+
+    def update(self):
+        """
+        측정 시각이 되었으면 1회 측정한다. (메인 루프에서 주기 호출)
+
+        Returns:
+            bool: 새 측정값이 캐시되었는지 여부
+        """
+        now = time.ticks_ms()
+        if time.ticks_diff(now, self._next_ms) < 0:
+            return False
+
+        try:
+            self.sensor.measure()
+            t = self.sensor.temperature()
+            h = self.sensor.humidity()
+        except Exception:
+            self.error_count += 1
+            self.consecutive_errors += 1
+            self._next_ms = time.ticks_add(now, self._backoff_ms)
+            self._backoff_ms = min(self._backoff_ms * 2, self.max_backoff_ms)
+            return False
+
+        self.temperature = t
+        self.humidity = h
+        self._measured_ms = now
+        self.consecutive_errors = 0
+        self._backoff_ms = self.MIN_PERIOD_MS
+        self._next_ms = time.ticks_add(now, self.period_ms)
+        return True
+
+    def has_data(self):
+        """캐시된 측정값이 있는지 여부"""
+        return self._measured_ms is not None
+
+    def get_cached(self):
+        """
+        캐시된 측정값 반환
+
+        Returns:
+            tuple or None: (temperature, humidity, age_ms)
+        """
+        if self._measured_ms is None:
+            return None
+        age = time.ticks_diff(time.ticks_ms(), self._measured_ms)
+        return self.temperature, self.humidity, age
@@ -14,7 +14,7 @@ BLE 연동 시에는 이 모듈을 통해 측정값을 얻어
 문자열 포맷으로 변환해 보내는 것을 권장합니다.
 """
 
-import machine
+from adc_sampler import AdcSampler, make_adc
 
 
 class DiyASensor:
@@ -27,7 +27,7 @@ class DiyASensor:
         print(status["raw_10bit"], status["voltage_5v"])
     """
 
-    def __init__(self, adc_pin, vref_board=3.3, vref_sensor=5.0):
+    def __init__(self, adc_pin, vref_board=3.3, vref_sensor=5.0, samples=16):
         """
         DIY-A 센서 초기화
 
@@ -35,15 +35,17 @@ class DiyASensor:
             adc_pin (int): ESP32-S3 GPIO 번호 (예: A0=2, A1=1 ...)
             vref_board (float): 보드 ADC 기준 전압 (기본 3.3V)
             vref_sensor (float): 센서 스펙 기준 전압 (기본 5.0V)
+            samples (int): 한 번 읽을 때 평균할 버스트 샘플 수 (기본 16)
         """
         self.adc_pin = adc_pin
         self.vref_board = vref_board
         self.vref_sensor = vref_sensor
 
         # ADC 객체 생성 (12비트, ATTN_11DB -> 약 0~vref_board)
-        self.adc = machine.ADC(machine.Pin(adc_pin))
-        self.adc.atten(machine.ADC.ATTN_11DB)
-        self.adc.width(machine.ADC.WIDTH_12BIT)
+        self.adc = make_adc(adc_pin)
+
+        # 버스트 샘플러 (samples 개 연속 샘플 평균)
+        self._sampler = AdcSampler(self.adc, size=samples)
 
         # 기준값(10비트 스케일, 사용자가 원하는 기준 상태에서 설정 가능)
         self.ref_10bit = None
@@ -52,8 +54,8 @@ class DiyASensor:
     # 기본 읽기 API
     # ------------------------------------------------------------------
     def read_raw_12bit(self):
-        """ADC 12비트 원시값 (0~4095) 반환"""
-        return self.adc.read()
+        """ADC 12비트 원시값 (0~4095) 반환 — 버스트 샘플 평균"""
+        return int(self._sampler.read_mean() + 0.5)
 
     def read_raw_10bit(self):
         """
@@ -66,39 +68,32 @@ class DiyASensor:
 
     def read_voltage_board(self):
         """
-        보드 기준 전압(0~vref_board, 보통 3.3V)으로 환산한 값 반환
+        보드 ADC 핀 전압(V) 반환 — read_uv() 또는 보드 보정 LUT 사용 (adc_calib)
         """
-        raw_12 = self.read_raw_12bit()
-        return (raw_12 / 4095) * self.vref_board
+        return self._sampler.read_mv() / 1000
 
     def read_voltage_5v(self):
         """
         센서 스펙 기준(0~vref_sensor, 기본 5V)으로 환산한 전압 반환
 
         - DIY-A 설명서 기준으로 사용자가 보기 쉬운 값
-        - 내부적으로는 10비트 스케일(0~1023)을 사용해 계산
+        - 보정된 보드 전압을 vref_sensor / vref_board 비율로 환산
         """
-        raw_10 = self.read_raw_10bit()
-        return (raw_10 / 1023) * self.vref_sensor
+        return self.read_voltage_board() * self.vref_sensor / self.vref_board
 
     # ------------------------------------------------------------------
     # 기준값 및 상태 API
     # ------------------------------------------------------------------
-    def calibrate_reference(self, samples=20, delay_ms=50):
+    def calibrate_reference(self, samples=64, delay_ms=0):
         """
         현재 상태를 기준(reference)으로 설정
 
         - 예: 자석/전류가 없는 “기본 상태”에서 호출
         - 이후 diff_10bit = 현재값 - ref_10bit 로 변화량 계산 가능
+        - samples 개를 버스트로 평균 (delay_ms > 0 이면 샘플 간격)
         """
-        import time
-
-        total = 0
-        for _ in range(samples):
-            total += self.read_raw_10bit()
-            time.sleep_ms(delay_ms)
-
-        self.ref_10bit = int(total / samples)
+        raw_12 = self._sampler.read_average(samples, delay_ms * 1000)
+        self.ref_10bit = int(raw_12 * 1023 / 4095)
         return self.ref_10bit
 
     def get_status(self):
@@ -112,7 +107,7 @@ class DiyASensor:
             }
         """
         raw_10 = self.read_raw_10bit()
-        v_5 = (raw_10 / 1023) * self.vref_sensor
+        v_5 = self.read_voltage_5v()
 
         return {
             "raw": raw_10,
@@ -1,30 +1,47 @@
 import machine
-from time import sleep
+import time
+import array
+import json
 import gc
+from adc_calib import calibration
+
+
+CAL_FILE = "/dust_cal.json"
+
 
 class DustSensor:
     """
     먼지 센서(예: GP2Y1010AU0F) 제어를 위한 클래스
+
+    백그라운드 측정 (start):
+    - 하드웨어 타이머가 10ms 주기로 콜백을 호출하고, 콜백 안에서
+      LED ON → 280us 시점 ADC 샘플 → 320us 시점 LED OFF 를 ticks_us 로 정확히 맞춘다.
+      (초 단위 float sleep 을 쓰지 않으며, 펄스 사이 9.68ms 동안 CPU 를 점유하지 않음)
+    - 최근 WINDOW 개 샘플의 이동 평균(정수 합)을 유지하므로 get_status()는 즉시 반환된다.
+    - 보정 기준값(VOC)은 CAL_FILE 에 저장되어 다음 부팅 시 자동으로 불러온다.
     """
     # 상수 설정
-    SAMPLING_TIME = 0.00028  # 샘플링 시간(초)
-    DELTA_TIME = 0.00004     # 델타 시간(초)
-    SLEEP_TIME = 0.00968     # 슬립 시간(초)
-    WARMUP_SAMPLES = 30      # 예열 샘플 수
     CALIBRATION_SAMPLES = 100 # 보정 샘플 수
+    SAMPLE_US = 280          # LED ON 후 샘플 시점(us)
+    PULSE_US = 320           # LED ON 펄스 폭(us)
+    PERIOD_MS = 10           # 펄스 주기(ms)
+    WINDOW = 50              # 이동 평균 샘플 수 (10ms x 50 = 0.5초)
+    TIMER_ID = 2             # 하드웨어 타이머 (EZSOUND 0, SCOPE 1)
     
     
-    def __init__(self, led_pin=39, vo_pin=19):
+    def __init__(self, led_pin=39, vo_pin=19, cal_file=CAL_FILE):
         """
         먼지 센서 초기화
         
         Args:
             led_pin: LED 제어 핀 번호
             vo_pin: 먼지 센서 아날로그 출력 핀 번호
+            cal_file: 보정 기준값(VOC) 저장 파일 (None 이면 저장 안 함)
         """
         # 핀 설정
         self.led_pin = machine.Pin(led_pin, machine.Pin.OUT)
         self.vo_pin = machine.ADC(vo_pin)
+        self.cal_file = cal_file
         
         # ESP32 여부 확인 및 ADC 설정
         self.is_esp32 = hasattr(machine, 'TouchPad')
@@ -41,15 +58,125 @@ class DustSensor:
         self.max_density = 0  # 최대 먼지 밀도
         self.is_calibrated = False
         
+        # 백그라운드 측정 상태 (타이머 콜백에서 갱신, 할당 없음)
+        self._timer = None
+        self._win = array.array("H", bytes(2 * self.WINDOW))
+        self._win_idx = 0
+        self._win_count = 0
+        self._win_sum = 0
+        self.pulse_count = 0
+        self._led_value = self.led_pin.value
+        self._adc_read = self.vo_pin.read
+        self._cb = self._pulse_irq
+        
         # LED 초기 상태: 꺼짐
         self.led_pin.value(1)
 
-        # 초기 보정 시도 (아직 보정되지 않은 경우에만)
-        #if not self.is_calibrated or self.voc is None:
-        #    self.calibrate(20)  # 적은 샘플로 빠른 보정
-        
+        # 저장된 보정값이 있으면 사용
+        self._load_calibration()
+
+    # -------------------------------
+    # 보정값 저장/불러오기
+    # -------------------------------
+    def _load_calibration(self):
+        """저장된 VOC 기준값을 불러온다. (성공 여부 반환)"""
+        if not self.cal_file:
+            return False
+        try:
+            with open(self.cal_file, "r") as f:
+                self.voc = float(json.load(f)["voc"])
+            self.is_calibrated = True
+            return True
+        except Exception:
+            return False
+
+    def save_calibration(self):
+        """현재 VOC 기준값을 저장한다. (성공 여부 반환)"""
+        if not self.cal_file or self.voc is None:
+            return False
+        try:
+            with open(self.cal_file, "w") as f:
+                json.dump({"voc": self.voc}, f)
+            return True
+        except Exception:
+            return False
+
+    # -------------------------------
+    # 백그라운드 측정
+    # -------------------------------
+    def start(self, timer_id=TIMER_ID):
+        """타이머 기반 10ms 주기 펄스 측정 시작"""
+        self.stop()
+        for i in range(self.WINDOW):
+            self._win[i] = 0
+        self._win_idx = 0
+        self._win_count = 0
+        self._win_sum = 0
+        self._timer = machine.Timer(timer_id)
+        self._timer.init(period=self.PERIOD_MS, mode=machine.Timer.PERIODIC, callback=self._cb)
+
+    def stop(self):
+        """백그라운드 측정 중지 (타이머 해제, LED 끄기)"""
+        if self._timer is not None:
+            try:
+                self._timer.deinit()
+            except Exception:
+                pass
+            self._timer = None
+        self.led_pin.value(1)
+
+    def is_running(self):
+        """백그라운드 측정 중인지 여부"""
+        return self._timer is not None
+
+    def _pulse_irq(self, _timer):
+        """
+        타이머 콜백: LED 펄스 1회 + 280us 시점 샘플 + 이동 평균 갱신
+        (콜백 안에서 펄스 전체를 처리하므로 콜백 지연은 주기에만 영향)
+        """
+        ticks_us = time.ticks_us
+        ticks_diff = time.ticks_diff
+        led = self._led_value
+        sample_us = self.SAMPLE_US
+        pulse_us = self.PULSE_US
+
+        led(0)  # LED 켜기 (Active Low)
+        t0 = ticks_us()
+        while ticks_diff(ticks_us(), t0) < sample_us:
+            pass
+        v = self._adc_read()
+        while ticks_diff(ticks_us(), t0) < pulse_us:
+            pass
+        led(1)  # LED 끄기
+
+        i = self._win_idx
+        self._win_sum += v - self._win[i]
+        self._win[i] = v
+        i += 1
+        if i >= self.WINDOW:
+            i = 0
+        self._win_idx = i
+        if self._win_count < self.WINDOW:
+            self._win_count += 1
+        self.pulse_count += 1
+
+    def read_average_raw(self):
+        """이동 평균 원시값 (샘플이 없으면 None)"""
+        n = self._win_count
+        if n == 0:
+            return None
+        return self._win_sum / n
+
     def calc_volt(self, val):
-        """ADC 값을 전압으로 변환 (0-3.3V)"""
+        """
+        ADC 값을 전압으로 변환 (ESP32: 보드 보정 LUT, adc_calib)
+
+        타이머 콜백에서 LED 펄스마다 raw 1회만 읽어 이동 평균하므로 read_uv() 대신 항상 LUT 를 쓴다.
+        read_uv() 지원 펌웨어에서는 LUT 가 기본 선형 환산(raw/4095*3.3)이라 EZVOLT 등 read_uv() 경로와
+        수십 mV 차이가 날 수 있다. 먼지 농도는 기준 전압(voc)과의 차이로 계산하므로 영향은 작다.
+        """
+        if self.adc_max == 4095:
+            return calibration.raw_to_volt(int(val + 0.5))
         return val * 3.3 / self.adc_max
     
     def calc_density(self, vo, k=0.5):
@@ -76,7 +203,10 @@ class DustSensor:
     
     def calibrate(self, samples=None):
         """
-        센서 보정 - 깨끗한 공기에서 기준 VOC 값 설정
+        센서 보정 - 깨끗한 공기에서 기준 VOC 값 설정 후 저장
+        
+        - 백그라운드 측정 중이면 이동 평균 창의 샘플로 즉시 계산 (대기 없음)
+        - 측정 중이 아니면 정확한 타이밍의 펄스로 samples 개를 측정
         
         Args:
             samples: 보정을 위한 샘플 수 (기본값: self.CALIBRATION_SAMPLES)
@@ -86,80 +216,72 @@ class DustSensor:
         """
         if samples is None:
             samples = self.CALIBRATION_SAMPLES
-            
-        print("센서 예열 중...")
-        # 센서 예열
-        for _ in range(self.WARMUP_SAMPLES):
-            self.led_pin.value(0)  # LED 켜기
-            sleep(0.2)
-            self.led_pin.value(1)  # LED 끄기
-            sleep(0.1)
-        
-        print("센서 보정 중... (깨끗한 공기에서 실행하세요)")
-        vals = []
-        
-        # 보정용 샘플 수집
-        for i in range(samples):
-            # 측정 사이클
-            self.led_pin.value(0)  # LED 켜기
-            sleep(self.SAMPLING_TIME)
-            val = self.vo_pin.read()
-            vals.append(val)
-            sleep(self.DELTA_TIME)
-            self.led_pin.value(1)  # LED 끄기
-            sleep(self.SLEEP_TIME)
-            
-            # 진행 상황 표시
-            if (i+1) % 20 == 0:
-                print(f"보정 진행률: {i+1}/{samples}")
+
+        if self.is_running():
+            count = self._win_count
+            if count == 0:
+                raise ValueError("No samples yet")
+            vals = list(self._win[:count])
+        else:
+            vals = [self.read_raw() for _ in range(samples)]
         
         # 이상치 제거 (상위 10%, 하위 10% 제거)
+        count = len(vals)
         vals.sort()
-        valid_vals = vals[samples//10:samples-samples//10]
+        valid_vals = vals[count//10:count-count//10]
         
         # 보정값 계산 및 설정
         avg = sum(valid_vals) / len(valid_vals)
         self.voc = self.calc_volt(avg)
         self.is_calibrated = True
+        self.save_calibration()
         
-        print(f"보정 완료. 기준 VOC: {self.voc:.3f}V")
         return self.voc
     
     def read_raw(self):
         """
-        센서에서 단일 원시 ADC 값을 읽기
+        센서에서 단일 원시 ADC 값을 읽기 (블로킹 1주기, 백그라운드 측정 미사용 시)
         
         Returns:
             int: 원시 ADC 값
         """
+        t0 = time.ticks_us()
         self.led_pin.value(0)  # LED 켜기
-        sleep(self.SAMPLING_TIME)
+        while time.ticks_diff(time.ticks_us(), t0) < self.SAMPLE_US:
+            pass
         val = self.vo_pin.read()
-        sleep(self.DELTA_TIME)
+        while time.ticks_diff(time.ticks_us(), t0) < self.PULSE_US:
+            pass
         self.led_pin.value(1)  # LED 끄기
-        sleep(self.SLEEP_TIME)
+        time.sleep_us(self.PERIOD_MS * 1000 - self.PULSE_US)
         return val
     
     def read(self, samples=10):
         """
         먼지 농도를 측정하여 반환
         
+        - 백그라운드 측정 중이면 이동 평균으로 즉시 계산 (samples 무시)
+        - 아니면 samples 개를 직접 측정 (10ms/샘플)
+        
         Args:
             samples: 평균을 위한 샘플 수
         
         Returns:
             tuple: (밀도(μg/m³), 전압(V), 원시ADC값)
         """
-        # 보정되지 않았으면 보정 실행
-        if not self.is_calibrated and self.voc is None:
-            self.calibrate(20)  # 적은 샘플로 빠른 보정
-        
-        vals = []
-        for _ in range(samples):
-            vals.append(self.read_raw())
+        avg = None
+        if self.is_running():
+            # 시작 직후라면 첫 펄스 샘플을 잠깐 기다림 (최대 몇 주기)
+            t0 = time.ticks_ms()
+            while self._win_count == 0 and time.ticks_diff(time.ticks_ms(), t0) < 5 * self.PERIOD_MS:
+                time.sleep_ms(1)
+            avg = self.read_average_raw()
+        if avg is None:
+            vals = []
+            for _ in range(samples):
+                vals.append(self.read_raw())
+            avg = sum(vals) / len(vals)
         
-        # 평균값 계산
-        avg = sum(vals) / len(vals)
         volt = self.calc_volt(avg)
         density = self.calc_density(volt)
         
@@ -8,6 +8,11 @@ EZMaker 전용 전류센서(EZCURR, INA219 기반) 드라이버
     - 전류 (mA)
     - 전력 (mW, W)
 
+연속 측정/에너지 적산:
+- ADC 평균 모드(1~128 샘플)를 설정할 수 있다.
+- update()는 변환 완료(CNVR) 플래그가 설정된 경우에만 전압/샌트/전류/전력을
+  한 번에 읽어 캐시하고, ticks_us 간격으로 mAh / mWh 를 적산한다. (메인 루프에서 호출)
+
 주의:
 - 실제 샌트 저항 값(Rshunt)이 몇 Ω 인지에 따라 보정이 필요합니다.
 - EZMaker 보드의 회로 설계에 맞춰 shunt_ohms, current_lsb 등을 조정해야 합니다.
@@ -26,6 +31,9 @@ class EzCurrSensor:
         sensor = EzCurrSensor(i2c)
         status = sensor.get_status()
         print(status["voltage"], status["current_mA"], status["power_mW"])
+
+        sensor.update()          # 메인 루프에서 주기 호출 (에너지 적산)
+        print(sensor.get_energy())
     """
 
     # INA219 레지스터 주소
@@ -36,7 +44,24 @@ class EzCurrSensor:
     REG_CURRENT = 0x04
     REG_CALIBRATION = 0x05
 
-    def __init__(self, i2c, addr=0x40, shunt_ohms=0.1, max_expected_amps=3.2):
+    # 버스 전압 레지스터 상태 비트
+    _BUS_CNVR = 0x02  # 변환 완료 (전력 레지스터 읽기 시 클리어)
+    _BUS_OVF = 0x01   # 수학 오버플로
+
+    # ADC 설정 코드 (BADC/SADC, 12비트 기준)
+    # 샘플 수 -> (코드, 변환시간 us)
+    _ADC_AVG = {
+        1: (0x3, 532),
+        2: (0x9, 1060),
+        4: (0xA, 2130),
+        8: (0xB, 4260),
+        16: (0xC, 8510),
+        32: (0xD, 17020),
+        64: (0xE, 34050),
+        128: (0xF, 68100),
+    }
+
+    def __init__(self, i2c, addr=0x40, shunt_ohms=0.1, max_expected_amps=3.2, samples=1):
         """
         EzCurrSensor 초기화
 
@@ -45,11 +70,29 @@ class EzCurrSensor:
             addr (int): INA219 I2C 주소 (기본 0x40)
             shunt_ohms (float): 샌트 저항 값 (Ω)
             max_expected_amps (float): 예상 최대 전류 (A)
+            samples (int): ADC 평균 샘플 수 (1, 2, 4, ... 128)
         """
         self.i2c = i2c
         self.addr = addr
         self.shunt_ohms = shunt_ohms
         self.max_expected_amps = max_expected_amps
+        self.samples = samples
+
+        # 레지스터 읽기/쓰기 버퍼 (재사용)
+        self._rbuf = bytearray(2)
+        self._wbuf = bytearray(2)
+
+        # 최근 측정값 캐시
+        self._voltage = None
+        self._shunt_mV = None
+        self._current_mA = None
+        self._power_mW = None
+        self._sample_us = None
+
+        # 에너지 적산
+        self.charge_mAh = 0.0
+        self.energy_mWh = 0.0
+        self._integrated_us = 0
 
         # 보정 관련 값 (데이터시트 공식 기반 단순 버전)
         # current_LSB ~ max_current / 32767
@@ -76,7 +119,7 @@ class EzCurrSensor:
         """
         16비트 레지스터 쓰기 (big-endian)
         """
-        data = bytearray(2)
+        data = self._wbuf
         data[0] = (value >> 8) & 0xFF
         data[1] = value & 0xFF
         self.i2c.writeto_mem(self.addr, reg, data)
@@ -85,9 +128,17 @@ class EzCurrSensor:
         """
         16비트 레지스터 읽기 (big-endian)
         """
-        data = self.i2c.readfrom_mem(self.addr, reg, 2)
+        data = self._rbuf
+        self.i2c.readfrom_mem_into(self.addr, reg, data)
         return (data[0] << 8) | data[1]
 
+    def _read_signed(self, reg):
+        """16비트 signed 레지스터 읽기"""
+        raw = self._read_register(reg)
+        if raw & 0x8000:
+            raw -= 1 << 16
+        return raw
+
     # -------------------------------
     # 센서 설정
     # -------------------------------
@@ -95,6 +146,10 @@ class EzCurrSensor:
         """
         INA219 구성 레지스터 및 보정 레지스터 설정
         """
+        adc, conv_us = self._ADC_AVG[self.samples]
+        # 버스/샌트 변환이 번갈아 수행되므로 한 주기는 두 변환시간의 합
+        self.conversion_us = conv_us * 2
+
         # 1) 보정값 설정
         try:
             self._write_register(self.REG_CALIBRATION, self.calibration_value)
@@ -103,17 +158,101 @@ class EzCurrSensor:
             return
 
         # 2) 구성 레지스터 설정
-        # - Bus Voltage Range: 32V
-        # - Gain: /8 (320mV)
-        # - Bus ADC: 12bit
-        # - Shunt ADC: 12bit
+        # - Bus Voltage Range: 16V (BRNG=0)
+        # - Gain: /1 (40mV, PG=00)
+        # - Bus/Shunt ADC: 12bit, samples 회 평균 (samples=1 이면 0x019F)
         # - Mode: Shunt and Bus, Continuous
-        config = 0x019F  # 데이터시트 예제 설정값 사용
+        config = (adc << 7) | (adc << 3) | 0x7
         try:
             self._write_register(self.REG_CONFIG, config)
         except OSError:
             return
 
+    def set_averaging(self, samples):
+        """
+        ADC 평균 샘플 수 설정 (1, 2, 4, 8, 16, 32, 64, 128)
+        """
+        if samples not in self._ADC_AVG:
+            raise ValueError("samples must be one of 1,2,4,...,128")
+        self.samples = samples
+        self._configure()
+
+    # -------------------------------
+    # 연속 측정 / 에너지 적산
+    # -------------------------------
+    def update(self):
+        """
+        변환 완료(CNVR)된 경우에만 버스 전압/샌트/전류/전력을 한 번에 읽어 캐시하고
+        이전 샘플과의 ticks_us 간격으로 mAh/mWh 를 적산한다. (메인 루프에서 호출)
+
+        Returns:
+            bool: 새 측정값을 읽었는지 여부
+        """
+        try:
+            bus = self._read_register(self.REG_BUS_VOLTAGE)
+            if not (bus & self._BUS_CNVR):
+                return False
+            shunt = self._read_signed(self.REG_SHUNT_VOLTAGE)
+            current = self._read_signed(self.REG_CURRENT)
+            # 전력 레지스터 읽기가 CNVR 을 클리어하므로 마지막에 읽는다
+            power = self._read_register(self.REG_POWER)
+        except OSError:
+            return False
+
+        now = time.ticks_us()
+        voltage = (bus >> 3) * 0.004          # LSB = 4mV
+        shunt_mV = shunt * 0.01               # LSB = 10uV
+        current_mA = current * self._current_LSB_mA
+        power_mW = power * self._power_LSB_mW
+
+        # 사다리꼴 적분 (1 mAh = 3.6e9 mA*us)
+        if self._sample_us is not None:
+            dt = time.ticks_diff(now, self._sample_us)
+            if dt > 0:
+                self.charge_mAh += (current_mA + self._current_mA) * dt / 7.2e9
+                self.energy_mWh += (power_mW + self._power_mW) * dt / 7.2e9
+                self._integrated_us += dt
+
+        self._voltage = voltage
+        self._shunt_mV = shunt_mV
+        self._current_mA = current_mA
+        self._power_mW = power_mW
+        self._sample_us = now
+        return True
+
+    def _ensure_sample(self):
+        """캐시가 없으면 한 변환 주기 동안 새 측정값을 기다린다."""
+        if self._sample_us is not None:
+            return
+        start = time.ticks_us()
+        while not self.update():
+            if time.ticks_diff(time.ticks_us(), start) > self.conversion_us * 2 + 2000:
+                break
+            time.sleep_ms(1)
+
+    def get_energy(self):
+        """
+        적산된 에너지 반환
+
+        Returns:
+            dict: {
+                "charge_mAh": float,  # 누적 전하량 (mAh)
+                "energy_mWh": float,  # 누적 에너지 (mWh)
+                "seconds": float,     # 적산 시간 (s)
+            }
+        """
+        return {
+            "charge_mAh": self.charge_mAh,
+            "energy_mWh": self.energy_mWh,
+            "seconds": self._integrated_us / 1000000,
+        }
+
+    def reset_energy(self):
+        """에너지 적산값 초기화"""
+        self.charge_mAh = 0.0
+        self.energy_mWh = 0.0
+        self._integrated_us = 0
+
     # -------------------------------
     # 측정 API
     # -------------------------------
@@ -162,23 +301,24 @@ class EzCurrSensor:
 
     def get_status(self):
         """
-        전류센서 상태를 딕셔너리로 반환
+        전류센서 상태를 딕셔너리로 반환 (새 변환이 있으면 갱신 후 캐시 반환)
 
         Returns:
             dict: {
                 "voltage": float or None,     # 버스 전압 (V)
+                "shunt_mV": float or None,    # 샌트 전압 (mV)
                 "current_mA": float or None,  # 전류 (mA)
                 "power_mW": float or None,    # 전력 (mW)
             }
         """
-        voltage = self.read_bus_voltage_voltage()
-        current_mA = self.read_current_mA()
-        power_mW = self.read_power_mW()
+        self.update()
+        self._ensure_sample()
 
         return {
-            "voltage": voltage,
-            "current_mA": current_mA,
-            "power_mW": power_mW,
+            "voltage": self._voltage,
+            "shunt_mV": self._shunt_mV,
+            "current_mA": self._current_mA,
+            "power_mW": self._power_mW,
         }
 
 
@@ -1,4 +1,5 @@
 import time
+import struct
 from machine import UART, Pin
 
 
@@ -10,12 +11,43 @@ class EzDustSensor:
     - 한 번의 측정으로 PM1.0 / PM2.5 / PM10 값을 모두 제공
     - 펌웨어/블록에서는 한 블록에서 세 값을 선택해서 사용할 수 있도록,
       get_status()에서 세 값을 모두 반환한다.
+
+    수신 방식:
+    - 센서는 약 1초마다 프레임을 스스로 송신한다.
+    - 메인 루프(스케줄러)에서 poll()을 주기적으로 호출하면, UART에 쌓인
+      바이트를 미리 할당한 수신 버퍼로 한 번에 옮기고(memoryview),
+      버퍼 안에서 헤더(0x42, 0x4D)를 찾아 완성된 프레임만 해석한다.
+    - get_status()는 캐시된 최신 값을 즉시 반환한다. (블로킹 없음)
     """
 
     # PMS7003/PMS7003M 프로토콜 상수
     _FRAME_HEADER_HIGH = 0x42
     _FRAME_HEADER_LOW = 0x4D
     _FRAME_LENGTH = 32  # 전체 프레임 길이 (헤더 2바이트 포함)
+    _FRAME_DATA_LENGTH = 28  # Byte 2~3 에 기록되는 데이터 길이 (2*13 + 체크섬 2)
+
+    # 수신 버퍼 크기 (프레임 4개분, 9600bps 기준 약 130ms 분량)
+    _RX_BUF_SIZE = 128
+
+    # 이동 평균 윈도우 크기 (프레임 개수, 약 1초/프레임)
+    _AVG_WINDOW = 8
+
+    # 프레임 Byte 4~29 (13 워드, big-endian) 필드 이름
+    FIELDS = (
+        "pm1_0_cf1",   # PM1.0 (CF=1, 표준 입자, μg/m³)
+        "pm2_5_cf1",   # PM2.5 (CF=1)
+        "pm10_cf1",    # PM10  (CF=1)
+        "pm1_0",       # PM1.0 (대기 환경, μg/m³)
+        "pm2_5",       # PM2.5 (대기 환경)
+        "pm10",        # PM10  (대기 환경)
+        "n0_3",        # 0.1L 공기 중 0.3μm 이상 입자 수
+        "n0_5",        # 0.5μm 이상
+        "n1_0",        # 1.0μm 이상
+        "n2_5",        # 2.5μm 이상
+        "n5_0",        # 5.0μm 이상
+        "n10",         # 10μm 이상
+        "reserved",    # 예약 (버전/에러 코드)
+    )
 
     def __init__(
         self,
@@ -24,6 +56,7 @@ class EzDustSensor:
         uart_id: int = 1,
         baudrate: int = 9600,
         timeout_ms: int = 1000,
+        avg_window: int = _AVG_WINDOW,
     ):
         """
         Args:
@@ -31,7 +64,8 @@ class EzDustSensor:
             tx_pin: UART TX 핀 번호 (센서의 RX에 연결)
             uart_id: 사용 할 UART 채널 (기본값 1)
             baudrate: 통신 속도 (PMS7003M 기본 9600 bps)
-            timeout_ms: 프레임 수신 타임아웃 (ms)
+            timeout_ms: 첫 프레임 수신 대기 타임아웃 (ms)
+            avg_window: PM 이동 평균 윈도우 크기 (프레임 개수)
         """
         self.rx_pin = rx_pin
         self.tx_pin = tx_pin
@@ -46,61 +80,153 @@ class EzDustSensor:
             stop=1,
             rx=Pin(rx_pin),
             tx=Pin(tx_pin),
+            rxbuf=256,
         )
 
-        # 최근 측정값 캐시
-        self._pm1_0 = None
-        self._pm2_5 = None
-        self._pm10 = None
-
-    def _read_frame(self) -> bytes:
+        # 수신 버퍼 (미리 할당, 이후 재할당 없음)
+        self._rx_buf = bytearray(self._RX_BUF_SIZE)
+        self._rx_mv = memoryview(self._rx_buf)
+        self._rx_len = 0
+
+        # 최근 프레임 캐시 (13 필드)
+        self._fields = None
+        self._last_frame_ms = None
+        self.frame_count = 0
+        self.checksum_errors = 0
+
+        # PM1.0 / PM2.5 / PM10 (대기 환경) 이동 평균
+        if avg_window < 1:
+            avg_window = 1
+        self._avg_window = avg_window
+        self._avg_hist = [[0] * avg_window for _ in range(3)]
+        self._avg_sum = [0, 0, 0]
+        self._avg_idx = 0
+        self._avg_count = 0
+
+    # ------------------------------------------------------------------
+    # 수신/파싱
+    # ------------------------------------------------------------------
+    def poll(self) -> int:
         """
-        PMS7003M 데이터 프레임(32 바이트)을 읽어 반환한다.
-        유효한 헤더(0x42, 0x4D)와 체크섬을 검사한다.
+        UART 수신 바이트를 버퍼로 옮기고 완성된 프레임을 해석한다.
+        메인 루프에서 주기적으로 호출한다. (블로킹 없음)
 
         Returns:
-            bytes: 유효한 전체 프레임 (길이 32)
-
-        Raises:
-            RuntimeError: 타임아웃 또는 체크섬 오류
+            int: 이번 호출에서 새로 해석한 유효 프레임 수
         """
-        start = time.ticks_ms()
-
-        while time.ticks_diff(time.ticks_ms(), start) < self.timeout_ms:
-            if self._uart.any() < 2:
-                # 헤더를 기다림
-                time.sleep_ms(10)
-                continue
-
-            # 헤더 탐색
-            first = self._uart.read(1)
-            if not first:
-                continue
-            if first[0] != self._FRAME_HEADER_HIGH:
-                # 헤더가 아니면 다음 바이트로 이동
-                continue
-
-            second = self._uart.read(1)
-            if not second or second[0] != self._FRAME_HEADER_LOW:
-                # 두 번째 헤더 바이트가 일치하지 않으면 다시 탐색
-                continue
-
-            # 나머지 프레임(30바이트) 읽기
-            rest = self._uart.read(self._FRAME_LENGTH - 2)
-            if not rest or len(rest) != self._FRAME_LENGTH - 2:
-                # 길이가 부족하면 계속 대기
+        parsed = 0
+        while True:
+            free = self._RX_BUF_SIZE - self._rx_len
+            if free <= 0:
+                # 헤더 없이 버퍼가 가득 찬 경우: 마지막 1바이트만 남기고 버림
+                self._compact(self._RX_BUF_SIZE - 1)
+                free = self._RX_BUF_SIZE - self._rx_len
+
+            if not self._uart.any():
+                break
+            n = self._uart.readinto(self._rx_mv[self._rx_len:], free)
+            if not n:
+                break
+            self._rx_len += n
+            parsed += self._scan()
+
+        return parsed
+
+    def _scan(self) -> int:
+        """
+        수신 버퍼에서 프레임 경계를 찾아 유효 프레임을 해석하고
+        소비한 바이트를 버퍼 앞쪽에서 제거한다.
+        """
+        buf = self._rx_buf
+        mv = self._rx_mv
+        length = self._rx_len
+        frame_len = self._FRAME_LENGTH
+        parsed = 0
+        pos = 0
+
+        while length - pos >= 2:
+            # 헤더(0x42, 0x4D) 탐색
+            start = self._find_header(pos, length)
+            if start < 0:
+                # 마지막 바이트가 0x42이면 다음 수신을 위해 남겨둔다
+                pos = length - 1 if buf[length - 1] == self._FRAME_HEADER_HIGH else length
+                break
+
+            if length - start < frame_len:
+                # 프레임이 아직 다 들어오지 않음
+                pos = start
+                break
+
+            # 데이터 길이 필드가 맞지 않으면 가짜 헤더로 보고 건너뜀
+            if ((buf[start + 2] << 8) | buf[start + 3]) != self._FRAME_DATA_LENGTH:
+                pos = start + 1
                 continue
 
-            frame = bytes([self._FRAME_HEADER_HIGH, self._FRAME_HEADER_LOW]) + rest
-
-            # 체크섬 검증
-            if not self._validate_checksum(frame):
-                # 잘못된 프레임이면 계속 다음 프레임 탐색
+            end = start + frame_len
+            calc = sum(mv[start:end - 2]) & 0xFFFF
+            recv = (buf[end - 2] << 8) | buf[end - 1]
+            if calc != recv:
+                self.checksum_errors += 1
+                pos = start + 1
                 continue
 
-            return frame
+            self._decode(start)
+            parsed += 1
+            pos = end
+
+        self._compact(pos)
+        return parsed
+
+    def _find_header(self, pos: int, length: int) -> int:
+        """버퍼 [pos, length) 구간에서 헤더 위치를 찾는다. 없으면 -1"""
+        buf = self._rx_buf
+        high = self._FRAME_HEADER_HIGH
+        low = self._FRAME_HEADER_LOW
+        for i in range(pos, length - 1):
+            if buf[i] == high and buf[i + 1] == low:
+                return i
+        return -1
+
+    def _compact(self, consumed: int):
+        """버퍼 앞쪽 consumed 바이트를 제거하고 남은 바이트를 앞으로 당긴다."""
+        if consumed <= 0:
+            return
+        remain = self._rx_len - consumed
+        if remain > 0:
+            if consumed >= remain:
+                # 겹치지 않는 구간: memoryview 복사 (임시 객체 할당 없음)
+                self._rx_mv[0:remain] = self._rx_mv[consumed:self._rx_len]
+            else:
+                buf = self._rx_buf
+                for i in range(remain):
+                    buf[i] = buf[consumed + i]
+        else:
+            remain = 0
+        self._rx_len = remain
+
+    def _decode(self, start: int):
+        """
+        버퍼의 start 위치에 있는 검증된 프레임을 해석해 캐시를 갱신한다.
 
-        raise RuntimeError("PMS7003M frame timeout")
+        - Byte  4~29: 13개 16비트 필드 (FIELDS 순서)
+        - Byte 30~31: 체크섬
+        여기서 PM 값은 “대기 환경값(Byte 10~15)”을 사용한다.
+        """
+        fields = struct.unpack_from(">13H", self._rx_buf, start + 4)
+        self._fields = fields
+        self._last_frame_ms = time.ticks_ms()
+        self.frame_count += 1
+
+        # 대기 환경 PM1.0 / PM2.5 / PM10 이동 평균 갱신
+        idx = self._avg_idx
+        for k in range(3):
+            value = fields[3 + k]
+            hist = self._avg_hist[k]
+            self._avg_sum[k] += value - hist[idx]
+            hist[idx] = value
+        self._avg_idx = (idx + 1) % self._avg_window
+        if self._avg_count < self._avg_window:
+            self._avg_count += 1
 
     @staticmethod
     def _validate_checksum(frame: bytes) -> bool:
@@ -113,69 +239,96 @@ class EzDustSensor:
         if len(frame) != EzDustSensor._FRAME_LENGTH:
             return False
 
-        data = frame[:-2]
-        checksum_bytes = frame[-2:]
-        calc = sum(data) & 0xFFFF
-        recv = (checksum_bytes[0] << 8) | checksum_bytes[1]
+        calc = sum(memoryview(frame)[:-2]) & 0xFFFF
+        recv = (frame[-2] << 8) | frame[-1]
         return calc == recv
 
-    def _parse_frame(self, frame: bytes):
-        """
-        PMS7003M 프레임에서 PM1.0 / PM2.5 / PM10 값을 파싱한다.
+    # ------------------------------------------------------------------
+    # 조회 API
+    # ------------------------------------------------------------------
+    def has_data(self) -> bool:
+        """유효 프레임을 한 번 이상 수신했는지 여부"""
+        return self._fields is not None
 
-        - 데이터 포맷 (데이터시트 기준):
-          Byte  0: 0x42
-          Byte  1: 0x4D
-          Byte  2: 데이터 길이 상위바이트
-          Byte  3: 데이터 길이 하위바이트
-          Byte  4~5 : PM1.0 (CF=1, 표준 입자, μg/m³)
-          Byte  6~7 : PM2.5 (CF=1)
-          Byte  8~9 : PM10  (CF=1)
-          Byte 10~11: PM1.0 (대기 환경, μg/m³)
-          Byte 12~13: PM2.5 (대기 환경)
-          Byte 14~15: PM10  (대기 환경)
+    def age_ms(self):
+        """마지막 유효 프레임 이후 경과 시간(ms), 없으면 None"""
+        if self._last_frame_ms is None:
+            return None
+        return time.ticks_diff(time.ticks_ms(), self._last_frame_ms)
 
-        여기서는 “대기 환경값(Byte 10~15)”을 사용한다.
+    def _wait_first_frame(self):
         """
-        if len(frame) != self._FRAME_LENGTH:
-            raise ValueError("Invalid frame length")
+        아직 프레임이 없을 때만 timeout_ms 동안 수신을 기다린다.
+        (핀 설정 직후 첫 STATUS 요청 대비)
 
-        # 대기 환경 기준 PM 값들
-        pm1_atm = (frame[10] << 8) | frame[11]
-        pm2_5_atm = (frame[12] << 8) | frame[13]
-        pm10_atm = (frame[14] << 8) | frame[15]
-
-        self._pm1_0 = pm1_atm
-        self._pm2_5 = pm2_5_atm
-        self._pm10 = pm10_atm
+        Raises:
+            RuntimeError: 타임아웃
+        """
+        start = time.ticks_ms()
+        while self._fields is None:
+            self.poll()
+            if self._fields is not None:
+                break
+            if time.ticks_diff(time.ticks_ms(), start) >= self.timeout_ms:
+                raise RuntimeError("PMS7003M frame timeout")
+            time.sleep_ms(10)
 
     def read(self):
         """
-        센서로부터 한 프레임을 읽고 PM 값을 업데이트한다.
+        수신된 바이트를 처리한 뒤 최신 PM 값을 반환한다.
 
         Returns:
             tuple: (pm1_0, pm2_5, pm10) [μg/m³]
         """
-        frame = self._read_frame()
-        self._parse_frame(frame)
-        return self._pm1_0, self._pm2_5, self._pm10
+        self.poll()
+        self._wait_first_frame()
+        f = self._fields
+        return f[3], f[4], f[5]
+
+    def read_average(self):
+        """
+        최근 avg_window 프레임의 PM 이동 평균을 반환한다.
+
+        Returns:
+            tuple: (pm1_0, pm2_5, pm10) [μg/m³, float]
+        """
+        self.poll()
+        self._wait_first_frame()
+        n = self._avg_count
+        s = self._avg_sum
+        return s[0] / n, s[1] / n, s[2] / n
+
+    def read_fields(self) -> dict:
+        """
+        최신 프레임의 13개 필드 전체를 dict로 반환한다.
+        """
+        self.poll()
+        self._wait_first_frame()
+        return dict(zip(self.FIELDS, self._fields))
 
     def get_status(self):
         """
-        현재 미세먼지 상태를 dict로 반환한다.
+        현재 미세먼지 상태를 dict로 반환한다. (캐시 기반, 즉시 반환)
 
         Returns:
             dict: {
                 "pm1_0": PM1.0 (극초미세먼지, μg/m³),
                 "pm2_5": PM2.5 (초미세먼지, μg/m³),
                 "pm10":  PM10  (미세먼지, μg/m³),
+                "avg_pm1_0", "avg_pm2_5", "avg_pm10": 이동 평균 (μg/m³),
+                "age_ms": 마지막 프레임 이후 경과 시간(ms),
             }
         """
         pm1_0, pm2_5, pm10 = self.read()
+        avg1_0, avg2_5, avg10 = self.read_average()
         return {
             "pm1_0": pm1_0,
             "pm2_5": pm2_5,
             "pm10": pm10,
+            "avg_pm1_0": avg1_0,
+            "avg_pm2_5": avg2_5,
+            "avg_pm10": avg10,
+            "age_ms": self.age_ms(),
         }
 
 
@@ -185,14 +338,13 @@ if __name__ == "__main__":
     sensor = EzDustSensor(rx_pin=18, tx_pin=17)  # 예시 핀 번호
     while True:
         try:
+            sensor.poll()
             status = sensor.get_status()
             print(
-                "PM1.0={pm1_0} μg/m³, PM2.5={pm2_5} μg/m³, PM10={pm10} μg/m³".format(
+                "PM1.0={pm1_0} μg/m³, PM2.5={pm2_5} μg/m³, PM10={pm10} μg/m³ (age={age_ms}ms)".format(
                     **status
                 )
             )
         except Exception as e:
             print("Error reading PMS7003M:", e)
         time.sleep(1)
-
-
@@ -15,7 +15,7 @@ EZMaker 전용 밝기센서(EZLIGHT) 드라이버
 EZ 전용 센서로 별도 클래스를 제공합니다.
 """
 
-import machine
+from adc_sampler import AdcSampler, make_adc
 
 
 class EzLightSensor:
@@ -28,42 +28,32 @@ class EzLightSensor:
         print(status["raw"], status["percent"])
     """
 
-    def __init__(self, adc_pin, vref_board=3.3):
+    def __init__(self, adc_pin, vref_board=3.3, samples=16):
         """
         EZLIGHT 센서 초기화
 
         Args:
             adc_pin (int): ESP32-S3 GPIO 번호 (예: A0=2, A1=1 ...)
             vref_board (float): 보드 ADC 기준 전압 (기본 3.3V)
+            samples (int): 한 번 읽을 때 평균할 버스트 샘플 수 (기본 16)
         """
         self.adc_pin = adc_pin
         self.vref_board = vref_board
 
         # ADC 객체 생성 (12비트, ATTN_11DB -> 약 0~vref_board)
-        self.adc = machine.ADC(machine.Pin(adc_pin))
-        try:
-            self.adc.atten(machine.ADC.ATTN_11DB)
-        except AttributeError:
-            # 플랫폼에 따라 atten이 없을 수 있음
-            pass
-        try:
-            self.adc.width(machine.ADC.WIDTH_12BIT)
-        except AttributeError:
-            # width 설정이 없는 포트도 있으므로 무시
-            pass
+        self.adc = make_adc(adc_pin)
+
+        # 버스트 샘플러 (samples 개 연속 샘플 평균)
+        self._sampler = AdcSampler(self.adc, size=samples)
 
     # ------------------------------------------------------------------
     # 기본 읽기 API
     # ------------------------------------------------------------------
     def read_raw_12bit(self):
         """
-        ADC 12비트 원시값 (0~4095 추정) 반환
+        ADC 12비트 원시값 (0~4095) 반환 — 버스트 샘플 평균
         """
-        val = self.adc.read()
-        # 일부 보드에서 0~65535를 반환하는 경우를 대비하여 스케일 조정
-        if val > 4095:
-            val = int(val * 4095 / 65535)
-        return val
+        return int(self._sampler.read_mean() + 0.5)
 
     def read_raw_10bit(self):
         """
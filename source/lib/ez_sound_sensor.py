@@ -10,9 +10,21 @@ EZMaker 전용 소리센서(EZSOUND) 드라이버
     - 전압(3.3V 기준)
     - 상대적인 소리 레벨 비율(0~100%)
 을 계산해 반환합니다.
+
+레벨미터 모드 (start_level):
+    마이크 출력은 파형이 계속 흔들리므로 순간값 1개로는 크기를 알 수 없다.
+    하드웨어 타이머로 일정 주기(기본 2kHz) 샘플링해 2개 창(half)으로 나눈
+    링 버퍼에 채우고, 메인 루프의 update_level()이 완료된 창마다
+    DC 성분을 뺀 RMS / 피크-투-피크 / 추정 dB 를 계산한다.
+    (ESP32 포트의 Timer 콜백은 soft IRQ 이므로 수 kHz 이하 권장)
 """
 
+import math
+import time
+import array
 import machine
+import micropython
+from adc_sampler import AdcSampler, make_adc
 
 
 class EzSoundSensor:
@@ -25,42 +37,55 @@ class EzSoundSensor:
         print(status["raw"], status["percent"], status["voltage"])
     """
 
-    def __init__(self, adc_pin, vref_board=3.3):
+    LEVEL_TIMER_ID = 0       # 레벨미터 샘플링 하드웨어 타이머
+    LEVEL_RATE_HZ = 2000     # 기본 샘플링 주파수
+    LEVEL_WINDOW = 256       # 기본 창 크기 (2kHz 기준 128ms)
+    DB_OFFSET = 94.0         # ADC 풀스케일(RMS 2048) 을 94dB 로 보는 추정 기준
+
+    def __init__(self, adc_pin, vref_board=3.3, samples=16):
         """
         EZSOUND 센서 초기화
 
         Args:
             adc_pin (int): ESP32-S3 GPIO 번호 (예: A0=2, A1=1 ...)
             vref_board (float): 보드 ADC 기준 전압 (기본 3.3V)
+            samples (int): 한 번 읽을 때 평균할 버스트 샘플 수 (기본 16)
         """
         self.adc_pin = adc_pin
         self.vref_board = vref_board
 
         # ADC 객체 생성 (12비트, ATTN_11DB -> 약 0~vref_board)
-        self.adc = machine.ADC(machine.Pin(adc_pin))
-        try:
-            self.adc.atten(machine.ADC.ATTN_11DB)
-        except AttributeError:
-            # 플랫폼에 따라 atten 이 없을 수 있음
-            pass
-        try:
-            self.adc.width(machine.ADC.WIDTH_12BIT)
-        except AttributeError:
-            # width 설정이 없는 포트도 있으므로 무시
-            pass
+        self.adc = make_adc(adc_pin)
+
+        # 버스트 샘플러 (samples 개 연속 샘플 평균)
+        self._sampler = AdcSampler(self.adc, size=samples)
+
+        # 레벨미터 상태
+        self.level_active = False
+        self.level_rate_hz = 0
+        self.db_offset = self.DB_OFFSET
+        self.level = None            # (rms, p2p, db) — rms/p2p 는 10비트 스케일
+        self.level_peak_p2p = 0      # 마지막 take_level() 이후 최대 p2p
+        self._level_ms = None
+        self._timer = None
+        self._lv_buf = None
+        self._lv_window = 0
+        self._lv_size = 0
+        self._lv_idx = 0
+        self._lv_ready = 0           # 완료된 창의 시작 인덱스
+        self._lv_seq = 0             # 완료된 창 개수 (타이머 콜백에서 증가)
+        self._lv_seen = 0            # update_level()에서 처리한 창 개수
+        self._lv_read = self.adc.read_u16
+        self._lv_cb = self._level_tick
 
     # ------------------------------------------------------------------
     # 기본 읽기 API
     # ------------------------------------------------------------------
     def read_raw_12bit(self):
         """
-        ADC 12비트 원시값 (0~4095 추정) 반환
+        ADC 12비트 원시값 (0~4095) 반환 — 버스트 샘플 평균
         """
-        val = self.adc.read()
-        # 일부 보드에서 0~65535를 반환하는 경우를 대비하여 스케일 조정
-        if val > 4095:
-            val = int(val * 4095 / 65535)
-        return val
+        return int(self._sampler.read_mean() + 0.5)
 
     def read_raw_10bit(self):
         """
@@ -101,6 +126,139 @@ class EzSoundSensor:
             "voltage": voltage,
         }
 
+    # ------------------------------------------------------------------
+    # 레벨미터 API (타이머 샘플링)
+    # ------------------------------------------------------------------
+    def start_level(self, rate_hz=LEVEL_RATE_HZ, window=LEVEL_WINDOW, timer_id=LEVEL_TIMER_ID):
+        """
+        타이머 샘플링 레벨미터 시작
+
+        Args:
+            rate_hz (int): 샘플링 주파수 (100~8000Hz)
+            window (int): 창 크기(샘플 수, 16~256) — 창마다 레벨 1회 계산
+            timer_id (int): 사용할 하드웨어 타이머 번호
+        """
+        self.stop_level()
+
+        rate_hz = max(100, min(int(rate_hz), 8000))
+        window = max(16, min(int(window), 256))
+
+        # 창 2개짜리 링 버퍼: 타이머가 한쪽을 채우는 동안 다른 쪽을 계산
+        if self._lv_buf is None or self._lv_window != window:
+            self._lv_buf = array.array("H", bytes(4 * window))
+        self._lv_window = window
+        self._lv_size = 2 * window
+        self._lv_idx = 0
+        self._lv_seq = 0
+        self._lv_seen = 0
+        self.level = None
+        self.level_peak_p2p = 0
+        self._level_ms = None
+
+        self._timer = machine.Timer(timer_id)
+        self._timer.init(freq=rate_hz, mode=machine.Timer.PERIODIC, callback=self._lv_cb)
+        self.level_rate_hz = rate_hz
+        self.level_active = True
+
+    def stop_level(self):
+        """레벨미터 중지 (타이머 해제)"""
+        if self._timer is not None:
+            try:
+                self._timer.deinit()
+            except Exception:
+                pass
+            self._timer = None
+        self.level_active = False
+
+    def _level_tick(self, _timer):
+        """타이머 콜백: 샘플 1개 저장 (할당 없음)"""
+        i = self._lv_idx
+        self._lv_buf[i] = self._lv_read() >> 4
+        i += 1
+        if i == self._lv_window:
+            self._lv_ready = 0
+            self._lv_seq += 1
+        elif i >= self._lv_size:
+            self._lv_ready = self._lv_window
+            self._lv_seq += 1
+            i = 0
+        self._lv_idx = i
+
+    @micropython.native
+    def _window_stats(self, start, n):
+        """창의 (합, 최소, 최대, 평균 기준 편차 제곱합) 계산 (2패스)"""
+        buf = self._lv_buf
+        end = start + n
+        total = 0
+        vmin = 4095
+        vmax = 0
+        for i in range(start, end):
+            v = buf[i]
+            total += v
+            if v < vmin:
+                vmin = v
+            if v > vmax:
+                vmax = v
+        mean = (total + (n >> 1)) // n
+        acc = 0
+        for i in range(start, end):
+            d = buf[i] - mean
+            acc += d * d
+        return total, vmin, vmax, acc
+
+    def update_level(self):
+        """
+        완료된 창이 있으면 RMS / p2p / dB 를 계산한다. (메인 루프에서 주기 호출)
+
+        Returns:
+            bool: 새 레벨이 계산되었는지 여부
+        """
+        if not self.level_active:
+            return False
+        seq = self._lv_seq
+        if seq == self._lv_seen:
+            return False
+        self._lv_seen = seq
+
+        n = self._lv_window
+        _total, vmin, vmax, acc = self._window_stats(self._lv_ready, n)
+
+        rms_12 = math.sqrt(acc / n)
+        p2p_12 = vmax - vmin
+        db = self.db_offset + 20.0 * math.log10(max(rms_12, 1.0) / 2048.0)
+
+        # 출력은 EZSOUND:STATUS 와 같은 10비트 스케일
+        p2p = (p2p_12 * 1023 + 2047) // 4095
+        self.level = (rms_12 * 1023 / 4095, p2p, db)
+        if p2p > self.level_peak_p2p:
+            self.level_peak_p2p = p2p
+        self._level_ms = time.ticks_ms()
+        return True
+
+    def take_level(self):
+        """
+        최근 레벨과 피크 홀드 값을 반환하고 피크 홀드를 초기화한다.
+
+        Returns:
+            tuple or None: (rms, p2p, db, peak_p2p)
+        """
+        if self.level is None:
+            return None
+        rms, p2p, db = self.level
+        peak = self.level_peak_p2p
+        self.level_peak_p2p = 0
+        return rms, p2p, db, peak
+
+    def set_db_offset(self, db_offset):
+        """dB 추정 기준(풀스케일 RMS 에 해당하는 dB) 설정"""
+        self.db_offset = float(db_offset)
+
+    def level_age_ms(self):
+        """마지막 레벨 계산 이후 경과 시간(ms), 없으면 None"""
+        if self._level_ms is None:
+            return None
+        return time.ticks_diff(time.ticks_ms(), self._level_ms)
+
 
 if __name__ == "__main__":
     print("EzSoundSensor 드라이버 모듈입니다.")
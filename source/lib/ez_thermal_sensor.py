@@ -10,6 +10,10 @@ EZMaker 수중/접촉 온도센서(EZTHERMAL, DS18B20 기반) 드라이버
     sensor = EzThermalSensor(pin_num=21)  # 예: EZMaker D0 → GPIO 21
     status = sensor.get_status()
     temp_c = status.get("temperature")
+
+    # 메인 루프에서 기다리지 않고 읽기 (변환 시작 → 750ms 뒤 결과 캐시)
+    if sensor.update():
+        print(sensor.temperature)
 """
 
 import machine
@@ -23,6 +27,8 @@ class EzThermalSensor:
     DS18B20 기반 EZMaker 수중/접촉 온도센서 드라이버
     """
 
+    CONVERSION_MS = 750  # 12비트 변환 최대 시간
+
     def __init__(self, pin_num: int, max_sensors: int = 1):
         """
         DS18B20 센서를 초기화합니다.
@@ -42,6 +48,45 @@ class EzThermalSensor:
         # 여러 개가 있을 경우, 우선 1개만 사용 (필요시 확장 가능)
         self._roms = roms[: max_sensors]
 
+        # update() 캐시 (논블로킹 측정)
+        self.temperature = None
+        self.last_update_ms = None
+        self._convert_ms = None  # 진행 중인 변환 시작 시각
+
+    def update(self):
+        """
+        논블로킹 측정 단계 실행 (메인 루프/위젯에서 주기 호출)
+
+        변환이 없으면 시작하고, CONVERSION_MS 가 지났으면 결과를 읽어
+        temperature 에 캐시한 뒤 다음 변환을 바로 시작한다.
+
+        Returns:
+            bool: 새 온도가 캐시되었는지 여부
+        """
+        now = time.ticks_ms()
+        fresh = False
+        if self._convert_ms is not None:
+            if time.ticks_diff(now, self._convert_ms) < self.CONVERSION_MS:
+                return False
+            try:
+                self.temperature = self._ds.read_temp(self._roms[0])
+                self.last_update_ms = now
+                fresh = True
+            except Exception:
+                pass
+        try:
+            self._ds.convert_temp()
+            self._convert_ms = now
+        except Exception:
+            self._convert_ms = None
+        return fresh
+
+    def age_ms(self):
+        """마지막 update() 측정 이후 경과 시간(ms), 없으면 None"""
+        if self.last_update_ms is None:
+            return None
+        return time.ticks_diff(time.ticks_ms(), self.last_update_ms)
+
     def read_celsius(self):
         """
         섭씨 온도를 한 번 읽어 반환합니다.
@@ -13,7 +13,8 @@ EZMaker 전용 전압센서(EZVOLT) 드라이버
 을 계산해 반환합니다.
 """
 
-import machine
+from adc_sampler import AdcSampler, make_adc
+from adc_calib import calibration, has_read_uv
 
 
 class EzVoltSensor:
@@ -26,7 +27,7 @@ class EzVoltSensor:
         print(status["raw"], status["voltage"])
     """
 
-    def __init__(self, adc_pin, vref_board=3.3, vref_input=25.0):
+    def __init__(self, adc_pin, vref_board=3.3, vref_input=25.0, samples=16):
         """
         EZVOLT 센서 초기화
 
@@ -34,36 +35,26 @@ class EzVoltSensor:
             adc_pin (int): ESP32-S3 GPIO 번호 (예: A0=2, A1=1 ...)
             vref_board (float): 보드 ADC 기준 전압 (기본 3.3V)
             vref_input (float): 전압센서 입력 기준 전압 (기본 25.0V)
+            samples (int): 한 번 읽을 때 평균할 버스트 샘플 수 (기본 16)
         """
         self.adc_pin = adc_pin
         self.vref_board = vref_board
         self.vref_input = vref_input
 
         # ADC 객체 생성 (12비트, ATTN_11DB -> 약 0~vref_board)
-        self.adc = machine.ADC(machine.Pin(adc_pin))
-        try:
-            self.adc.atten(machine.ADC.ATTN_11DB)
-        except AttributeError:
-            # 플랫폼에 따라 atten이 없을 수 있음
-            pass
-        try:
-            self.adc.width(machine.ADC.WIDTH_12BIT)
-        except AttributeError:
-            # width 설정이 없는 포트도 있으므로 무시
-            pass
+        self.adc = make_adc(adc_pin)
+
+        # 버스트 샘플러 (samples 개 연속 샘플 평균)
+        self._sampler = AdcSampler(self.adc, size=samples)
 
     # ------------------------------------------------------------------
     # 기본 읽기 API
     # ------------------------------------------------------------------
     def read_raw_12bit(self):
         """
-        ADC 12비트 원시값 (0~4095 추정) 반환
+        ADC 12비트 원시값 (0~4095) 반환 — 버스트 샘플 평균
         """
-        val = self.adc.read()
-        # 일부 보드에서 0~65535를 반환하는 경우를 대비하여 스케일 조정
-        if val > 4095:
-            val = int(val * 4095 / 65535)
-        return val
+        return int(self._sampler.read_mean() + 0.5)
 
     def read_raw_10bit(self):
         """
@@ -75,20 +66,35 @@ class EzVoltSensor:
 
     def read_voltage_board(self):
         """
-        보드 기준 전압(0~vref_board, 보통 3.3V)으로 환산한 값 반환
+        보드 ADC 핀 전압(V) 반환 — read_uv() 또는 보드 보정 LUT 사용 (adc_calib)
         """
-        raw_12 = self.read_raw_12bit()
-        return (raw_12 / 4095) * self.vref_board
+        return self._sampler.read_mv() / 1000
 
     def read_voltage_input(self):
         """
         전압센서 입력 측(0~vref_input, 기본 25V) 기준으로 환산한 값 반환
 
-        - EZMaker 전압센서가 0~25V 입력을 0~3.3V 범위로 스케일링한다고 가정
-        - 10비트 Raw 값(0~1023)을 기준으로 선형 비례 변환
+        - EZMaker 전압센서가 0~25V 입력을 0~vref_board 범위로 분압한다고 가정
+        - 보정된 보드 전압에 분압비(vref_input / vref_board)를 곱해 계산
         """
-        raw_10 = self.read_raw_10bit()
-        return (raw_10 / 1023) * self.vref_input
+        return self.read_voltage_board() * self.vref_input / self.vref_board
+
+    def uses_read_uv(self):
+        """read_uv()(eFuse 보정) 사용 여부 — True 이면 보정 LUT 는 전압 읽기에 쓰이지 않음"""
+        return has_read_uv(self.adc)
+
+    def calibrate_point(self, input_v):
+        """
+        현재 입력 전압(멀티미터 측정값, V)을 보드 ADC 보정점으로 추가하고 저장한다.
+        (read_uv() 미지원 펌웨어용, uses_read_uv() 가 True 이면 호출 측에서 거부)
+
+        Returns:
+            tuple: (raw12, board_mV)
+        """
+        raw_12 = int(self._sampler.read_average(64) + 0.5)
+        board_mv = int(input_v * self.vref_board / self.vref_input * 1000 + 0.5)
+        calibration.add_point(raw_12, board_mv)
+        return raw_12, board_mv
 
     # ------------------------------------------------------------------
     # 상태 API
@@ -100,13 +106,13 @@ class EzVoltSensor:
         Returns:
             dict: {
                 "raw": int,        # 10비트 Raw 값 (0~1023)
-                "voltage": float,  # 센서 입력 전압(0~25V 환산)
-                "board_v": float,  # 보드 기준 전압(0~3.3V, 참고용)
+                "voltage": float,  # 센서 입력 전압(0~25V 환산, 보정 적용)
+                "board_v": float,  # 보드 ADC 핀 전압(V, 보정 적용)
             }
         """
         raw_10 = self.read_raw_10bit()
         board_v = self.read_voltage_board()
-        input_v = (raw_10 / 1023) * self.vref_input
+        input_v = board_v * self.vref_input / self.vref_board
 
         return {
             "raw": raw_10,
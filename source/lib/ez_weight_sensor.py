@@ -6,12 +6,23 @@ EZMaker 전용 무게센서(EZWEIGHT, HX711 기반) 드라이버
     - Raw 값: HX711 24비트 ADC 출력 (보정 전 카운트 값)
     - 무게(Weight): 스케일 인자(scale)를 적용한 값 (기본 단위 g 로 가정)
 
+백그라운드 수집:
+- 메인 루프에서 update()를 자주 호출하면, DOUT 이 LOW(변환 완료)일 때만
+  한 번 읽어 중앙값 필터 창에 넣는다. (대기/블로킹 없음, 10SPS 기준 100ms마다 1회)
+- get_status()는 필터링된 캐시 값을 즉시 반환한다.
+  아직 샘플이 없으면 변환 1회만 수행해 raw/weight 를 함께 계산한다.
+
+보정값 저장:
+- 영점(offset)과 스케일(scale)은 플래시의 CAL_FILE 에 저장되며,
+  다음 부팅/핀 설정 시 자동으로 불러온다. (파일이 없으면 초기화 시 tare 수행)
+
 주의:
 - 실제 사용 시에는 `scale` 값과 영점(tare)을 반드시 보정해야 합니다.
 - 이 드라이버는 보드에 이미 업로드된 `hx711` 모듈을 사용합니다.
 """
 
 import time
+import json
 
 try:
     import hx711  # 보드 /lib 에 존재하는 HX711 모듈을 사용
@@ -19,17 +30,30 @@ except ImportError:
     hx711 = None  # 런타임에서 ImportError 를 처리하도록 둠
 
 
+CAL_FILE = "/ezweight_cal.json"
+
+
 class EzWeightSensor:
     """
     HX711 기반 EZMaker 무게센서 드라이버
 
     사용 예:
         sensor = EzWeightSensor(dout_pin=42, sck_pin=14, scale=400.0)
-        status = sensor.get_status()
-        print(status["raw"], status["weight"])
+        while True:
+            sensor.update()           # 메인 루프에서 주기 호출
+            status = sensor.get_status()
+            print(status["raw"], status["weight"])
     """
 
-    def __init__(self, dout_pin: int, sck_pin: int, scale: float = 400.0, ready_timeout_ms: int = 2000):
+    def __init__(
+        self,
+        dout_pin: int,
+        sck_pin: int,
+        scale: float = 400.0,
+        ready_timeout_ms: int = 2000,
+        filter_size: int = 5,
+        cal_file: str = CAL_FILE,
+    ):
         """
         EzWeightSensor 초기화
 
@@ -38,6 +62,8 @@ class EzWeightSensor:
             sck_pin (int): HX711 SCK(CLK) 핀 번호
             scale (float): 스케일 인자 (Raw → g 변환 계수, 보정 필요)
             ready_timeout_ms (int): 센서 준비 대기 타임아웃(ms)
+            filter_size (int): 중앙값 필터 창 크기 (샘플 수, 홀수 권장)
+            cal_file (str): 영점/스케일 저장 파일 경로 (None 이면 저장 안 함)
         """
         if hx711 is None:
             raise ImportError("hx711 module not found. Please upload hx711.py/.mpy to /lib.")
@@ -45,44 +71,143 @@ class EzWeightSensor:
         self.dout_pin = dout_pin
         self.sck_pin = sck_pin
         self.scale = scale
+        self.ready_timeout_ms = ready_timeout_ms
+        self.cal_file = cal_file
 
         # HX711 인스턴스 생성
         self._hx = hx711.HX711(self.dout_pin, self.sck_pin)
 
+        # 중앙값 필터 창 (미리 할당)
+        if filter_size < 1:
+            filter_size = 1
+        self._filter_size = filter_size
+        self._window = [0] * filter_size
+        self._sorted = [0] * filter_size
+        self._win_idx = 0
+        self._win_count = 0
+        self._filtered_raw = None
+        self._last_sample_ms = None
+
         # 센서 준비 대기 (가능한 경우)
         try:
-            if hasattr(self._hx, "wait_ready_timeout"):
-                self._hx.wait_ready_timeout(timeout_ms=ready_timeout_ms)
+            self._hx.wait_ready_timeout(timeout_ms=ready_timeout_ms)
         except Exception:
             # 준비 대기 실패는 치명적이지 않으므로 무시
             pass
 
-        # 영점(Tare) 보정 시도
-        try:
-            if hasattr(self._hx, "tare"):
+        # 저장된 보정값이 있으면 사용, 없으면 영점(Tare) 보정 시도
+        if not self._load_calibration():
+            try:
                 self._hx.tare()
+            except Exception:
+                # tare 실패 시에도 이후 read() 가 동작할 수 있으므로 무시
+                pass
+
+        self._hx.set_scale(self.scale)
+
+    # -------------------------------
+    # 보정값 저장/불러오기
+    # -------------------------------
+    def _load_calibration(self):
+        """
+        플래시에 저장된 영점/스케일을 불러온다.
+
+        Returns:
+            bool: 불러오기 성공 여부
+        """
+        if not self.cal_file:
+            return False
+        try:
+            with open(self.cal_file, "r") as f:
+                cal = json.load(f)
+            self._hx.set_offset(cal["offset"])
+            self.scale = float(cal["scale"])
+            return True
         except Exception:
-            # tare 실패 시에도 이후 read()/get_units() 가 동작할 수 있으므로 무시
-            pass
+            return False
 
-        # 스케일 인자 설정 시도
+    def save_calibration(self):
+        """
+        현재 영점/스케일을 플래시에 저장한다.
+
+        Returns:
+            bool: 저장 성공 여부
+        """
+        if not self.cal_file:
+            return False
         try:
-            if hasattr(self._hx, "set_scale"):
-                self._hx.set_scale(self.scale)
+            with open(self.cal_file, "w") as f:
+                json.dump({"offset": self._hx.get_offset(), "scale": self.scale}, f)
+            return True
         except Exception:
-            # set_scale 이 없거나 실패해도 get_units 가 raw 기반으로 동작할 수 있으므로 무시
-            pass
+            return False
+
+    # -------------------------------
+    # 백그라운드 수집
+    # -------------------------------
+    def update(self):
+        """
+        변환이 끝난 경우(DOUT LOW)에만 1회 읽어 필터에 반영한다.
+        메인 루프에서 주기적으로 호출한다. (블로킹 없음)
+
+        Returns:
+            bool: 새 샘플을 읽었는지 여부
+        """
+        raw = self._hx.read_if_ready()
+        if raw is None:
+            return False
+        self._push(raw)
+        return True
+
+    def _push(self, raw):
+        """샘플을 필터 창에 넣고 중앙값을 갱신한다."""
+        n = self._filter_size
+        self._window[self._win_idx] = raw
+        self._win_idx = (self._win_idx + 1) % n
+        if self._win_count < n:
+            self._win_count += 1
+
+        count = self._win_count
+        buf = self._sorted
+        for i in range(count):
+            buf[i] = self._window[i]
+        # 창 크기가 작으므로 삽입 정렬 (추가 할당 없음)
+        for i in range(1, count):
+            v = buf[i]
+            j = i - 1
+            while j >= 0 and buf[j] > v:
+                buf[j + 1] = buf[j]
+                j -= 1
+            buf[j + 1] = v
+
+        self._filtered_raw = buf[count // 2]
+        self._last_sample_ms = time.ticks_ms()
+
+    def _ensure_sample(self):
+        """샘플이 하나도 없으면 변환 1회를 기다려 읽는다."""
+        if self._filtered_raw is not None:
+            return True
+        if not self._hx.wait_ready_timeout(timeout_ms=self.ready_timeout_ms, delay_ms=1):
+            return False
+        self.update()
+        return self._filtered_raw is not None
+
+    def age_ms(self):
+        """마지막 샘플 이후 경과 시간(ms), 없으면 None"""
+        if self._last_sample_ms is None:
+            return None
+        return time.ticks_diff(time.ticks_ms(), self._last_sample_ms)
 
     # -------------------------------
     # 측정 API
     # -------------------------------
     def read_raw(self):
         """
-        HX711 Raw 값 반환 (보정 전 카운트 값)
+        HX711 Raw 값 반환 (중앙값 필터 적용, 보정 전 카운트 값)
         """
         try:
-            if hasattr(self._hx, "read"):
-                return self._hx.read()
+            if self._ensure_sample():
+                return self._filtered_raw
         except Exception:
             return None
         return None
@@ -92,31 +217,78 @@ class EzWeightSensor:
         스케일/영점을 적용한 무게 값 반환
 
         Args:
-            times (int): 내부 평균 횟수 (hx711.get_units(times) 에 전달)
+            times (int): 하위 호환용 인자 (필터가 평균을 대신하므로 사용하지 않음)
         """
-        try:
-            if hasattr(self._hx, "get_units"):
-                return self._hx.get_units(times)
-        except Exception:
+        raw = self.read_raw()
+        if raw is None:
             return None
-        return None
+        return (raw - self._hx.get_offset()) / self.scale
+
+    def cached_weight(self):
+        """
+        마지막 필터 샘플로 계산한 무게 (HX711 을 기다리지 않음, 샘플이 없으면 None)
+
+        메인 루프의 update() 가 채운 값만 쓰므로 LCD 갱신처럼 자주 불리는 곳에서 쓴다.
+        """
+        raw = self._filtered_raw
+        if raw is None:
+            return None
+        return (raw - self._hx.get_offset()) / self.scale
+
+    def tare(self):
+        """
+        현재 값(필터 적용)을 영점으로 설정하고 저장한다.
+
+        Returns:
+            bool: 성공 여부
+        """
+        raw = self.read_raw()
+        if raw is None:
+            return False
+        self._hx.set_offset(raw)
+        self.save_calibration()
+        return True
+
+    def set_scale(self, scale: float):
+        """
+        스케일 인자를 설정하고 저장한다.
+        """
+        if scale == 0:
+            raise ValueError("scale must not be 0")
+        self.scale = float(scale)
+        self._hx.set_scale(self.scale)
+        self.save_calibration()
+
+    def calibrate(self, known_weight: float):
+        """
+        알려진 무게(g)를 올려둔 상태에서 스케일 인자를 계산해 저장한다.
+
+        Returns:
+            float or None: 계산된 스케일 인자
+        """
+        raw = self.read_raw()
+        if raw is None or known_weight == 0:
+            return None
+        scale = (raw - self._hx.get_offset()) / known_weight
+        if scale == 0:
+            return None
+        self.set_scale(scale)
+        return scale
 
     def get_status(self):
         """
-        무게센서 상태를 딕셔너리로 반환
+        무게센서 상태를 딕셔너리로 반환 (캐시 기반, 변환 1회 이내)
 
         Returns:
             dict: {
-                "raw":     int or None,   # HX711 Raw 카운트 값
+                "raw":     int or None,   # HX711 Raw 카운트 값 (중앙값 필터)
                 "weight":  float or None, # 스케일/영점 적용 무게 값 (단위 g 로 가정)
             }
         """
         raw = self.read_raw()
-
-        # 너무 빠른 연속 읽기를 피하기 위해 약간의 지연을 둘 수 있음
-        time.sleep_ms(10)
-
-        weight = self.read_weight(times=1)
+        weight = None
+        if raw is not None:
+            weight = (raw - self._hx.get_offset()) / self.scale
 
         return {
             "raw": raw,
@@ -126,6 +298,5 @@ class EzWeightSensor:
 
 if __name__ == "__main__":
     print("EzWeightSensor (HX711) 드라이버 모듈입니다.")
-    print("보드에서 직접 사용 시 EzWeightSensor(dout_pin, sck_pin, scale) 로 초기화하세요.")
-
-
+    print("보드에서 직접 사용 시 EzWeightSensor(dout_pin, sck_pin, scale) 로 초기화하고,")
+    print("메인 루프에서 sensor.update() 를 주기적으로 호출하세요.")
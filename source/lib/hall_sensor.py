@@ -18,7 +18,7 @@ EZMaker 자기장(Hall) 센서 드라이버
 을 계산해 반환합니다.
 """
 
-import machine
+from adc_sampler import AdcSampler, make_adc
 
 
 class HallSensor:
@@ -31,30 +31,23 @@ class HallSensor:
         print(status["raw"], status["strength"], status["density"])
     """
 
-    def __init__(self, adc_pin, vref_board=3.3):
+    def __init__(self, adc_pin, vref_board=3.3, samples=16):
         """
         Hall 센서 초기화
 
         Args:
             adc_pin (int): ESP32-S3 GPIO 번호 (예: A0=2, A1=1 ...)
             vref_board (float): 보드 ADC 기준 전압 (기본 3.3V)
+            samples (int): 한 번 읽을 때 평균할 버스트 샘플 수 (기본 16)
         """
         self.adc_pin = adc_pin
         self.vref_board = vref_board
 
         # ADC 객체 생성 (12비트, ATTN_11DB -> 약 0~vref_board)
-        self.adc = machine.ADC(machine.Pin(adc_pin))
-        # ESP32-S3 기준: 0~3.3V 측정
-        try:
-            self.adc.atten(machine.ADC.ATTN_11DB)
-        except AttributeError:
-            # 플랫폼에 따라 atten이 없을 수 있음
-            pass
-        try:
-            self.adc.width(machine.ADC.WIDTH_12BIT)
-        except AttributeError:
-            # width 설정이 없는 포트도 있으므로 무시
-            pass
+        self.adc = make_adc(adc_pin)
+
+        # 버스트 샘플러 (samples 개 연속 샘플 평균)
+        self._sampler = AdcSampler(self.adc, size=samples)
 
         # 기준값(10비트 스케일)
         self.ref_10bit = None
@@ -68,15 +61,9 @@ class HallSensor:
     # ------------------------------------------------------------------
     def read_raw_12bit(self):
         """
-        ADC 12비트 원시값 (0~4095 추정) 반환
+        ADC 12비트 원시값 (0~4095) 반환 — 버스트 샘플 평균
         """
-        # ESP32-S3에서는 read()가 0~4095를 반환
-        val = self.adc.read()
-        # 일부 보드에서 0~65535를 반환하는 경우를 대비하여 스케일 조정
-        if val > 4095:
-            # 16비트 → 12비트로 선형 스케일링
-            val = int(val * 4095 / 65535)
-        return val
+        return int(self._sampler.read_mean() + 0.5)
 
     def read_raw_10bit(self):
         """
@@ -95,20 +82,15 @@ class HallSensor:
     # ------------------------------------------------------------------
     # 기준값 및 상태 계산
     # ------------------------------------------------------------------
-    def calibrate_reference(self, samples=20, delay_ms=50):
+    def calibrate_reference(self, samples=64, delay_ms=0):
         """
         현재 상태를 기준(reference)으로 설정
 
         - 자석을 멀리 둔 "자기장 없음" 상태에서 호출하는 것을 권장
+        - samples 개를 버스트로 평균 (delay_ms > 0 이면 샘플 간격)
         """
-        import time
-
-        total = 0
-        for _ in range(samples):
-            total += self.read_raw_10bit()
-            time.sleep_ms(delay_ms)
-
-        self.ref_10bit = int(total / samples)
+        raw_12 = self._sampler.read_average(samples, delay_ms * 1000)
+        self.ref_10bit = int(raw_12 * 1023 / 4095)
         return self.ref_10bit
 
     def _ensure_reference(self):
@@ -116,7 +98,7 @@ class HallSensor:
         기준값(ref_10bit)이 설정되지 않았다면 자동으로 보정
         """
         if self.ref_10bit is None:
-            self.calibrate_reference(samples=20, delay_ms=50)
+            self.calibrate_reference()
 
     def get_status(self):
         """
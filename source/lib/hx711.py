@@ -10,6 +10,7 @@ HX711 Weight Sensor Library for MicroPython
 - Scale (보정) 기능
 - Gain 설정 (128, 64, 32)
 - 인터럽트 제어로 안정적인 통신
+- ESP32-S3에서는 GPIO 레지스터를 직접 다루는 viper 커널로 24비트 시프트 (수십 us)
 
 사용 예:
     from hx711 import HX711
@@ -30,11 +31,69 @@ HX711 Weight Sensor Library for MicroPython
 - https://github.com/bogde/HX711
 """
 
+import os
 import time
+import micropython
 from machine import Pin, disable_irq, enable_irq
 
+# ESP32-S3 GPIO 레지스터 (TRM 기준)
+# - GPIO 0~31 : OUT_W1TS/OUT_W1TC/IN
+# - GPIO 32~48: OUT1_W1TS/OUT1_W1TC/IN1
+_GPIO_BASE = 0x60004000
+_GPIO_OUT_W1TS = _GPIO_BASE + 0x0008
+_GPIO_OUT_W1TC = _GPIO_BASE + 0x000C
+_GPIO_OUT1_W1TS = _GPIO_BASE + 0x0014
+_GPIO_OUT1_W1TC = _GPIO_BASE + 0x0018
+_GPIO_IN = _GPIO_BASE + 0x003C
+_GPIO_IN1 = _GPIO_BASE + 0x0040
+
+
+def _is_esp32s3():
+    """위 레지스터 주소는 ESP32-S3 전용 (ESP32/C3 등은 주소가 달라 Python 경로 사용)"""
+    try:
+        return "ESP32S3" in os.uname().machine.upper().replace("-", "")
+    except Exception:
+        return False
+
+
+@micropython.viper
+def _shift_in_viper(in_reg: int, dout_mask: int, set_reg: int, clr_reg: int, sck_mask: int, gain_pulses: int) -> int:
+    """
+    24비트 데이터를 MSB부터 읽고 gain_pulses 만큼 추가 클럭을 준다.
+
+    - PD_SCK HIGH 유지시간: 최소 0.2us, 최대 50us (데이터시트)
+    - 짧은 빈 루프로 HIGH/LOW 구간을 약 0.3us 이상 확보한다.
+    """
+    gpio_in = ptr32(in_reg)
+    gpio_set = ptr32(set_reg)
+    gpio_clr = ptr32(clr_reg)
+    data = 0
+    for i in range(24):
+        gpio_set[0] = sck_mask
+        d = 0
+        while d < 16:
+            d += 1
+        data = data << 1
+        if gpio_in[0] & dout_mask:
+            data = data | 1
+        gpio_clr[0] = sck_mask
+        d = 0
+        while d < 16:
+            d += 1
+    for i in range(gain_pulses):
+        gpio_set[0] = sck_mask
+        d = 0
+        while d < 16:
+            d += 1
+        gpio_clr[0] = sck_mask
+        d = 0
+        while d < 16:
+            d += 1
+    return data
+
+
 class HX711:
-    def __init__(self, dout_pin, pd_sck_pin, gain=128):
+    def __init__(self, dout_pin, pd_sck_pin, gain=128, fast=True):
         """
         Initialize HX711 instance.
         
@@ -42,6 +101,7 @@ class HX711:
             dout_pin (int): GPIO number for DOUT (Data)
             pd_sck_pin (int): GPIO number for PD_SCK (Clock)
             gain (int): Initial gain (128, 64, or 32). Default 128.
+            fast (bool): Use the viper register kernel on ESP32-S3 (default True)
         """
         self.p_dout = Pin(dout_pin, Pin.IN)
         self.p_pd_sck = Pin(pd_sck_pin, Pin.OUT)
@@ -53,6 +113,24 @@ class HX711:
         
         self.set_gain(gain)
 
+        # viper 커널용 레지스터 주소/마스크 (ESP32-S3 에서만 사용)
+        self._fast = bool(fast) and _is_esp32s3()
+        if self._fast:
+            if dout_pin < 32:
+                self._in_reg = _GPIO_IN
+                self._dout_mask = 1 << dout_pin
+            else:
+                self._in_reg = _GPIO_IN1
+                self._dout_mask = 1 << (dout_pin - 32)
+            if pd_sck_pin < 32:
+                self._set_reg = _GPIO_OUT_W1TS
+                self._clr_reg = _GPIO_OUT_W1TC
+                self._sck_mask = 1 << pd_sck_pin
+            else:
+                self._set_reg = _GPIO_OUT1_W1TS
+                self._clr_reg = _GPIO_OUT1_W1TC
+                self._sck_mask = 1 << (pd_sck_pin - 32)
+
     def is_ready(self):
         """
         Check if HX711 is ready for reading.
@@ -86,45 +164,35 @@ class HX711:
         """
         # Wait for the chip to become ready
         self.wait_ready()
+        return self._read_bits()
 
+    def read_if_ready(self):
+        """
+        Read 24-bit data only if a conversion is ready (non-blocking).
+
+        Returns:
+            int or None: Signed 24-bit value, or None if DOUT is still high
+        """
+        if not self.is_ready():
+            return None
+        return self._read_bits()
+
+    def _read_bits(self):
+        """
+        Shift out one conversion. Caller must ensure the chip is ready.
+        """
         # Disable interrupts for critical timing
         irq_state = disable_irq()
         
         try:
-            data = 0
-            
-            # Pulse the clock pin 24 times to read the data.
-            # MSB First.
-            # Timing is critical:
-            # PD_SCK high time: min 0.2 us, max 50 us
-            # PD_SCK low time: min 0.2 us
-            # We use simple loop/operations which take > 1us on MicroPython,
-            # so we might not need explicit sleeps if CPU isn't too fast.
-            # But to be safe and match C++ 'shiftInSlow', we add delays if needed.
-            
-            for _ in range(24):
-                self.p_pd_sck.value(1)
-                # time.sleep_us(1) # Optional, usually overhead is enough
-                
-                # Read bit when Clock is High? No, usually read on rising edge or high level.
-                # HX711: Data is shifted out on falling edge of PD_SCK and remains valid until next falling edge.
-                # But C++ code reads *while* clock is High.
-                # shiftInSlow: Clock HIGH -> Read -> Clock LOW
-                
-                # Reading bit
-                bit_val = self.p_dout.value()
-                data = (data << 1) | bit_val
-                
-                self.p_pd_sck.value(0)
-                # time.sleep_us(1) 
-
-            # Set the channel and the gain factor for the next reading using the clock pin.
-            for _ in range(self.GAIN):
-                self.p_pd_sck.value(1)
-                # time.sleep_us(1)
-                self.p_pd_sck.value(0)
-                # time.sleep_us(1)
-                
+            if self._fast:
+                data = _shift_in_viper(
+                    self._in_reg, self._dout_mask,
+                    self._set_reg, self._clr_reg, self._sck_mask,
+                    self.GAIN,
+                )
+            else:
+                data = self._shift_in_slow()
         finally:
             enable_irq(irq_state)
 
@@ -136,6 +204,30 @@ class HX711:
 
         return data
 
+    def _shift_in_slow(self):
+        """
+        Pin 객체 기반 시프트 (viper 커널을 쓸 수 없는 포트용)
+        """
+        sck = self.p_pd_sck.value
+        dout = self.p_dout.value
+        data = 0
+
+        # Pulse the clock pin 24 times to read the data.
+        # MSB First.
+        # HX711: Data is shifted out on falling edge of PD_SCK and remains valid until next falling edge.
+        # shiftInSlow: Clock HIGH -> Read -> Clock LOW
+        for _ in range(24):
+            sck(1)
+            data = (data << 1) | dout()
+            sck(0)
+
+        # Set the channel and the gain factor for the next reading using the clock pin.
+        for _ in range(self.GAIN):
+            sck(1)
+            sck(0)
+
+        return data
+
     def wait_ready(self, delay_ms=10):
         """
         Wait for the chip to become ready. Blocking.
@@ -9,6 +9,8 @@ I2C 방식 캐릭터 LCD (16x2, 20x4 등) MicroPython 드라이버 라이브러
 - 텍스트 출력, 커서 이동
 - 백라이트 제어
 - 화면 클리어, 홈 등 기본 기능
+- 배치 전송: 명령/문자열을 PCF8574 출력 바이트열 하나로 만들어 writeto() 1회로 전송
+- 섀도 프레임버퍼: 행/열 버퍼와 실제 LCD 내용을 비교해 바뀐 칸만 전송
 
 지원 LCD:
 - 16x2 (16열 x 2행)
@@ -29,11 +31,23 @@ I2C 방식 캐릭터 LCD (16x2, 20x4 등) MicroPython 드라이버 라이브러
 - SCL (D5) -> GPIO 40
 - SDA (D6) -> GPIO 41
 - I2C Address: 0x27 (또는 0x3F)
+
+전송 방식:
+- 4비트 니블 1개 = 확장기 바이트 2개 (E High → E Low, 하강 에지에서 래치)
+  문자 1개 = 4바이트, 같은 행의 연속 칸은 DDRAM 주소 자동 증가로 이어서 보낸다.
+- 이전처럼 니블마다 writeto() 3회 + sleep_us(50) 를 하지 않으므로
+  (100kHz 에서 바이트당 약 90us > HD44780 명령 실행 시간 37us) 별도 지연이 필요 없다.
+- putstr() 는 프레임버퍼에 쓴 뒤 바뀐 칸만 전송하므로 같은 문자열을 다시 쓰면 버스 전송이 없다.
+- 화면이 깨졌을 때(전원 노이즈 등)는 refresh() 로 전체를 다시 보낸다.
 """
 
 from machine import SoftI2C
 import time
 
+_EN = 0x04   # Enable 비트
+_RS = 0x01   # Register Select (1 = 데이터)
+_ROW_OFFSETS = (0x00, 0x40, 0x14, 0x54)
+
 class I2cLcd:
     """I2C LCD 1602/2004 드라이버"""
     
@@ -83,11 +97,26 @@ class I2cLcd:
             self.num_lines = 0
         self.num_columns = num_columns
         self.backlight_val = self.LCD_BACKLIGHT
-        
+
+        # 섀도 프레임버퍼: _fb = 표시하려는 내용, _shown = 실제 LCD 에 써진 내용
+        self._rows = max(1, self.num_lines)
+        size = self._rows * num_columns
+        self._fb = bytearray(b" " * size)
+        self._shown = bytearray(b" " * size)
+        self._dirty = False        # _fb 가 _shown 과 다를 수 있음
+        self._cur_col = 0          # putstr() 가 쓸 위치
+        self._cur_row = 0
+        self._addr = None          # LCD 의 현재 DDRAM 주소 (모르면 None)
+
+        # 전송 버퍼: 행마다 (주소 명령 + 문자) 최악의 경우를 담을 수 있는 크기
+        self._tx = bytearray(4 * self._rows * (num_columns + num_columns // 2 + 2))
+        self._txv = memoryview(self._tx)
+
         time.sleep_ms(20)
         self.expanderWrite(0)
         time.sleep_ms(20)
-        
+
+        # 4비트 모드 진입 시퀀스 (니블 사이 대기가 필요하므로 개별 전송)
         self.write4bits(0x03 << 4)
         time.sleep_ms(5)
         self.write4bits(0x03 << 4)
@@ -104,6 +133,9 @@ class I2cLcd:
         self.command(self.LCD_ENTRYMODESET | self.mode)
         self.home()
 
+    # ------------------------------------------------------------------
+    # 저수준 전송
+    # ------------------------------------------------------------------
     def expanderWrite(self, _data):
         # 값을 0-255 범위로 제한
         val = (_data | self.backlight_val) & 0xFF
@@ -114,30 +146,160 @@ class I2cLcd:
         self.pulseEnable(value)
 
     def pulseEnable(self, _data):
-        self.expanderWrite(_data | 0x04) # En high
+        self.expanderWrite(_data | _EN) # En high
         time.sleep_us(1)
-        self.expanderWrite(_data & ~0x04) # En low
+        self.expanderWrite(_data & ~_EN) # En low
         time.sleep_us(50)
 
+    def _put_byte(self, n, value, rs):
+        """
+        전송 버퍼 n 위치에 바이트 1개(니블 2개 x E High/Low)를 채우고 다음 위치를 반환
+        """
+        tx = self._tx
+        flags = rs | self.backlight_val
+        hi = (value & 0xF0) | flags
+        lo = ((value << 4) & 0xF0) | flags
+        tx[n] = hi | _EN
+        tx[n + 1] = hi
+        tx[n + 2] = lo | _EN
+        tx[n + 3] = lo
+        return n + 4
+
+    def _send(self, n):
+        """전송 버퍼 앞쪽 n 바이트를 writeto() 1회로 전송"""
+        if n:
+            self.i2c.writeto(self.i2c_addr, self._txv[:n])
+
     def command(self, value):
-        self.write4bits((value & 0xF0))
-        self.write4bits((value << 4) & 0xF0)
+        self._send(self._put_byte(0, value, 0))
 
     def write(self, value):
-        self.write4bits((value & 0xF0) | 0x01) # Rs high
-        self.write4bits((value << 4) | 0x01)   # Rs high
+        """현재 커서 위치에 문자 코드 1개 출력 (프레임버퍼 경유)"""
+        self.putstr(chr(value & 0xFF))
 
+    # ------------------------------------------------------------------
+    # 프레임버퍼 / 차등 전송
+    # ------------------------------------------------------------------
     def putstr(self, string):
-        for char in string:
-            self.write(ord(char))
+        """
+        현재 커서 위치부터 문자열 출력
+
+        프레임버퍼에 쓴 뒤 바뀐 칸만 전송한다. 행 끝을 넘는 문자는 잘린다.
+        """
+        self.write_at(self._cur_col, self._cur_row, string)
+        self.show()
+
+    def write_at(self, col, row, string):
+        """
+        프레임버퍼에만 문자열을 쓴다. (show() 호출 시 바뀐 칸만 전송)
+
+        여러 칸을 고친 뒤 show() 를 한 번 호출하면 화면 전체가 writeto() 1회로 갱신된다.
+
+        Returns:
+            int: 실제로 쓴 글자 수
+        """
+        cols = self.num_columns
+        if row < 0 or row >= self._rows or col >= cols:
+            return 0
+        fb = self._fb
+        base = row * cols
+        count = 0
+        for ch in string:
+            if col >= cols:
+                break
+            if col >= 0:
+                fb[base + col] = ord(ch) & 0xFF
+                count += 1
+            col += 1
+        self._cur_col = col    # 행 끝을 넘으면 이후 출력은 잘림 (move_to 로 다시 지정)
+        self._cur_row = row
+        if count:
+            self._dirty = True
+        return count
+
+    def show(self):
+        """
+        프레임버퍼와 실제 LCD 내용을 비교해 바뀐 칸만 writeto() 1회로 전송
+
+        같은 행에서 바뀌지 않은 칸이 1칸 끼어 있으면 주소 명령(4바이트) 대신
+        그 칸(4바이트)을 같이 보내 구간을 이어 붙인다.
+
+        Returns:
+            int: 전송한 문자 수
+        """
+        if not self._dirty:
+            return 0
+        self._dirty = False
+        fb = self._fb
+        shown = self._shown
+        cols = self.num_columns
+        addr = self._addr
+        n = 0
+        sent = 0
+        for row in range(self._rows):
+            base = row * cols
+            col = 0
+            while col < cols:
+                i = base + col
+                if fb[i] == shown[i]:
+                    col += 1
+                    continue
+                # 바뀐 구간 [col, end) 찾기 (1칸짜리 빈틈은 포함)
+                end = col + 1
+                while end < cols:
+                    j = base + end
+                    if fb[j] != shown[j]:
+                        end += 1
+                    elif end + 1 < cols and fb[j + 1] != shown[j + 1]:
+                        end += 2
+                    else:
+                        break
+                target = _ROW_OFFSETS[row] + col
+                if addr != target:
+                    n = self._put_byte(n, self.LCD_SETDDRAMADDR | target, 0)
+                for k in range(base + col, base + end):
+                    v = fb[k]
+                    n = self._put_byte(n, v, _RS)
+                    shown[k] = v
+                sent += end - col
+                addr = target + (end - col)
+                col = end
+        self._send(n)
+        self._addr = addr
+        return sent
+
+    def refresh(self):
+        """프레임버퍼 전체를 LCD 에 다시 전송 (화면이 깨졌을 때 복구용)"""
+        for i in range(len(self._shown)):
+            self._shown[i] = self._fb[i] ^ 0xFF
+        self._addr = None
+        self._dirty = True
+        return self.show()
+
+    def get_text(self, row):
+        """프레임버퍼의 한 행 내용을 문자열로 반환"""
+        if row < 0 or row >= self._rows:
+            return ""
+        base = row * self.num_columns
+        return bytes(self._fb[base:base + self.num_columns]).decode()
 
     def clear(self):
         self.command(self.LCD_CLEARDISPLAY)
         time.sleep_ms(2)
+        for i in range(len(self._fb)):
+            self._fb[i] = 0x20
+            self._shown[i] = 0x20
+        self._dirty = False
+        self._cur_col = 0
+        self._cur_row = 0
+        self._addr = 0
 
     def home(self):
         self.command(self.LCD_RETURNHOME)
         time.sleep_ms(2)
+        self._cur_col = 0
+        self._cur_row = 0
+        self._addr = 0
 
     def display(self):
         self.displaycontrol |= self.LCD_DISPLAYON
@@ -156,8 +318,6 @@ class I2cLcd:
         self.expanderWrite(0)
 
     def move_to(self, col, row):
-        col = max(0, min(col, self.num_columns - 1))
-        row = max(0, min(row, self.num_lines - 1))
-        offsets = [0x00, 0x40, 0x14, 0x54]
-        self.command(self.LCD_SETDDRAMADDR | (col + offsets[row]))
-
+        """커서 이동 (다음 putstr() 위치, 실제 주소 명령은 전송 시 필요할 때만 보냄)"""
+        self._cur_col = max(0, min(col, self.num_columns - 1))
+        self._cur_row = max(0, min(row, self._rows - 1))
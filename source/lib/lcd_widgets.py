@@ -0,0 +1,233 @@
+"""
+I2C LCD 온디바이스 위젯 (마퀴 스크롤 / 센서 값 바인딩 필드)
+
+호스트가 센서 값을 BLE 로 읽고 문자열을 만들어 LCD:PRINT 로 다시 보내는 대신,
+보드가 직접 화면을 갱신한다. (갱신 중 BLE 전송 없음)
+
+- Marquee: 긴 문자열을 row/col 위치의 width 칸 창 안에서 step_ms 마다 한 칸씩 스크롤
+- BoundField: "{EZTHERMAL:.1f}C" 같은 템플릿을 period_ms 마다 캐시된 센서 값으로 채워 출력
+  - {이름} 또는 {이름:포맷} — 포맷은 파이썬 format() 규칙 ("{EZWEIGHT:6.1f}g")
+  - 값은 resolve(이름) 콜백이 돌려준다. (None 이면 "--")
+- LcdWidgets.update() 를 메인 루프에서 호출하면 시각이 된 위젯만 프레임버퍼에 쓰고
+  I2cLcd.show() 한 번으로 바뀐 칸만 전송한다.
+- 하드웨어 타이머 대신 ticks_ms 스케줄을 사용한다. (타이머 0~2 는 EZSOUND/SCOPE/먼지센서가 사용)
+
+사용 예:
+    from lcd_widgets import LcdWidgets
+
+    widgets = LcdWidgets(lcd, resolve=lambda name: {"EZTHERMAL": 23.4}.get(name))
+    widgets.add_marquee(0, 0, 16, "DeepCoB EZMaker 온도 모니터", step_ms=300)
+    widgets.add_field(1, 0, "{EZTHERMAL:.1f}C", period_ms=1000)
+    while True:
+        widgets.update()
+"""
+
+import time
+
+
+def parse_template(template):
+    """
+    템플릿을 [(문자열, None, None) | (None, 이름, 포맷), ...] 조각 목록으로 변환
+
+    "{{" / "}}" 는 중괄호 문자 자체로 출력한다.
+    """
+    parts = []
+    literal = ""
+    i = 0
+    n = len(template)
+    while i < n:
+        ch = template[i]
+        if ch == "{" and i + 1 < n and template[i + 1] == "{":
+            literal += "{"
+            i += 2
+            continue
+        if ch == "}" and i + 1 < n and template[i + 1] == "}":
+            literal += "}"
+            i += 2
+            continue
+        if ch == "{":
+            end = template.find("}", i + 1)
+            if end < 0:
+                raise ValueError("unclosed '{' in template")
+            body = template[i + 1:end]
+            sep = body.find(":")
+            if sep >= 0:
+                name, fmt = body[:sep], body[sep + 1:]
+            else:
+                name, fmt = body, ""
+            name = name.strip().upper()
+            if not name:
+                raise ValueError("empty field name")
+            if literal:
+                parts.append((literal, None, None))
+                literal = ""
+            parts.append((None, name, fmt))
+            i = end + 1
+            continue
+        literal += ch
+        i += 1
+    if literal:
+        parts.append((literal, None, None))
+    return parts
+
+
+class Marquee:
+    """width 칸 창 안에서 한 칸씩 흐르는 문자열"""
+
+    def __init__(self, row, col, width, text, step_ms=300, gap=3):
+        self.row = row
+        self.col = col
+        self.width = max(1, width)
+        self.period_ms = max(50, int(step_ms))
+        # 창보다 짧으면 스크롤하지 않고 고정 출력
+        if len(text) <= self.width:
+            self._loop = text + " " * (self.width - len(text))
+            self.scrolling = False
+        else:
+            self._loop = text + " " * gap
+            self.scrolling = True
+        self._pos = 0
+
+    def render(self, resolve):
+        """현재 창 문자열을 반환하고 다음 위치로 이동"""
+        loop = self._loop
+        if not self.scrolling:
+            return loop
+        w = self.width
+        p = self._pos
+        end = p + w
+        if end <= len(loop):
+            text = loop[p:end]
+        else:
+            text = loop[p:] + loop[:end - len(loop)]
+        self._pos = (p + 1) % len(loop)
+        return text
+
+
+class BoundField:
+    """캐시된 센서 값으로 채워지는 템플릿 필드"""
+
+    def __init__(self, row, col, template, period_ms=1000, width=None):
+        self.row = row
+        self.col = col
+        self.period_ms = max(100, int(period_ms))
+        self.width = width
+        self.parts = parse_template(template)
+        self.names = tuple(name for _, name, _ in self.parts if name)
+        self._last_len = 0
+
+    def render(self, resolve):
+        out = []
+        for literal, name, fmt in self.parts:
+            if name is None:
+                out.append(literal)
+                continue
+            try:
+                value = resolve(name)
+            except Exception:
+                value = None
+            if value is None:
+                out.append("--")
+                continue
+            try:
+                out.append(format(value, fmt))
+            except Exception:
+                out.append(str(value))
+        text = "".join(out)
+        if self.width is not None:
+            text = text[:self.width]
+            text += " " * (self.width - len(text))
+        else:
+            # 이전보다 짧아지면 남은 칸을 공백으로 지움
+            n = len(text)
+            if n < self._last_len:
+                text += " " * (self._last_len - n)
+            self._last_len = n
+        return text
+
+
+class LcdWidgets:
+    """
+    LCD 위젯 스케줄러
+
+    Attributes:
+        widgets (list): 슬롯별 위젯 (빈 슬롯은 None)
+    """
+
+    MAX_WIDGETS = 8
+
+    def __init__(self, lcd, resolve):
+        """
+        Args:
+            lcd (I2cLcd): 프레임버퍼(write_at/show)를 지원하는 LCD
+            resolve: resolve(이름) -> 값 또는 None (캐시된 센서 값)
+        """
+        self.lcd = lcd
+        self.resolve = resolve
+        self.widgets = [None] * self.MAX_WIDGETS
+        self._due = [0] * self.MAX_WIDGETS
+
+    def _place(self, widget):
+        """같은 위치의 위젯을 대체하거나 빈 슬롯에 넣고 슬롯 번호를 반환"""
+        slot = -1
+        for i, w in enumerate(self.widgets):
+            if w is not None and w.row == widget.row and w.col == widget.col:
+                slot = i
+                break
+        if slot < 0:
+            for i, w in enumerate(self.widgets):
+                if w is None:
+                    slot = i
+                    break
+        if slot < 0:
+            raise ValueError("no free widget slot")
+        self.widgets[slot] = widget
+        self._due[slot] = time.ticks_ms()  # 다음 update() 에서 바로 출력
+        return slot
+
+    def add_marquee(self, row, col, width, text, step_ms=300):
+        """스크롤 문자열 위젯 추가, 슬롯 번호 반환"""
+        return self._place(Marquee(row, col, width, text, step_ms))
+
+    def add_field(self, row, col, template, period_ms=1000, width=None):
+        """센서 값 바인딩 필드 추가, 슬롯 번호 반환"""
+        return self._place(BoundField(row, col, template, period_ms, width))
+
+    def remove(self, slot):
+        """슬롯의 위젯 제거 (화면 내용은 그대로 둠)"""
+        if 0 <= slot < self.MAX_WIDGETS and self.widgets[slot] is not None:
+            self.widgets[slot] = None
+            return True
+        return False
+
+    def clear(self):
+        """모든 위젯 제거"""
+        for i in range(self.MAX_WIDGETS):
+            self.widgets[i] = None
+
+    def active(self):
+        """등록된 위젯이 있는지 여부"""
+        for w in self.widgets:
+            if w is not None:
+                return True
+        return False
+
+    def update(self):
+        """
+        시각이 된 위젯을 프레임버퍼에 쓰고 바뀐 칸만 한 번에 전송 (메인 루프에서 주기 호출)
+
+        Returns:
+            int: LCD 로 전송한 문자 수
+        """
+        now = time.ticks_ms()
+        touched = False
+        for i in range(self.MAX_WIDGETS):
+            w = self.widgets[i]
+            if w is None or time.ticks_diff(now, self._due[i]) < 0:
+                continue
+            self._due[i] = time.ticks_add(now, w.period_ms)
+            self.lcd.write_at(w.col, w.row, w.render(self.resolve))
+            touched = True
+        if touched:
+            return self.lcd.show()
+        return 0
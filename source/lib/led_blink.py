@@ -0,0 +1,118 @@
+"""
+LED 깜빡임 (저주파 PWM 하드웨어 깜빡임 / 메인 루프 예비 방식)
+
+상주 스레드가 100ms 마다 깨어나 duty() 를 읽고 뒤집는 대신,
+
+- PWM 방식: LED 의 LEDC 채널을 깜빡임 주파수(1000 / (2 x 간격) Hz), 듀티 50% 로 바꿔
+  하드웨어가 정확한 주기로 켜고 끈다. (CPU 개입 없음)
+- SOFT 방식: 정수 주파수로 나누어떨어지지 않는 간격이거나 LEDC 가 그 주파수를 만들 수 없으면
+  (PWM 타이머 부족 등) 원래 PWM 주파수로 두고 update() 에서 ticks_ms 마감 시각마다 뒤집는다.
+  마감 시각은 간격만큼 더해 가므로 주기가 누적해서 밀리지 않는다.
+  (하드웨어 타이머 0~3 은 EZSOUND/SCOPE/먼지센서/버저 시퀀서가 사용)
+
+두 방식 모두 켜진 구간은 최대 밝기(기존 깜빡임과 동일)로 출력한다.
+
+사용 예:
+    from led_blink import LedBlinker
+
+    blinker = LedBlinker(led_pwm)
+    blinker.start(500)          # 0.5초 켜짐 / 0.5초 꺼짐
+    while True:
+        blinker.update()        # SOFT 방식일 때만 동작
+"""
+
+import time
+
+
+class LedBlinker:
+    """
+    PWM LED 깜빡임 제어
+
+    Attributes:
+        mode (int): OFF / PWM / SOFT
+        interval_ms (int): 켜짐(=꺼짐) 구간 길이
+    """
+
+    OFF = 0
+    PWM = 1
+    SOFT = 2
+    MODE_NAMES = ("OFF", "PWM", "SOFT")
+
+    FULL = 65535
+    HALF = 32768
+
+    def __init__(self, pwm, base_freq=1000):
+        """
+        Args:
+            pwm (machine.PWM): LED PWM 객체
+            base_freq (int): 평상시(밝기 제어용) PWM 주파수
+        """
+        self.pwm = pwm
+        self.base_freq = base_freq
+        self.mode = self.OFF
+        self.interval_ms = 0
+        self._on = False
+        self._next_ms = 0
+
+    @property
+    def active(self):
+        return self.mode != self.OFF
+
+    def start(self, interval_ms):
+        """
+        깜빡임 시작 (interval_ms 켜짐 + interval_ms 꺼짐)
+
+        Returns:
+            int: 사용한 방식 (PWM 또는 SOFT)
+        """
+        self.stop()
+        self.interval_ms = interval_ms
+        period = 2 * interval_ms
+        if 1000 % period == 0 and self._try_pwm(1000 // period):
+            self.mode = self.PWM
+            return self.mode
+
+        self.mode = self.SOFT
+        self._on = True
+        self.pwm.duty_u16(self.FULL)
+        self._next_ms = time.ticks_add(time.ticks_ms(), interval_ms)
+        return self.mode
+
+    def _try_pwm(self, freq):
+        """LEDC 를 깜빡임 주파수로 설정 (정확히 설정되지 않으면 원래대로 두고 False)"""
+        try:
+            self.pwm.freq(freq)
+            if self.pwm.freq() != freq:
+                raise ValueError("inexact blink frequency")
+            self.pwm.duty_u16(self.HALF)
+            return True
+        except Exception:
+            try:
+                self.pwm.freq(self.base_freq)
+            except Exception:
+                pass
+            return False
+
+    def stop(self):
+        """깜빡임 중지 (PWM 주파수 복원, LED 밝기는 호출 측에서 설정)"""
+        mode = self.mode
+        self.mode = self.OFF
+        if mode == self.PWM:
+            self.pwm.duty_u16(0)
+            self.pwm.freq(self.base_freq)
+        elif mode == self.SOFT:
+            self.pwm.duty_u16(0)
+
+    def update(self):
+        """SOFT 방식: 마감 시각이 되었으면 켜짐/꺼짐 전환 (메인 루프에서 주기 호출)"""
+        if self.mode != self.SOFT:
+            return
+        now = time.ticks_ms()
+        if time.ticks_diff(now, self._next_ms) < 0:
+            return
+        self._next_ms = time.ticks_add(self._next_ms, self.interval_ms)
+        if time.ticks_diff(now, self._next_ms) >= 0:
+            # 한 주기 이상 밀렸으면 현재 시각 기준으로 다시 맞춤
+            self._next_ms = time.ticks_add(now, self.interval_ms)
+        self._on = not self._on
+        self.pwm.duty_u16(self.FULL if self._on else 0)
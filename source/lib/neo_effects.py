@@ -0,0 +1,372 @@
+"""
+NeoPixel 효과 엔진 (무지개 / 체이스 / 숨쉬기 / 채우기-페이드 / 반짝임)
+
+전용 스레드와 time.sleep() 대신 메인 루프에서 update() 를 호출하면
+프레임 시각이 된 경우에만 1프레임을 계산해 neo.write() 한다.
+
+- 색상환(wheel)은 256개 항목의 R/G/B LUT 로 미리 계산한다.
+- 밝기(+감마)는 256개 항목의 LUT 하나로 적용한다. (float 곱셈/클램프/int 변환 없음)
+- 픽셀 값은 NeoPixel.buf 에 색상 순서(ORDER, 보통 GRB)대로 직접 쓴다. (튜플 생성 없음)
+- stop() 은 대기 없이 즉시 멈추고 LED 를 끈다.
+- 정적 출력: fill_range() / gradient() / load_rgb() 로 구간 채우기, 그라데이션,
+  호스트가 보낸 RGB 바이트열(NEO:FRAME)을 같은 LUT 로 buf 에 기록한다. (write() 는 호출 측에서 1회)
+
+사용 예:
+    from neo_effects import NeoEffects
+
+    fx = NeoEffects(neo)
+    fx.start(NeoEffects.RAINBOW, speed=5)
+    while True:
+        fx.update()
+"""
+
+import time
+import random
+import micropython
+
+
+def _build_wheel():
+    """0~255 위치 → (R, G, B) 색상환 LUT"""
+    wr = bytearray(256)
+    wg = bytearray(256)
+    wb = bytearray(256)
+    for pos in range(256):
+        if pos < 85:
+            r, g, b = 255 - pos * 3, pos * 3, 0
+        elif pos < 170:
+            p = pos - 85
+            r, g, b = 0, 255 - p * 3, p * 3
+        else:
+            p = pos - 170
+            r, g, b = p * 3, 0, 255 - p * 3
+        wr[pos] = r
+        wg[pos] = g
+        wb[pos] = b
+    return wr, wg, wb
+
+
+WHEEL_R, WHEEL_G, WHEEL_B = _build_wheel()
+
+
+def _build_breath(steps=64):
+    """숨쉬기 효과 밝기 곡선 (0 → 255 → 0, 감마 2.2 로 부드럽게)"""
+    import math
+    env = bytearray(steps)
+    for i in range(steps):
+        s = (1 - math.cos(2 * math.pi * i / steps)) / 2
+        env[i] = int(255 * (s ** 2.2) + 0.5)
+    return env
+
+
+BREATH = _build_breath()
+
+
+class NeoEffects:
+    """
+    NeoPixel 효과 엔진
+
+    Attributes:
+        effect (int): 실행 중인 효과 (NONE 이면 정지)
+        speed (int): 속도 1~10 (프레임 간격 = (11 - speed) * 50ms, 기존 무지개 효과와 동일)
+    """
+
+    NONE = 0
+    RAINBOW = 1
+    CHASE = 2
+    BREATHE = 3
+    FADE = 4      # 한 칸씩 채운 뒤 서서히 꺼짐 (반복)
+    SPARKLE = 5
+
+    NAMES = {
+        "RAINBOW": RAINBOW,
+        "CHASE": CHASE,
+        "BREATHE": BREATHE,
+        "FADE": FADE,
+        "SPARKLE": SPARKLE,
+    }
+
+    def __init__(self, neo, brightness=255, gamma=1.0):
+        """
+        Args:
+            neo (NeoPixel): 대상 NeoPixel 객체 (buf/ORDER/bpp 사용)
+            brightness (int): 밝기 0~255
+            gamma (float): 밝기 LUT 감마 (1.0 이면 기존 선형 밝기와 동일)
+        """
+        self.neo = neo
+        self.n = neo.n
+        self.bpp = neo.bpp
+        order = getattr(neo, "ORDER", (1, 0, 2, 3))
+        self._ro = order[0]
+        self._go = order[1]
+        self._bo = order[2]
+
+        self._lut = bytearray(256)
+        self.brightness = 255
+        self.gamma = gamma
+        self.set_brightness(brightness, gamma)
+
+        # 픽셀별 무지개 기본 위상 (i * 256 // n)
+        self._hue = bytearray((i * 256 // self.n) & 255 for i in range(self.n))
+
+        self.effect = self.NONE
+        self.speed = 5
+        self.color = (255, 255, 255)
+        self.period_ms = 300
+        self._step = 0
+        self._phase = 0
+        self._next_ms = 0
+
+    # ------------------------------------------------------------------
+    # 설정
+    # ------------------------------------------------------------------
+    def set_brightness(self, brightness, gamma=None):
+        """밝기(0~255)/감마로 LUT 재계산 (명령 수신 시 1회)"""
+        if gamma is not None:
+            self.gamma = gamma
+        brightness = max(0, min(255, int(brightness)))
+        self.brightness = brightness
+        lut = self._lut
+        if self.gamma == 1.0:
+            for v in range(256):
+                lut[v] = v * brightness // 255
+        else:
+            g = self.gamma
+            for v in range(256):
+                lut[v] = int(((v / 255) ** g) * brightness + 0.5)
+
+    def scale(self, v):
+        """단일 색상 값에 밝기 LUT 적용"""
+        return self._lut[v & 0xFF]
+
+    @property
+    def active(self):
+        """효과 실행 중 여부"""
+        return self.effect != self.NONE
+
+    def start(self, effect, speed=5, color=None):
+        """
+        효과 시작 (이미 실행 중이면 효과/속도/색상만 바꿈)
+
+        Args:
+            effect (int): RAINBOW / CHASE / BREATHE / FADE / SPARKLE
+            speed (int): 1~10
+            color (tuple): (r, g, b) — RAINBOW 외 효과의 색상
+        """
+        self.speed = max(1, min(10, int(speed)))
+        self.period_ms = (11 - self.speed) * 50
+        if effect in (self.BREATHE, self.FADE):
+            # 단계가 많은 효과는 프레임 간격을 줄여 한 주기 길이를 비슷하게 맞춤
+            self.period_ms = max(10, self.period_ms // 8)
+        if color is not None:
+            self.color = (color[0] & 0xFF, color[1] & 0xFF, color[2] & 0xFF)
+        if effect != self.effect:
+            self._step = 0
+            self._phase = 0
+            self._clear_buf()
+        self.effect = effect
+        self._next_ms = time.ticks_ms()
+
+    def stop(self, clear=True):
+        """즉시 정지 (clear=True 이면 LED 끄기)"""
+        self.effect = self.NONE
+        if clear:
+            self._clear_buf()
+            self.neo.write()
+
+    # ------------------------------------------------------------------
+    # 프레임
+    # ------------------------------------------------------------------
+    def update(self):
+        """
+        프레임 시각이 되었으면 1프레임 계산 후 write() (메인 루프에서 주기 호출)
+
+        Returns:
+            bool: 프레임을 출력했는지 여부
+        """
+        if self.effect == self.NONE:
+            return False
+        now = time.ticks_ms()
+        if time.ticks_diff(now, self._next_ms) < 0:
+            return False
+        self._next_ms = time.ticks_add(now, self.period_ms)
+
+        effect = self.effect
+        if effect == self.RAINBOW:
+            self._rainbow(self._step & 255)
+            self._step = (self._step + 1) & 255
+        elif effect == self.CHASE:
+            self._chase(self._step % 3)
+            self._step = (self._step + 1) % 3
+        elif effect == self.BREATHE:
+            self._solid(BREATH[self._step])
+            self._step = (self._step + 1) % len(BREATH)
+        elif effect == self.FADE:
+            self._fill_fade()
+        elif effect == self.SPARKLE:
+            self._sparkle()
+        self.neo.write()
+        return True
+
+    def _clear_buf(self):
+        buf = self.neo.buf
+        for i in range(len(buf)):
+            buf[i] = 0
+
+    @micropython.native
+    def _rainbow(self, offset):
+        buf = self.neo.buf
+        lut = self._lut
+        hue = self._hue
+        bpp = self.bpp
+        ro = self._ro
+        go = self._go
+        bo = self._bo
+        j = 0
+        for i in range(self.n):
+            h = (hue[i] + offset) & 255
+            buf[j + ro] = lut[WHEEL_R[h]]
+            buf[j + go] = lut[WHEEL_G[h]]
+            buf[j + bo] = lut[WHEEL_B[h]]
+            j += bpp
+
+    @micropython.native
+    def _set_range(self, start, end, level):
+        """start~end-1 픽셀을 color x level/255 (밝기 LUT 적용)로 설정"""
+        buf = self.neo.buf
+        lut = self._lut
+        bpp = self.bpp
+        r = lut[(self.color[0] * level) >> 8]
+        g = lut[(self.color[1] * level) >> 8]
+        b = lut[(self.color[2] * level) >> 8]
+        ro = self._ro
+        go = self._go
+        bo = self._bo
+        j = start * bpp
+        for _ in range(start, end):
+            buf[j + ro] = r
+            buf[j + go] = g
+            buf[j + bo] = b
+            j += bpp
+
+    def _solid(self, level):
+        self._set_range(0, self.n, level + 1 if level else 0)
+
+    @micropython.native
+    def _chase(self, phase):
+        # 3칸마다 1칸 점등 (theater chase)
+        buf = self.neo.buf
+        lut = self._lut
+        bpp = self.bpp
+        r = lut[self.color[0]]
+        g = lut[self.color[1]]
+        b = lut[self.color[2]]
+        ro = self._ro
+        go = self._go
+        bo = self._bo
+        j = 0
+        for i in range(self.n):
+            on = (i % 3) == phase
+            buf[j + ro] = r if on else 0
+            buf[j + go] = g if on else 0
+            buf[j + bo] = b if on else 0
+            j += bpp
+
+    def _fill_fade(self):
+        n = self.n
+        if self._phase == 0:
+            # 한 프레임에 한 칸씩 채우기 (채우는 단계는 8프레임마다 1칸)
+            k = self._step >> 3
+            if k < n:
+                self._set_range(k, k + 1, 256)
+                self._step += 1
+            else:
+                self._phase = 1
+                self._step = 255
+        else:
+            level = self._step
+            self._set_range(0, n, level + 1 if level else 0)
+            if level == 0:
+                self._phase = 0
+            else:
+                self._step = max(0, level - 8)
+
+    @micropython.native
+    def _decay(self):
+        buf = self.neo.buf
+        for i in range(len(buf)):
+            v = buf[i]
+            buf[i] = (v * 3) >> 2
+
+    # ------------------------------------------------------------------
+    # 정적 출력 (buf 만 채움, neo.write() 는 호출 측에서)
+    # ------------------------------------------------------------------
+    def _put(self, i, r, g, b):
+        j = i * self.bpp
+        buf = self.neo.buf
+        lut = self._lut
+        buf[j + self._ro] = lut[r & 0xFF]
+        buf[j + self._go] = lut[g & 0xFF]
+        buf[j + self._bo] = lut[b & 0xFF]
+
+    def fill_range(self, start, end, r, g, b):
+        """start~end(포함) 픽셀을 한 색으로 채움 (범위는 스트립 안으로 잘림)"""
+        start = max(0, start)
+        end = min(self.n - 1, end)
+        for i in range(start, end + 1):
+            self._put(i, r, g, b)
+        return max(0, end - start + 1)
+
+    def gradient(self, start, end, c1, c2):
+        """start~end(포함) 픽셀을 c1 → c2 선형 그라데이션으로 채움"""
+        span = end - start
+        count = 0
+        for i in range(max(0, start), min(self.n - 1, end) + 1):
+            k = i - start
+            if span:
+                r = c1[0] + (c2[0] - c1[0]) * k // span
+                g = c1[1] + (c2[1] - c1[1]) * k // span
+                b = c1[2] + (c2[2] - c1[2]) * k // span
+            else:
+                r, g, b = c1
+            self._put(i, r, g, b)
+            count += 1
+        return count
+
+    @micropython.native
+    def load_rgb(self, offset, data, start=0):
+        """
+        RGB 바이트열(R,G,B 반복)을 offset 픽셀부터 buf 에 기록 (밝기 LUT + ORDER 적용)
+
+        Args:
+            offset (int): 첫 픽셀 번호
+            data (bytes/memoryview): 패킹된 RGB
+            start (int): data 안의 시작 위치
+
+        Returns:
+            int: 기록한 픽셀 수 (스트립 끝에서 잘림)
+        """
+        count = (len(data) - start) // 3
+        if offset + count > self.n:
+            count = self.n - offset
+        if count <= 0:
+            return 0
+        buf = self.neo.buf
+        lut = self._lut
+        bpp = self.bpp
+        ro = self._ro
+        go = self._go
+        bo = self._bo
+        j = offset * bpp
+        k = start
+        for _ in range(count):
+            buf[j + ro] = lut[data[k]]
+            buf[j + go] = lut[data[k + 1]]
+            buf[j + bo] = lut[data[k + 2]]
+            j += bpp
+            k += 3
+        return count
+
+    def _sparkle(self):
+        self._decay()
+        k = random.getrandbits(8) % self.n
+        self._set_range(k, k + 1, 256)
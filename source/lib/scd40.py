@@ -9,8 +9,12 @@ Sensirion SCD40/SCD41 이산화탄소 센서 MicroPython 드라이버 라이브
 - 온도 측정 (-10~60°C)
 - 습도 측정 (0~100% RH)
 - I2C 통신
-- CRC-8 체크섬 검증
-- 주기적 측정 모드 (5초 간격)
+- CRC-8 체크섬 검증 (256바이트 테이블)
+- 주기적 측정 모드 (5초 간격) / 저전력 주기 모드 (30초 간격)
+- 단발 측정 모드 (SCD41 전용, 요청 시 1회 측정 후 유휴)
+  - get_sensor_variant 로 SCD40 이면 거부, 조회를 지원하지 않는 구형 펌웨어는 시도 후
+    결과가 나오지 않으면 주기 모드로 전환
+- 백그라운드 캐시: update()를 메인 루프에서 호출하면 측정값을 (co2, T, RH, 시각)으로 보관
 
 사용 예:
     from machine import Pin, SoftI2C
@@ -27,6 +31,13 @@ Sensirion SCD40/SCD41 이산화탄소 센서 MicroPython 드라이버 라이브
         co2, temp, hum = sensor.read()
         print(f"CO2: {co2} ppm, Temp: {temp:.1f} C, Humidity: {hum:.1f} %")
 
+    # 백그라운드 캐시 사용 예
+    sensor.set_mode(SCD40.MODE_LOW_POWER)
+    while True:
+        sensor.update()
+        if sensor.has_data():
+            co2, temp, hum, ts = sensor.get_cached()
+
 연결:
 - SCL (D5) -> GPIO 40
 - SDA (D6) -> GPIO 41
@@ -40,20 +51,72 @@ Sensirion SCD40/SCD41 이산화탄소 센서 MicroPython 드라이버 라이브
 from machine import SoftI2C
 import time
 
+
+def _make_crc8_table(poly=0x31):
+    """CRC-8 (polynomial 0x31) 바이트 단위 테이블 생성 (모듈 로드 시 1회)"""
+    table = bytearray(256)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            if crc & 0x80:
+                crc = ((crc << 1) ^ poly) & 0xFF
+            else:
+                crc = (crc << 1) & 0xFF
+        table[i] = crc
+    return bytes(table)
+
+
+_CRC8_TABLE = _make_crc8_table()
+
+
 class SCD40:
     """Sensirion SCD40/SCD41 CO2 센서 드라이버"""
     
     # 명령어 정의
     CMD_START_MEASUREMENT = 0x21B1
+    CMD_START_LOW_POWER_MEASUREMENT = 0x21AC
+    CMD_MEASURE_SINGLE_SHOT = 0x219D  # SCD41 전용
     CMD_STOP_MEASUREMENT = 0x3F86
     CMD_READ_MEASUREMENT = 0xEC05
     CMD_DATA_READY = 0xE4B8
     CMD_SERIAL_NUMBER = 0x3682
     CMD_REINIT = 0x3646
+    CMD_GET_SENSOR_VARIANT = 0x202F
+
+    # get_sensor_variant 응답 상위 4비트 → 센서 종류
+    _VARIANTS = {0: "SCD40", 1: "SCD41", 5: "SCD43"}
+
+    # 측정 모드
+    MODE_IDLE = "IDLE"
+    MODE_PERIODIC = "PERIODIC"      # 5초 간격
+    MODE_LOW_POWER = "LOWPOWER"     # 30초 간격
+    MODE_SINGLE_SHOT = "SINGLE"     # 요청 간격마다 단발 측정 (SCD41 전용, 측정 5초)
+
+    # 모드별 측정 주기(ms)
+    _MODE_PERIOD_MS = {
+        "PERIODIC": 5000,
+        "LOWPOWER": 30000,
+        "SINGLE": 5000,
+    }
+    SINGLE_SHOT_DURATION_MS = 5000
+    _READY_RETRY_MS = 500  # 예상 시각에 준비되지 않았을 때 재확인 간격
+    SHOT_MAX_RETRIES = 6   # 단발 측정 후 재확인 한도 (5초 + 3초 안에 결과가 없으면 미지원으로 판단)
     
     def __init__(self, i2c, addr=0x62):
         self.i2c = i2c
         self.addr = addr
+
+        self.mode = self.MODE_IDLE
+        self.single_shot_interval_ms = 60000  # 단발 모드 측정 간격 (set_mode 로 변경)
+
+        # 측정값 캐시 (co2, temp, hum, ticks_ms)
+        self._cache = None
+        self._next_check_ms = time.ticks_ms()
+        self._shot_pending = False
+        self._ready_misses = 0
+        self.variant = None          # "SCD40" / "SCD41" / "SCD43", 모르면 None
+        self._single_shot_ok = True  # 단발 측정 결과가 나오지 않으면 False
+        self.error_count = 0
         
     def _send_command(self, cmd):
         """2바이트 명령어 전송"""
@@ -64,16 +127,11 @@ class SCD40:
         return self.i2c.readfrom(self.addr, length)
     
     def _crc8(self, data):
-        """CRC-8 계산 (polynomial 0x31, init 0xFF)"""
+        """CRC-8 계산 (polynomial 0x31, init 0xFF, 테이블 방식)"""
         crc = 0xFF
+        table = _CRC8_TABLE
         for byte in data:
-            crc ^= byte
-            for _ in range(8):
-                if crc & 0x80:
-                    crc = (crc << 1) ^ 0x31
-                else:
-                    crc <<= 1
-                crc &= 0xFF
+            crc = table[crc ^ byte]
         return crc
     
     def _check_crc(self, data, crc):
@@ -84,11 +142,114 @@ class SCD40:
         """주기적 측정 시작 (5초 간격)"""
         self._send_command(self.CMD_START_MEASUREMENT)
         time.sleep_ms(1)
+        self.mode = self.MODE_PERIODIC
+        self._schedule_check(self._MODE_PERIOD_MS[self.MODE_PERIODIC])
+
+    def start_low_power_measurement(self):
+        """저전력 주기적 측정 시작 (30초 간격)"""
+        self._send_command(self.CMD_START_LOW_POWER_MEASUREMENT)
+        time.sleep_ms(1)
+        self.mode = self.MODE_LOW_POWER
+        self._schedule_check(self._MODE_PERIOD_MS[self.MODE_LOW_POWER])
         
     def stop_measurement(self):
         """측정 중지"""
         self._send_command(self.CMD_STOP_MEASUREMENT)
         time.sleep_ms(500)
+        self.mode = self.MODE_IDLE
+        self._shot_pending = False
+
+    def trigger_single_shot(self):
+        """
+        단발 측정 시작 (SCD41 전용, 비블로킹)
+        약 5초 후 is_data_ready()/read() 로 결과를 읽는다.
+        """
+        self._send_command(self.CMD_MEASURE_SINGLE_SHOT)
+        self._shot_pending = True
+        self._ready_misses = 0
+        self._schedule_check(self.SINGLE_SHOT_DURATION_MS)
+
+    def measure_single_shot(self):
+        """
+        단발 측정 후 결과 반환 (SCD41 전용, 약 5초 블로킹)
+
+        Returns:
+            tuple: (co2, temperature, humidity)
+        """
+        self._send_command(self.CMD_MEASURE_SINGLE_SHOT)
+        time.sleep_ms(self.SINGLE_SHOT_DURATION_MS)
+        result = self.read()
+        self._store(result)
+        return result
+
+    def result_timeout_ms(self):
+        """현재 모드에서 정상이라면 다음 측정값이 나올 때까지의 최대 대기 시간(ms)"""
+        if self.mode == self.MODE_SINGLE_SHOT:
+            return self.SINGLE_SHOT_DURATION_MS + (self.SHOT_MAX_RETRIES + 2) * self._READY_RETRY_MS
+        return self._MODE_PERIOD_MS.get(self.mode, self._MODE_PERIOD_MS[self.MODE_PERIODIC]) + 1500
+
+    def read_variant(self):
+        """
+        센서 종류 조회 (get_sensor_variant, 유휴 상태에서만 응답)
+
+        Returns:
+            str or None: "SCD40" / "SCD41" / "SCD43" (응답이 없거나 알 수 없으면 None)
+        """
+        try:
+            self._send_command(self.CMD_GET_SENSOR_VARIANT)
+            time.sleep_ms(1)
+            data = self._read_data(3)
+            if self._check_crc(data[0:2], data[2]):
+                self.variant = self._VARIANTS.get(data[0] >> 4)
+        except OSError:
+            self.variant = None  # 구형 펌웨어는 명령에 NACK
+        return self.variant
+
+    def supports_single_shot(self):
+        """단발 측정 지원 여부 (SCD40 이거나 단발 측정 결과가 나오지 않았으면 False)"""
+        return self._single_shot_ok and self.variant != "SCD40"
+
+    def set_mode(self, mode, single_shot_interval_ms=None):
+        """
+        측정 모드 변경 (배포 환경에 맞게 선택)
+
+        Args:
+            mode: MODE_PERIODIC / MODE_LOW_POWER / MODE_SINGLE_SHOT / MODE_IDLE
+            single_shot_interval_ms: 단발 모드 측정 간격(ms), 최소 5000
+
+        Raises:
+            ValueError: 알 수 없는 모드, 또는 단발 측정을 지원하지 않는 센서(SCD40)
+                        (이때 기존 모드는 유지)
+        """
+        if mode not in (self.MODE_IDLE, self.MODE_PERIODIC, self.MODE_LOW_POWER, self.MODE_SINGLE_SHOT):
+            raise ValueError("Unknown SCD40 mode: {}".format(mode))
+        if mode == self.MODE_SINGLE_SHOT and not self.supports_single_shot():
+            raise ValueError("Single-shot mode requires SCD41")
+
+        # 주기 측정 중에는 다른 명령을 받지 않으므로 먼저 중지
+        previous = self.mode
+        if previous in (self.MODE_PERIODIC, self.MODE_LOW_POWER):
+            self.stop_measurement()
+        self.mode = self.MODE_IDLE
+        self._shot_pending = False
+
+        if mode == self.MODE_SINGLE_SHOT and self.variant is None:
+            # 종류 조회는 유휴 상태에서만 가능하므로 중지 후 확인
+            if self.read_variant() == "SCD40":
+                if previous != self.MODE_IDLE:
+                    self.set_mode(previous)
+                raise ValueError("Single-shot mode requires SCD41")
+
+        if single_shot_interval_ms is not None:
+            self.single_shot_interval_ms = max(int(single_shot_interval_ms), self.SINGLE_SHOT_DURATION_MS)
+
+        if mode == self.MODE_PERIODIC:
+            self.start_measurement()
+        elif mode == self.MODE_LOW_POWER:
+            self.start_low_power_measurement()
+        elif mode == self.MODE_SINGLE_SHOT:
+            self.mode = self.MODE_SINGLE_SHOT
+            self.trigger_single_shot()
         
     def is_data_ready(self):
         """데이터 준비 상태 확인"""
@@ -134,3 +295,78 @@ class SCD40:
                  (data[4] << 16) | (data[6] << 8) | data[7]
         return serial
 
+    # ------------------------------------------------------------------
+    # 백그라운드 캐시
+    # ------------------------------------------------------------------
+    def _schedule_check(self, delay_ms):
+        self._next_check_ms = time.ticks_add(time.ticks_ms(), delay_ms)
+
+    def _store(self, result):
+        co2, temperature, humidity = result
+        self._cache = (co2, temperature, humidity, time.ticks_ms())
+
+    def update(self):
+        """
+        메인 루프에서 주기적으로 호출한다. (측정 주기당 I2C 확인 1~2회)
+
+        - 주기/저전력 모드: 다음 측정 예상 시각에 data-ready 를 확인하고 읽어 캐시
+        - 단발 모드: 간격마다 단발 측정을 시작하고, 5초 후 결과를 읽어 캐시
+          (SHOT_MAX_RETRIES 번 재확인해도 결과가 없으면 주기 모드로 전환, mode 로 확인)
+
+        Returns:
+            bool: 새 측정값이 캐시되었는지 여부
+        """
+        if self.mode == self.MODE_IDLE:
+            return False
+        if time.ticks_diff(time.ticks_ms(), self._next_check_ms) < 0:
+            return False
+
+        try:
+            if self.mode == self.MODE_SINGLE_SHOT and not self._shot_pending:
+                self.trigger_single_shot()
+                return False
+
+            if not self.is_data_ready():
+                if self._shot_pending:
+                    self._ready_misses += 1
+                    if self._ready_misses > self.SHOT_MAX_RETRIES:
+                        # 단발 명령을 무시하는 센서(SCD40 구형 펌웨어): 주기 모드로 전환
+                        self._single_shot_ok = False
+                        self._shot_pending = False
+                        self.error_count += 1
+                        self.start_measurement()
+                        return False
+                self._schedule_check(self._READY_RETRY_MS)
+                return False
+
+            self._store(self.read())
+        except Exception:
+            self.error_count += 1
+            self._schedule_check(self._READY_RETRY_MS)
+            return False
+
+        if self.mode == self.MODE_SINGLE_SHOT:
+            self._shot_pending = False
+            self._schedule_check(self.single_shot_interval_ms - self.SINGLE_SHOT_DURATION_MS)
+        else:
+            self._schedule_check(self._MODE_PERIOD_MS[self.mode])
+        return True
+
+    def has_data(self):
+        """캐시된 측정값이 있는지 여부"""
+        return self._cache is not None
+
+    def get_cached(self):
+        """
+        캐시된 측정값 반환
+
+        Returns:
+            tuple or None: (co2, temperature, humidity, ticks_ms)
+        """
+        return self._cache
+
+    def age_ms(self):
+        """마지막 측정 이후 경과 시간(ms), 없으면 None"""
+        if self._cache is None:
+            return None
+        return time.ticks_diff(time.ticks_ms(), self._cache[3])
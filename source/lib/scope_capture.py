@@ -0,0 +1,361 @@
+"""
+EZMaker 아날로그 포트 다채널 오실로스코프 캡처
+
+A0~A4 아날로그 포트(GPIO 2/1/3/20/19) 중 1~5개 채널을 하드웨어 타이머로
+일정 주기(최대 수 kHz) 샘플링해 미리 할당한 링 버퍼(array('H'))에 채운다.
+BLE 로 STATUS 를 반복 요청하는 방식(수십 Hz)보다 훨씬 빠른 파형 캡처가 가능하다.
+
+- 샘플은 프레임(채널 수 만큼의 샘플 묶음) 단위로 인터리브 저장: [ch0, ch1, ..., ch0, ch1, ...]
+- 값은 12비트(0~4095) 스케일 (read_u16() >> 4)
+- 레벨 트리거(상승/하강 엣지) + 프리트리거(트리거 이전 프레임 수) 지원
+- 트리거가 timeout_ms 안에 오지 않으면 강제 트리거(AUTO)
+- 캡처 완료 후 pump()가 MTU 크기 바이너리 청크로 나눠 전송한다.
+  (링 버퍼의 memoryview 조각을 그대로 notify 하므로 복사/선형화 없음)
+
+전송 프로토콜 (notify 함수로 전송):
+    SCOPE:BEGIN:<채널수>,<샘플링Hz>,<프레임수>,<트리거프레임>
+    <바이너리 청크> ...  (최대 180바이트, 총 길이 = 프레임수 * 채널수 * 2 바이트, uint16 LE 인터리브)
+    SCOPE:END:<청크수>
+    BLE notify 는 순서가 보장되므로 수신측은 BEGIN 의 총 길이만큼 바이너리로 받은 뒤 END 를 확인한다.
+
+사용 예:
+    from scope_capture import ScopeCapture
+
+    scope = ScopeCapture()
+    scope.configure(pins=(2, 1), rate_hz=2000, frames=500)
+    scope.set_trigger(level=2048, edge=ScopeCapture.EDGE_RISE, pretrigger=100)
+    scope.start()
+    while True:
+        scope.update()
+        scope.pump(uart.ez_scope_notify)
+"""
+
+import time
+import array
+import machine
+from adc_sampler import make_adc
+
+
+# EZMaker 아날로그 포트(A0~A4) GPIO 번호
+SCOPE_PINS = (2, 1, 3, 20, 19)
+
+
+class ScopeCapture:
+    """
+    타이머 기반 다채널 ADC 캡처 + 바이너리 청크 전송
+
+    캡처 상태:
+    - IDLE     : 대기
+    - PREFILL  : 프리트리거 구간 채우는 중
+    - WAIT_TRIG: 트리거 조건 대기
+    - POST     : 트리거 이후 구간 채우는 중
+    - DONE     : 캡처 완료 (전송 대기/전송 중)
+    """
+
+    IDLE = 0
+    PREFILL = 1
+    WAIT_TRIG = 2
+    POST = 3
+    DONE = 4
+
+    EDGE_RISE = 0
+    EDGE_FALL = 1
+
+    TIMER_ID = 1             # 하드웨어 타이머 (EZSOUND 레벨미터는 0 사용)
+    # 소프트 IRQ 타이머 콜백은 BLE 동작 중 100us 주기를 지키지 못하므로 수 kHz 로 제한
+    # (실제 달성 주파수는 actual_rate_hz 로 확인)
+    MAX_RATE_HZ = 5000       # 채널당 최대 샘플링 주파수
+    MAX_TOTAL_RATE = 10000   # 전체(채널 수 x 주파수) 최대 샘플 속도
+    MAX_SAMPLES = 4000       # 버퍼 최대 샘플 수 (8KB)
+    CHUNK_SAMPLES = 90       # 청크당 샘플 수 (180바이트, MTU 185 - ATT 헤더 3 이내)
+
+    def __init__(self, timer_id=TIMER_ID):
+        self.timer_id = timer_id
+        self._timer = None
+
+        self.pins = ()
+        self.rate_hz = 1000
+        self.frames = 0
+        self._nch = 0
+        self._reads = ()
+        self._buf = array.array("H", bytes(2 * self.MAX_SAMPLES))
+        self._view = memoryview(self._buf)
+
+        # 트리거 설정
+        self.trigger_level = None    # None 이면 트리거 없음 (즉시 캡처)
+        self.trigger_edge = self.EDGE_RISE
+        self.trigger_channel = 0
+        self.pretrigger = 0
+        self.timeout_ms = 2000
+
+        # 타이머 콜백에서 갱신하는 상태 (할당 없음)
+        self.state = self.IDLE
+        self._frame = 0              # 다음에 쓸 프레임 인덱스
+        self._count = 0              # PREFILL 에서 채운 프레임 수 / POST 남은 프레임 수
+        self._prev = 0               # 트리거 채널 직전 값
+        self._trig_frame = 0         # 트리거가 걸린 프레임 인덱스
+        self.forced = False          # AUTO 강제 트리거 여부
+        self._armed_ms = 0
+        self._ticks = 0              # 콜백 호출 수 / 첫·마지막 호출 시각 (달성 주파수 측정)
+        self._first_us = 0
+        self._last_us = 0
+        self.actual_rate_hz = 0      # 마지막 캡처에서 실제 달성한 샘플링 주파수 (0 = 측정 전)
+        self._cb = self._tick
+
+        # 전송 상태
+        self._tx_stage = 0           # 0: 없음, 1: BEGIN, 2: 데이터, 3: END
+        self._tx_offset = 0          # 선형화된 데이터 기준 샘플 오프셋
+        self._tx_seq = 0
+
+    # ------------------------------------------------------------------
+    # 설정
+    # ------------------------------------------------------------------
+    def configure(self, pins=None, rate_hz=None, frames=None):
+        """
+        캡처 채널/주파수/길이 설정 (캡처 중에는 중지 후 적용)
+
+        Args:
+            pins (tuple): GPIO 번호 목록 (SCOPE_PINS 중 1~5개)
+            rate_hz (int): 채널당 샘플링 주파수(Hz)
+            frames (int): 캡처 프레임 수 (채널당 샘플 수)
+        """
+        self.stop()
+        if pins is not None:
+            pins = tuple(pins)
+            if not pins or len(pins) > len(SCOPE_PINS):
+                raise ValueError("1~5 channels required")
+            for p in pins:
+                if p not in SCOPE_PINS:
+                    raise ValueError("Invalid scope pin: %d" % p)
+            self.pins = pins
+            self._nch = len(pins)
+            self._reads = tuple(make_adc(p).read_u16 for p in pins)
+            if self.trigger_channel >= self._nch:
+                self.trigger_channel = 0
+        if rate_hz is not None:
+            self.rate_hz = int(rate_hz)
+        if frames is not None:
+            self.frames = int(frames)
+
+        nch = self._nch or 1
+        self.rate_hz = max(1, min(self.rate_hz, self.MAX_RATE_HZ, self.MAX_TOTAL_RATE // nch))
+        max_frames = self.MAX_SAMPLES // nch
+        if self.frames <= 0 or self.frames > max_frames:
+            self.frames = max_frames
+        if self.pretrigger >= self.frames:
+            self.pretrigger = self.frames - 1
+
+    def set_trigger(self, level=None, edge=EDGE_RISE, pretrigger=0, channel=0, timeout_ms=2000):
+        """
+        레벨 트리거 설정
+
+        Args:
+            level (int): 트리거 레벨 (12비트, None 이면 트리거 없음)
+            edge (int): EDGE_RISE / EDGE_FALL
+            pretrigger (int): 트리거 이전에 남길 프레임 수
+            channel (int): 트리거 채널 인덱스 (pins 순서 기준)
+            timeout_ms (int): 트리거 대기 제한 시간 (초과 시 강제 트리거)
+        """
+        self.trigger_level = None if level is None else max(0, min(int(level), 4095))
+        self.trigger_edge = edge
+        self.trigger_channel = channel if 0 <= channel < max(self._nch, 1) else 0
+        self.timeout_ms = max(int(timeout_ms), 0)
+        if self.frames:
+            self.pretrigger = max(0, min(int(pretrigger), self.frames - 1))
+        else:
+            self.pretrigger = max(0, int(pretrigger))
+
+    # ------------------------------------------------------------------
+    # 캡처
+    # ------------------------------------------------------------------
+    def start(self):
+        """캡처 시작 (타이머 가동, 즉시 반환)"""
+        if not self._nch:
+            raise ValueError("No scope channels configured")
+        self.stop()
+
+        self._frame = 0
+        self._count = 0
+        self._trig_frame = 0
+        self.forced = False
+        self._tx_stage = 0
+        self._ticks = 0
+        self.actual_rate_hz = 0
+        if self.trigger_level is None:
+            # 트리거 없음: 처음부터 frames 개 채움
+            self.state = self.POST
+            self._count = self.frames
+        elif self.pretrigger > 0:
+            self.state = self.PREFILL
+        else:
+            self.state = self.WAIT_TRIG
+        self._prev = -1
+        self._armed_ms = time.ticks_ms()
+
+        self._timer = machine.Timer(self.timer_id)
+        self._timer.init(freq=self.rate_hz, mode=machine.Timer.PERIODIC, callback=self._cb)
+
+    def stop(self):
+        """캡처/전송 중지 (타이머 해제)"""
+        self._stop_timer()
+        self.state = self.IDLE
+        self._tx_stage = 0
+
+    def _stop_timer(self):
+        if self._timer is not None:
+            try:
+                self._timer.deinit()
+            except Exception:
+                pass
+            self._timer = None
+
+    def _tick(self, _timer):
+        """타이머 콜백: 프레임 1개 저장 + 트리거 상태 갱신 (할당 없음)"""
+        state = self.state
+        if state == self.IDLE or state == self.DONE:
+            return
+        t = time.ticks_us()
+        if self._ticks == 0:
+            self._first_us = t
+        self._last_us = t
+        self._ticks += 1
+
+        buf = self._buf
+        frame = self._frame
+        i = frame * self._nch
+        for read in self._reads:
+            buf[i] = read() >> 4
+            i += 1
+
+        nxt = frame + 1
+        if nxt >= self.frames:
+            nxt = 0
+        self._frame = nxt
+
+        if state == self.POST:
+            self._count -= 1
+            if self._count <= 0:
+                self.state = self.DONE
+        elif state == self.WAIT_TRIG:
+            v = buf[frame * self._nch + self.trigger_channel]
+            prev = self._prev
+            self._prev = v
+            level = self.trigger_level
+            if prev >= 0:
+                if self.trigger_edge == self.EDGE_RISE:
+                    hit = prev < level <= v
+                else:
+                    hit = prev > level >= v
+                if hit:
+                    self._trig_frame = frame
+                    self._count = self.frames - self.pretrigger - 1
+                    self.state = self.POST if self._count > 0 else self.DONE
+        else:  # PREFILL
+            self._count += 1
+            if self._count >= self.pretrigger:
+                self.state = self.WAIT_TRIG
+
+    def update(self):
+        """
+        메인 루프에서 주기 호출: 트리거 타임아웃 처리, 완료 시 타이머 해제
+
+        Returns:
+            bool: 이번 호출에서 캡처가 완료되었는지 여부
+        """
+        state = self.state
+        if state == self.WAIT_TRIG and self.timeout_ms:
+            if time.ticks_diff(time.ticks_ms(), self._armed_ms) >= self.timeout_ms:
+                # AUTO: 현재 위치에서 강제 트리거
+                frame = self._frame - 1
+                if frame < 0:
+                    frame = self.frames - 1
+                self._trig_frame = frame
+                self._count = self.frames - self.pretrigger - 1
+                self.forced = True
+                self.state = self.POST if self._count > 0 else self.DONE
+        elif state == self.DONE and self._timer is not None:
+            self._stop_timer()
+            self.actual_rate_hz = self.measured_rate_hz()
+            self._tx_stage = 1
+            self._tx_offset = 0
+            self._tx_seq = 0
+            return True
+        return False
+
+    def measured_rate_hz(self):
+        """콜백 시각으로 계산한 실제 샘플링 주파수 (Hz, 측정 불가면 0)"""
+        span = time.ticks_diff(self._last_us, self._first_us)
+        if self._ticks < 2 or span <= 0:
+            return 0
+        return (self._ticks - 1) * 1000000 // span
+
+    def busy(self):
+        """캡처 또는 전송 진행 중 여부"""
+        return self.state not in (self.IDLE, self.DONE) or self._tx_stage != 0
+
+    def start_frame(self):
+        """선형화된 데이터의 첫 프레임(링 버퍼 인덱스)"""
+        if self.trigger_level is None and not self.forced:
+            return 0
+        start = self._trig_frame - self.pretrigger
+        if start < 0:
+            start += self.frames
+        return start
+
+    # ------------------------------------------------------------------
+    # 전송
+    # ------------------------------------------------------------------
+    def pump(self, notify, max_chunks=4):
+        """
+        완료된 캡처를 청크 몇 개씩 전송하고 빠르게 반환한다. (메인 루프에서 호출)
+
+        Args:
+            notify: 바이트 데이터를 전송하는 함수 (예: uart.ez_scope_notify)
+            max_chunks (int): 한 번 호출에 보낼 최대 청크 수
+
+        Returns:
+            bool: 전송이 모두 끝났는지 여부 (이번 호출에서 END 전송)
+        """
+        stage = self._tx_stage
+        if stage == 0:
+            return False
+
+        if stage == 1:
+            trig = self.pretrigger if (self.trigger_level is not None or self.forced) else 0
+            notify(("SCOPE:BEGIN:%d,%d,%d,%d" % (self._nch, self.rate_hz, self.frames, trig)).encode())
+            self._tx_stage = 2
+            return False
+
+        if stage == 2:
+            total = self.frames * self._nch
+            # 링 버퍼를 선형화하지 않고 start 지점부터 순서대로 조각을 보낸다
+            start = self.start_frame() * self._nch
+            view = self._view
+            sent = 0
+            while self._tx_offset < total and sent < max_chunks:
+                off = self._tx_offset
+                n = total - off
+                if n > self.CHUNK_SAMPLES:
+                    n = self.CHUNK_SAMPLES
+                src = start + off
+                if src >= total:
+                    src -= total
+                # 버퍼 끝을 넘어가면 끝까지만 보내고 다음 청크에서 처음부터 이어 보냄
+                if src + n > total:
+                    n = total - src
+                notify(view[src:src + n])
+                self._tx_offset = off + n
+                self._tx_seq += 1
+                sent += 1
+            if self._tx_offset >= total:
+                self._tx_stage = 3
+            return False
+
+        notify(("SCOPE:END:%d" % self._tx_seq).encode())
+        self._tx_stage = 0
+        self.state = self.IDLE
+        return True
+
+    def deinit(self):
+        """타이머 해제"""
+        self.stop()
@@ -0,0 +1,213 @@
+"""
+서보모터 모션 컨트롤러 (부드러운 이동 / 동시 도착 그룹 이동)
+
+호스트가 중간 각도를 수백 번 보내는 대신 "목표 각도 + 이동 시간" 한 번으로
+보드가 50Hz(20ms) 주기로 중간 각도를 계산해 출력한다.
+
+- 보간 곡선: LINEAR(등속), EASE(smoothstep, 가감속), TRAP(사다리꼴 속도, 앞뒤 25% 가감속)
+- 위치는 경과 시간으로 계산하므로 메인 루프가 늦게 돌아도 도착 시각은 변하지 않는다.
+- 그룹 이동: 여러 서보가 같은 시작 시각/이동 시간으로 움직여 함께 도착한다.
+- update() 는 완료된 이동을 [("S", 서보번호) 또는 ("G", 그룹번호)] 로 돌려준다.
+- 하드웨어 타이머 대신 메인 루프의 20ms 주기 스케줄을 사용한다.
+  (ESP32-S3 타이머 4개 중 0~2 는 EZSOUND/SCOPE/먼지센서, 3 은 버저 시퀀서용)
+
+사용 예:
+    from servo_motion import ServoMotion
+
+    motion = ServoMotion()
+    motion.attach(1, pwm1)
+    motion.set_angle(1, 0)
+    motion.move(1, 180, 1000, ServoMotion.EASE)
+    while True:
+        for done in motion.update():
+            print("done", done)
+"""
+
+import time
+
+
+class ServoMotion:
+    """서보 각도 보간 컨트롤러"""
+
+    LINEAR = 0
+    EASE = 1
+    TRAP = 2
+    EASE_NAMES = {"LINEAR": LINEAR, "EASE": EASE, "TRAP": TRAP}
+
+    PERIOD_MS = 20       # 50Hz (서보 PWM 주기와 동일)
+    TRAP_ACCEL = 0.25    # TRAP 가속/감속 구간 비율
+
+    def __init__(self, pulse_min_ns=500_000, pulse_max_ns=2_500_000):
+        """
+        Args:
+            pulse_min_ns (int): 0도 펄스 폭 (기본 0.5ms)
+            pulse_max_ns (int): 180도 펄스 폭 (기본 2.5ms)
+        """
+        self.pulse_min_ns = pulse_min_ns
+        self.pulse_span_ns = pulse_max_ns - pulse_min_ns
+        self._pwms = {}
+        self._angles = {}       # 서보번호 -> 마지막 출력 각도
+        self._moves = {}        # 서보번호 -> [시작각, 목표각, 시작ms, 시간ms, 곡선, 그룹]
+        self._groups = {}       # 그룹번호 -> 남은 서보 수
+        self._next_group = 1
+        self._next_ms = 0
+
+    # ------------------------------------------------------------------
+    # 채널
+    # ------------------------------------------------------------------
+    def attach(self, index, pwm):
+        """서보 번호에 PWM 연결 (핀 재설정 시 이동 취소, 각도는 다시 모르는 상태)"""
+        self._cancel(index)
+        self._pwms[index] = pwm
+        self._angles.pop(index, None)
+
+    def detach(self, index):
+        self._cancel(index)
+        self._pwms.pop(index, None)
+        self._angles.pop(index, None)
+
+    def is_attached(self, index):
+        return self._pwms.get(index) is not None
+
+    def angle(self, index):
+        """마지막 출력 각도 (모르면 None)"""
+        return self._angles.get(index)
+
+    def _write(self, index, deg):
+        self._pwms[index].duty_ns(int(self.pulse_min_ns + self.pulse_span_ns * deg / 180))
+        self._angles[index] = deg
+
+    def set_angle(self, index, deg):
+        """
+        즉시 각도 설정 (진행 중인 이동은 취소)
+
+        Returns:
+            bool: 성공 여부 (PWM 미연결이면 False)
+        """
+        if not self.is_attached(index):
+            return False
+        self._cancel(index)
+        self._write(index, max(0, min(180, deg)))
+        return True
+
+    # ------------------------------------------------------------------
+    # 이동
+    # ------------------------------------------------------------------
+    def move(self, index, deg, duration_ms, ease=EASE, _group=0, _start_ms=None):
+        """
+        현재 각도에서 deg 까지 duration_ms 동안 이동 시작
+
+        현재 각도를 모르면(핀 설정 직후) 바로 목표 각도로 이동하고 다음 update() 에서 완료된다.
+
+        Returns:
+            bool: 성공 여부 (PWM 미연결이면 False)
+        """
+        if not self.is_attached(index):
+            return False
+        self._cancel(index)
+        deg = max(0, min(180, deg))
+        start = self._angles.get(index)
+        if start is None:
+            self._write(index, deg)
+            start = deg
+        if _start_ms is None:
+            _start_ms = time.ticks_ms()
+        self._moves[index] = [start, deg, _start_ms, max(0, int(duration_ms)), ease, _group]
+        return True
+
+    def move_group(self, targets, duration_ms, ease=EASE):
+        """
+        여러 서보를 같은 시각에 출발시켜 함께 도착하도록 이동
+
+        Args:
+            targets: [(서보번호, 각도), ...]
+
+        Returns:
+            int: 그룹 번호 (완료 시 update() 가 ("G", 그룹번호) 반환)
+        """
+        for index, _ in targets:
+            if not self.is_attached(index):
+                raise ValueError("servo {} not configured".format(index))
+        group = self._next_group
+        self._next_group = group + 1 if group < 0xFFFF else 1
+        now = time.ticks_ms()
+        self._groups[group] = len(targets)
+        for index, deg in targets:
+            self.move(index, deg, duration_ms, ease, group, now)
+        return group
+
+    def _cancel(self, index):
+        """진행 중인 이동 취소 (그룹에서는 빠지며 완료 알림 대상에서 제외)"""
+        m = self._moves.pop(index, None)
+        if m is not None and m[5]:
+            group = m[5]
+            left = self._groups.get(group)
+            if left is not None:
+                if left <= 1:
+                    del self._groups[group]
+                else:
+                    self._groups[group] = left - 1
+
+    def stop(self, index=None):
+        """이동 정지 (현재 위치 유지), index 가 None 이면 전체"""
+        if index is None:
+            self._moves = {}
+            self._groups = {}
+        else:
+            self._cancel(index)
+
+    def busy(self, index=None):
+        """이동 중 여부"""
+        if index is None:
+            return bool(self._moves)
+        return index in self._moves
+
+    def _profile(self, ease, t):
+        """0~1 경과 비율 → 0~1 진행 비율"""
+        if ease == self.EASE:
+            return t * t * (3 - 2 * t)
+        if ease == self.TRAP:
+            a = self.TRAP_ACCEL
+            v = 1 / (1 - a)
+            if t < a:
+                return 0.5 * v / a * t * t
+            if t > 1 - a:
+                r = 1 - t
+                return 1 - 0.5 * v / a * r * r
+            return 0.5 * v * a + v * (t - a)
+        return t
+
+    def update(self):
+        """
+        20ms 마다 이동 중인 서보의 각도를 갱신 (메인 루프에서 주기 호출)
+
+        Returns:
+            list: 이번에 완료된 이동 [("S", 서보번호) 또는 ("G", 그룹번호), ...]
+        """
+        done = []
+        if not self._moves:
+            return done
+        now = time.ticks_ms()
+        if time.ticks_diff(now, self._next_ms) < 0:
+            return done
+        self._next_ms = time.ticks_add(now, self.PERIOD_MS)
+
+        for index in list(self._moves):
+            start, target, t0, duration, ease, group = self._moves[index]
+            elapsed = time.ticks_diff(now, t0)
+            if elapsed >= duration:
+                self._write(index, target)
+                del self._moves[index]
+                if group:
+                    left = self._groups.get(group, 1) - 1
+                    if left <= 0:
+                        self._groups.pop(group, None)
+                        done.append(("G", group))
+                    else:
+                        self._groups[group] = left
+                else:
+                    done.append(("S", index))
+            elif elapsed > 0:
+                p = self._profile(ease, elapsed / duration)
+                self._write(index, start + (target - start) * p)
+        return done
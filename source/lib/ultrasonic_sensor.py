@@ -0,0 +1,281 @@
+"""
+Non-blocking Ultrasonic Sensor Library for MicroPython
+=======================================================
+
+HC-SR04(2핀) / CS100A(1핀) 초음파 센서 비동기 드라이버
+
+기존 HCSR04 드라이버는 machine.time_pulse_us()로 에코를 기다리는 동안
+CPU를 점유하고, 범위 밖 측정은 타임아웃 전체를 소모한다.
+이 드라이버는 트리거만 보낸 뒤 에코 핀의 상승/하강 엣지를 Pin.irq에서
+ticks_us로 기록하고, 메인 루프의 poll()에서 측정을 마무리한다.
+
+주요 기능:
+- 2핀(Trig/Echo 분리) / 1핀(Trig/Echo 겸용) 배선 모두 지원
+- IRQ 타임스탬프 기반 펄스 폭 측정 (블로킹 없음)
+- 중앙값(median-of-N) 필터로 튀는 값 제거
+- 온도 보정 음속 (c = 331.3 + 0.606 * T m/s)
+- 연속 측정 모드 (기본 50ms 주기, 20Hz)
+
+사용 예:
+    from ultrasonic_sensor import UltrasonicSensor
+
+    sensor = UltrasonicSensor(trigger_pin=21, echo_pin=47)  # 2핀
+    # sensor = UltrasonicSensor(trigger_pin=48)             # 1핀
+    sensor.start_continuous(50)
+    while True:
+        if sensor.poll():
+            print(sensor.distance_cm, "cm")
+"""
+
+import time
+import array
+from machine import Pin
+
+
+class UltrasonicSensor:
+    """
+    IRQ 타임스탬프 기반 초음파 센서 드라이버
+
+    측정 상태:
+    - IDLE     : 측정 대기
+    - WAIT_RISE: 트리거 전송 후 에코 상승 엣지 대기
+    - WAIT_FALL: 에코 HIGH 구간 (하강 엣지 대기)
+    - DONE     : 하강 엣지 수신, poll()에서 거리 계산 대기
+    """
+
+    IDLE = 0
+    WAIT_RISE = 1
+    WAIT_FALL = 2
+    DONE = 3
+
+    MIN_DISTANCE_CM = 2
+    MAX_DISTANCE_CM = 400
+
+    def __init__(self, trigger_pin, echo_pin=None, echo_timeout_us=25000, filter_size=5, temperature_c=20.0):
+        """
+        Args:
+            trigger_pin (int): 트리거 핀 (1핀 모듈은 데이터 핀)
+            echo_pin (int): 에코 핀 (None 또는 trigger_pin 과 같으면 1핀 모드)
+            echo_timeout_us (int): 에코 대기 타임아웃 (400cm 왕복 약 23.3ms)
+            filter_size (int): 중앙값 필터 창 크기 (샘플 수)
+            temperature_c (float): 음속 보정용 기온(°C)
+        """
+        self.trigger_pin = trigger_pin
+        self.echo_pin = echo_pin if echo_pin is not None else trigger_pin
+        self.single_pin = self.echo_pin == trigger_pin
+        self.echo_timeout_us = echo_timeout_us
+
+        # IRQ 에서 쓰는 상태/타임스탬프 (미리 할당, IRQ 내 할당 없음)
+        self._state = self.IDLE
+        self._edges = array.array("i", [0, 0])  # [상승 시각, 하강 시각]
+        self._trigger_us = 0
+        self._irq_cb = self._echo_irq
+
+        # 중앙값 필터
+        if filter_size < 1:
+            filter_size = 1
+        self._filter_size = filter_size
+        self._window = [0.0] * filter_size
+        self._sorted = [0.0] * filter_size
+        self._win_idx = 0
+        self._win_count = 0
+
+        # 최근 결과
+        self.distance_cm = None      # 필터 적용 거리 (범위 밖이면 None)
+        self.last_raw_cm = None      # 필터 전 마지막 거리
+        self.last_update_ms = None
+        self.timeouts = 0
+        self._misses = 0
+
+        # 연속 측정
+        self.continuous = False
+        self.interval_ms = 50
+        self._last_trigger_ms = time.ticks_ms()
+
+        self.set_temperature(temperature_c)
+
+        if self.single_pin:
+            self._pin = Pin(trigger_pin, Pin.OUT, pull=None)
+            self._pin.value(0)
+            self._echo = None
+        else:
+            self._pin = Pin(trigger_pin, Pin.OUT, pull=None)
+            self._pin.value(0)
+            self._echo = Pin(self.echo_pin, Pin.IN, pull=None)
+            self._attach_irq(self._echo)
+
+    # ------------------------------------------------------------------
+    # 설정
+    # ------------------------------------------------------------------
+    def set_temperature(self, temperature_c):
+        """
+        음속 보정용 기온 설정
+        거리(cm) = 펄스(us) * c(m/s) / 20000  (왕복이므로 2로 나눔)
+        """
+        self.temperature_c = temperature_c
+        self.sound_speed = 331.3 + 0.606 * temperature_c
+        self._cm_per_us = self.sound_speed / 20000.0
+
+    def start_continuous(self, interval_ms=50):
+        """연속 측정 시작 (poll()이 주기마다 트리거)"""
+        self.interval_ms = max(int(interval_ms), 40)
+        self.continuous = True
+
+    def stop_continuous(self):
+        """연속 측정 중지"""
+        self.continuous = False
+
+    # ------------------------------------------------------------------
+    # IRQ / 트리거
+    # ------------------------------------------------------------------
+    def _attach_irq(self, pin):
+        try:
+            pin.irq(handler=self._irq_cb, trigger=Pin.IRQ_RISING | Pin.IRQ_FALLING, hard=True)
+        except TypeError:
+            # hard IRQ 를 지원하지 않는 포트
+            pin.irq(handler=self._irq_cb, trigger=Pin.IRQ_RISING | Pin.IRQ_FALLING)
+
+    def _echo_irq(self, pin):
+        """에코 엣지 IRQ: 시각만 기록 (할당 없음)"""
+        now = time.ticks_us()
+        if pin.value():
+            if self._state == self.WAIT_RISE:
+                self._edges[0] = now
+                self._state = self.WAIT_FALL
+        elif self._state == self.WAIT_FALL:
+            self._edges[1] = now
+            self._state = self.DONE
+
+    def trigger(self):
+        """
+        10us 트리거 펄스를 보내고 에코 측정을 시작한다. (즉시 반환)
+
+        Returns:
+            bool: 트리거 전송 여부 (측정 중이면 False)
+        """
+        if self._state in (self.WAIT_RISE, self.WAIT_FALL):
+            return False
+
+        pin = self._pin
+        if self.single_pin:
+            pin.irq(handler=None)
+            pin.init(Pin.OUT, pull=None)
+
+        pin.value(0)
+        time.sleep_us(2)
+        pin.value(1)
+        time.sleep_us(10)
+        pin.value(0)
+
+        self._state = self.WAIT_RISE
+        self._trigger_us = time.ticks_us()
+        self._last_trigger_ms = time.ticks_ms()
+
+        if self.single_pin:
+            # 같은 핀을 입력으로 전환해 에코 대기
+            pin.init(Pin.IN, pull=None)
+            self._attach_irq(pin)
+        return True
+
+    def busy(self):
+        """측정 진행 중 여부"""
+        return self._state in (self.WAIT_RISE, self.WAIT_FALL)
+
+    # ------------------------------------------------------------------
+    # 결과 처리
+    # ------------------------------------------------------------------
+    def _push(self, value):
+        """중앙값 필터 창에 추가하고 필터 결과를 갱신"""
+        n = self._filter_size
+        self._window[self._win_idx] = value
+        self._win_idx = (self._win_idx + 1) % n
+        if self._win_count < n:
+            self._win_count += 1
+
+        count = self._win_count
+        buf = self._sorted
+        for i in range(count):
+            buf[i] = self._window[i]
+        for i in range(1, count):
+            v = buf[i]
+            j = i - 1
+            while j >= 0 and buf[j] > v:
+                buf[j + 1] = buf[j]
+                j -= 1
+            buf[j + 1] = v
+        self.distance_cm = buf[count // 2]
+
+    def _miss(self):
+        """
+        범위 밖/타임아웃 처리: 한두 번은 필터가 흡수하고,
+        창 크기만큼 연속되면 필터를 비우고 범위 밖(None)으로 본다.
+        """
+        self.last_raw_cm = None
+        self._misses += 1
+        if self._misses >= self._filter_size:
+            self.distance_cm = None
+            self._win_count = 0
+            self._win_idx = 0
+
+    def poll(self):
+        """
+        메인 루프에서 주기적으로 호출한다.
+        - 에코 측정 완료 시 거리 계산/필터 반영
+        - 타임아웃 시 범위 밖으로 처리
+        - 연속 모드이면 주기마다 다음 트리거
+
+        Returns:
+            bool: 이번 호출에서 측정이 끝났는지 여부 (성공/범위 밖 모두)
+        """
+        finished = False
+        state = self._state
+
+        if state == self.DONE:
+            pulse = time.ticks_diff(self._edges[1], self._edges[0])
+            self._state = self.IDLE
+            cm = pulse * self._cm_per_us
+            self.last_update_ms = time.ticks_ms()
+            if self.MIN_DISTANCE_CM <= cm <= self.MAX_DISTANCE_CM:
+                self.last_raw_cm = cm
+                self._misses = 0
+                self._push(cm)
+            else:
+                self._miss()
+            finished = True
+        elif state in (self.WAIT_RISE, self.WAIT_FALL):
+            if time.ticks_diff(time.ticks_us(), self._trigger_us) > self.echo_timeout_us:
+                self._state = self.IDLE
+                self.timeouts += 1
+                self.last_update_ms = time.ticks_ms()
+                self._miss()
+                finished = True
+
+        if self.continuous and self._state == self.IDLE:
+            if time.ticks_diff(time.ticks_ms(), self._last_trigger_ms) >= self.interval_ms:
+                self.trigger()
+
+        return finished
+
+    def age_ms(self):
+        """마지막 측정 완료 이후 경과 시간(ms), 없으면 None"""
+        if self.last_update_ms is None:
+            return None
+        return time.ticks_diff(time.ticks_ms(), self.last_update_ms)
+
+    def deinit(self):
+        """IRQ 해제"""
+        self.continuous = False
+        self._state = self.IDLE
+        try:
+            (self._echo or self._pin).irq(handler=None)
+        except Exception:
+            pass
+
+
+if __name__ == "__main__":
+    sensor = UltrasonicSensor(trigger_pin=21, echo_pin=47)
+    sensor.start_continuous(50)
+    while True:
+        if sensor.poll():
+            print("distance:", sensor.distance_cm, "cm (raw:", sensor.last_raw_cm, ")")
+        time.sleep_ms(5)